@@ -22,10 +22,47 @@
 # waive the privileges and immunities granted to it by virtue of its status
 # as an Intergovernmental Organization or submit itself to any jurisdiction.
 
-"""Invenio Digital Library Framework."""
+"""Invenio Digital Library Framework.
+
+The installed module bundles are available as attributes of the package and
+are only imported when first accessed (see :mod:`invenio.bundles`).
+"""
 
 from __future__ import absolute_import, print_function
 
+import sys
+import types
+
+from .bundles import BUNDLES, Bundle, import_report
 from .version import __version__
 
-__all__ = ('__version__', )
+__all__ = ('__version__', 'import_report', ) + tuple(sorted(BUNDLES))
+
+
+class LazyPackage(types.ModuleType):
+    """Package resolving the bundle attributes on first access.
+
+    Module level ``__getattr__`` (PEP 562) requires Python 3.7, so the
+    package module is replaced by an instance of this class instead.
+    """
+
+    def __getattr__(self, name):
+        """Resolve bundle attributes on first access."""
+        if name in BUNDLES:
+            bundle = Bundle(name, BUNDLES[name])
+            setattr(self, name, bundle)
+            return bundle
+        raise AttributeError(
+            'module {0!r} has no attribute {1!r}'.format(self.__name__, name))
+
+    def __dir__(self):
+        """List the package attributes including the bundles."""
+        return sorted(set(self.__dict__) | set(BUNDLES))
+
+
+_package = LazyPackage(__name__, __doc__)
+_package.__dict__.update(globals())
+# Keep the replaced module alive: Python 2 clears the globals of collected
+# modules.
+_package._module = sys.modules[__name__]
+sys.modules[__name__] = _package
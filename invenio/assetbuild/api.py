@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental collection of static files and build of asset bundles."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from functools import partial
+
+from ..reindex.api import fork_context
+
+STATE_FORMAT = 1
+"""Version of the build state file format."""
+
+_targets = {}
+"""Targets being built, inherited by the forked worker processes."""
+
+
+class FileHasher(object):
+    """Content digests of files.
+
+    Digests are reused while the size and modification time of a file are
+    unchanged, so only modified files are read again.
+    """
+
+    def __init__(self, cache=None):
+        """Initialize the hasher.
+
+        :param cache: Dictionary mapping paths to ``[size, mtime, digest]``,
+            updated in place.
+        """
+        self.cache = {} if cache is None else cache
+
+    def digest(self, path):
+        """Return the digest of a file, or ``None`` if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.cache.pop(path, None)
+            return None
+        entry = self.cache.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime:
+            return entry[2]
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        self.cache[path] = [stat.st_size, stat.st_mtime, digest.hexdigest()]
+        return self.cache[path][2]
+
+    def fingerprint(self, paths, key=''):
+        """Return a digest of a set of files and an extra key."""
+        fingerprint = hashlib.sha1(key.encode('utf-8'))
+        for path in sorted(paths):
+            fingerprint.update('{0}\0{1}\0'.format(
+                path, self.digest(path)).encode('utf-8'))
+        return fingerprint.hexdigest()
+
+
+class BuildState(object):
+    """Fingerprints of the last successful build of each target."""
+
+    def __init__(self, path=None):
+        """Load the state from ``path`` if it exists."""
+        self.path = path
+        self.files = {}
+        self.targets = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == STATE_FORMAT:
+                self.files = data['files']
+                self.targets = data['targets']
+
+    def save(self):
+        """Write the state atomically."""
+        if not self.path:
+            return
+        data = json.dumps(dict(version=STATE_FORMAT, files=self.files,
+                               targets=self.targets), sort_keys=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.')
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.rename(tmp, self.path)
+
+
+class Target(object):
+    """Something built from input files."""
+
+    def __init__(self, name, inputs, build, outputs=(), key='',
+                 parallel=True):
+        """Initialize the target.
+
+        :param name: Unique name of the target.
+        :param inputs: Paths of the input files.
+        :param build: Function building the target.
+        :param outputs: Paths of the built files; the target is rebuilt if
+            one of them is missing.
+        :param key: String describing how the target is built (e.g. its
+            filters), which rebuilds the target when it changes.
+        :param parallel: Whether the target may be built in a worker
+            process.
+        """
+        self.name = name
+        self.inputs = list(inputs)
+        self.build = build
+        self.outputs = list(outputs)
+        self.key = key
+        self.parallel = parallel
+
+
+class BuildError(Exception):
+    """Some targets failed to build."""
+
+    def __init__(self, errors):
+        """Initialize the error with a dictionary of messages by target."""
+        super(BuildError, self).__init__(
+            'Failed to build {0}.'.format(', '.join(sorted(errors))))
+        self.errors = errors
+
+
+def _build(name):
+    """Build a target in a worker process."""
+    try:
+        _targets[name].build()
+    except Exception as e:
+        return name, '{0}: {1}'.format(e.__class__.__name__, e)
+    return name, None
+
+
+def build_targets(targets, state, processes=None, force=False,
+                  callback=None):
+    """Build the targets whose inputs changed since the last build.
+
+    Parallel targets are built in forked worker processes, which inherit the
+    application context of the parent process. The state is saved even when
+    some targets fail, so their successfully built siblings are skipped
+    next time.
+
+    :param targets: List of :class:`Target`.
+    :param state: The :class:`BuildState` to compare with and update.
+    :param processes: Number of worker processes (defaults to CPU count).
+    :param force: Build all targets.
+    :param callback: Called with each target name once built.
+    :returns: Tuple of the names of built and of skipped targets.
+    :raises BuildError: If some targets failed.
+    """
+    hasher = FileHasher(state.files)
+    stale, skipped = [], []
+    for target in targets:
+        fingerprint = hasher.fingerprint(target.inputs, target.key)
+        if force or state.targets.get(target.name) != fingerprint or \
+                not all(os.path.exists(path) for path in target.outputs):
+            stale.append((target, fingerprint))
+        else:
+            skipped.append(target.name)
+
+    fingerprints = dict((t.name, fingerprint) for t, fingerprint in stale)
+    results = []
+    parallel = [t.name for t, dummy in stale if t.parallel]
+    processes = processes or multiprocessing.cpu_count()
+    try:
+        for target, dummy in stale:
+            if not target.parallel or processes < 2 or len(parallel) < 2:
+                results.append(_build_one(target))
+        if processes > 1 and len(parallel) > 1:
+            _targets.update((t.name, t) for t, dummy in stale)
+            pool = fork_context().Pool(min(processes, len(parallel)))
+            try:
+                results.extend(pool.imap_unordered(_build, parallel))
+            finally:
+                pool.close()
+                pool.join()
+                _targets.clear()
+    finally:
+        built, errors = [], {}
+        for name, error in results:
+            if error:
+                errors[name] = error
+                state.targets.pop(name, None)
+            else:
+                built.append(name)
+                state.targets[name] = fingerprints[name]
+                if callback:
+                    callback(name)
+        state.save()
+    if errors:
+        raise BuildError(errors)
+    return built, skipped
+
+
+def _build_one(target):
+    """Build a target in the current process."""
+    _targets[target.name] = target
+    try:
+        return _build(target.name)
+    finally:
+        _targets.pop(target.name)
+
+
+def copy_files(files):
+    """Copy files, given as a dictionary mapping destinations to sources."""
+    for destination, source in files.items():
+        directory = os.path.dirname(destination)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        shutil.copy2(source, destination)
+
+
+def collect_targets(app, static_root=None):
+    """Return the targets collecting blueprint static files.
+
+    As with Flask-Collect, files of blueprints registered first take
+    precedence, and blueprints whose static URL is below the one of the
+    application are collected in the corresponding subfolder.
+
+    :param app: Flask application.
+    :param static_root: Destination folder (defaults to the application
+        static folder).
+    """
+    static_root = static_root or app.static_folder
+    static_url = app.static_url_path.rstrip('/') + '/'
+    collected = set()
+    targets = []
+    for name, blueprint in app.blueprints.items():
+        if not blueprint.has_static_folder or \
+                not os.path.isdir(blueprint.static_folder):
+            continue
+        prefix = ''
+        if blueprint.static_url_path and \
+                blueprint.static_url_path.startswith(static_url):
+            prefix = blueprint.static_url_path[len(static_url):]
+        files = {}
+        for root, dirs, filenames in os.walk(blueprint.static_folder,
+                                             followlinks=True):
+            for filename in filenames:
+                source = os.path.join(root, filename)
+                relative = os.path.normpath(os.path.join(
+                    prefix, os.path.relpath(source, blueprint.static_folder)))
+                if relative not in collected:
+                    collected.add(relative)
+                    files[os.path.join(static_root, relative)] = source
+        targets.append(Target(
+            'collect:{0}'.format(name), files.values(),
+            partial(copy_files, files), outputs=files, parallel=False))
+    return targets
+
+
+def _build_bundle(bundle):
+    """Build a webassets bundle."""
+    bundle.build(force=True)
+
+
+def bundle_targets(env):
+    """Return the targets building the bundles of a webassets environment.
+
+    :param env: A webassets environment, such as
+        ``app.jinja_env.assets_environment`` of Flask-Assets.
+    """
+    from webassets.bundle import get_all_bundle_files
+
+    targets = []
+    for bundle in env:
+        if not bundle.output:
+            continue
+        outputs = []
+        if '%(version)s' not in bundle.output:
+            outputs.append(os.path.join(env.directory, bundle.output))
+        key = json.dumps([bundle.output, [
+            getattr(f, 'name', None) or f.__class__.__name__
+            for f in bundle.filters]])
+        targets.append(Target(
+            'bundle:{0}'.format(bundle.output), get_all_bundle_files(bundle),
+            partial(_build_bundle, bundle), outputs=outputs, key=key))
+    return targets
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for incremental asset builds."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import BuildError, BuildState, build_targets, bundle_targets, \
+    collect_targets
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.command('build-assets')
+@click.option('--jobs', '-j', type=int,
+              help='Bundles built in parallel (ASSETBUILD_PROCESSES).')
+@click.option('--force', '-f', is_flag=True,
+              help='Collect and build everything.')
+@click.option('--collect/--no-collect', default=True,
+              help='Collect blueprint static files first.')
+@with_appcontext
+def build_assets(jobs, force, collect):
+    """Collect static files and build bundles whose sources changed."""
+    ext = current_app.extensions['invenio-assetbuild']
+    state = BuildState(ext.state_path)
+    processes = jobs or current_app.config['ASSETBUILD_PROCESSES']
+    env = getattr(current_app.jinja_env, 'assets_environment', None)
+
+    phases = []
+    if collect:
+        phases.append(('collected', lambda: collect_targets(current_app)))
+    if env is not None:
+        phases.append(('built', lambda: bundle_targets(env)))
+    try:
+        for verb, targets in phases:
+            # Bundles are fingerprinted once static files are collected.
+            built, skipped = build_targets(
+                targets(), state, processes=processes, force=force,
+                callback=lambda name: click.echo(name, err=True))
+            click.secho('{0} {1}, {2} unchanged.'.format(
+                verb.capitalize(), len(built), len(skipped)), fg='green')
+    except BuildError as e:
+        for name, error in sorted(e.errors.items()):
+            click.secho('{0}: {1}'.format(name, error), fg='red', err=True)
+        raise click.ClickException(str(e))
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental asset build extension."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+from . import config
+from .cli import build_assets
+
+
+class InvenioAssetBuild(object):
+    """Incremental asset build extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.state_path = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        self.state_path = app.config['ASSETBUILD_STATE'] or os.path.join(
+            app.instance_path, 'assetbuild.json')
+        app.cli.add_command(build_assets)
+        app.extensions['invenio-assetbuild'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('ASSETBUILD_'):
+                app.config.setdefault(k, getattr(config, k))
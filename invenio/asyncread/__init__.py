@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Asynchronous read path for record fetches and searches.
+
+Read traffic is mostly waiting for the database and the search engine. On
+the WSGI application every waiting request holds a worker thread; the
+asynchronous read path serves the same reads from an asyncio event loop
+instead, where waiting requests cost almost nothing:
+
+* ``GET /records/<pid_value>`` returns a record;
+* ``GET /records/?q=<query>&page=<page>&size=<size>`` searches records.
+
+Database and search calls go through adapters which await asynchronous
+clients directly and run synchronous ones in a small thread pool, with
+separately bounded concurrency. Requests beyond the bounds wait on the
+event loop and, past ``ASYNCREAD_MAX_WAITING``, are rejected with ``503``.
+
+The read path runs next to the WSGI application, e.g. on another port to
+which the front-end proxy routes ``GET`` requests of the record endpoints:
+
+.. code-block:: console
+
+    $ invenio serve-async invenio3.factory:create_app --port 5001
+
+It is an ASGI application (see
+:meth:`~invenio.asyncread.ext.InvenioAsyncRead.create_asgi_app`), so it
+can also be run by any ASGI server. It requires Python 3.7 or later;
+``python setup.py bench --suites async`` compares how the synchronous and
+asynchronous paths scale with concurrent connections.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .ext import InvenioAsyncRead
+
+__all__ = ('InvenioAsyncRead', )
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Adapters running database and search calls with bounded concurrency.
+
+Requires Python 3.7 or later.
+"""
+
+from __future__ import absolute_import, print_function
+
+import asyncio
+import functools
+
+
+class Overloaded(Exception):
+    """Too many calls are waiting for a free slot."""
+
+
+class Gone(Exception):
+    """The requested record was deleted."""
+
+
+class Limiter(object):
+    """Bound the number of concurrent calls to a backend.
+
+    Calls beyond ``concurrency`` wait for a free slot; when no slot is free
+    and ``max_waiting`` calls are already waiting, new calls fail right away
+    with :class:`Overloaded` instead of piling up.
+    """
+
+    def __init__(self, concurrency, max_waiting=None):
+        """Initialize the limiter.
+
+        :param concurrency: Maximum number of concurrent calls.
+        :param max_waiting: Maximum number of waiting calls (``None`` for no
+            limit).
+        """
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = None
+
+    async def run(self, func, *args, **kwargs):
+        """Run a call once a slot is free (see :func:`call`)."""
+        if self._semaphore is None:
+            # Created lazily so that it belongs to the running loop.
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        if self.max_waiting is not None and self._semaphore.locked() and \
+                self.waiting >= self.max_waiting:
+            raise Overloaded()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            return await call(func, *args, **kwargs)
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+
+async def call(func, *args, executor=None, **kwargs):
+    """Call a coroutine function, or a function in a thread pool.
+
+    :param func: Coroutine function or synchronous function.
+    :param executor: Executor running synchronous functions (``None`` for
+        the default executor of the loop).
+    """
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs))
+
+
+def in_app_context(app, func):
+    """Wrap a synchronous function to run within an application context."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with app.app_context():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def load_record(pid_value, pid_type='recid'):
+    """Load a record from a persistent identifier value.
+
+    Uses the persistent identifier cache when it is enabled.
+
+    :returns: The record as a dictionary, or ``None`` if it does not exist.
+    :raises Gone: If the record was deleted.
+    """
+    from flask import current_app
+    from invenio_pidstore.errors import PIDDeletedError, \
+        PIDDoesNotExistError, PIDUnregistered
+    from invenio_pidstore.resolver import Resolver
+    from invenio_records.api import Record
+
+    from ..pidcache.api import CachedResolver
+
+    pidcache = current_app.extensions.get('invenio-pidcache')
+    resolver_class = CachedResolver if pidcache is not None and \
+        pidcache.cache is not None else Resolver
+    resolver = resolver_class(pid_type=pid_type, object_type='rec',
+                              getter=Record.get_record)
+    try:
+        dummy, record = resolver.resolve(pid_value)
+    except (PIDDoesNotExistError, PIDUnregistered):
+        return None
+    except PIDDeletedError:
+        raise Gone()
+    return dict(record)
+
+
+class SearchAdapter(object):
+    """Search an index with a synchronous or asynchronous client."""
+
+    def __init__(self, client, index, doc_type=None, executor=None):
+        """Initialize the adapter.
+
+        :param client: Elasticsearch client, whose ``search`` may be a
+            coroutine function.
+        :param index: Searched index.
+        :param doc_type: Searched document type.
+        :param executor: Executor running the calls of a synchronous client.
+        """
+        self.client = client
+        self.index = index
+        self.doc_type = doc_type
+        self.executor = executor
+
+    async def search(self, query, start, size):
+        """Search records.
+
+        :param query: Query string (empty for all records).
+        :param start: Offset of the first hit.
+        :param size: Number of hits.
+        :returns: The search response.
+        """
+        body = {
+            'query': {'query_string': {'query': query}} if query else
+            {'match_all': {}},
+            'from': start,
+            'size': size,
+        }
+        kwargs = dict(index=self.index, body=body)
+        if self.doc_type:
+            kwargs['doc_type'] = self.doc_type
+        return await call(self.client.search, executor=self.executor,
+                          **kwargs)
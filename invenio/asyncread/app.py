@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""ASGI application serving record fetches and searches.
+
+Requires Python 3.7 or later.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+from urllib.parse import parse_qs, unquote
+
+from .adapters import Gone, Limiter, Overloaded
+
+
+class HTTPError(Exception):
+    """Error answered with a status code."""
+
+    def __init__(self, status, message, headers=None):
+        """Initialize the error."""
+        super(HTTPError, self).__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or []
+
+
+class AsyncReadApp(object):
+    """Read-only record endpoints on an asyncio event loop.
+
+    * ``GET <prefix>/<pid_value>`` returns a record;
+    * ``GET <prefix>/?q=<query>&page=<page>&size=<size>`` searches records.
+
+    Fetches and searches go through separate :class:`Limiter`, so that a
+    slow search engine cannot use up the database connections, and
+    requests beyond the limits wait without holding a thread.
+    """
+
+    def __init__(self, load_record, search, prefix='/records',
+                 db_limiter=None, search_limiter=None, executor=None,
+                 page_size=10, max_page_size=100):
+        """Initialize the application.
+
+        :param load_record: Function (or coroutine function) loading a record
+            dictionary from a persistent identifier value, ``None`` if it
+            does not exist.
+        :param search: Coroutine function ``search(query, start, size)``
+            returning an Elasticsearch response, e.g.
+            :meth:`invenio.asyncread.adapters.SearchAdapter.search`.
+        :param prefix: URL prefix of the endpoints.
+        :param db_limiter: :class:`Limiter` of the record fetches.
+        :param search_limiter: :class:`Limiter` of the searches.
+        :param executor: Executor running a synchronous ``load_record``.
+        :param page_size: Default number of hits per page.
+        :param max_page_size: Maximum number of hits per page.
+        """
+        self.load_record = load_record
+        self.search = search
+        self.prefix = prefix.rstrip('/')
+        self.db_limiter = db_limiter or Limiter(10)
+        self.search_limiter = search_limiter or Limiter(10)
+        self.executor = executor
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                await send({'type': message['type'] + '.complete'})
+                if message['type'] == 'lifespan.shutdown':
+                    return
+        if scope['type'] != 'http':
+            return
+
+        headers = [(b'content-type', b'application/json')]
+        try:
+            status, body = await self.handle(
+                scope['method'], scope['path'],
+                parse_qs(scope.get('query_string', b'').decode('latin-1')))
+        except HTTPError as e:
+            status, body = e.status, dict(status=e.status, message=e.message)
+            headers.extend(e.headers)
+        data = json.dumps(body).encode('utf-8')
+        headers.append((b'content-length', str(len(data)).encode('ascii')))
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': headers})
+        await send({'type': 'http.response.body',
+                    'body': data if scope['method'] != 'HEAD' else b''})
+
+    async def handle(self, method, path, args):
+        """Dispatch a request.
+
+        :returns: ``(status, body)``.
+        """
+        if path != self.prefix and not path.startswith(self.prefix + '/'):
+            raise HTTPError(404, 'Not found.')
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(405, 'Method not allowed.',
+                            [(b'allow', b'GET, HEAD')])
+        pid_value = unquote(path[len(self.prefix) + 1:])
+        try:
+            if not pid_value:
+                return await self.search_records(args)
+            if '/' in pid_value:
+                raise HTTPError(404, 'Not found.')
+            return await self.get_record(pid_value)
+        except Overloaded:
+            raise HTTPError(503, 'Too many concurrent requests.',
+                            [(b'retry-after', b'1')])
+
+    async def get_record(self, pid_value):
+        """Fetch a record."""
+        try:
+            record = await self.db_limiter.run(
+                self.load_record, pid_value, executor=self.executor)
+        except Gone:
+            raise HTTPError(410, 'Record was deleted.')
+        if record is None:
+            raise HTTPError(404, 'Record not found.')
+        return 200, dict(id=pid_value, metadata=record)
+
+    def _int_arg(self, args, name, default):
+        """Parse a positive integer query argument."""
+        try:
+            value = int(args.get(name, [default])[0])
+        except ValueError:
+            value = 0
+        if value < 1:
+            raise HTTPError(400, 'Invalid {0}.'.format(name))
+        return value
+
+    async def search_records(self, args):
+        """Search records."""
+        page = self._int_arg(args, 'page', 1)
+        size = min(self._int_arg(args, 'size', self.page_size),
+                   self.max_page_size)
+        response = await self.search_limiter.run(
+            self.search, args.get('q', [''])[0], (page - 1) * size, size)
+        hits = response['hits']
+        return 200, dict(hits=dict(
+            total=hits['total'],
+            hits=[dict(id=hit['_id'], metadata=hit['_source'])
+                  for hit in hits['hits']],
+        ))
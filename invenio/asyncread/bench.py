@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Concurrent connection scaling of the synchronous and asynchronous paths.
+
+Record fetches with a simulated I/O latency are served by:
+
+* ``sync``: a WSGI application on the threaded server, one request per
+  thread;
+* ``async_executor``: the asynchronous read path with a synchronous loader
+  run in a thread pool of the same size;
+* ``async``: the asynchronous read path with an asynchronous loader.
+
+Each path is load tested with an increasing number of concurrent clients.
+"""
+
+from __future__ import absolute_import, print_function
+
+import asyncio
+import json
+import socket
+import threading
+import time
+
+from ..loadtest.api import MIXES, LoadTest
+from ..server.workers import ThreadedServer
+from .adapters import Limiter
+from .app import AsyncReadApp
+from .server import HTTPServer
+
+CLIENTS = (1, 8, 32, 128)
+"""Numbers of concurrent clients."""
+
+
+def record(pid_value):
+    """Return a generated record."""
+    return dict(recid=pid_value, title='Record {0}'.format(pid_value))
+
+
+def sync_app(latency):
+    """Create a WSGI application waiting ``latency`` seconds per request."""
+    def app(environ, start_response):
+        time.sleep(latency)
+        body = json.dumps(dict(
+            id=environ['PATH_INFO'].rsplit('/', 1)[-1],
+            metadata=record(environ['PATH_INFO'].rsplit('/', 1)[-1]),
+        )).encode('utf-8')
+        start_response('200 OK', [('Content-Type', 'application/json'),
+                                  ('Content-Length', str(len(body)))])
+        return [body]
+    return app
+
+
+def serve_sync(latency, threads):
+    """Serve the synchronous path in a thread."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(1024)
+    server = ThreadedServer(sock, sync_app(latency), threads=threads)
+    server.RequestHandlerClass.access_log = False
+    thread = threading.Thread(target=server.serve)
+    thread.daemon = True
+    thread.start()
+
+    def stop():
+        server.stop()
+        thread.join()
+        server.server_close()
+    return 'http://127.0.0.1:{0}'.format(sock.getsockname()[1]), stop
+
+
+def serve_async(latency, threads, concurrency, native):
+    """Serve the asynchronous path in a thread."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def load_async(pid_value):
+        await asyncio.sleep(latency)
+        return record(pid_value)
+
+    def load_sync(pid_value):
+        time.sleep(latency)
+        return record(pid_value)
+
+    async def search(query, start, size):
+        return dict(hits=dict(total=0, hits=[]))
+
+    executor = None if native else ThreadPoolExecutor(threads)
+    server = HTTPServer(AsyncReadApp(
+        load_async if native else load_sync, search,
+        db_limiter=Limiter(concurrency), executor=executor))
+    host, port = server.start()
+
+    def stop():
+        server.stop()
+        if executor is not None:
+            executor.shutdown()
+    return 'http://{0}:{1}'.format(host, port), stop
+
+
+def run(clients=CLIENTS, requests=100, latency=0.02, threads=8,
+        concurrency=1000, **kwargs):
+    """Compare the paths with increasing numbers of concurrent clients.
+
+    :param clients: Numbers of concurrent clients.
+    :param requests: Minimum number of requests per measurement (at least
+        four per client are sent).
+    :param latency: Simulated I/O latency of a record fetch in seconds.
+    :param threads: Threads of the synchronous server and of the thread
+        pool of ``async_executor``.
+    :param concurrency: Concurrent fetches allowed by the asynchronous path.
+    :returns: Dictionary of path to results by number of clients.
+    """
+    paths = {
+        'sync': lambda: serve_sync(latency, threads),
+        'async_executor': lambda: serve_async(
+            latency, threads, concurrency, native=False),
+        'async': lambda: serve_async(
+            latency, threads, concurrency, native=True),
+    }
+    results = dict(latency=latency, threads=threads)
+    for name, serve in paths.items():
+        results[name] = {}
+        for count in clients:
+            url, stop = serve()
+            try:
+                result = LoadTest(url, MIXES['read'], clients=count,
+                                  requests=max(requests, 4 * count)).run()
+            finally:
+                stop()
+            total = result['total']
+            results[name][str(count)] = dict(
+                requests_per_second=total['requests_per_second'],
+                errors=total['errors'],
+                p50=total['latency'].get('p50'),
+                p95=total['latency'].get('p95'),
+                p99=total['latency'].get('p99'),
+            )
+    return results
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the asynchronous read path."""
+
+from __future__ import absolute_import, print_function
+
+import logging
+
+import click
+
+from ..helpers import load_app
+
+
+@click.command('serve-async')
+@click.argument('app')
+@click.option('--host', '-h', default='127.0.0.1', show_default=True,
+              help='Interface to bind.')
+@click.option('--port', '-p', default=5001, type=int, show_default=True,
+              help='Port to bind.')
+def serve_async(app, host, port):
+    """Serve the asynchronous record read path of APP.
+
+    APP is the import path of an application or application factory, e.g.
+    "invenio3.factory:create_app". The record fetch and search endpoints
+    are served from an asyncio event loop next to the WSGI application;
+    route their read traffic to this port from the front-end proxy.
+    """
+    from .server import HTTPServer
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] [%(process)d] %(levelname)s %(message)s')
+    flask_app = load_app(app)
+    ext = flask_app.extensions.get('invenio-asyncread')
+    if ext is None:
+        raise click.ClickException(
+            'Invenio-AsyncRead is not loaded by the application.')
+    HTTPServer(ext.create_asgi_app(flask_app), host=host,
+               port=port).serve_forever()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Asynchronous record read path configuration."""
+
+ASYNCREAD_URL_PREFIX = '/records'
+"""URL prefix of the record and search endpoints."""
+
+ASYNCREAD_PID_TYPE = 'recid'
+"""Type of the persistent identifiers in record URLs."""
+
+ASYNCREAD_SEARCH_INDEX = 'records'
+"""Searched index."""
+
+ASYNCREAD_SEARCH_DOC_TYPE = None
+"""Searched document type (``None`` for all)."""
+
+ASYNCREAD_PAGE_SIZE = 10
+"""Default number of search hits per page."""
+
+ASYNCREAD_MAX_PAGE_SIZE = 100
+"""Maximum number of search hits per page."""
+
+ASYNCREAD_DB_CONCURRENCY = 10
+"""Maximum number of concurrent record fetches.
+
+A synchronous record loader runs in a thread pool of this size, separate
+from the one of the search client. Keep it at most the size of the
+database connection pool of the process.
+"""
+
+ASYNCREAD_SEARCH_CONCURRENCY = 10
+"""Maximum number of concurrent search requests.
+
+A synchronous search client runs in a thread pool of this size, so slow
+searches never hold up record fetches.
+"""
+
+ASYNCREAD_MAX_WAITING = 1000
+"""Requests waiting for a fetch or search slot before new ones are
+answered with ``503 Service Unavailable`` (``None`` for no limit)."""
+
+ASYNCREAD_RECORD_LOADER = 'invenio.asyncread.adapters:load_record'
+"""Function loading a record from a persistent identifier value.
+
+Either a coroutine function or a synchronous function, which is then run
+in the record fetch thread pool within an application context. Returns the record as a
+dictionary or ``None`` if it does not exist.
+"""
+
+ASYNCREAD_SEARCH_CLIENT = None
+"""Search client (or its import path) with a ``search`` method, which can
+be a coroutine function. Defaults to the client of Invenio-Search, run in
+the search thread pool."""
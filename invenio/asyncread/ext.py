@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Asynchronous record read path extension."""
+
+from __future__ import absolute_import, print_function
+
+import functools
+
+from ..helpers import obj_or_import_string
+from . import config
+
+
+class InvenioAsyncRead(object):
+    """Asynchronous record read path extension.
+
+    Builds the ASGI application serving record fetches and searches next to
+    the WSGI application (see :meth:`create_asgi_app`).
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-asyncread'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('ASYNCREAD_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def create_asgi_app(self, app):
+        """Create the ASGI application of the read path.
+
+        A synchronous record loader and a synchronous search client each
+        run in their own thread pool, sized to ``ASYNCREAD_DB_CONCURRENCY``
+        and ``ASYNCREAD_SEARCH_CONCURRENCY``, so that slow searches cannot
+        delay the record fetches. The loader runs within an application
+        context.
+
+        :param app: Flask application providing the configuration, the
+            database and the search client.
+        :returns: An :class:`invenio.asyncread.app.AsyncReadApp`.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .adapters import Limiter, SearchAdapter, in_app_context
+        from .app import AsyncReadApp
+
+        db_concurrency = app.config['ASYNCREAD_DB_CONCURRENCY']
+        search_concurrency = app.config['ASYNCREAD_SEARCH_CONCURRENCY']
+        loader = obj_or_import_string(app.config['ASYNCREAD_RECORD_LOADER'])
+        if not asyncio.iscoroutinefunction(loader):
+            loader = in_app_context(app, functools.partial(
+                loader, pid_type=app.config['ASYNCREAD_PID_TYPE']))
+
+        client = obj_or_import_string(app.config['ASYNCREAD_SEARCH_CLIENT'])
+        if client is None and 'invenio-search' in app.extensions:
+            client = app.extensions['invenio-search'].client
+        search = SearchAdapter(
+            client, app.config['ASYNCREAD_SEARCH_INDEX'],
+            doc_type=app.config['ASYNCREAD_SEARCH_DOC_TYPE'],
+            executor=ThreadPoolExecutor(search_concurrency),
+        ).search
+
+        max_waiting = app.config['ASYNCREAD_MAX_WAITING']
+        return AsyncReadApp(
+            loader, search,
+            prefix=app.config['ASYNCREAD_URL_PREFIX'],
+            db_limiter=Limiter(db_concurrency, max_waiting),
+            search_limiter=Limiter(search_concurrency, max_waiting),
+            executor=ThreadPoolExecutor(db_concurrency),
+            page_size=app.config['ASYNCREAD_PAGE_SIZE'],
+            max_page_size=app.config['ASYNCREAD_MAX_PAGE_SIZE'],
+        )
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Minimal asyncio HTTP/1.1 server for ASGI applications.
+
+Serves the asynchronous read path without any additional dependency; in
+production any ASGI server (e.g. Uvicorn) can run the application instead.
+Requires Python 3.7 or later.
+"""
+
+from __future__ import absolute_import, print_function
+
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 410: 'Gone', 413: 'Payload Too Large',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+"""Reason phrases of the status codes."""
+
+
+class HTTPServer(object):
+    """Serve an ASGI application with keep-alive connections."""
+
+    max_header_size = 64 * 1024
+    """Maximum size of the request line and headers in bytes."""
+
+    max_body_size = 1024 * 1024
+    """Maximum size of a request body in bytes."""
+
+    def __init__(self, app, host='127.0.0.1', port=0, backlog=1024):
+        """Initialize the server.
+
+        :param app: ASGI application.
+        :param host: Interface to bind.
+        :param port: Port to bind (``0`` picks a free port).
+        :param backlog: Size of the listening socket backlog.
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.server = None
+        self.loop = None
+        self._thread = None
+
+    async def start_serving(self):
+        """Bind the socket and start accepting connections."""
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port,
+            backlog=self.backlog)
+        self.host, self.port = \
+            self.server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def handle_connection(self, reader, writer):
+        """Handle the requests of a connection until it is closed."""
+        try:
+            while await self.handle_request(reader, writer):
+                pass
+        except (asyncio.CancelledError, asyncio.IncompleteReadError,
+                ConnectionError):
+            pass
+        except Exception:
+            logger.exception('Error handling a connection')
+        finally:
+            writer.close()
+
+    async def handle_request(self, reader, writer):
+        """Handle one request.
+
+        :returns: ``True`` if the connection can be reused.
+        """
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.LimitOverrunError:
+            return False
+        except asyncio.IncompleteReadError:
+            return False
+        if len(head) > self.max_header_size:
+            return False
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            await self.write_error(writer, 400)
+            return False
+        headers = []
+        for line in lines[1:]:
+            if line:
+                name, dummy, value = line.partition(':')
+                headers.append((name.strip().lower().encode('latin-1'),
+                                value.strip().encode('latin-1')))
+        header_dict = dict(headers)
+        keep_alive = version == 'HTTP/1.1' and \
+            header_dict.get(b'connection', b'').lower() != b'close'
+
+        length = int(header_dict.get(b'content-length', b'0') or 0)
+        if length > self.max_body_size:
+            await self.write_error(writer, 413)
+            return False
+        body = await reader.readexactly(length) if length else b''
+
+        path, dummy, query = target.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': version.split('/', 1)[-1],
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode('latin-1'),
+            'query_string': query.encode('latin-1'),
+            'root_path': '',
+            'headers': headers,
+            'server': (self.host, self.port),
+            'client': writer.get_extra_info('peername'),
+        }
+        messages = [{'type': 'http.request', 'body': body,
+                     'more_body': False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            return {'type': 'http.disconnect'}
+
+        response = dict(status=500, headers=[], body=[])
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = list(message.get('headers', []))
+            elif message['type'] == 'http.response.body':
+                response['body'].append(message.get('body', b''))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            logger.exception('Error handling %s %s', method, target)
+            await self.write_error(writer, 500)
+            return False
+
+        body = b''.join(response['body'])
+        names = set(name.lower() for name, value in response['headers'])
+        if b'content-length' not in names:
+            response['headers'].append(
+                (b'content-length', str(len(body)).encode('ascii')))
+        if not keep_alive:
+            response['headers'].append((b'connection', b'close'))
+        self.write_response(writer, response['status'],
+                            response['headers'], body)
+        await writer.drain()
+        return keep_alive
+
+    def write_response(self, writer, status, headers, body):
+        """Write a response."""
+        lines = ['HTTP/1.1 {0} {1}'.format(status, REASONS.get(status, ''))]
+        lines.extend('{0}: {1}'.format(name.decode('latin-1'),
+                                       value.decode('latin-1'))
+                     for name, value in headers)
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') +
+                     body)
+
+    async def write_error(self, writer, status):
+        """Write an error response closing the connection."""
+        self.write_response(writer, status, [
+            (b'content-length', b'0'), (b'connection', b'close')], b'')
+        await writer.drain()
+
+    async def shutdown(self):
+        """Stop accepting connections and cancel the pending requests."""
+        self.server.close()
+        tasks = [task for task in asyncio.all_tasks()
+                 if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.start_serving())
+        logger.info('Serving on http://%s:%s', self.host, self.port)
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            loop.run_until_complete(self.shutdown())
+            loop.close()
+
+    def start(self):
+        """Serve in a background thread.
+
+        :returns: The bound ``(host, port)``.
+        """
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.start_serving())
+        self._thread = threading.Thread(target=self.loop.run_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self.host, self.port
+
+    def stop(self):
+        """Stop serving in the background thread."""
+        asyncio.run_coroutine_threadsafe(
+            self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Batched task submission and result aggregation."""
+
+from __future__ import absolute_import, print_function
+
+import functools
+import logging
+import threading
+import time
+import uuid
+
+from ..cache import LRUCache
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_default_backend = LRUCache()
+
+
+def current_backend():
+    """Get the backend of the result counters.
+
+    Uses the backend of the batching extension when running in an
+    application context, otherwise a per-process in-memory backend.
+    """
+    from flask import current_app, has_app_context
+
+    if has_app_context() and 'invenio-batch' in current_app.extensions:
+        return current_app.extensions['invenio-batch'].backend
+    return _default_backend
+
+
+def current_timeout():
+    """Get the time to live of the result counters.
+
+    Uses ``BATCH_RESULTS_TIMEOUT`` when running in an application context.
+    """
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return current_app.config.get(
+            'BATCH_RESULTS_TIMEOUT', config.BATCH_RESULTS_TIMEOUT)
+    return config.BATCH_RESULTS_TIMEOUT
+
+
+def tasks_are_eager():
+    """Check if Celery executes the tasks in the calling process."""
+    try:
+        from celery import current_app
+    except ImportError:
+        return True
+    conf = current_app.conf
+    return bool(conf.get('task_always_eager') or
+                conf.get('CELERY_ALWAYS_EAGER'))
+
+
+class BatchAggregator(object):
+    """Result counters of a batch.
+
+    Instead of one result per item stored in the Celery result backend,
+    each chunk task increments three counters of the batch. The counters
+    expire ``timeout`` seconds after their last update, and are removed
+    when :meth:`wait` sees the batch completed.
+    """
+
+    FIELDS = ('submitted', 'succeeded', 'failed', )
+
+    def __init__(self, batch_id, backend=None, timeout=None):
+        """Initialize the aggregator.
+
+        :param batch_id: Identifier of the batch.
+        :param backend: Cache backend holding the counters.
+        :param timeout: Time to live in seconds of the counters (defaults
+            to ``BATCH_RESULTS_TIMEOUT``, ``0`` for no expiry).
+        """
+        self.batch_id = batch_id
+        self.backend = backend if backend is not None else current_backend()
+        self.timeout = timeout if timeout is not None else current_timeout()
+
+    def is_shared(self):
+        """Check if the workers and the producer see the same counters.
+
+        Counters in the memory of each process are only shared when the
+        tasks are executed eagerly.
+        """
+        return not isinstance(self.backend, LRUCache) or tasks_are_eager()
+
+    def key(self, field):
+        """Key of a counter."""
+        return 'batch:{0}:{1}'.format(self.batch_id, field)
+
+    def incr(self, **counts):
+        """Increment counters and extend the life of all the counters."""
+        for field in self.FIELDS:
+            if counts.get(field) or self.timeout:
+                self.backend.incr(self.key(field), counts.get(field, 0),
+                                  timeout=self.timeout)
+
+    def submitted(self, count):
+        """Count submitted items."""
+        self.incr(submitted=count)
+
+    def completed(self, succeeded, failed):
+        """Count processed items."""
+        self.incr(succeeded=succeeded, failed=failed)
+
+    def summary(self):
+        """Get the counters and the number of pending items."""
+        result = dict((field, self.backend.get_counter(self.key(field)))
+                      for field in self.FIELDS)
+        result['pending'] = max(
+            result['submitted'] - result['succeeded'] - result['failed'], 0)
+        return result
+
+    def wait(self, timeout=None, interval=0.5):
+        """Wait until all submitted items are processed.
+
+        The counters are removed once the batch is completed.
+
+        :returns: The summary.
+        :raises RuntimeError: If the timeout expires, or if the counters
+            are kept in the memory of each process while the tasks run in
+            worker processes (they would never be seen).
+        """
+        if not self.is_shared():
+            raise RuntimeError(
+                'Batch {0} is counted in the memory of the worker processes; '
+                'set BATCH_RESULTS_BACKEND to a shared backend to wait for '
+                'it.'.format(self.batch_id))
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            summary = self.summary()
+            if not summary['pending']:
+                self.clear()
+                return summary
+            if deadline is not None and time.time() > deadline:
+                raise RuntimeError('Batch {0} not completed: {1}'.format(
+                    self.batch_id, summary))
+            time.sleep(interval)
+
+    def clear(self):
+        """Remove the counters."""
+        self.backend.delete_many([self.key(f) for f in self.FIELDS])
+
+
+class Batcher(object):
+    """Group items into chunked task messages.
+
+    Items are sent when ``batch_size`` items are buffered, when the oldest
+    buffered item waited ``flush_interval`` seconds, or when the batcher is
+    flushed or closed. Use it as a context manager to send the remaining
+    items on exit.
+    """
+
+    def __init__(self, task, batch_size=100, flush_interval=1.0,
+                 aggregator=None, clock=time.time):
+        """Initialize the batcher.
+
+        :param task: Celery task called with ``(batch_id, items)``.
+        :param batch_size: Maximum number of items per message.
+        :param flush_interval: Maximum seconds an item is buffered.
+        :param aggregator: :class:`BatchAggregator` counting the items.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.task = task
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batch_id = aggregator.batch_id if aggregator else \
+            uuid.uuid4().hex
+        self.aggregator = aggregator or BatchAggregator(self.batch_id)
+        self.clock = clock
+        self.items = 0
+        self.messages = 0
+        self._buffer = []
+        self._first = None
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, *args):
+        """Buffer the arguments of one item."""
+        with self._lock:
+            if not self._buffer:
+                self._first = self.clock()
+            self._buffer.append(args)
+            full = len(self._buffer) >= self.batch_size
+        if full or self.clock() - self._first >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Send the buffered items."""
+        with self._lock:
+            items, self._buffer = self._buffer, []
+        if not items:
+            return
+        self.task.apply_async(args=(self.batch_id, items))
+        self.aggregator.submitted(len(items))
+        self.items += len(items)
+        self.messages += 1
+
+    def start(self):
+        """Flush periodically from a background thread.
+
+        Needed by long-lived producers which may stop adding items before
+        a batch is full.
+        """
+        def run():
+            while self._timer is not None:
+                time.sleep(self.flush_interval)
+                with self._lock:
+                    due = self._buffer and \
+                        self.clock() - self._first >= self.flush_interval
+                if due:
+                    self.flush()
+
+        self._timer = threading.Thread(target=run)
+        self._timer.daemon = True
+        self._timer.start()
+        return self
+
+    def close(self):
+        """Stop the background flushing and send the remaining items."""
+        self._timer = None
+        self.flush()
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Send the remaining items."""
+        self.close()
+
+    def result(self):
+        """Get the aggregated result of the batch."""
+        return self.aggregator.summary()
+
+
+def run_items(func, batch_id, items):
+    """Call a function for each item and count the outcomes.
+
+    Failing items are logged and counted; they do not stop the chunk.
+
+    :returns: Tuple ``(succeeded, failed)``.
+    """
+    succeeded = failed = 0
+    for args in items:
+        try:
+            func(*args)
+            succeeded += 1
+        except Exception:
+            failed += 1
+            logger.exception('Item %r of batch %s failed', args, batch_id)
+    BatchAggregator(batch_id).completed(succeeded, failed)
+    return succeeded, failed
+
+
+class BatchTask(object):
+    """Function processing one item, sendable in chunked task messages."""
+
+    def __init__(self, func, batch_size=None, flush_interval=None,
+                 name=None):
+        """Register the chunk task of a function.
+
+        :param func: Function processing one item.
+        :param batch_size: Default number of items per message.
+        :param flush_interval: Default seconds an item is buffered.
+        :param name: Name of the chunk task.
+        """
+        from celery import shared_task
+
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        def run_chunk(batch_id, items):
+            return run_items(func, batch_id, items)
+
+        self.task = shared_task(
+            name=name or '{0}.{1}.batch'.format(func.__module__,
+                                                func.__name__),
+            ignore_result=True,
+        )(run_chunk)
+
+    def __call__(self, *args, **kwargs):
+        """Process one item synchronously."""
+        return self.func(*args, **kwargs)
+
+    def batcher(self, batch_size=None, flush_interval=None, **kwargs):
+        """Create a :class:`Batcher` sending items to the chunk task.
+
+        Defaults are taken from the decorator arguments, then from
+        ``BATCH_SIZE`` and ``BATCH_FLUSH_INTERVAL``.
+        """
+        from flask import current_app, has_app_context
+
+        config = current_app.config if has_app_context() else {}
+        return Batcher(
+            self.task,
+            batch_size=batch_size or self.batch_size or config.get(
+                'BATCH_SIZE', 100),
+            flush_interval=flush_interval or self.flush_interval or
+            config.get('BATCH_FLUSH_INTERVAL', 1.0),
+            **kwargs
+        )
+
+
+def batch_task(batch_size=None, flush_interval=None, name=None):
+    """Decorate a per-item function to allow batched submission.
+
+    .. code-block:: python
+
+        @batch_task(batch_size=500)
+        def index_record(record_id):
+            ...
+
+        with index_record.batcher() as batcher:
+            for record_id in record_ids:
+                batcher.add(record_id)
+        batcher.result()  # {'submitted': ..., 'succeeded': ..., ...}
+    """
+    def decorator(func):
+        return BatchTask(func, batch_size=batch_size,
+                         flush_interval=flush_interval, name=name)
+    return decorator
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark of batched versus per-item task submission."""
+
+from __future__ import absolute_import, print_function
+
+from ..bench.api import summarize, timer
+from .api import BatchTask
+
+
+def process(value):
+    """Process one item (does nothing)."""
+
+
+def run(repeat=3, tasks=5000, batch_size=100, **kwargs):
+    """Measure the submission of tasks to Celery's in-memory broker.
+
+    :param repeat: Number of measurements per path.
+    :param tasks: Number of items submitted per measurement.
+    :param batch_size: Items per message of the batched path.
+    """
+    try:
+        from celery import Celery
+    except ImportError as e:
+        return dict(skipped=True, missing=[str(e)])
+
+    celery = Celery('invenio-bench', broker='memory://', set_as_current=True)
+    single = celery.task(name='invenio.batch.bench.process',
+                         ignore_result=True)(process)
+    batched = BatchTask(process, name='invenio.batch.bench.process.batch')
+
+    rates = dict(single=[], batched=[])
+    messages = 0
+    for dummy in range(repeat):
+        start = timer()
+        for value in range(tasks):
+            single.apply_async(args=(value, ))
+        rates['single'].append(tasks / (timer() - start))
+
+        start = timer()
+        with batched.batcher(batch_size=batch_size,
+                             flush_interval=3600) as batcher:
+            for value in range(tasks):
+                batcher.add(value)
+        rates['batched'].append(tasks / (timer() - start))
+        messages = batcher.messages
+        batcher.aggregator.clear()
+
+    single_rate = summarize(rates['single'])
+    batched_rate = summarize(rates['batched'])
+    return dict(
+        tasks=tasks,
+        batch_size=batch_size,
+        single_tasks_per_second=single_rate,
+        batched_tasks_per_second=batched_rate,
+        single_round_trips=tasks,
+        batched_round_trips=messages,
+        round_trips_saved=tasks - messages,
+        speedup=batched_rate['median'] / single_rate['median'],
+    )
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Batched task submission configuration."""
+
+BATCH_SIZE = 100
+"""Number of items sent in one task message."""
+
+BATCH_FLUSH_INTERVAL = 1.0
+"""Maximum number of seconds an item waits before its batch is sent."""
+
+BATCH_RESULTS_BACKEND = 'lru'
+"""Backend of the result counters: ``'lru'`` (per process, only suitable
+with eager tasks), ``'redis'`` (using ``CACHE_REDIS_HOST``, requires
+``invenio[redis]``) or an import path to a backend factory.
+
+The results of tasks run by Celery workers can only be followed with a
+shared backend: with ``'lru'``, the counters are incremented in the memory
+of the workers and :meth:`~invenio.batch.api.BatchAggregator.wait`
+raises an error.
+"""
+
+BATCH_RESULTS_TIMEOUT = 24 * 60 * 60
+"""Seconds the result counters of a batch are kept after their last
+update (``0`` keeps them until they are cleared)."""
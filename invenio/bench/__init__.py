@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark suite for Invenio installations.
+
+The benchmarks measure an Invenio installation and write a machine readable
+JSON report which can be compared across upgrades:
+
+.. code-block:: console
+
+    $ python setup.py bench --output bench.json
+
+By default every registered suite (see :data:`invenio.bench.api.SUITES`)
+is run. The ``aliases`` suite benchmarks the instances assembled by the
+package aliases (``invenio[minimal]``, ``invenio[full]``, ...) against local
+stand-ins of the external services.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import SUITES, Report, measure, run, summarize
+
+__all__ = ('Report', 'SUITES', 'measure', 'run', 'summarize', )
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark of the instances assembled by the package aliases.
+
+For every alias (e.g. ``invenio[minimal]`` or ``invenio[full]``) a fresh
+interpreter is spawned which measures:
+
+* the cold import time of all Invenio modules required by the alias;
+* the time needed to build the application with the application factory;
+* the latency of the first request;
+* the steady-state number of requests per second.
+
+The application runs against the local stand-ins from
+:mod:`invenio.standins` so no external service is needed.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+import subprocess
+import sys
+
+import pkg_resources
+
+from .api import summarize
+
+ALIASES = ('minimal', 'full', )
+"""Aliases benchmarked by default."""
+
+
+def alias_requirements(alias, distribution='invenio'):
+    """Get the requirements of an alias, including the core requirements.
+
+    :param alias: Name of the extra (e.g. ``full``).
+    :param distribution: Name of the distribution defining the alias.
+    :returns: List of :class:`pkg_resources.Requirement`.
+    """
+    dist = pkg_resources.get_distribution(distribution)
+    return dist.requires(extras=(alias, ))
+
+
+def invenio_projects(requirements):
+    """Keep only the Invenio modules among requirements.
+
+    :param requirements: Iterable of :class:`pkg_resources.Requirement`.
+    :returns: Sorted list of project keys (e.g. ``invenio-records``).
+    """
+    return sorted(set(
+        req.key for req in requirements if req.key.startswith('invenio-')
+    ))
+
+
+def missing_requirements(requirements):
+    """List the requirements which are not satisfied.
+
+    :param requirements: Iterable of :class:`pkg_resources.Requirement`.
+    :returns: List of requirement strings.
+    """
+    missing = []
+    for req in requirements:
+        try:
+            pkg_resources.working_set.require(str(req))
+        except (pkg_resources.DistributionNotFound,
+                pkg_resources.VersionConflict):
+            missing.append(str(req))
+    return missing
+
+
+def probe(projects, requests=100, path='/'):
+    """Measure one alias in a fresh interpreter.
+
+    :param projects: Invenio projects to load.
+    :param requests: Number of requests for the steady-state measurement.
+    :param path: URL path to request.
+    :returns: Dictionary of measurements (see :mod:`invenio.bench.probe`).
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'invenio.bench.probe',
+         '--requests', str(requests), '--path', path] + list(projects),
+        universal_newlines=True,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(aliases=None, repeat=3, requests=100, path='/', **kwargs):
+    """Benchmark each alias.
+
+    :param aliases: Aliases to benchmark. Defaults to :data:`ALIASES`.
+    :param repeat: Number of fresh interpreters spawned per alias.
+    :param requests: Number of requests for the steady-state measurement.
+    :param path: URL path to request.
+    :returns: Dictionary of alias name to results. Aliases are skipped if
+        their requirements are not installed, or if the ``invenio``
+        distribution defining them is not (e.g. in a source checkout
+        without ``pip install -e .``).
+    """
+    results = {}
+    for alias in aliases or ALIASES:
+        try:
+            requirements = alias_requirements(alias)
+        except pkg_resources.DistributionNotFound as exc:
+            results[alias] = dict(skipped=True, missing=[str(exc.req)])
+            continue
+        missing = missing_requirements(requirements)
+        if missing:
+            results[alias] = dict(skipped=True, missing=missing)
+            continue
+
+        projects = invenio_projects(requirements)
+        samples = [probe(projects, requests=requests, path=path)
+                   for dummy in range(repeat)]
+        results[alias] = dict(
+            projects=projects,
+            status_code=samples[-1]['status_code'],
+            import_time=summarize(s['import_time'] for s in samples),
+            app_factory_time=summarize(
+                s['app_factory_time'] for s in samples),
+            first_request_time=summarize(
+                s['first_request_time'] for s in samples),
+            requests_per_second=summarize(
+                s['requests_per_second'] for s in samples),
+        )
+    return results
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark primitives, suite registry and JSON reports."""
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import json
+import platform
+import sys
+import timeit
+
+from ..helpers import obj_or_import_string
+from ..version import __version__
+
+SUITES = {
+    'aliases': 'invenio.bench.aliases:run',
+    'batch': 'invenio.batch.bench:run',
+    'catalogs': 'invenio.catalogs.bench:run',
+    'config': 'invenio.configsnapshot.bench:run',
+    'export': 'invenio.export.bench:run',
+    'ingest': 'invenio.ingest.bench:run',
+    'loadtest': 'invenio.loadtest.bench:run',
+    'mail': 'invenio.mailpool.bench:run',
+    'schemas': 'invenio.schemacache.bench:run',
+    'sessions': 'invenio.sessioncache.bench:run',
+    'templates': 'invenio.templatecache.bench:run',
+}
+"""Registered benchmark suites.
+
+Each value is a callable (or an import path to a callable) accepting the
+benchmark options as keyword arguments and returning a JSON serializable
+dictionary of results.
+"""
+
+if sys.version_info >= (3, 7):
+    # The asynchronous read path uses syntax unavailable on older versions.
+    SUITES['async'] = 'invenio.asyncread.bench:run'
+
+REPORT_FORMAT = 1
+"""Version of the JSON report layout."""
+
+timer = timeit.default_timer
+"""Highest resolution wall clock available on the platform."""
+
+
+def measure(func, repeat=1):
+    """Call a function several times and measure each call.
+
+    :param func: Function without arguments to measure.
+    :param repeat: Number of calls.
+    :returns: List of durations in seconds.
+    """
+    samples = []
+    for dummy in range(repeat):
+        start = timer()
+        func()
+        samples.append(timer() - start)
+    return samples
+
+
+def percentile(samples, fraction):
+    """Compute a percentile using nearest-rank on sorted samples.
+
+    :param samples: Sequence of numbers.
+    :param fraction: Percentile expressed as a fraction (e.g. ``0.95``).
+    :returns: The percentile value or ``None`` for an empty sequence.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = int(round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Summarize a list of samples.
+
+    :param samples: Sequence of numbers.
+    :returns: Dictionary with count, min, max, mean, median, p95 and p99.
+    """
+    samples = list(samples)
+    if not samples:
+        return dict(count=0)
+    return dict(
+        count=len(samples),
+        min=min(samples),
+        max=max(samples),
+        mean=sum(samples) / float(len(samples)),
+        median=percentile(samples, 0.5),
+        p95=percentile(samples, 0.95),
+        p99=percentile(samples, 0.99),
+    )
+
+
+class Report(object):
+    """Machine readable benchmark report.
+
+    Reports are written as JSON with sorted keys so that two reports (e.g.
+    before and after an upgrade) can be compared with any diff tool.
+    """
+
+    def __init__(self, results=None, environment=None):
+        """Initialize the report.
+
+        :param results: Dictionary of suite name to suite results.
+        :param environment: Dictionary describing the environment in which
+            the benchmarks were run.
+        """
+        self.results = results or {}
+        self.environment = environment or self.current_environment()
+
+    @staticmethod
+    def current_environment():
+        """Describe the running environment."""
+        return dict(
+            invenio=__version__,
+            python=platform.python_version(),
+            implementation=platform.python_implementation(),
+            platform=platform.platform(),
+            executable=sys.executable,
+            date=datetime.datetime.utcnow().isoformat(),
+        )
+
+    def to_dict(self):
+        """Serialize the report to a dictionary."""
+        return dict(
+            format=REPORT_FORMAT,
+            environment=self.environment,
+            results=self.results,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize a report from a dictionary."""
+        if data.get('format') != REPORT_FORMAT:
+            raise ValueError(
+                'Unsupported report format {0!r}.'.format(data.get('format')))
+        return cls(results=data['results'], environment=data['environment'])
+
+    def dumps(self):
+        """Serialize the report to a JSON string."""
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def save(self, path):
+        """Write the report to a file."""
+        with open(path, 'w') as fp:
+            fp.write(self.dumps())
+            fp.write('\n')
+
+    @classmethod
+    def load(cls, path):
+        """Read a report from a file."""
+        with open(path) as fp:
+            return cls.from_dict(json.load(fp))
+
+
+def run(suites=None, **options):
+    """Run benchmark suites.
+
+    :param suites: Names of the suites to run. Defaults to all registered
+        suites.
+    :param options: Options passed to every suite.
+    :returns: A :class:`Report` instance.
+    """
+    names = list(suites or sorted(SUITES))
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        raise KeyError('Unknown benchmark suite(s): {0}'.format(
+            ', '.join(unknown)))
+
+    report = Report()
+    for name in names:
+        suite = obj_or_import_string(SUITES[name])
+        report.results[name] = suite(**options)
+    return report
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Measure a single Invenio instance in a fresh interpreter.
+
+The module is executed by :mod:`invenio.bench.aliases` as::
+
+    python -m invenio.bench.probe --requests 100 invenio-base invenio-db
+
+and prints a single line of JSON with the measurements.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import importlib
+import json
+
+from ..standins import standin_config
+from .api import timer
+
+
+def import_modules(projects):
+    """Import the top-level module of each project.
+
+    :param projects: Project keys (e.g. ``invenio-records``).
+    :returns: Time spent importing in seconds.
+    """
+    start = timer()
+    for project in projects:
+        importlib.import_module(project.replace('-', '_'))
+    return timer() - start
+
+
+def load_entry_points(group, projects):
+    """Load the entry points of a group defined by the given projects."""
+    import pkg_resources
+    return [ep.load() for ep in pkg_resources.iter_entry_points(group)
+            if ep.dist.key in projects]
+
+
+def create_app(projects, config=None):
+    """Build an application with the extensions of the given projects.
+
+    :param projects: Project keys of the Invenio modules to load.
+    :param config: Configuration taking precedence over the stand-ins.
+    """
+    from invenio_base.app import create_app_factory
+
+    def config_loader(app, **kwargs):
+        kwargs.update(config or {})
+        app.config.update(standin_config(**kwargs))
+
+    app = create_app_factory(
+        'invenio-bench',
+        config_loader=config_loader,
+        extensions=load_entry_points('invenio_base.apps', projects),
+        blueprints=load_entry_points('invenio_base.blueprints', projects),
+    )()
+
+    if 'invenio-db' in projects:
+        from invenio_db import db
+        with app.app_context():
+            db.create_all()
+    return app
+
+
+def main(argv=None):
+    """Run the measurements and print them as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('projects', nargs='*')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--path', default='/')
+    args = parser.parse_args(argv)
+    projects = set(args.projects)
+
+    import_time = import_modules(sorted(projects))
+
+    start = timer()
+    app = create_app(projects)
+    app_factory_time = timer() - start
+
+    client = app.test_client()
+    start = timer()
+    response = client.get(args.path)
+    first_request_time = timer() - start
+
+    start = timer()
+    for dummy in range(args.requests):
+        client.get(args.path)
+    elapsed = timer() - start
+
+    print(json.dumps(dict(
+        import_time=import_time,
+        app_factory_time=app_factory_time,
+        first_request_time=first_request_time,
+        requests_per_second=args.requests / elapsed if elapsed else None,
+        status_code=response.status_code,
+    )))
+
+
+if __name__ == '__main__':
+    main()
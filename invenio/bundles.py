@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Lazily imported Invenio module bundles.
+
+The bundles correspond to the extras of the ``invenio`` package (e.g.
+``pip install invenio[records]``) and are exposed as attributes of the
+``invenio`` package. Nothing is imported until a module of a bundle is
+first accessed:
+
+.. code-block:: python
+
+    import invenio
+
+    invenio.records.pidstore  # imports invenio_pidstore now
+    invenio.import_report()   # lists what was imported and its cost
+"""
+
+from __future__ import absolute_import, print_function
+
+import importlib
+import pkgutil
+import sys
+import threading
+import timeit
+
+BUNDLES = {
+    'accounts': {
+        'accounts': 'invenio_accounts',
+    },
+    'records': {
+        'pidstore': 'invenio_pidstore',
+        'records': 'invenio_records',
+        'records_rest': 'invenio_records_rest',
+        'records_ui': 'invenio_records_ui',
+    },
+    'theme': {
+        'assets': 'invenio_assets',
+        'theme': 'invenio_theme',
+    },
+    'utils': {
+        'db': 'invenio_db',
+        'logging': 'invenio_logging',
+        'mail': 'invenio_mail',
+        'rest': 'invenio_rest',
+    },
+}
+"""Modules provided by each bundle (kept in sync with ``setup.py``)."""
+
+_imports = []
+_lock = threading.RLock()
+
+
+def _timed_import(bundle, name, module_name):
+    """Import a module and record the time it took."""
+    with _lock:
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        loaded_before = len(sys.modules)
+        start = timeit.default_timer()
+        module = importlib.import_module(module_name)
+        _imports.append(dict(
+            bundle=bundle,
+            name=name,
+            module=module_name,
+            seconds=timeit.default_timer() - start,
+            modules_loaded=len(sys.modules) - loaded_before,
+        ))
+        return module
+
+
+def import_report():
+    """List the bundle modules imported so far.
+
+    :returns: List of dictionaries with the ``bundle``, attribute ``name``,
+        ``module`` name, import time in ``seconds`` (including the modules it
+        imported itself) and number of ``modules_loaded`` by the import, in
+        the order in which they were imported.
+    """
+    with _lock:
+        return [dict(entry) for entry in _imports]
+
+
+class Bundle(object):
+    """Module bundle whose modules are imported on first access."""
+
+    def __init__(self, name, modules):
+        """Initialize the bundle.
+
+        :param name: Name of the bundle (e.g. ``records``).
+        :param modules: Dictionary of attribute name to module name.
+        """
+        self.__name__ = name
+        self._modules = dict(modules)
+
+    def __getattr__(self, name):
+        """Import the module registered under ``name``."""
+        try:
+            module_name = self._modules[name]
+        except KeyError:
+            raise AttributeError(
+                'Bundle {0!r} has no module {1!r}.'.format(
+                    self.__name__, name))
+        try:
+            module = _timed_import(self.__name__, name, module_name)
+        except ImportError as e:
+            raise ImportError(
+                '{0} (install it with "pip install invenio[{1}]")'.format(
+                    e, self.__name__))
+        setattr(self, name, module)
+        return module
+
+    def __dir__(self):
+        """List the modules of the bundle."""
+        return sorted(self._modules)
+
+    def __repr__(self):
+        """Represent the bundle."""
+        return '<Bundle {0!r}: {1}>'.format(
+            self.__name__, ', '.join(sorted(self._modules)))
+
+    @property
+    def installed(self):
+        """Names of the modules which are installed, without importing."""
+        available = set(sys.modules) | set(
+            entry[1] for entry in pkgutil.iter_modules())
+        return sorted(
+            name for name, module_name in self._modules.items()
+            if module_name in available
+        )
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cache backends and counters shared by the Invenio caching layers.
+
+Two backends with the same interface are available: a size bounded
+in-process :class:`~invenio.cache.backends.LRUCache` and a
+:class:`~invenio.cache.backends.RedisCache` shared by all processes (using
+the Redis configured by ``CACHE_REDIS_HOST``).
+"""
+
+from __future__ import absolute_import, print_function
+
+from .backends import LRUCache, RedisCache, create_backend, redis_url
+from .stats import CacheStats
+
+__all__ = ('CacheStats', 'LRUCache', 'RedisCache', 'create_backend',
+           'redis_url', )
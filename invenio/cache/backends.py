@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cache backends: size bounded in-process LRU and Redis."""
+
+from __future__ import absolute_import, print_function
+
+import collections
+import pickle
+import threading
+import time
+
+from ..helpers import obj_or_import_string
+
+
+def sizeof(value):
+    """Estimate the memory used by a cached value in bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+class LRUCache(object):
+    """Thread-safe in-process cache evicting least recently used entries.
+
+    Eviction is based on the estimated size of the entries rather than on
+    their number, so that a few large values cannot exhaust the memory.
+    Counters (see :meth:`incr`) are kept apart and never evicted, so they
+    can safely be used as invalidation generations; they only expire if
+    incremented with a timeout.
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024, default_timeout=None,
+                 sizeof=sizeof, clock=time.time):
+        """Initialize the cache.
+
+        :param max_size: Maximum total size of the entries in bytes.
+        :param default_timeout: Default time to live in seconds (``None``
+            keeps entries until they are evicted).
+        :param sizeof: Function estimating the size of a value.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.max_size = max_size
+        self.default_timeout = default_timeout
+        self.sizeof = sizeof
+        self.clock = clock
+        self.size = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._counters = {}
+        self._counter_expires = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def _pop(self, key):
+        """Remove an entry and return it (lock must be held)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+        return entry
+
+    def get(self, key):
+        """Get a value or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._pop(key)
+            if entry is None:
+                return None
+            value, size, expires = entry
+            if expires is not None and expires <= self.clock():
+                return None
+            # Re-insert to mark the entry as most recently used.
+            self._entries[key] = entry
+            self.size += size
+            return value
+
+    def set(self, key, value, timeout=None):
+        """Store a value.
+
+        :param timeout: Time to live in seconds, overriding the default.
+        :returns: ``False`` if the value is larger than the cache.
+        """
+        size = self.sizeof(value)
+        timeout = timeout if timeout is not None else self.default_timeout
+        expires = self.clock() + timeout if timeout else None
+        with self._lock:
+            self._pop(key)
+            if size > self.max_size:
+                return False
+            while self._entries and self.size + size > self.max_size:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (value, size, expires)
+            self.size += size
+        return True
+
+    def _expire_counters(self):
+        """Remove the expired counters (lock must be held)."""
+        now = self.clock()
+        for key, expires in list(self._counter_expires.items()):
+            if expires <= now:
+                del self._counter_expires[key]
+                self._counters.pop(key, None)
+
+    def delete(self, key):
+        """Remove a value or a counter."""
+        with self._lock:
+            self._counter_expires.pop(key, None)
+            counter = self._counters.pop(key, None)
+            return self._pop(key) is not None or counter is not None
+
+    def get_many(self, keys):
+        """Get several values, ``None`` for missing ones."""
+        return [self.get(key) for key in keys]
+
+    def set_many(self, mapping, timeout=None):
+        """Store several values."""
+        for key, value in mapping.items():
+            self.set(key, value, timeout=timeout)
+
+    def delete_many(self, keys):
+        """Remove several values."""
+        for key in keys:
+            self.delete(key)
+
+    def incr(self, key, delta=1, timeout=None):
+        """Increment a counter and return its new value.
+
+        :param timeout: Time to live in seconds of the counter after this
+            increment (``None`` keeps it until it is deleted).
+        """
+        with self._lock:
+            self._expire_counters()
+            value = self._counters[key] = self._counters.get(key, 0) + delta
+            if timeout:
+                self._counter_expires[key] = self.clock() + timeout
+            return value
+
+    def get_counter(self, key):
+        """Get the value of a counter (``0`` if missing)."""
+        with self._lock:
+            self._expire_counters()
+            return self._counters.get(key, 0)
+
+    def clear(self):
+        """Remove all entries and counters."""
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+            self._counter_expires.clear()
+            self.size = 0
+
+
+class RedisCache(object):
+    """Cache stored in Redis, shared by all processes.
+
+    Values are pickled; keys are prefixed with a namespace so that several
+    caches can share the same Redis database.
+    """
+
+    def __init__(self, url=None, prefix='invenio:', default_timeout=None,
+                 client=None):
+        """Initialize the cache.
+
+        :param url: Redis URL (e.g. ``redis://localhost:6379/0``).
+        :param prefix: Prefix of all keys.
+        :param default_timeout: Default time to live in seconds.
+        :param client: Existing Redis client, instead of ``url``.
+        """
+        if client is None:
+            import redis
+            client = redis.StrictRedis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.default_timeout = default_timeout
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def get(self, key):
+        """Get a value or ``None`` if missing."""
+        value = self.client.get(self._key(key))
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, timeout=None):
+        """Store a value."""
+        timeout = timeout if timeout is not None else self.default_timeout
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if timeout:
+            return self.client.setex(self._key(key), int(timeout), value)
+        return self.client.set(self._key(key), value)
+
+    def delete(self, key):
+        """Remove a value."""
+        return bool(self.client.delete(self._key(key)))
+
+    def get_many(self, keys):
+        """Get several values in one round-trip."""
+        if not keys:
+            return []
+        return [pickle.loads(v) if v is not None else None
+                for v in self.client.mget([self._key(k) for k in keys])]
+
+    def set_many(self, mapping, timeout=None):
+        """Store several values in one round-trip."""
+        pipe = self.client.pipeline(transaction=False)
+        timeout = timeout if timeout is not None else self.default_timeout
+        for key, value in mapping.items():
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            if timeout:
+                pipe.setex(self._key(key), int(timeout), value)
+            else:
+                pipe.set(self._key(key), value)
+        pipe.execute()
+
+    def delete_many(self, keys):
+        """Remove several values."""
+        if keys:
+            self.client.delete(*[self._key(k) for k in keys])
+
+    def incr(self, key, delta=1, timeout=None):
+        """Increment a counter atomically and return its new value.
+
+        :param timeout: Time to live in seconds of the counter after this
+            increment (``None`` keeps it until it is deleted).
+        """
+        if not timeout:
+            return self.client.incr(self._key(key), delta)
+        pipe = self.client.pipeline()
+        pipe.incr(self._key(key), delta)
+        pipe.expire(self._key(key), int(timeout))
+        return pipe.execute()[0]
+
+    def get_counter(self, key):
+        """Get the value of a counter (``0`` if missing)."""
+        return int(self.client.get(self._key(key)) or 0)
+
+    def clear(self):
+        """Remove all keys of the namespace."""
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+def redis_url(config):
+    """Build the Redis URL from the application configuration.
+
+    Uses ``CACHE_REDIS_URL`` if set, otherwise ``CACHE_REDIS_HOST``,
+    ``CACHE_REDIS_PORT`` and ``CACHE_REDIS_DB`` as written by the instance
+    configuration.
+    """
+    if config.get('CACHE_REDIS_URL'):
+        return config['CACHE_REDIS_URL']
+    return 'redis://{0}:{1}/{2}'.format(
+        config.get('CACHE_REDIS_HOST', 'localhost'),
+        config.get('CACHE_REDIS_PORT', 6379),
+        config.get('CACHE_REDIS_DB', 0),
+    )
+
+
+def create_backend(backend, namespace, config=None, **options):
+    """Create a cache backend.
+
+    :param backend: ``'lru'``, ``'redis'`` or a factory (or its import path)
+        called with ``namespace`` and ``options``.
+    :param namespace: Namespace of the cache, used as Redis key prefix.
+    :param config: Application configuration used to connect to Redis.
+    :param options: Options of the backend (e.g. ``max_size`` or
+        ``default_timeout``).
+    """
+    if backend == 'lru':
+        return LRUCache(**options)
+    if backend == 'redis':
+        options.pop('max_size', None)
+        return RedisCache(url=redis_url(config or {}),
+                          prefix='{0}:'.format(namespace), **options)
+    return obj_or_import_string(backend)(namespace, **options)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Invalidation of cache entries when database transactions end.
+
+Entries changed in a transaction are invalidated when flushed, and again
+once the transaction is committed or rolled back, so that entries cached
+by concurrent requests before the commit are dropped too.
+
+The SQLAlchemy session listeners are registered once per process and
+invalidate every cache registered under a name, so that several
+applications in the same process (e.g. the UI and the REST API) all see
+the changes.
+"""
+
+from __future__ import absolute_import, print_function
+
+import collections
+import weakref
+
+INFO_KEY = 'invenio-cache-invalidation'
+"""Key of the pending invalidations in ``Session.info``."""
+
+_caches = collections.defaultdict(weakref.WeakSet)
+
+
+def listen_once(target, identifier, fn):
+    """Add an SQLAlchemy event listener unless it is already registered."""
+    from sqlalchemy import event
+
+    if not event.contains(target, identifier, fn):
+        event.listen(target, identifier, fn)
+
+
+def register(name, cache):
+    """Register a cache invalidated by the changes recorded under a name.
+
+    :param name: Name of the kind of cached entries (e.g. ``pidcache``).
+    :param cache: Object with an ``invalidate(*key)`` method.
+    """
+    from sqlalchemy.orm import Session
+
+    _caches[name].add(cache)
+    listen_once(Session, 'after_commit', transaction_ended)
+    listen_once(Session, 'after_soft_rollback', soft_rollback)
+
+
+def invalidate(name, keys, session=None):
+    """Invalidate keys now and again when the transaction of a session ends.
+
+    :param name: Name under which the caches are registered.
+    :param keys: Iterable of argument tuples of ``invalidate()``.
+    :param session: Session of the transaction, if any.
+    """
+    keys = set(keys)
+    for cache in list(_caches[name]):
+        for key in keys:
+            cache.invalidate(*key)
+    if session is not None:
+        defer(name, keys, session)
+
+
+def defer(name, keys, session):
+    """Invalidate keys when the transaction of a session ends.
+
+    :param name: Name under which the caches are registered.
+    :param keys: Iterable of argument tuples of ``invalidate()``.
+    :param session: Session of the transaction.
+    """
+    keys = set(keys)
+    if keys:
+        session.info.setdefault(INFO_KEY, {}).setdefault(
+            name, set()).update(keys)
+
+
+def transaction_ended(session):
+    """Invalidate the keys changed during the transaction."""
+    for name, keys in session.info.pop(INFO_KEY, {}).items():
+        invalidate(name, keys)
+
+
+def soft_rollback(session, previous_transaction):
+    """Invalidate the keys changed during a rolled back transaction."""
+    transaction_ended(session)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Counters of cache efficiency."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+
+
+class CacheStats(object):
+    """Thread-safe hit, miss and invalidation counters."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def hit(self, count=1):
+        """Count cache hits."""
+        with self._lock:
+            self.hits += count
+
+    def miss(self, count=1):
+        """Count cache misses."""
+        with self._lock:
+            self.misses += count
+
+    def invalidate(self, count=1):
+        """Count invalidations."""
+        with self._lock:
+            self.invalidations += count
+
+    @property
+    def hit_ratio(self):
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+    def to_dict(self):
+        """Serialize the counters."""
+        return dict(hits=self.hits, misses=self.misses,
+                    invalidations=self.invalidations,
+                    hit_ratio=self.hit_ratio)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Merged translation catalogs shared by all worker processes.
+
+Invenio-I18N loads, for every locale used by a process, the ``.mo`` file
+of every module and merges them into a dictionary private to the process.
+The ``catalogs build`` command merges them once, at deployment, into one
+catalog file per locale:
+
+.. code-block:: console
+
+    $ invenio catalogs build
+
+Processes map the catalogs into memory instead: opening a catalog parses
+nothing, translations are looked up in place, and the pages of the files
+are shared by all processes of the host. Locales without a catalog are
+translated by Invenio-I18N as before. The catalogs must be rebuilt when
+the installed modules change.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import CatalogStore, MappedTranslations, build_catalogs
+from .ext import InvenioCatalogs
+
+__all__ = ('CatalogStore', 'InvenioCatalogs', 'MappedTranslations',
+           'build_catalogs', )
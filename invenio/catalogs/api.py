@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+r"""Merged translation catalogs read through memory mapping.
+
+A catalog file holds all messages of one locale in a hash table which is
+used in place: nothing is parsed when a catalog is opened, and the pages
+of the file are shared by all processes mapping it.
+
+Layout (little-endian)::
+
+    header   magic, version, number of messages, hash table size,
+             offset and length of the JSON metadata
+    entries  key offset, key length, value offset, value length
+    table    entry number + 1 (0 for empty slots), by CRC-32 of the key
+    strings  UTF-8 encoded keys, values and metadata
+
+Keys are the message ids, prefixed by their context and ``\x04``;
+plural messages end with ``\x00`` and their forms are separated by
+``\x00``, as in ``.mo`` files.
+"""
+
+from __future__ import absolute_import, print_function
+
+import gettext
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+MAGIC = b'INVCATLG'
+
+VERSION = 1
+
+HEADER = struct.Struct('<8sIIIII')
+
+ENTRY = struct.Struct('<IIII')
+
+SLOT = struct.Struct('<I')
+
+CONTEXT_SEPARATOR = u'\x04'
+
+PLURAL_SEPARATOR = u'\x00'
+
+logger = logging.getLogger(__name__)
+
+
+def key_hash(key):
+    """Hash of an encoded key, stable across processes."""
+    return zlib.crc32(key) & 0xffffffff
+
+
+def read_mo(path):
+    """Read the messages of a ``.mo`` file.
+
+    :returns: Tuple of the messages (dictionary of keys to values, see the
+        module documentation) and the metadata of the catalog.
+    """
+    with open(path, 'rb') as fp:
+        translations = gettext.GNUTranslations(fp)
+    messages, plurals = {}, {}
+    for key, value in translations._catalog.items():
+        if isinstance(key, tuple):
+            plurals.setdefault(key[0], {})[key[1]] = value
+        elif key:
+            messages[key] = value
+    for key, forms in plurals.items():
+        messages[key + PLURAL_SEPARATOR] = PLURAL_SEPARATOR.join(
+            forms[index] for index in sorted(forms))
+    return messages, translations.info()
+
+
+def write_catalog(path, messages, info=None):
+    """Write a catalog file atomically.
+
+    Processes which mapped the previous file keep reading it until they
+    open the new one.
+
+    :param path: Path of the catalog.
+    :param messages: Dictionary of keys to translated values.
+    :param info: Metadata of the catalog (e.g. ``plural-forms``).
+    """
+    keys = sorted(messages)
+    size = 1
+    while size < 2 * len(keys):
+        size *= 2
+    strings_offset = HEADER.size + ENTRY.size * len(keys) + SLOT.size * size
+
+    entries, table, strings = [], [0] * size, []
+    offset = strings_offset
+    for number, key in enumerate(keys):
+        encoded_key = key.encode('utf-8')
+        value = messages[key].encode('utf-8')
+        entries.append(ENTRY.pack(offset, len(encoded_key),
+                                  offset + len(encoded_key), len(value)))
+        strings.extend((encoded_key, value))
+        offset += len(encoded_key) + len(value)
+        slot = key_hash(encoded_key) & (size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (size - 1)
+        table[slot] = number + 1
+    metadata = json.dumps(info or {}, sort_keys=True).encode('utf-8')
+
+    tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as fp:
+        fp.write(HEADER.pack(MAGIC, VERSION, len(keys), size, offset,
+                             len(metadata)))
+        fp.write(b''.join(entries))
+        fp.write(b''.join(SLOT.pack(slot) for slot in table))
+        fp.write(b''.join(strings))
+        fp.write(metadata)
+    os.rename(tmp_path, path)
+
+
+def find_locales(directories, domain='messages'):
+    """List the locales having translations in any directory."""
+    locales = set()
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for locale in os.listdir(directory):
+            if os.path.exists(os.path.join(
+                    directory, locale, 'LC_MESSAGES', domain + '.mo')):
+                locales.add(locale)
+    return sorted(locales)
+
+
+def merge_catalogs(directories, locale, domain='messages'):
+    """Merge the translations of a locale from several directories.
+
+    Each directory is searched like :func:`gettext.find` does (e.g.
+    ``pt_BR`` then ``pt``) and messages of later directories override the
+    ones of earlier directories, as with Invenio-I18N.
+
+    :returns: Tuple of the messages, the metadata and the source files.
+    """
+    messages, info, sources = {}, {}, []
+    for directory in directories:
+        path = gettext.find(domain, directory, [locale])
+        if path is None:
+            continue
+        catalog, catalog_info = read_mo(path)
+        messages.update(catalog)
+        for key, value in catalog_info.items():
+            info.setdefault(key, value)
+        sources.append(path)
+    return messages, info, sources
+
+
+def build_catalogs(directories, output, locales=None, domain='messages'):
+    """Build the merged catalog of each locale.
+
+    :param directories: Translation directories, by increasing priority.
+    :param output: Directory of the catalogs.
+    :param locales: Locales to build (defaults to all found locales).
+    :param domain: Gettext domain.
+    :returns: Dictionary of locales to the number of merged messages.
+    """
+    if not os.path.isdir(output):
+        os.makedirs(output)
+    built = {}
+    for locale in locales or find_locales(directories, domain=domain):
+        messages, info, sources = merge_catalogs(directories, locale,
+                                                 domain=domain)
+        if not sources:
+            continue
+        info = dict(info, locale=locale, sources=sources)
+        write_catalog(catalog_path(output, locale), messages, info)
+        built[locale] = len(messages)
+    return built
+
+
+def catalog_path(directory, locale):
+    """Path of the catalog of a locale."""
+    return os.path.join(directory, '{0}.catalog'.format(locale))
+
+
+class MappedTranslations(gettext.NullTranslations):
+    """Translations read from a memory mapped catalog.
+
+    Compatible with the translations of Babel used by Flask-BabelEx and
+    Jinja2. Messages missing from the catalog are looked up in the
+    fallback translations, if any.
+    """
+
+    def __init__(self, path):
+        """Map a catalog file.
+
+        :raises ValueError: If the file is not a catalog.
+        """
+        gettext.NullTranslations.__init__(self)
+        with open(path, 'rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size or \
+                HEADER.unpack_from(self._mmap, 0)[:2] != (MAGIC, VERSION):
+            self._mmap.close()
+            raise ValueError('Not a catalog: {0}'.format(path))
+        self._count, self._size, info_offset, info_length = \
+            HEADER.unpack_from(self._mmap, 0)[2:]
+        self._table_offset = HEADER.size + ENTRY.size * self._count
+        self._info = json.loads(self._mmap[
+            info_offset:info_offset + info_length].decode('utf-8'))
+        self._charset = 'utf-8'
+        self.path = path
+
+        plural_forms = self._info.get('plural-forms', '')
+        plural = [part.split('=', 1)[1] for part in plural_forms.split(';')
+                  if part.strip().startswith('plural=')]
+        self.plural = gettext.c2py(plural[0]) if plural else \
+            (lambda n: int(n != 1))
+
+    def __len__(self):
+        """Return the number of messages."""
+        return self._count
+
+    def __contains__(self, key):
+        """Check if a key is in the catalog."""
+        return self.lookup(key) is not None
+
+    def lookup(self, key):
+        """Get the translation of a key, or ``None`` if missing."""
+        if not self._size:
+            return None
+        encoded = key.encode('utf-8')
+        mask = self._size - 1
+        slot = key_hash(encoded) & mask
+        while True:
+            number = SLOT.unpack_from(
+                self._mmap, self._table_offset + SLOT.size * slot)[0]
+            if not number:
+                return None
+            key_offset, key_length, value_offset, value_length = \
+                ENTRY.unpack_from(
+                    self._mmap, HEADER.size + ENTRY.size * (number - 1))
+            if key_length == len(encoded) and \
+                    self._mmap[key_offset:key_offset + key_length] == \
+                    encoded:
+                return self._mmap[
+                    value_offset:value_offset + value_length].decode('utf-8')
+            slot = (slot + 1) & mask
+
+    def gettext(self, message):
+        """Translate a message."""
+        value = self.lookup(message)
+        if value is not None:
+            return value
+        if self._fallback:
+            return self._fallback.gettext(message)
+        return message
+
+    def ngettext(self, singular, plural, n):
+        """Translate a message with plural forms."""
+        value = self.lookup(singular + PLURAL_SEPARATOR)
+        if value is not None:
+            forms = value.split(PLURAL_SEPARATOR)
+            index = self.plural(n)
+            if index < len(forms):
+                return forms[index]
+        if self._fallback:
+            return self._fallback.ngettext(singular, plural, n)
+        return singular if n == 1 else plural
+
+    def pgettext(self, context, message):
+        """Translate a message in a context."""
+        value = self.lookup(context + CONTEXT_SEPARATOR + message)
+        if value is not None:
+            return value
+        if self._fallback and hasattr(self._fallback, 'pgettext'):
+            return self._fallback.pgettext(context, message)
+        return message
+
+    def npgettext(self, context, singular, plural, n):
+        """Translate a message with plural forms in a context."""
+        value = self.lookup(
+            context + CONTEXT_SEPARATOR + singular + PLURAL_SEPARATOR)
+        if value is not None:
+            forms = value.split(PLURAL_SEPARATOR)
+            index = self.plural(n)
+            if index < len(forms):
+                return forms[index]
+        if self._fallback and hasattr(self._fallback, 'npgettext'):
+            return self._fallback.npgettext(context, singular, plural, n)
+        return singular if n == 1 else plural
+
+    # Names used by Babel, Flask-BabelEx and Jinja2 on Python 2.
+    ugettext = gettext
+    ungettext = ngettext
+    upgettext = pgettext
+    unpgettext = npgettext
+
+    def is_stale(self, directories, domain='messages'):
+        """Check if the catalog differs from the translation directories.
+
+        The catalog is stale if the ``.mo`` files it would be built from are
+        not the ones it was built from (e.g. a module was installed or
+        removed) or were modified after it was built.
+        """
+        locale = self._info.get('locale')
+        if locale is None:
+            return False
+        sources = [path for path in (
+            gettext.find(domain, directory, [locale])
+            for directory in directories) if path is not None]
+        if sources != self._info.get('sources'):
+            return True
+        built = os.path.getmtime(self.path)
+        return any(os.path.getmtime(path) > built for path in sources)
+
+    def close(self):
+        """Unmap the catalog."""
+        self._mmap.close()
+
+
+class CatalogStore(object):
+    """Catalogs of a directory, mapped once per process and locale."""
+
+    def __init__(self, directory, directories=None, domain='messages'):
+        """Initialize the store.
+
+        :param directory: Directory of the catalogs.
+        :param directories: Translation directories the catalogs are built
+            from, or a callable returning them. Stale catalogs are not used
+            if given.
+        :param domain: Gettext domain.
+        """
+        self.directory = directory
+        self.directories = directories
+        self.domain = domain
+        self.catalogs = {}
+        self._sources = None
+        self._lock = threading.Lock()
+
+    def get(self, locale):
+        """Get the translations of a locale.
+
+        A catalog of the locale without territory (e.g. ``pt`` for
+        ``pt_BR``) is used if there is none for the locale.
+
+        :returns: A :class:`MappedTranslations`, or ``None`` if there is no
+            up to date catalog for the locale.
+        """
+        try:
+            return self.catalogs[locale]
+        except KeyError:
+            pass
+        with self._lock:
+            if locale not in self.catalogs:
+                translations = None
+                for name in (locale, locale.split('_')[0]):
+                    path = catalog_path(self.directory, name)
+                    if os.path.exists(path):
+                        translations = MappedTranslations(path)
+                        break
+                if translations is not None and self.is_stale(translations):
+                    logger.warning(
+                        'Catalog %s is out of date, run "catalogs build".',
+                        translations.path)
+                    translations.close()
+                    translations = None
+                self.catalogs[locale] = translations
+        return self.catalogs[locale]
+
+    def is_stale(self, translations):
+        """Check if mapped translations are out of date."""
+        if self.directories is None:
+            return False
+        if self._sources is None:
+            self._sources = self.directories() \
+                if callable(self.directories) else self.directories
+        return translations.is_stale(self._sources, self.domain)
+
+    def clear(self):
+        """Forget the mapped catalogs (e.g. after a rebuild)."""
+        with self._lock:
+            self.catalogs.clear()
+            self._sources = None
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Memory per worker with per-module and merged translation catalogs.
+
+Translations of several modules are generated for the supported locales.
+Worker processes are started side by side, each one translating every
+message in every locale:
+
+* ``gettext``: like Invenio-I18N, each worker parses the ``.mo`` file of
+  every module and merges them into a private dictionary per locale;
+* ``mapped``: each worker maps the merged catalogs built beforehand.
+
+The memory of the workers (proportional set size and private memory, read
+from ``/proc``) is reported above the one of an idle worker, with the
+time spent loading each locale and translating its messages. The module
+is also the worker: ``python -m invenio.catalogs.bench <options>``, the
+options being encoded in JSON.
+"""
+
+from __future__ import absolute_import, print_function
+
+import gettext
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+from ..bench.api import timer
+from .api import CatalogStore, build_catalogs
+
+LOCALES = ('ar', 'de', 'el', 'es', 'fr', 'it', 'ja', 'pt_BR', 'ru',
+           'zh_CN')
+"""Locales of the generated translations."""
+
+
+def write_mo(path, messages, plural_forms='nplurals=2; plural=(n != 1);'):
+    """Write a ``.mo`` file.
+
+    :param messages: Dictionary of message ids to translations. Plural
+        messages have a ``(singular, plural)`` tuple as id and a list of
+        forms as translation.
+    """
+    entries = {u'': u'Content-Type: text/plain; charset=UTF-8\n'
+                    u'Plural-Forms: {0}\n'.format(plural_forms)}
+    for key, value in messages.items():
+        if isinstance(key, tuple):
+            key, value = u'\x00'.join(key), u'\x00'.join(value)
+        entries[key] = value
+    keys = sorted(entries)
+    ids = b''
+    strs = b''
+    offsets = []
+    for key in keys:
+        encoded_key = key.encode('utf-8')
+        encoded_value = entries[key].encode('utf-8')
+        offsets.append((len(ids), len(encoded_key), len(strs),
+                        len(encoded_value)))
+        ids += encoded_key + b'\x00'
+        strs += encoded_value + b'\x00'
+    ids_start = 7 * 4 + 16 * len(keys)
+    strs_start = ids_start + len(ids)
+    key_table, value_table = [], []
+    for key_offset, key_length, value_offset, value_length in offsets:
+        key_table.extend((key_length, ids_start + key_offset))
+        value_table.extend((value_length, strs_start + value_offset))
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, 'wb') as fp:
+        fp.write(struct.pack('<7I', 0x950412de, 0, len(keys), 7 * 4,
+                             7 * 4 + 8 * len(keys), 0, 0))
+        fp.write(struct.pack('<{0}I'.format(len(key_table)), *key_table))
+        fp.write(struct.pack('<{0}I'.format(len(value_table)),
+                             *value_table))
+        fp.write(ids)
+        fp.write(strs)
+
+
+def message_id(module, number):
+    """Message id of a generated message."""
+    return u'Module {0}: message number {1} of the user interface'.format(
+        module, number)
+
+
+def generate_translations(root, modules, messages, locales=LOCALES):
+    """Generate the translation directories of several modules.
+
+    :returns: List of the translation directories.
+    """
+    directories = []
+    for module in range(modules):
+        directory = os.path.join(root, 'module{0}'.format(module))
+        for locale in locales:
+            write_mo(
+                os.path.join(directory, locale, 'LC_MESSAGES', 'messages.mo'),
+                dict((message_id(module, number), u'[{0}] {1}'.format(
+                    locale, message_id(module, number)))
+                    for number in range(messages)))
+        directories.append(directory)
+    return directories
+
+
+def load_merged(directories, locale):
+    """Load and merge the translations of a locale like Invenio-I18N."""
+    try:
+        from babel.support import Translations
+    except ImportError:
+        Translations = None
+    translations = None
+    for directory in directories:
+        if Translations is not None:
+            catalog = Translations.load(directory, [locale])
+        else:
+            catalog = gettext.translation('messages', directory, [locale],
+                                          fallback=True)
+        if translations is None:
+            translations = catalog
+        elif Translations is not None:
+            translations.merge(catalog)
+        else:
+            translations._catalog.update(getattr(catalog, '_catalog', {}))
+    return translations
+
+
+def worker(options):
+    """Translate all messages in all locales.
+
+    :returns: Seconds spent loading the locales and translating, and the
+        loaded translations (to keep them in memory while measuring).
+    """
+    if options['mode'] == 'mapped':
+        get = CatalogStore(options['catalogs']).get
+    else:
+        def get(locale):
+            return load_merged(options['directories'], locale)
+    seconds, loaded = {}, []
+    if options['mode'] == 'none':
+        return seconds, loaded
+    seconds = dict(load=0.0, translate=0.0)
+    for locale in options['locales']:
+        start = timer()
+        translations = get(locale)
+        loaded_at = timer()
+        for module in range(options['modules']):
+            for number in range(options['messages']):
+                translations.gettext(message_id(module, number))
+        seconds['load'] += loaded_at - start
+        seconds['translate'] += timer() - loaded_at
+        loaded.append(translations)
+    return seconds, loaded
+
+
+def read_memory(pid):
+    """Read the memory of a process in kilobytes, or ``None``."""
+    try:
+        with open('/proc/{0}/smaps_rollup'.format(pid)) as fp:
+            lines = fp.read().splitlines()
+    except (IOError, OSError):
+        return None
+    values = {}
+    for line in lines[1:]:
+        name, value = line.split(':', 1)
+        values[name] = int(value.split()[0])
+    return dict(pss=values['Pss'], rss=values['Rss'],
+                private=values['Private_Clean'] + values['Private_Dirty'])
+
+
+def measure(options, workers):
+    """Start workers side by side and measure them once they are done."""
+    processes = [subprocess.Popen(
+        [sys.executable, '-m', 'invenio.catalogs.bench',
+         json.dumps(options)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        for _ in range(workers)]
+    try:
+        seconds = [json.loads(process.stdout.readline().decode('utf-8'))
+                   for process in processes]
+        memory = [read_memory(process.pid) for process in processes]
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+    return seconds, memory
+
+
+def average(values):
+    """Average of values."""
+    return sum(values) / float(len(values)) if values else 0.0
+
+
+def run(workers=4, modules=20, messages=200, locales=LOCALES, **kwargs):
+    """Measure the memory per worker and the first use of the locales.
+
+    :param workers: Number of concurrent workers.
+    :param modules: Number of modules with translations.
+    :param messages: Number of messages per module.
+    :param locales: Translated locales.
+    :returns: Dictionary of the results.
+    """
+    root = tempfile.mkdtemp()
+    try:
+        directories = generate_translations(root, modules, messages,
+                                            locales=locales)
+        catalogs = os.path.join(root, 'catalogs')
+        start = timer()
+        build_catalogs(directories, catalogs, locales=list(locales))
+        results = dict(
+            workers=workers, modules=modules, messages=messages,
+            locales=list(locales), build_seconds=timer() - start,
+            catalog_bytes=sum(os.path.getsize(os.path.join(catalogs, name))
+                              for name in os.listdir(catalogs)),
+        )
+        options = dict(directories=directories, catalogs=catalogs,
+                       locales=list(locales), modules=modules,
+                       messages=messages)
+        baseline = None
+        for mode in ('none', 'gettext', 'mapped'):
+            seconds, memory = measure(dict(options, mode=mode), workers)
+            result = dict(
+                (key + '_seconds_per_locale', average(
+                    [worker_seconds.get(key, 0) for worker_seconds in seconds]
+                ) / len(locales)) for key in ('load', 'translate'))
+            if None not in memory:
+                usage = dict((key, average([m[key] for m in memory]))
+                             for key in ('pss', 'private', 'rss'))
+                if baseline is None:
+                    baseline = usage
+                result.update(('{0}_kb'.format(key), value - baseline[key])
+                              for key, value in usage.items())
+            if mode != 'none':
+                results[mode] = result
+        return results
+    finally:
+        shutil.rmtree(root)
+
+
+def main(argv=None):
+    """Run a worker and wait for a line on stdin before exiting."""
+    options = json.loads((argv or sys.argv[1:])[0])
+    seconds, loaded = worker(options)
+    print(json.dumps(seconds))
+    sys.stdout.flush()
+    sys.stdin.readline()
+
+
+if __name__ == '__main__':
+    main()
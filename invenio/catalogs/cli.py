@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the translation catalogs."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import build_catalogs
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.group()
+def catalogs():
+    """Manage the translation catalogs."""
+
+
+@catalogs.command()
+@click.option('--locale', '-l', 'locales', multiple=True,
+              help='Locale to build (defaults to all locales).')
+@with_appcontext
+def build(locales):
+    """Merge the translations of all modules into one catalog per locale."""
+    ext = current_app.extensions['invenio-catalogs']
+    output = ext.directory(current_app)
+    built = build_catalogs(
+        ext.translation_directories(current_app), output,
+        locales=list(locales) or current_app.config['CATALOGS_LOCALES'],
+        domain=current_app.config['CATALOGS_DOMAIN'])
+    for locale, count in sorted(built.items()):
+        click.echo('{0}: {1} messages'.format(locale, count))
+    ext.store.clear()
+    click.secho('Built {0} catalogs into {1}.'.format(len(built), output),
+                fg='green')
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Translation catalog configuration."""
+
+CATALOGS_ENABLED = True
+"""Translate with the merged catalogs, for the locales which have one."""
+
+CATALOGS_DIRECTORY = None
+"""Directory of the merged catalogs (defaults to
+``<instance_path>/catalogs``)."""
+
+CATALOGS_ENTRY_POINT_GROUP = 'invenio_i18n.translations'
+"""Entry point group of the modules providing translations."""
+
+CATALOGS_DOMAIN = 'messages'
+"""Gettext domain of the translations."""
+
+CATALOGS_LOCALES = None
+"""Locales to build (defaults to all locales with translations)."""
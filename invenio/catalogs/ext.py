@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Translation catalog extension."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+from . import config
+from .api import CatalogStore
+from .cli import catalogs
+
+
+def get_locale():
+    """Get the locale of the current request."""
+    try:
+        from flask_babelex import get_locale
+    except ImportError:
+        from flask_babel import get_locale
+    return get_locale()
+
+
+class InvenioCatalogs(object):
+    """Translation catalog extension.
+
+    Makes Invenio-I18N translate with the merged catalogs built by
+    ``catalogs build``. Locales without a catalog, or whose catalog is out
+    of date with the installed translations, are translated as before. The translation domain is replaced as soon as Invenio-I18N is
+    initialized: right away if it was loaded first, otherwise on the first
+    request.
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.store = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.cli.add_command(catalogs)
+        app.extensions['invenio-catalogs'] = self
+        self.store = CatalogStore(
+            self.directory(app),
+            directories=lambda: self.translation_directories(app),
+            domain=app.config['CATALOGS_DOMAIN'])
+        if app.config['CATALOGS_ENABLED'] and not self.install(app):
+            app.before_request(lambda: self.install(app) and None)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('CATALOGS_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    @staticmethod
+    def directory(app):
+        """Get the directory of the catalogs of an application."""
+        return app.config['CATALOGS_DIRECTORY'] or \
+            os.path.join(app.instance_path, 'catalogs')
+
+    @staticmethod
+    def translation_directories(app):
+        """List the translation directories, by increasing priority.
+
+        Like Invenio-I18N: ``I18N_TRANSLATIONS_PATHS``, then the
+        ``translations`` directory of each entry point module.
+        """
+        import pkg_resources
+
+        directories = list(app.config.get('I18N_TRANSLATIONS_PATHS', []))
+        for ep in pkg_resources.iter_entry_points(
+                app.config['CATALOGS_ENTRY_POINT_GROUP']):
+            if pkg_resources.resource_isdir(ep.module_name, 'translations'):
+                directories.append(pkg_resources.resource_filename(
+                    ep.module_name, 'translations'))
+        return directories
+
+    def install(self, app):
+        """Translate with the catalogs in the domain of Invenio-I18N.
+
+        :returns: ``True`` if the domain uses the catalogs.
+        """
+        domain = getattr(app.extensions.get('invenio-i18n'), 'domain', None)
+        if domain is None:
+            return False
+        if getattr(domain.get_translations, 'catalogs', None) is self:
+            return True
+        original = domain.get_translations
+
+        def get_translations():
+            locale = get_locale()
+            translations = self.store.get(str(locale)) \
+                if locale is not None else None
+            return translations if translations is not None else original()
+
+        get_translations.catalogs = self
+        domain.get_translations = get_translations
+        return True
+
+    def collect_metrics(self):
+        """Report the size of the mapped catalogs."""
+        for locale, translations in sorted(self.store.catalogs.items()):
+            if translations is not None:
+                yield ('invenio_catalogs_mapped_bytes',
+                       dict(locale=locale), os.path.getsize(translations.path))
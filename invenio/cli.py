@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Invenio command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import click
+
+from .asyncread.cli import serve_async
+from .loadtest.cli import loadtest
+from .registry.cli import registry
+from .server.cli import serve
+from .startup.cli import profile_startup
+from .version import __version__
+
+
+@click.group()
+@click.version_option(__version__)
+def cli():
+    """Invenio management commands."""
+
+
+cli.add_command(loadtest)
+cli.add_command(profile_startup)
+cli.add_command(registry)
+cli.add_command(serve)
+cli.add_command(serve_async)
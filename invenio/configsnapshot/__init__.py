@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Frozen configuration snapshots.
+
+Every process of an instance assembles its configuration at startup from
+the defaults of the installed modules, the instance configuration file
+and the environment. ``config freeze`` resolves it once into a validated
+snapshot file, which the configuration loader of the instance reads
+instead, as long as none of its sources changed:
+
+.. code-block:: python
+
+    from invenio.configsnapshot import FrozenConfigLoader
+    from invenio_config import create_conf_loader
+
+    config_loader = FrozenConfigLoader(
+        create_conf_loader(config=config, env_prefix='APP'),
+        env_prefix='APP')
+
+.. code-block:: console
+
+    $ invenio config freeze
+    $ invenio config diff
+    $ invenio config show
+
+``config diff`` lists the keys whose live value differs from the snapshot
+and where the live value comes from; secrets are masked. The snapshot is
+ignored, with a warning, when the instance configuration file, the
+configuration modules of the instance, its environment variables or the
+installed distributions changed since it was frozen.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import FrozenConfigLoader, Snapshot, SnapshotError
+from .ext import InvenioConfigSnapshot
+
+__all__ = ('FrozenConfigLoader', 'InvenioConfigSnapshot', 'Snapshot',
+           'SnapshotError', )
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Frozen configuration snapshots."""
+
+from __future__ import absolute_import, print_function
+
+import base64
+import datetime
+import hashlib
+import json
+import os
+import re
+import sys
+
+from ..helpers import import_string
+
+try:
+    from importlib.util import find_spec
+except ImportError:  # pragma: no cover
+    find_spec = None
+from ..registry.api import METADATA_SUFFIXES, distributions_fingerprint
+from ..version import __version__
+
+SNAPSHOT_FORMAT = 1
+"""Version of the snapshot file layout."""
+
+SECRET_KEYS = re.compile(r'SECRET|PASSWORD|PASSWD|TOKEN|PRIVATE')
+"""Keys whose values are masked when displayed."""
+
+URL_CREDENTIALS = re.compile(r'(://[^:/@]*:)[^@/]*@')
+"""Password in URLs (e.g. ``SQLALCHEMY_DATABASE_URI``)."""
+
+
+class SnapshotError(ValueError):
+    """A snapshot cannot be written, read or used."""
+
+
+def import_path(obj):
+    """Get the import path of a class or function, or ``None``."""
+    module = getattr(obj, '__module__', None)
+    name = getattr(obj, '__qualname__', None) or getattr(
+        obj, '__name__', None)
+    if not module or not name or '<' in name:
+        return None
+    path = '{0}:{1}'.format(module, name)
+    try:
+        return path if import_string(path) is obj else None
+    except (ImportError, AttributeError):
+        return None
+
+
+def encode_value(value):
+    """Encode a configuration value to JSON.
+
+    Values which JSON cannot represent (tuples, sets, bytes, durations,
+    classes and functions) are tagged so that they are decoded to an equal
+    value.
+
+    :raises SnapshotError: If the value cannot be encoded.
+    """
+    if value is None or isinstance(value, (bool, float, type(u''))):
+        return value
+    if isinstance(value, int) or type(value).__name__ == 'long':
+        return value
+    if isinstance(value, bytes):
+        return {'__bytes__': base64.b64encode(value).decode('ascii')}
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [encode_value(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': sorted(
+            (encode_value(item) for item in value),
+            key=lambda item: json.dumps(item, sort_keys=True))}
+    if isinstance(value, datetime.timedelta):
+        return {'__timedelta__': value.total_seconds()}
+    if isinstance(value, dict):
+        if not all(isinstance(key, type(u'')) for key in value):
+            raise SnapshotError('Only text keys can be frozen.')
+        return dict((key, encode_value(item)) for key, item in value.items())
+    path = import_path(value)
+    if path is None:
+        raise SnapshotError('Cannot freeze {0!r}.'.format(value))
+    return {'__import__': path}
+
+
+def decode_value(value):
+    """Decode a configuration value encoded by :func:`encode_value`."""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        tag, item = next(iter(value.items()))
+        if tag == '__bytes__':
+            return base64.b64decode(item.encode('ascii'))
+        if tag == '__tuple__':
+            return tuple(decode_value(i) for i in item)
+        if tag == '__set__':
+            return set(decode_value(i) for i in item)
+        if tag == '__timedelta__':
+            return datetime.timedelta(seconds=item)
+        if tag == '__import__':
+            return import_string(item)
+    return dict((key, decode_value(item)) for key, item in value.items())
+
+
+def instance_config_path(app):
+    """Path of the instance configuration file of an application."""
+    return os.path.join(app.instance_path, '{0}.cfg'.format(app.name))
+
+
+def distribution_paths(paths=None):
+    """List the import paths containing installed distributions.
+
+    Other paths (e.g. the directory of the running script, which differs
+    between the command line and the web server) are left out, as well as
+    the order of the paths.
+
+    :param paths: Import paths to inspect. Defaults to ``sys.path``.
+    """
+    found = set()
+    for path in paths if paths is not None else sys.path:
+        path = os.path.abspath(path or '.')
+        try:
+            names = os.listdir(path)
+        except OSError:
+            continue
+        if any(name.endswith(METADATA_SUFFIXES) for name in names):
+            found.add(path)
+    return sorted(found)
+
+
+def module_file(name):
+    """Get the source file of a module, without importing it.
+
+    :returns: The path, or ``None`` if the module cannot be found.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        path = getattr(module, '__file__', None)
+    elif find_spec is not None:
+        try:
+            spec = find_spec(name)
+        except (ImportError, ValueError, AttributeError):
+            return None
+        path = spec.origin if spec is not None else None
+    else:
+        return None
+    if path and path.endswith(('.pyc', '.pyo')) and \
+            os.path.exists(path[:-1]):
+        path = path[:-1]
+    return path if path and os.path.isfile(path) else None
+
+
+def config_modules(app, modules=()):
+    """List the modules which may provide configuration defaults.
+
+    Besides ``modules``, the module of the application and its ``config``
+    submodule are included (e.g. ``mysite`` and ``mysite.config`` for an
+    instance created by ``inveniomanage instance create``), since the
+    instance is often run from its folder without being installed.
+
+    :param app: The application.
+    :param modules: Additional modules or import paths.
+    """
+    names = [app.import_name, '{0}.config'.format(app.import_name)]
+    for module in modules:
+        names.append(getattr(module, '__name__', module))
+    return names
+
+
+def sources_fingerprint(app, env_prefix='APP', files=(), paths=None,
+                        modules=()):
+    """Compute a fingerprint of the configuration sources.
+
+    It changes when the instance configuration file (or one of ``files``)
+    is modified, when the source of a configuration module is modified,
+    when an environment variable of the instance is set, changed or
+    removed, or when the installed distributions change.
+
+    :param app: The application.
+    :param env_prefix: Prefix of the environment variables of the instance.
+    :param files: Additional configuration files.
+    :param paths: Import paths used for the distributions fingerprint.
+    :param modules: Additional configuration modules (see
+        :func:`config_modules`).
+    """
+    digest = hashlib.sha1()
+    digest.update(distributions_fingerprint(
+        distribution_paths(paths)).encode('utf-8'))
+    sources = [module_file(name) for name in config_modules(app, modules)]
+    for path in [instance_config_path(app)] + list(files) + \
+            [path for path in sources if path]:
+        try:
+            stat = os.stat(path)
+            state = '{0!r}:{1}'.format(stat.st_mtime, stat.st_size)
+        except OSError:
+            state = 'missing'
+        digest.update(u'{0}={1}\n'.format(path, state).encode('utf-8'))
+    prefix = env_prefix + '_'
+    for name, value in sorted(os.environ.items()):
+        if name.startswith(prefix):
+            digest.update(u'{0}={1}\n'.format(name, value).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class Snapshot(object):
+    """Resolved configuration of an application."""
+
+    def __init__(self, app_name, config, fingerprint=None, created=None):
+        """Initialize the snapshot.
+
+        :param app_name: Name of the application.
+        :param config: Dictionary of the configuration.
+        :param fingerprint: Fingerprint of the configuration sources.
+        :param created: Creation date as an ISO formatted string.
+        """
+        self.app_name = app_name
+        self.config = config
+        self.fingerprint = fingerprint
+        self.created = created or datetime.datetime.utcnow().isoformat()
+
+    def to_dict(self):
+        """Serialize the snapshot.
+
+        :raises SnapshotError: If values cannot be frozen (all their keys
+            are reported).
+        """
+        config, errors = {}, []
+        for key, value in sorted(self.config.items()):
+            try:
+                config[key] = encode_value(value)
+            except SnapshotError as e:
+                errors.append('{0}: {1}'.format(key, e))
+        if errors:
+            raise SnapshotError('Cannot freeze the configuration:\n' +
+                                '\n'.join(errors))
+        data = dict(
+            format=SNAPSHOT_FORMAT,
+            invenio=__version__,
+            app=self.app_name,
+            fingerprint=self.fingerprint,
+            created=self.created,
+            config=config,
+        )
+        data['checksum'] = checksum(data)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize and validate a snapshot.
+
+        :raises SnapshotError: If the snapshot is incompatible or corrupted.
+        """
+        if data.get('format') != SNAPSHOT_FORMAT or \
+                data.get('invenio') != __version__:
+            raise SnapshotError('Incompatible configuration snapshot.')
+        data = dict(data)
+        if data.pop('checksum', None) != checksum(data):
+            raise SnapshotError('Corrupted configuration snapshot.')
+        return cls(
+            data['app'],
+            dict((key, decode_value(value))
+                 for key, value in data['config'].items()),
+            fingerprint=data['fingerprint'],
+            created=data['created'],
+        )
+
+    def save(self, path):
+        """Write the snapshot atomically, readable by its owner only."""
+        data = self.to_dict()
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(data, fp, indent=2, sort_keys=True)
+        os.rename(tmp_path, path)
+
+    @classmethod
+    def load_file(cls, path):
+        """Read a snapshot file."""
+        with open(path) as fp:
+            try:
+                data = json.load(fp)
+            except ValueError:
+                raise SnapshotError('Corrupted configuration snapshot.')
+        return cls.from_dict(data)
+
+
+def checksum(data):
+    """Checksum of the serialized snapshot."""
+    return hashlib.sha1(json.dumps(
+        data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+
+
+def mask(key, value):
+    """Mask the secrets in a configuration value before displaying it."""
+    if SECRET_KEYS.search(key) and value:
+        return '***'
+    text = repr(value)
+    return URL_CREDENTIALS.sub(r'\1***@', text)
+
+
+def diff_configs(frozen, live):
+    """Compare a frozen configuration with the live one.
+
+    :returns: Sorted list of ``(key, status, frozen value, live value)``,
+        ``status`` being ``'added'`` (only live), ``'removed'`` (only
+        frozen) or ``'changed'``.
+    """
+    changes = []
+    for key in sorted(set(frozen) | set(live)):
+        if key not in frozen:
+            changes.append((key, 'added', None, live[key]))
+        elif key not in live:
+            changes.append((key, 'removed', frozen[key], None))
+        elif frozen[key] != live[key]:
+            changes.append((key, 'changed', frozen[key], live[key]))
+    return changes
+
+
+def env_keys(env_prefix='APP'):
+    """Map the configuration keys set by environment variables to them."""
+    prefix = env_prefix + '_'
+    return dict((name[len(prefix):], name) for name in os.environ
+                if name.startswith(prefix))
+
+
+def instance_keys(app):
+    """List the keys set by the instance configuration file."""
+    from flask import Config
+
+    config = Config(app.root_path)
+    try:
+        config.from_pyfile(instance_config_path(app), silent=True)
+    except Exception:
+        return set()
+    return set(config)
+
+
+class FrozenConfigLoader(object):
+    """Configuration loader using a snapshot when it is up to date.
+
+    Wraps the configuration loader of an instance (e.g. the one created by
+    Invenio-Config). When the snapshot written by ``config freeze`` exists
+    and its sources did not change, the configuration is read from it
+    instead of being assembled from the module defaults, the instance
+    configuration file and the environment. Otherwise the wrapped loader
+    is used, with a warning if the snapshot is stale or invalid.
+
+    The loader of an application is available as ``app.config_loader``.
+    """
+
+    def __init__(self, config_loader, path=None, env_prefix='APP',
+                 files=(), modules=()):
+        """Initialize the loader.
+
+        :param config_loader: Configuration loader of the instance, called
+            with the application and keyword configuration.
+        :param path: Path of the snapshot (defaults to
+            ``<instance_path>/<app name>.snapshot.json``).
+        :param env_prefix: Prefix of the environment variables read by the
+            configuration loader.
+        :param files: Additional configuration files read by the loader.
+        :param modules: Configuration modules read by the loader which are
+            not part of an installed distribution nor the module of the
+            application (see :func:`config_modules`).
+        """
+        self.config_loader = config_loader
+        self.path = path
+        self.env_prefix = env_prefix
+        self.files = tuple(files)
+        self.modules = tuple(modules)
+        self.frozen = False
+
+    def snapshot_path(self, app):
+        """Get the path of the snapshot of an application."""
+        return self.path or os.path.join(
+            app.instance_path, '{0}.snapshot.json'.format(app.name))
+
+    def fingerprint(self, app):
+        """Compute the fingerprint of the sources of an application."""
+        return sources_fingerprint(app, env_prefix=self.env_prefix,
+                                   files=self.files, modules=self.modules)
+
+    def load_snapshot(self, app):
+        """Load the snapshot of an application.
+
+        :returns: The :class:`Snapshot`, or ``None`` if it is missing,
+            invalid or stale.
+        """
+        path = self.snapshot_path(app)
+        if not os.path.exists(path):
+            return None
+        try:
+            snapshot = Snapshot.load_file(path)
+        except (IOError, OSError, SnapshotError, ImportError,
+                AttributeError) as e:
+            app.logger.warning('Ignoring configuration snapshot %s: %s',
+                               path, e)
+            return None
+        if snapshot.app_name != app.name or \
+                snapshot.fingerprint != self.fingerprint(app):
+            app.logger.warning('Ignoring stale configuration snapshot %s.',
+                               path)
+            return None
+        return snapshot
+
+    def live_config(self, app, **kwargs_config):
+        """Assemble the configuration from its sources.
+
+        :returns: The configuration of a new application with the name and
+            the instance path of ``app``.
+        """
+        from flask import Flask
+
+        fresh = Flask(app.import_name, instance_path=app.instance_path)
+        self.config_loader(fresh, **kwargs_config)
+        return dict(fresh.config)
+
+    def freeze(self, app):
+        """Write the snapshot of the live configuration of an application.
+
+        :returns: The :class:`Snapshot`.
+        :raises SnapshotError: If the configuration cannot be frozen.
+        """
+        snapshot = Snapshot(app.name, self.live_config(app),
+                            fingerprint=self.fingerprint(app))
+        snapshot.save(self.snapshot_path(app))
+        return snapshot
+
+    def __call__(self, app, **kwargs_config):
+        """Load the configuration of an application."""
+        snapshot = self.load_snapshot(app)
+        self.frozen = snapshot is not None
+        if self.frozen:
+            app.config.update(snapshot.config)
+            app.config.update(kwargs_config)
+        else:
+            self.config_loader(app, **kwargs_config)
+        app.config_loader = self
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the configuration snapshots."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+import click
+from flask import current_app
+
+from .api import Snapshot, SnapshotError, diff_configs, env_keys, \
+    instance_config_path, instance_keys, mask
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+def get_loader():
+    """Get the configuration loader of the current application."""
+    loader = getattr(current_app, 'config_loader', None)
+    if loader is None:
+        raise click.ClickException(
+            'The application is not configured with a FrozenConfigLoader.')
+    return loader
+
+
+def source_of(key, env, instance):
+    """Describe the live source of a configuration key."""
+    if key in env:
+        return 'environment {0}'.format(env[key])
+    if key in instance:
+        return 'instance {0}'.format(instance_config_path(current_app))
+    return 'defaults'
+
+
+@click.group()
+def config():
+    """Manage the configuration snapshots."""
+
+
+@config.command()
+@with_appcontext
+def freeze():
+    """Resolve the configuration and write its snapshot."""
+    loader = get_loader()
+    try:
+        snapshot = loader.freeze(current_app)
+    except SnapshotError as e:
+        raise click.ClickException(str(e))
+    click.secho('Configuration with {0} keys frozen into {1}.'.format(
+        len(snapshot.config), loader.snapshot_path(current_app)),
+        fg='green')
+
+
+@config.command()
+@with_appcontext
+def diff():
+    """Show how the snapshot differs from the live configuration."""
+    loader = get_loader()
+    path = loader.snapshot_path(current_app)
+    if not os.path.exists(path):
+        raise click.ClickException('No snapshot {0}.'.format(path))
+    try:
+        snapshot = Snapshot.load_file(path)
+    except (SnapshotError, ImportError) as e:
+        raise click.ClickException('Invalid snapshot {0}: {1}'.format(
+            path, e))
+
+    changes = diff_configs(snapshot.config, loader.live_config(current_app))
+    env, instance = env_keys(loader.env_prefix), instance_keys(current_app)
+    for key, status, frozen, live in changes:
+        source = source_of(key, env, instance)
+        if status == 'added':
+            click.secho('+ {0} = {1} ({2})'.format(
+                key, mask(key, live), source), fg='green')
+        elif status == 'removed':
+            click.secho('- {0} = {1}'.format(key, mask(key, frozen)),
+                        fg='red')
+        else:
+            click.secho('~ {0} = {1} -> {2} ({3})'.format(
+                key, mask(key, frozen), mask(key, live), source),
+                fg='yellow')
+
+    if snapshot.fingerprint != loader.fingerprint(current_app):
+        click.echo('The sources changed since the snapshot was frozen on '
+                   '{0}.'.format(snapshot.created))
+    if not changes:
+        click.secho('The snapshot matches the live configuration.',
+                    fg='green')
+    else:
+        raise SystemExit(1)
+
+
+@config.command()
+@click.option('--live', is_flag=True,
+              help='Show the live configuration instead of the snapshot.')
+@with_appcontext
+def show(live):
+    """Show the frozen (or live) configuration, secrets masked."""
+    loader = get_loader()
+    if live:
+        values = loader.live_config(current_app)
+    else:
+        try:
+            values = Snapshot.load_file(
+                loader.snapshot_path(current_app)).config
+        except (IOError, OSError, SnapshotError, ImportError) as e:
+            raise click.ClickException(str(e))
+    for key in sorted(values):
+        click.echo('{0} = {1}'.format(key, mask(key, values[key])))
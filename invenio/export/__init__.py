@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming record exports.
+
+Records matching a search are fetched from the search engine page by page
+(with ``search_after`` or a scroll) and serialized one at a time into a
+streamed response, so exporting a whole collection uses constant memory:
+
+.. code-block:: console
+
+   $ curl 'http://localhost:5000/records/export/jsonl?q=ellis'
+   $ python manage.py export marcxml -o records.xml
+
+JSON Lines (``jsonl``), JSON array (``json``) and MARCXML (``marcxml``)
+formats are available; others can be added to ``EXPORT_FORMATS``.
+
+The export view is disabled by default. It is enabled by setting its URL,
+together with who may use it, since records are exported without access
+filtering:
+
+.. code-block:: python
+
+    EXPORT_URL = '/records/export'
+    EXPORT_PERMISSION_FACTORY = \
+        'invenio.export.permissions:authenticated_user'
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import export_records, scroll_hits, search_after_hits
+from .ext import InvenioExport
+from .serializers import JSONArraySerializer, JSONLinesSerializer, \
+    MARCXMLSerializer, StreamSerializer
+
+__all__ = ('InvenioExport', 'JSONArraySerializer', 'JSONLinesSerializer',
+           'MARCXMLSerializer', 'StreamSerializer', 'export_records',
+           'scroll_hits', 'search_after_hits', )
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Paging through search results for exports."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+
+from ..helpers import obj_or_import_string
+
+
+def search_after_hits(client, index, body=None, doc_type=None, size=500,
+                      sort=None):
+    """Iterate over all hits of a search using ``search_after``.
+
+    :param client: Elasticsearch client.
+    :param index: Searched index.
+    :param body: Search body (its ``sort`` is replaced by ``sort``).
+    :param size: Number of hits fetched at once.
+    :param sort: Sort ending with a unique field (defaults to
+        ``control_number``).
+    """
+    sort = sort or [{'control_number': 'asc'}]
+    body = dict(body or {}, size=size, sort=sort)
+    while True:
+        hits = client.search(index=index, doc_type=doc_type,
+                             body=body)['hits']['hits']
+        for hit in hits:
+            yield hit
+        if len(hits) < size:
+            return
+        body['search_after'] = hits[-1]['sort']
+
+
+def scroll_hits(client, index, body=None, doc_type=None, size=500,
+                scroll='5m'):
+    """Iterate over all hits of a search using a scroll.
+
+    The scroll is cleared when the iteration ends or is closed.
+    """
+    result = client.search(index=index, doc_type=doc_type,
+                           body=dict(body or {}, size=size), scroll=scroll)
+    scroll_id = result.get('_scroll_id')
+    try:
+        while result['hits']['hits']:
+            for hit in result['hits']['hits']:
+                yield hit
+            result = client.scroll(scroll_id=scroll_id, scroll=scroll)
+            scroll_id = result.get('_scroll_id', scroll_id)
+    finally:
+        if scroll_id:
+            client.clear_scroll(scroll_id=scroll_id)
+
+
+def search_client():
+    """Return the search client of the current application.
+
+    Exports bypass the search result cache, if installed.
+    """
+    from ..searchcache.api import CachedSearchClient
+
+    client = current_app.extensions['invenio-search'].client
+    if isinstance(client, CachedSearchClient):
+        client = client.client
+    return client
+
+
+def get_serializer(fmt):
+    """Create the serializer of an export format.
+
+    :raises KeyError: If the format is not configured.
+    """
+    return obj_or_import_string(current_app.config['EXPORT_FORMATS'][fmt])()
+
+
+def export_records(fmt, query=None, client=None):
+    """Export the records matching a query.
+
+    :param fmt: Export format (see ``EXPORT_FORMATS``).
+    :param query: Query string (all records by default).
+    :param client: Search client (defaults to the one of Invenio-Search).
+    :returns: Tuple of the serializer and an iterator over encoded chunks.
+    """
+    config = current_app.config
+    serializer = get_serializer(fmt)
+    client = client or search_client()
+    body = {'query': {'query_string': {'query': query}}} if query else {}
+    if config['EXPORT_PAGINATION'] == 'scroll':
+        hits = scroll_hits(client, config['EXPORT_INDEX'], body,
+                           doc_type=config['EXPORT_DOC_TYPE'],
+                           size=config['EXPORT_PAGE_SIZE'],
+                           scroll=config['EXPORT_SCROLL'])
+    else:
+        hits = search_after_hits(client, config['EXPORT_INDEX'], body,
+                                 doc_type=config['EXPORT_DOC_TYPE'],
+                                 size=config['EXPORT_PAGE_SIZE'],
+                                 sort=config['EXPORT_SORT'])
+    return serializer, serializer.stream(
+        (hit['_source'] for hit in hits),
+        buffer_size=config['EXPORT_BUFFER_SIZE'])
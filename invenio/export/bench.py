@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark of the peak memory of exports versus their size."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+from ..bench.api import timer
+from .api import search_after_hits
+from .serializers import JSONLinesSerializer
+
+
+def make_record(recid):
+    """Generate a record."""
+    return dict(recid=recid, title='Record {0}'.format(recid) * 5,
+                authors=[dict(full_name='Author {0}'.format(i))
+                         for i in range(10)],
+                keywords=['keyword{0}'.format(i) for i in range(10)])
+
+
+class SyntheticSearchClient(object):
+    """Search client generating its documents on demand.
+
+    Unlike the stand-ins keeping documents in memory, it does not allocate
+    memory growing with the number of documents, which would hide the one of
+    the export itself.
+    """
+
+    def __init__(self, count):
+        """Serve ``count`` documents."""
+        self.count = count
+
+    def search(self, index=None, doc_type=None, body=None, **params):
+        """Return a page of documents sorted by identifier."""
+        start = body.get('search_after', [-1])[0] + 1
+        end = min(start + body.get('size', 10), self.count)
+        return dict(hits=dict(total=self.count, hits=[
+            dict(_id=str(i), _source=make_record(i), sort=[i])
+            for i in range(start, end)]))
+
+
+def buffered_export(client, size):
+    """Serialize all records at once, as a non-streaming response does."""
+    return json.dumps([hit['_source'] for hit in search_after_hits(
+        client, 'records', size=size)]).encode('utf-8')
+
+
+def streaming_export(client, size):
+    """Serialize records as a stream, dropping the chunks."""
+    total = 0
+    records = (hit['_source']
+               for hit in search_after_hits(client, 'records', size=size))
+    for chunk in JSONLinesSerializer().stream(records):
+        total += len(chunk)
+    return total
+
+
+def measure_peak(func, *args):
+    """Return the duration and peak traced memory of a call."""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        start = timer()
+        func(*args)
+        return timer() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes=(1000, 5000, 20000), page_size=500, **kwargs):
+    """Measure peak memory of buffered and streaming exports.
+
+    :param sizes: Numbers of exported records.
+    :param page_size: Records fetched per search request.
+    """
+    try:
+        import tracemalloc  # noqa
+    except ImportError as e:
+        return dict(skipped=True, missing=[str(e)])
+
+    results = []
+    for size in sizes:
+        client = SyntheticSearchClient(size)
+        buffered_time, buffered_peak = measure_peak(
+            buffered_export, client, page_size)
+        streaming_time, streaming_peak = measure_peak(
+            streaming_export, client, page_size)
+        results.append(dict(
+            records=size,
+            buffered_peak_bytes=buffered_peak,
+            buffered_seconds=buffered_time,
+            streaming_peak_bytes=streaming_peak,
+            streaming_seconds=streaming_time,
+        ))
+    return dict(page_size=page_size, exports=results)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for streaming exports."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import export_records
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.command('export')
+@click.argument('fmt', metavar='FORMAT')
+@click.option('--query', '-q', help='Query string (all records by default).')
+@click.option('--output', '-o', type=click.File('wb'), default='-',
+              help='Output file (standard output by default).')
+@with_appcontext
+def export_cmd(fmt, query, output):
+    """Export records in the given format."""
+    if fmt not in current_app.config['EXPORT_FORMATS']:
+        raise click.BadParameter('Unknown format {0}.'.format(fmt))
+    for chunk in export_records(fmt, query)[1]:
+        output.write(chunk)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming export configuration."""
+
+EXPORT_URL = None
+"""URL of the export view, followed by ``/<format>`` (e.g.
+``'/records/export'``), or ``None`` to disable the view.
+
+The view exports every record of ``EXPORT_INDEX`` without access
+filtering; restrict it with ``EXPORT_PERMISSION_FACTORY``.
+"""
+
+EXPORT_PERMISSION_FACTORY = 'invenio.export.permissions:deny_all'
+"""Function called with the format returning the permission to export
+(see :mod:`invenio.export.permissions`)."""
+
+EXPORT_MAX_CONCURRENT = 2
+"""Maximum number of exports streamed at once by a process; further
+requests are answered with ``429 Too Many Requests``."""
+
+EXPORT_INDEX = 'records'
+"""Index searched for the exported records."""
+
+EXPORT_DOC_TYPE = None
+"""Document type searched for the exported records."""
+
+EXPORT_PAGE_SIZE = 500
+"""Number of records fetched from the search engine at once."""
+
+EXPORT_PAGINATION = 'search_after'
+"""Pagination through the results: ``'search_after'`` or ``'scroll'`` (for
+search engines without ``search_after``)."""
+
+EXPORT_SORT = [{'control_number': 'asc'}]
+"""Sort of ``search_after`` pagination, which must end with a unique
+keyword or numeric field (recent Elasticsearch versions cannot sort on
+``_id``)."""
+
+EXPORT_SCROLL = '5m'
+"""Time the search engine keeps a scroll open between two pages."""
+
+EXPORT_BUFFER_SIZE = 64 * 1024
+"""Bytes of serialized records sent at once."""
+
+EXPORT_FORMATS = {
+    'json': 'invenio.export.serializers:JSONArraySerializer',
+    'jsonl': 'invenio.export.serializers:JSONLinesSerializer',
+    'marcxml': 'invenio.export.serializers:marcxml_serializer',
+}
+"""Export formats and the factories of their serializers."""
+
+EXPORT_MARC21_CONVERTER = 'dojson.contrib.to_marc21:to_marc21.do'
+"""Function converting a record to MARC21 for the MARCXML export (``None``
+if records are already in MARC21)."""
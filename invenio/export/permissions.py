@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Permission factories of the export view.
+
+A factory is called with the requested format and returns an object whose
+``can()`` method tells if the current user may export, like the
+permissions of Invenio-Access.
+"""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+
+
+class StaticPermission(object):
+    """Permission granted or refused to everybody."""
+
+    def __init__(self, allowed):
+        """Initialize the permission."""
+        self.allowed = allowed
+
+    def can(self):
+        """Check the permission."""
+        return self.allowed
+
+
+class AuthenticatedPermission(object):
+    """Permission granted to the logged in users (with Flask-Login)."""
+
+    def can(self):
+        """Check the permission."""
+        try:
+            from flask_login import current_user
+        except ImportError:
+            return False
+        if not hasattr(current_app, 'login_manager'):
+            return False
+        return current_user.is_authenticated
+
+
+def allow_all(fmt):
+    """Allow everybody to export."""
+    return StaticPermission(True)
+
+
+def deny_all(fmt):
+    """Allow nobody to export."""
+    return StaticPermission(False)
+
+
+def authenticated_user(fmt):
+    """Allow the logged in users to export."""
+    return AuthenticatedPermission()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental record serializers."""
+
+from __future__ import absolute_import, print_function
+
+import json
+from xml.sax.saxutils import escape, quoteattr
+
+from ..helpers import obj_or_import_string
+
+
+class StreamSerializer(object):
+    """Serialize records one at a time.
+
+    Subclasses implement :meth:`serialize` and may define a header, a
+    separator between records and a footer.
+    """
+
+    mimetype = 'application/octet-stream'
+    header = u''
+    separator = u''
+    footer = u''
+
+    def serialize(self, record):
+        """Serialize one record to text."""
+        raise NotImplementedError()
+
+    def stream(self, records, buffer_size=64 * 1024):
+        """Serialize records into UTF-8 encoded chunks.
+
+        Only ``buffer_size`` bytes of serialized records (plus the last
+        record) are held in memory at once.
+        """
+        chunks, size = [self.header], len(self.header)
+        for count, record in enumerate(records):
+            if count:
+                chunks.append(self.separator)
+            chunk = self.serialize(record)
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= buffer_size:
+                yield u''.join(chunks).encode('utf-8')
+                chunks, size = [], 0
+        chunks.append(self.footer)
+        yield u''.join(chunks).encode('utf-8')
+
+
+class JSONLinesSerializer(StreamSerializer):
+    """One JSON document per line."""
+
+    mimetype = 'application/x-ndjson'
+
+    def serialize(self, record):
+        """Serialize one record."""
+        return json.dumps(record, sort_keys=True) + u'\n'
+
+
+class JSONArraySerializer(StreamSerializer):
+    """A JSON array of records."""
+
+    mimetype = 'application/json'
+    header = u'['
+    separator = u','
+    footer = u']\n'
+
+    def serialize(self, record):
+        """Serialize one record."""
+        return json.dumps(record, sort_keys=True)
+
+
+def _text(value):
+    """Escape a value as XML text."""
+    return escape(u'{0}'.format(value))
+
+
+def marcxml_record(marc):
+    """Serialize a MARC21 record to MARCXML.
+
+    :param marc: Dictionary mapping ``leader``, control field tags and data
+        field tags followed by their two indicators (``_`` for blank, e.g.
+        ``24510``) to values: text for control fields, dictionaries of
+        subfield codes to text (or lists of text) for data fields. Several
+        occurrences of a field are given as a list.
+    """
+    lines = [u'<record>']
+    if 'leader' in marc:
+        lines.append(u'<leader>{0}</leader>'.format(_text(marc['leader'])))
+    for tag in sorted(marc):
+        if tag == 'leader' or tag.startswith(('_', '$')):
+            continue
+        values = marc[tag]
+        for value in values if isinstance(values, (list, tuple)) else [
+                values]:
+            if not isinstance(value, dict):
+                lines.append(
+                    u'<controlfield tag={0}>{1}</controlfield>'.format(
+                        quoteattr(tag[:3]), _text(value)))
+                continue
+            ind1 = value.get('$ind1', tag[3:4] or '_').replace('_', ' ')
+            ind2 = value.get('$ind2', tag[4:5] or '_').replace('_', ' ')
+            lines.append(u'<datafield tag={0} ind1={1} ind2={2}>'.format(
+                quoteattr(tag[:3]), quoteattr(ind1), quoteattr(ind2)))
+            for code in sorted(value):
+                if code.startswith(('_', '$')):
+                    continue
+                subvalues = value[code]
+                for subvalue in subvalues if isinstance(
+                        subvalues, (list, tuple)) else [subvalues]:
+                    lines.append(u'<subfield code={0}>{1}</subfield>'.format(
+                        quoteattr(code), _text(subvalue)))
+            lines.append(u'</datafield>')
+    lines.append(u'</record>\n')
+    return u''.join(lines)
+
+
+class MARCXMLSerializer(StreamSerializer):
+    """A MARCXML collection of records."""
+
+    mimetype = 'application/marcxml+xml'
+    header = (u'<?xml version="1.0" encoding="UTF-8"?>\n'
+              u'<collection xmlns="http://www.loc.gov/MARC21/slim">\n')
+    footer = u'</collection>\n'
+
+    def __init__(self, converter=None):
+        """Initialize the serializer.
+
+        :param converter: Function converting a record to MARC21 (see
+            :func:`marcxml_record`), or its import path.
+        """
+        self.converter = converter
+
+    def serialize(self, record):
+        """Serialize one record."""
+        if self.converter is not None:
+            self.converter = obj_or_import_string(self.converter)
+            record = self.converter(record)
+        return marcxml_record(record)
+
+
+def marcxml_serializer():
+    """Create the MARCXML serializer of the current application."""
+    from flask import current_app
+    return MARCXMLSerializer(current_app.config['EXPORT_MARC21_CONVERTER'])
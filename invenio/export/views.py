@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming export view."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+
+from flask import abort, current_app, request, stream_with_context
+
+from ..helpers import obj_or_import_string
+from .api import export_records
+
+_running = set()
+"""Exports being streamed by the process."""
+
+_lock = threading.Lock()
+
+
+def release(token):
+    """Free the slot of an export."""
+    with _lock:
+        _running.discard(token)
+
+
+def stream(chunks, token):
+    """Yield the chunks, then free the slot of the export."""
+    try:
+        for chunk in chunks:
+            yield chunk
+    finally:
+        release(token)
+
+
+def export(fmt):
+    """Stream the records matching the ``q`` argument."""
+    if fmt not in current_app.config['EXPORT_FORMATS']:
+        abort(404)
+    permission_factory = obj_or_import_string(
+        current_app.config['EXPORT_PERMISSION_FACTORY'])
+    if not permission_factory(fmt).can():
+        abort(403)
+
+    token = object()
+    with _lock:
+        if len(_running) >= current_app.config['EXPORT_MAX_CONCURRENT']:
+            abort(429)
+        _running.add(token)
+    try:
+        serializer, chunks = export_records(fmt, request.args.get('q'))
+    except Exception:
+        release(token)
+        raise
+    response = current_app.response_class(
+        stream_with_context(stream(chunks, token)),
+        mimetype=serializer.mimetype)
+    response.headers['Content-Disposition'] = \
+        'attachment; filename=records.{0}'.format(fmt)
+    response.call_on_close(lambda: release(token))
+    return response
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Content-hashed, precompressed static files.
+
+After the static files are collected and the bundles built, the
+``static hash`` command copies every static file to a name containing its
+content hash (e.g. ``gen/theme.3f2a9c0d1e4b.css``), writes gzip and, when
+the ``brotli`` module is installed, brotli compressed siblings of text
+files, and records them in a manifest. The ``url()`` references of the
+hashed stylesheets are rewritten to the hashed names of the fonts, images
+and stylesheets they load:
+
+.. code-block:: console
+
+   $ python manage.py build-assets
+   $ python manage.py static hash --prune
+
+``url_for('static', filename='gen/theme.css')`` then resolves to the hashed
+copy, which is served with far-future ``Cache-Control`` headers and in the
+precompressed variant accepted by the client. Front-end servers can serve
+the siblings directly (e.g. nginx's ``gzip_static``).
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import Manifest, build_manifest, compress_file
+from .ext import InvenioHashedAssets
+
+__all__ = ('InvenioHashedAssets', 'Manifest', 'build_manifest',
+           'compress_file', )
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Content-hashed and precompressed static files."""
+
+from __future__ import absolute_import, print_function
+
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_FORMAT = 1
+"""Version of the manifest file format."""
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+"""Content encodings of precompressed files with their suffix, preferred
+first."""
+
+CSS_URL = re.compile(r'''url\(\s*(['"]?)([^'"()\s]+)\1\s*\)''')
+"""Regular expression matching the ``url()`` references of stylesheets."""
+
+
+def file_digest(path, size=12):
+    """Return the first ``size`` hexadecimal digits of a file hash."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:size]
+
+
+def data_digest(data, size=12):
+    """Return the first ``size`` hexadecimal digits of a content hash."""
+    return hashlib.sha1(data).hexdigest()[:size]
+
+
+def hashed_name(name, digest):
+    """Insert a digest before the extension of a filename.
+
+    >>> hashed_name('gen/theme.css', 'abc')
+    'gen/theme.abc.css'
+    """
+    root, ext = os.path.splitext(name)
+    return '{0}.{1}{2}'.format(root, digest, ext)
+
+
+def css_reference(url, name, static_url_path=None):
+    """Resolve a ``url()`` of a stylesheet to a static filename.
+
+    :param url: Referenced URL.
+    :param name: Filename of the stylesheet in the static folder.
+    :param static_url_path: URL prefix of the static folder, used to
+        resolve absolute URLs.
+    :returns: The filename in the static folder or ``None`` for URLs
+        outside of it (e.g. external or ``data:`` URLs).
+    """
+    path = re.split(r'[?#]', url, 1)[0]
+    if not path or ':' in path or path.startswith('//'):
+        return None
+    if path.startswith('/'):
+        prefix = (static_url_path or '').rstrip('/') + '/'
+        if not static_url_path or not path.startswith(prefix):
+            return None
+        path = path[len(prefix):]
+    else:
+        path = posixpath.join(posixpath.dirname(name), path)
+    return posixpath.normpath(path)
+
+
+def rewrite_css(css, name, assets, static_url_path=None):
+    """Point the ``url()`` references of a stylesheet to hashed files.
+
+    Only the filename of a reference is replaced, so relative references
+    stay relative and query strings or fragments are kept.
+
+    >>> rewrite_css('a { background: url("../img/a.png#x") }',
+    ...             'gen/theme.css', {'img/a.png': 'img/a.0f.png'})
+    'a { background: url("../img/a.0f.png#x") }'
+
+    :param css: Content of the stylesheet.
+    :param name: Filename of the stylesheet in the static folder.
+    :param assets: Dictionary mapping filenames to hashed filenames.
+    :param static_url_path: URL prefix of the static folder.
+    :returns: The rewritten content.
+    """
+    def replace(match):
+        quote, url = match.groups()
+        target = css_reference(url, name, static_url_path)
+        if target not in assets:
+            return match.group(0)
+        end = len(re.split(r'[?#]', url, 1)[0])
+        path = posixpath.join(posixpath.dirname(url[:end]),
+                              posixpath.basename(assets[target]))
+        return 'url({0}{1}{2}{0})'.format(quote, path, url[end:])
+    return CSS_URL.sub(replace, css)
+
+
+def _atomic_write(path, write, mode=0o644):
+    """Call ``write`` with a temporary file renamed to ``path`` after."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.chmod(tmp, mode)
+        os.rename(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+def _copy(source, target):
+    """Copy a file atomically with its permissions and times."""
+    def write(f):
+        with open(source, 'rb') as src:
+            shutil.copyfileobj(src, f)
+    _atomic_write(target, write)
+    shutil.copystat(source, target)
+
+
+def compress_file(path, encodings=None, level=9):
+    """Write precompressed siblings of a file.
+
+    Siblings not smaller than the file are not kept.
+
+    :param path: File to compress.
+    :param encodings: Content encodings to produce (defaults to gzip, and
+        brotli when the ``brotli`` module is installed).
+    :returns: List of the content encodings written.
+    """
+    if encodings is None:
+        encodings = ['gzip'] + (['br'] if brotli else [])
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    written = []
+    for encoding, suffix in ENCODINGS:
+        if encoding not in encodings:
+            continue
+        if encoding == 'gzip':
+            def write(f):
+                with gzip.GzipFile(filename='', mode='wb', fileobj=f,
+                                   compresslevel=level, mtime=0) as out:
+                    out.write(data)
+        else:
+            compressed = brotli.compress(data)
+
+            def write(f):
+                f.write(compressed)
+        _atomic_write(path + suffix, write)
+        if os.path.getsize(path + suffix) < len(data):
+            written.append(encoding)
+        else:
+            os.remove(path + suffix)
+    return written
+
+
+class Manifest(object):
+    """Mapping of static filenames to their content-hashed copies."""
+
+    def __init__(self, assets=None, encodings=None):
+        """Initialize the manifest.
+
+        :param assets: Dictionary mapping filenames to hashed filenames.
+        :param encodings: Dictionary mapping hashed filenames to the list
+            of content encodings available precompressed.
+        """
+        self.assets = assets or {}
+        self.encodings = encodings or {}
+        self.hashed = set(self.assets.values())
+
+    def resolve(self, filename):
+        """Return the hashed filename, or ``filename`` if not hashed."""
+        return self.assets.get(filename, filename)
+
+    def to_dict(self):
+        """Serialize the manifest."""
+        return dict(version=MANIFEST_FORMAT, assets=self.assets,
+                    encodings=self.encodings)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize a manifest."""
+        if data.get('version') != MANIFEST_FORMAT:
+            raise ValueError('Unsupported manifest format.')
+        return cls(assets=data['assets'], encodings=data['encodings'])
+
+    def save(self, path):
+        """Write the manifest atomically."""
+        data = json.dumps(self.to_dict(), indent=2, sort_keys=True)
+        _atomic_write(path, lambda f: f.write(data.encode('utf-8')))
+
+    @classmethod
+    def load(cls, path):
+        """Read a manifest, returning an empty one if it does not exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _derived(name, names, digest_size):
+    """Check if a file is a hashed copy or a compressed sibling."""
+    for dummy, suffix in ENCODINGS:
+        if name.endswith(suffix) and name[:-len(suffix)] in names:
+            return True
+    root, ext = os.path.splitext(name)
+    match = re.search(r'\.[0-9a-f]{%d}$' % digest_size, root)
+    return bool(match) and root[:match.start()] + ext in names
+
+
+def build_manifest(static_folder, manifest_path, digest_size=12,
+                   compress_extensions=(), compress_min_size=0,
+                   prune=False, static_url_path=None):
+    """Write hashed and precompressed copies of all static files.
+
+    Original files are left in place so unhashed URLs keep working. Hashed
+    copies which already exist are not rewritten. In the hashed copies of
+    stylesheets, the ``url()`` references to other static files point to
+    their hashed copies, so the hash of a stylesheet changes with the files
+    it references.
+
+    :param static_folder: Folder of collected static files.
+    :param manifest_path: Path of the manifest to write.
+    :param digest_size: Number of hexadecimal digits of the hash.
+    :param compress_extensions: Extensions of files to precompress.
+    :param compress_min_size: Minimum size of precompressed files.
+    :param prune: Remove hashed files of the previous manifest which are
+        no longer referenced.
+    :param static_url_path: URL prefix of the static folder, used to
+        resolve the absolute URLs referenced by stylesheets.
+    :returns: The new :class:`Manifest`.
+    """
+    previous = Manifest.load(manifest_path)
+    names = set()
+    for root, dirs, files in os.walk(static_folder):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if path != manifest_path and not filename.endswith('.tmp'):
+                names.add(os.path.relpath(path, static_folder).replace(
+                    os.sep, '/'))
+
+    manifest = Manifest()
+    sources = sorted(name for name in names if not (
+        name in previous.hashed or _derived(name, names, digest_size)))
+    stylesheets = set(
+        name for name in sources if name.lower().endswith('.css'))
+
+    def add(name, data=None):
+        source = os.path.join(static_folder, *name.split('/'))
+        if data is None:
+            digest = file_digest(source, digest_size)
+        else:
+            digest = data_digest(data, digest_size)
+        target_name = hashed_name(name, digest)
+        target = os.path.join(static_folder, *target_name.split('/'))
+        manifest.assets[name] = target_name
+
+        if target_name in previous.hashed and os.path.exists(target):
+            encodings = previous.encodings.get(target_name, [])
+        else:
+            if data is None:
+                _copy(source, target)
+            else:
+                _atomic_write(target, lambda f: f.write(data))
+                shutil.copystat(source, target)
+            encodings = []
+            ext = os.path.splitext(name)[1].lower()
+            if ext in compress_extensions and \
+                    os.path.getsize(target) >= compress_min_size:
+                encodings = compress_file(target)
+        if encodings:
+            manifest.encodings[target_name] = encodings
+
+    def add_stylesheet(name, parents=()):
+        if name in manifest.assets or name in parents:
+            return
+        with open(os.path.join(static_folder, *name.split('/')), 'rb') as f:
+            # Latin-1 maps every byte, so the content is kept unchanged.
+            css = f.read().decode('latin-1')
+        for match in CSS_URL.finditer(css):
+            reference = css_reference(match.group(2), name, static_url_path)
+            if reference in stylesheets:
+                add_stylesheet(reference, parents + (name, ))
+        add(name, rewrite_css(
+            css, name, manifest.assets, static_url_path).encode('latin-1'))
+
+    for name in sources:
+        if name not in stylesheets:
+            add(name)
+    for name in sorted(stylesheets):
+        add_stylesheet(name)
+    manifest.hashed = set(manifest.assets.values())
+
+    if prune:
+        for name in previous.hashed - manifest.hashed:
+            path = os.path.join(static_folder, *name.split('/'))
+            for suffix in ('', ) + tuple(s for dummy, s in ENCODINGS):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+    manifest.save(manifest_path)
+    return manifest
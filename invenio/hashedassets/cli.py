@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for hashed static assets."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import build_manifest
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.group()
+def static():
+    """Manage the static files."""
+
+
+@static.command('hash')
+@click.option('--prune', is_flag=True,
+              help='Remove hashed files of the previous build.')
+@with_appcontext
+def hash_cmd(prune):
+    """Write hashed and precompressed copies of the static files."""
+    config = current_app.config
+    manifest = build_manifest(
+        current_app.static_folder,
+        current_app.extensions['invenio-hashedassets'].manifest_path,
+        digest_size=config['HASHEDASSETS_DIGEST_SIZE'],
+        compress_extensions=config['HASHEDASSETS_COMPRESS_EXTENSIONS'],
+        compress_min_size=config['HASHEDASSETS_COMPRESS_MIN_SIZE'],
+        prune=prune,
+        static_url_path=current_app.static_url_path,
+    )
+    click.secho('Hashed {0} files ({1} precompressed).'.format(
+        len(manifest.assets), len(manifest.encodings)), fg='green')
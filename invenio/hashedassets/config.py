@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Hashed static assets configuration."""
+
+HASHEDASSETS_ENABLED = True
+"""Resolve static URLs through the manifest and serve precompressed files."""
+
+HASHEDASSETS_MANIFEST = 'manifest.json'
+"""Manifest location, relative to the static folder."""
+
+HASHEDASSETS_DIGEST_SIZE = 12
+"""Number of hexadecimal digits of the content hash in filenames."""
+
+HASHEDASSETS_COMPRESS_EXTENSIONS = [
+    '.css', '.eot', '.html', '.js', '.json', '.map', '.svg', '.ttf', '.txt',
+    '.xml',
+]
+"""Extensions of the files stored precompressed."""
+
+HASHEDASSETS_COMPRESS_MIN_SIZE = 256
+"""Files smaller than this number of bytes are not compressed."""
+
+HASHEDASSETS_MAX_AGE = 365 * 24 * 3600
+"""Cache lifetime, in seconds, of hashed files."""
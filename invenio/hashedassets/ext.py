@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Hashed static assets extension."""
+
+from __future__ import absolute_import, print_function
+
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory
+
+from . import config
+from .api import ENCODINGS, Manifest
+from .cli import static
+
+
+def send_static_file(filename):
+    """Serve a static file, precompressed when the client accepts it."""
+    return current_app.extensions['invenio-hashedassets'].send_static_file(
+        filename)
+
+
+class InvenioHashedAssets(object):
+    """Hashed static assets extension.
+
+    Static URLs built with ``url_for('static', filename=...)``, including
+    those of Flask-Assets bundles, point to the content-hashed copies listed
+    in the manifest, which are served with far-future caching headers.
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.manifest = Manifest()
+        self.manifest_path = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        if app.static_folder:
+            self.manifest_path = os.path.join(
+                app.static_folder, app.config['HASHEDASSETS_MANIFEST'])
+            if app.config['HASHEDASSETS_ENABLED']:
+                self.manifest = Manifest.load(self.manifest_path)
+                app.url_defaults(self.url_defaults)
+                if 'static' in app.view_functions:
+                    app.view_functions['static'] = send_static_file
+        app.cli.add_command(static)
+        app.extensions['invenio-hashedassets'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('HASHEDASSETS_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def url_defaults(self, endpoint, values):
+        """Replace static filenames by their hashed copy."""
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = self.manifest.resolve(values['filename'])
+
+    def negotiate(self, filename):
+        """Return the best precompressed content encoding and its suffix."""
+        available = self.manifest.encodings.get(filename, ())
+        for encoding, suffix in ENCODINGS:
+            if encoding in available and request.accept_encodings[encoding]:
+                return encoding, suffix
+        return None, None
+
+    def send_static_file(self, filename):
+        """Serve a static file."""
+        app = current_app
+        encoding, suffix = self.negotiate(filename)
+        if encoding:
+            response = send_from_directory(
+                app.static_folder, filename + suffix,
+                mimetype=mimetypes.guess_type(filename)[0] or
+                'application/octet-stream')
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = app.send_static_file(filename)
+        if filename in self.manifest.encodings:
+            response.vary.add('Accept-Encoding')
+        if filename in self.manifest.hashed:
+            response.headers['Cache-Control'] = \
+                'public, max-age={0}, immutable'.format(
+                    app.config['HASHEDASSETS_MAX_AGE'])
+        return response
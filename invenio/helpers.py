@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Small helpers shared by the Invenio meta-package modules."""
+
+from __future__ import absolute_import, print_function
+
+import importlib
+import os
+import sys
+
+try:
+    string_types = (basestring, )  # noqa
+except NameError:
+    string_types = (str, )
+
+
+def import_string(import_name):
+    """Import an object based on a string.
+
+    Both ``package.module:attribute`` and ``package.module.attribute``
+    notations are supported.
+
+    :param import_name: Dotted name of the object to import.
+    :returns: The imported object.
+    """
+    if ':' in import_name:
+        module_name, obj_name = import_name.split(':', 1)
+    elif '.' in import_name:
+        module_name, obj_name = import_name.rsplit('.', 1)
+    else:
+        return importlib.import_module(import_name)
+    module = importlib.import_module(module_name)
+    obj = module
+    for attr in obj_name.split('.'):
+        try:
+            obj = getattr(obj, attr)
+        except AttributeError:
+            raise ImportError(
+                'Cannot import {0!r} from {1!r}.'.format(attr, module_name))
+    return obj
+
+
+def obj_or_import_string(value, default=None):
+    """Import string or return object.
+
+    :param value: Import path or object.
+    :param default: Default value if ``value`` is empty.
+    :returns: The imported object, ``value`` itself or ``default``.
+    """
+    if isinstance(value, string_types):
+        return import_string(value)
+    elif value:
+        return value
+    return default
+
+
+def include_current_directory():
+    """Add the current directory to the import paths.
+
+    Like the ``flask`` command does, so that the package of an instance
+    which is not installed can be imported from its folder.
+    """
+    cwd = os.getcwd()
+    if cwd not in sys.path:
+        sys.path.insert(0, cwd)
+
+
+def load_app(import_path, **kwargs):
+    """Load a Flask application from an import path.
+
+    The package of the application is also looked up in the current
+    directory (see :func:`include_current_directory`).
+
+    :param import_path: Import path of an application or of an application
+        factory (e.g. ``myinstance.factory:create_app``).
+    :param kwargs: Keyword arguments passed to the application factory.
+    :returns: The Flask application.
+    """
+    include_current_directory()
+    obj = import_string(import_path)
+    if hasattr(obj, 'wsgi_app'):
+        return obj
+    return obj(**kwargs)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""HTTP-aware response cache for the record endpoints.
+
+Rendered responses of the record UI and REST endpoints are cached for
+anonymous requests. Responses carry an ``ETag`` derived from the record
+revision and a ``Last-Modified`` date, so that clients revalidating a
+cached page get a ``304 Not Modified``. Cached responses of a record are
+invalidated as soon as the record is updated or deleted.
+
+The cache is disabled by default. It is kept in the Redis configured by
+``CACHE_REDIS_HOST``, shared by all processes so that a record changed by
+any web or Celery worker is invalidated everywhere:
+
+.. code-block:: python
+
+    HTTPCACHE_ENABLED = True
+    HTTPCACHE_BACKEND = 'redis'
+
+The size bounded in-process ``'lru'`` backend is only suited to a single
+process (e.g. the development server), since the other processes would
+keep serving the responses of changed records.
+
+Hits and misses are counted in ``InvenioHTTPCache.cache.stats`` and
+reported in the ``X-Cache`` response header.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import ResponseCache
+from .ext import InvenioHTTPCache
+
+__all__ = ('InvenioHTTPCache', 'ResponseCache', )
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Response cache for record endpoints."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+
+from ..cache import CacheStats
+
+
+def digest(*parts):
+    """Hash strings into a short hexadecimal digest."""
+    md5 = hashlib.md5()
+    for part in parts:
+        md5.update(u'{0}\0'.format(part).encode('utf-8'))
+    return md5.hexdigest()
+
+
+class ResponseCache(object):
+    """Cache of rendered record responses.
+
+    Entries are keyed on the record identifier, an invalidation generation
+    of the record and the variant of the request (path, query string,
+    negotiated format and language). Invalidating a record increments its
+    generation, which makes all its cached variants unreachable in every
+    process sharing the backend; they are then evicted or expire.
+    """
+
+    VARIANT_HEADERS = ('Accept', 'Accept-Language')
+    """Request headers selecting the representation of a response."""
+
+    EXCLUDED_HEADERS = ('Set-Cookie', 'Content-Length', 'Date')
+    """Response headers which are never cached."""
+
+    def __init__(self, backend, endpoints, revision_loader, timeout=None):
+        """Initialize the cache.
+
+        :param backend: Cache backend (see :mod:`invenio.cache`).
+        :param endpoints: Dictionary of cached endpoint to the type of the
+            persistent identifier in the ``pid_value`` URL argument.
+        :param revision_loader: Function returning the revision and the
+            modification date of a record.
+        :param timeout: Seconds a response is kept.
+        """
+        self.backend = backend
+        self.endpoints = endpoints
+        self.revision_loader = revision_loader
+        self.timeout = timeout
+        self.stats = CacheStats()
+
+    @staticmethod
+    def generation_key(pid_type, pid_value):
+        """Key of the invalidation counter of a record."""
+        return 'gen:{0}:{1}'.format(pid_type, pid_value)
+
+    def is_cacheable(self, request, session):
+        """Check if a request can be answered from the cache."""
+        return (
+            request.method in ('GET', 'HEAD') and
+            request.endpoint in self.endpoints and
+            'pid_value' in (request.view_args or {}) and
+            'Authorization' not in request.headers and
+            not (session.get('user_id') or session.get('_user_id'))
+        )
+
+    def make_key(self, request):
+        """Build the cache key of a request."""
+        pid_type = self.endpoints[request.endpoint]
+        pid_value = request.view_args['pid_value']
+        generation = self.backend.get_counter(
+            self.generation_key(pid_type, pid_value))
+        variant = digest(request.full_path, *(
+            request.headers.get(h, '') for h in self.VARIANT_HEADERS))
+        return 'response:{0}:{1}:{2}:{3}:{4}'.format(
+            request.endpoint, pid_type, pid_value, generation, variant)
+
+    def get(self, key):
+        """Get a cached response entry and count the hit or miss."""
+        entry = self.backend.get(key)
+        if entry is None:
+            self.stats.miss()
+        else:
+            self.stats.hit()
+        return entry
+
+    def store(self, key, request, response):
+        """Set the validators of a response and cache it.
+
+        :returns: ``True`` if the response was cached.
+        """
+        if response.status_code != 200 or response.is_streamed or \
+                'Set-Cookie' in response.headers:
+            return False
+
+        pid_type = self.endpoints[request.endpoint]
+        pid_value = request.view_args['pid_value']
+        revision, updated = self.revision_loader(pid_type, pid_value)
+        response.set_etag(digest(pid_type, pid_value, revision, key))
+        if updated is not None:
+            response.last_modified = updated
+
+        self.backend.set(key, dict(
+            status=response.status_code,
+            headers=[(k, v) for k, v in response.headers.items()
+                     if k not in self.EXCLUDED_HEADERS],
+            body=response.get_data(),
+        ), timeout=self.timeout)
+        return True
+
+    def invalidate(self, pid_type, pid_value):
+        """Invalidate all cached responses of a record."""
+        self.backend.incr(self.generation_key(pid_type, pid_value))
+        self.stats.invalidate()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record response cache configuration."""
+
+HTTPCACHE_ENABLED = False
+"""Enable the response cache.
+
+Records are invalidated in the process which changed them, so the cache
+must be shared by all web and Celery worker processes (see
+``HTTPCACHE_BACKEND``).
+"""
+
+HTTPCACHE_BACKEND = 'redis'
+"""Cache backend: ``'redis'`` (shared, using ``CACHE_REDIS_HOST``,
+requires ``invenio[redis]``), ``'lru'`` (per process, only for a single
+process, e.g. in development) or an import path to a backend factory."""
+
+HTTPCACHE_LRU_MAX_SIZE = 64 * 1024 * 1024
+"""Maximum size in bytes of the responses kept by the ``lru`` backend."""
+
+HTTPCACHE_DEFAULT_TIMEOUT = 3600
+"""Seconds a response is kept in the cache."""
+
+HTTPCACHE_ENDPOINTS = {
+    'invenio_records_ui.recid': 'recid',
+    'invenio_records_rest.recid_item': 'recid',
+}
+"""Cached endpoints and the type of the persistent identifier in their
+``pid_value`` URL argument."""
+
+HTTPCACHE_REVISION_LOADER = 'invenio.httpcache.utils:record_revision'
+"""Function returning the ``(revision, last modification date)`` of the
+record identified by ``(pid_type, pid_value)``."""
+
+HTTPCACHE_PIDS_LOADER = 'invenio.httpcache.utils:record_pids'
+"""Function returning the ``(pid_type, pid_value)`` identifying a record,
+used to invalidate the cache when the record changes."""
+
+HTTPCACHE_HEADER = 'X-Cache'
+"""Response header set to ``HIT`` or ``MISS`` (``None`` to disable)."""
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record response cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app, g, request, session
+
+from ..cache import create_backend
+from ..cache.invalidation import defer, register
+from ..helpers import obj_or_import_string
+from . import config
+from .api import ResponseCache
+
+
+class InvenioHTTPCache(object):
+    """Record response cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.cache = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-httpcache'] = self
+        if not app.config['HTTPCACHE_ENABLED']:
+            return
+
+        self.header = app.config['HTTPCACHE_HEADER']
+        self.pids_loader = obj_or_import_string(
+            app.config['HTTPCACHE_PIDS_LOADER'])
+        if app.config['HTTPCACHE_BACKEND'] == 'lru' and not (
+                app.debug or app.testing):
+            app.logger.warning(
+                'The response cache is not shared by the processes: records '
+                'changed by other processes are served stale.')
+        self.cache = ResponseCache(
+            create_backend(
+                app.config['HTTPCACHE_BACKEND'], 'httpcache',
+                config=app.config,
+                max_size=app.config['HTTPCACHE_LRU_MAX_SIZE'],
+            ),
+            app.config['HTTPCACHE_ENDPOINTS'],
+            obj_or_import_string(app.config['HTTPCACHE_REVISION_LOADER']),
+            timeout=app.config['HTTPCACHE_DEFAULT_TIMEOUT'],
+        )
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        self.connect_signals()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('HTTPCACHE_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def connect_signals(self):
+        """Invalidate the cache when records change."""
+        try:
+            from invenio_records.signals import after_record_delete, \
+                after_record_update
+        except ImportError:
+            return
+        register('httpcache', self.cache)
+        after_record_update.connect(self.record_changed, weak=False)
+        after_record_delete.connect(self.record_changed, weak=False)
+
+    def record_changed(self, sender, record=None, **kwargs):
+        """Invalidate the responses of a changed record.
+
+        The responses are invalidated right away, and again once the
+        transaction of the record ends, so that responses cached by
+        concurrent requests before the commit are dropped too.
+        """
+        record = record if record is not None else sender
+        keys = [tuple(key) for key in self.pids_loader(record)]
+        for key in keys:
+            self.cache.invalidate(*key)
+        model = getattr(record, 'model', None)
+        if model is not None:
+            from sqlalchemy.orm import object_session
+
+            session = object_session(model)
+            if session is not None:
+                defer('httpcache', keys, session)
+
+    def before_request(self):
+        """Answer from the cache when possible."""
+        if not self.cache.is_cacheable(request, session):
+            return
+        key = self.cache.make_key(request)
+        entry = self.cache.get(key)
+        if entry is None:
+            g.httpcache_key = key
+            return
+
+        response = current_app.response_class(
+            entry['body'], status=entry['status'], headers=entry['headers'])
+        if self.header:
+            response.headers[self.header] = 'HIT'
+        return response.make_conditional(request)
+
+    def after_request(self, response):
+        """Store cacheable responses."""
+        key = getattr(g, 'httpcache_key', None)
+        if key is None:
+            return response
+        del g.httpcache_key
+        if self.cache.store(key, request, response):
+            response = response.make_conditional(request)
+        if self.header:
+            response.headers[self.header] = 'MISS'
+        return response
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record revision and persistent identifier loaders."""
+
+from __future__ import absolute_import, print_function
+
+
+def record_revision(pid_type, pid_value):
+    """Get the revision and modification date of a record.
+
+    :param pid_type: Persistent identifier type.
+    :param pid_value: Persistent identifier value.
+    :returns: Tuple ``(revision, updated)``.
+    """
+    from invenio_pidstore.models import PersistentIdentifier
+    from invenio_records.api import Record
+
+    pid = PersistentIdentifier.get(pid_type, pid_value)
+    record = Record.get_record(pid.object_uuid)
+    revision = getattr(record, 'revision_id', None)
+    if revision is None:
+        revision = record.model.version_id
+    return revision, record.model.updated
+
+
+def record_pids(record):
+    """Get the persistent identifiers pointing to a record.
+
+    :param record: Record instance.
+    :returns: List of ``(pid_type, pid_value)`` tuples.
+    """
+    from invenio_pidstore.models import PersistentIdentifier
+
+    return [
+        (pid.pid_type, pid.pid_value)
+        for pid in PersistentIdentifier.query.filter_by(
+            object_type='rec', object_uuid=record.id)
+    ]
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk record ingestion API."""
+
+from __future__ import absolute_import, print_function
+
+import itertools
+import timeit
+
+
+def chunked(iterable, size):
+    """Split an iterable into lists of at most ``size`` items.
+
+    The iterable is consumed lazily, one chunk at a time.
+
+    :param iterable: Any iterable, e.g. a generator of records.
+    :param size: Maximum number of items per chunk.
+    :returns: Generator of lists.
+    """
+    if size < 1:
+        raise ValueError('Chunk size must be positive.')
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class IngestStats(object):
+    """Throughput of an ingestion."""
+
+    def __init__(self):
+        """Initialize the statistics."""
+        self.records = 0
+        self.batches = 0
+        self.started = timeit.default_timer()
+
+    @property
+    def elapsed(self):
+        """Seconds since the ingestion started."""
+        return timeit.default_timer() - self.started
+
+    @property
+    def rate(self):
+        """Records ingested per second."""
+        elapsed = self.elapsed
+        return self.records / elapsed if elapsed else 0.0
+
+    def to_dict(self):
+        """Serialize the statistics."""
+        return dict(records=self.records, batches=self.batches,
+                    seconds=self.elapsed, records_per_second=self.rate)
+
+    def __str__(self):
+        """Format the statistics."""
+        return '{0} records in {1} batches, {2:.1f}s ({3:.1f} rec/s)'.format(
+            self.records, self.batches, self.elapsed, self.rate)
+
+
+class RecordWriter(object):
+    """Create records and their persistent identifiers in one transaction.
+
+    The writer is called with a batch of record dictionaries; all records
+    and identifiers of the batch are committed at once, or none if any of
+    them fails.
+    """
+
+    def __init__(self, pid_type='recid', pid_field='recid'):
+        """Initialize the writer.
+
+        :param pid_type: Type of the persistent identifiers to register.
+        :param pid_field: Record field holding the identifier value.
+        """
+        self.pid_type = pid_type
+        self.pid_field = pid_field
+
+    def create(self, data):
+        """Create a record and register its persistent identifier."""
+        from invenio_pidstore.models import PersistentIdentifier
+        from invenio_records.api import Record
+
+        record = Record.create(data)
+        if self.pid_field and self.pid_field in data:
+            pid = PersistentIdentifier.create(
+                self.pid_type, str(data[self.pid_field]), self.pid_type)
+            pid.assign('rec', record.id)
+            pid.register()
+        return record
+
+    def __call__(self, batch):
+        """Write a batch of records in a single transaction."""
+        from invenio_db import db
+
+        try:
+            with db.session.begin_nested():
+                for data in batch:
+                    self.create(data)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+def bulk_ingest(records, writer=None, chunk_size=1000, callback=None):
+    """Ingest a stream of records in batches.
+
+    :param records: Iterable of record dictionaries, e.g. one of the
+        readers from :mod:`invenio.ingest.readers`.
+    :param writer: Callable writing a batch of records. Defaults to a
+        :class:`RecordWriter`.
+    :param chunk_size: Number of records per batch.
+    :param callback: Called with the :class:`IngestStats` after each batch.
+    :returns: The final :class:`IngestStats`.
+    """
+    writer = writer or RecordWriter()
+    stats = IngestStats()
+    for batch in chunked(records, chunk_size):
+        writer(batch)
+        stats.records += len(batch)
+        stats.batches += 1
+        if callback:
+            callback(stats)
+    return stats
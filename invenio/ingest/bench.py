@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark of bulk ingestion versus one record per transaction."""
+
+from __future__ import absolute_import, print_function
+
+from ..bench.api import summarize
+from ..bench.probe import create_app
+from .api import RecordWriter, bulk_ingest
+
+PROJECTS = ('invenio-db', 'invenio-pidstore', 'invenio-records', )
+"""Projects needed by the benchmark."""
+
+
+def generate_records(start, count):
+    """Generate synthetic records with consecutive identifiers."""
+    for recid in range(start, start + count):
+        yield {'title': 'Record {0}'.format(recid), 'recid': recid}
+
+
+def run(repeat=3, ingest_records=2000, chunk_size=500, **kwargs):
+    """Measure records per second with and without batching.
+
+    The one record per transaction path corresponds to ``records create``
+    followed by the registration of the persistent identifier.
+
+    :param repeat: Number of measurements per path.
+    :param ingest_records: Number of records ingested per measurement.
+    :param chunk_size: Records per transaction of the bulk path.
+    """
+    try:
+        app = create_app(set(PROJECTS))
+    except ImportError as e:
+        return dict(skipped=True, missing=[str(e)])
+
+    writer = RecordWriter()
+    rates = dict(single=[], bulk=[])
+    offset = 1
+    with app.app_context():
+        for dummy in range(repeat):
+            for path, size in (('single', 1), ('bulk', chunk_size)):
+                stats = bulk_ingest(
+                    generate_records(offset, ingest_records),
+                    writer=writer, chunk_size=size)
+                rates[path].append(stats.rate)
+                offset += ingest_records
+
+    single = summarize(rates['single'])
+    bulk = summarize(rates['bulk'])
+    return dict(
+        records=ingest_records,
+        chunk_size=chunk_size,
+        single_records_per_second=single,
+        bulk_records_per_second=bulk,
+        speedup=bulk['median'] / single['median'],
+    )
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for bulk record ingestion."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import RecordWriter, bulk_ingest
+from .readers import READERS
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.command()
+@click.argument('source', type=click.File('rb'), default='-')
+@click.option('--format', '-f', 'input_format', default='jsonl',
+              type=click.Choice(sorted(READERS)), show_default=True,
+              help='Format of the input.')
+@click.option('--chunk-size', '-n', type=int,
+              help='Records per transaction (INGEST_CHUNK_SIZE).')
+@click.option('--pid-type', help='Persistent identifier type.')
+@click.option('--pid-field', help='Record field holding the identifier.')
+@with_appcontext
+def ingest(source, input_format, chunk_size, pid_type, pid_field):
+    """Create records in bulk from SOURCE (a file or "-" for stdin)."""
+    config = current_app.config
+    writer = RecordWriter(
+        pid_type=pid_type or config['INGEST_PID_TYPE'],
+        pid_field=pid_field or config['INGEST_PID_FIELD'],
+    )
+    records = READERS[input_format](source)
+
+    def progress(stats):
+        click.echo(str(stats), err=True)
+
+    stats = bulk_ingest(
+        records,
+        writer=writer,
+        chunk_size=chunk_size or config['INGEST_CHUNK_SIZE'],
+        callback=progress,
+    )
+    click.secho('Ingested {0}'.format(stats), fg='green')
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming readers of record files."""
+
+from __future__ import absolute_import, print_function
+
+import json
+from xml.etree import ElementTree
+
+MARC21_NAMESPACE = 'http://www.loc.gov/MARC21/slim'
+
+
+def read_jsonlines(fp):
+    """Read one JSON record per line.
+
+    :param fp: File-like object opened in text or binary mode.
+    :returns: Generator of record dictionaries.
+    """
+    for lineno, line in enumerate(fp, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError('Invalid JSON on line {0}: {1}'.format(
+                lineno, e))
+
+
+def iter_marcxml(fp):
+    """Iterate over the ``<record>`` elements of a MARCXML file.
+
+    Consumed records are detached from the root element (e.g. the
+    ``<collection>``) once processed, so the memory usage does not depend on
+    the size of the file.
+
+    :param fp: File-like object.
+    :returns: Generator of :class:`xml.etree.ElementTree.Element`.
+    """
+    tags = ('record', '{{{0}}}record'.format(MARC21_NAMESPACE))
+    root = None
+    for event, element in ElementTree.iterparse(fp, events=('start', 'end')):
+        if root is None:
+            root = element
+        if event == 'end' and element.tag in tags:
+            yield element
+            element.clear()
+            root.clear()
+
+
+def read_marcxml(fp):
+    """Read MARCXML records converted to JSON with DoJSON.
+
+    :param fp: File-like object.
+    :returns: Generator of record dictionaries.
+    """
+    try:
+        from dojson.contrib.marc21 import marc21
+        from dojson.contrib.marc21.utils import create_record
+    except ImportError:
+        raise RuntimeError('Reading MARCXML requires "dojson".')
+
+    for element in iter_marcxml(fp):
+        yield marc21.do(create_record(ElementTree.tostring(element)))
+
+
+READERS = {
+    'jsonl': read_jsonlines,
+    'marcxml': read_marcxml,
+}
+"""Available readers by input format."""
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Opt-in instrumentation of the requests.
+
+When enabled, the time spent by each request in SQL queries, template
+renderings, search requests and Celery task dispatches is recorded and
+aggregated in histograms per endpoint, exposed in the Prometheus text
+format:
+
+.. code-block:: python
+
+    INSTRUMENTATION_ENABLED = True
+
+.. code-block:: console
+
+    $ curl http://localhost:5000/metrics
+
+The metrics can only be read from the addresses listed in
+``INSTRUMENTATION_METRICS_ALLOWED_IPS`` (the local host by default) or with
+the bearer token set in ``INSTRUMENTATION_METRICS_TOKEN``.
+
+Metrics are aggregated per process, not per instance; with several worker
+processes each scrape only reports the worker which served it. When the
+instrumentation is disabled no hook is installed at all.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .ext import InvenioInstrumentation
+from .metrics import Histogram, MetricsRegistry
+from .trace import RequestTrace, current_trace
+
+__all__ = ('Histogram', 'InvenioInstrumentation', 'MetricsRegistry',
+           'RequestTrace', 'current_trace', )
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Request instrumentation configuration."""
+
+from .metrics import DEFAULT_BUCKETS
+
+INSTRUMENTATION_ENABLED = False
+"""Enable the instrumentation (no hook is installed when disabled)."""
+
+INSTRUMENTATION_SPANS = ('db', 'template', 'search', 'celery', )
+"""Span kinds to record: SQL queries, template renderings, search requests
+and Celery task dispatches."""
+
+INSTRUMENTATION_BUCKETS = DEFAULT_BUCKETS
+"""Upper bounds in seconds of the histogram buckets."""
+
+INSTRUMENTATION_METRICS_URL = '/metrics'
+"""URL of the metrics in the Prometheus text format.
+
+The metrics are kept in the memory of each process: with several worker
+processes (e.g. a pre-forking server) every scrape only reports the
+requests served by the worker which answered it. Run one process per
+scraped address, or scrape each worker separately, to get complete
+figures.
+"""
+
+INSTRUMENTATION_METRICS_ALLOWED_IPS = ('127.0.0.1', '::1', )
+"""Client addresses allowed to read the metrics.
+
+The address is the one of the connecting client, so behind a reverse proxy
+the proxy must either block the metrics URL or the application must be
+wrapped with :class:`werkzeug.middleware.proxy_fix.ProxyFix`.
+"""
+
+INSTRUMENTATION_METRICS_TOKEN = None
+"""Bearer token allowing any client to read the metrics.
+
+When set, requests with an ``Authorization: Bearer <token>`` header are
+allowed regardless of their address.
+"""
+
+INSTRUMENTATION_SERVER_TIMING = False
+"""Add the timing breakdown of each request in a ``Server-Timing`` header."""
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Request instrumentation extension."""
+
+from __future__ import absolute_import, print_function
+
+from flask import request
+
+from . import config
+from .metrics import MetricsRegistry
+from .trace import current_trace, install_hooks, start_trace
+from .views import metrics
+
+METRICS_ENDPOINT = 'invenio_instrumentation.metrics'
+
+
+def extensions_collector(app):
+    """Collect the gauges reported by the application extensions.
+
+    Extensions exposing a ``cache`` with :class:`invenio.cache.CacheStats`
+    in its ``stats`` attribute, or a ``collect_metrics()`` method returning
+    ``(name, labels, value)`` tuples, are reported.
+    """
+    def collect():
+        for name, ext in sorted(app.extensions.items()):
+            stats = getattr(getattr(ext, 'cache', None), 'stats', None)
+            if stats is not None and hasattr(stats, 'to_dict'):
+                for key, value in sorted(stats.to_dict().items()):
+                    yield ('invenio_cache_{0}'.format(key), dict(cache=name),
+                           value)
+            if hasattr(ext, 'collect_metrics'):
+                for metric in ext.collect_metrics():
+                    yield metric
+    return collect
+
+
+class InvenioInstrumentation(object):
+    """Request instrumentation extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.registry = None
+        self.spans = []
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-instrumentation'] = self
+        if not app.config['INSTRUMENTATION_ENABLED']:
+            return
+
+        self.server_timing = app.config['INSTRUMENTATION_SERVER_TIMING']
+        self.registry = MetricsRegistry(app.config['INSTRUMENTATION_BUCKETS'])
+        self.registry.describe(
+            'invenio_request_duration_seconds', 'Duration of the requests.')
+        for kind in app.config['INSTRUMENTATION_SPANS']:
+            self.registry.describe(
+                'invenio_request_{0}_seconds'.format(kind),
+                'Time spent per request in {0} spans.'.format(kind))
+        self.registry.register_collector(extensions_collector(app))
+        self.spans = install_hooks(app.config['INSTRUMENTATION_SPANS'])
+
+        app.add_url_rule(app.config['INSTRUMENTATION_METRICS_URL'],
+                         METRICS_ENDPOINT, metrics)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('INSTRUMENTATION_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def before_request(self):
+        """Start the trace of the request."""
+        if request.endpoint != METRICS_ENDPOINT:
+            start_trace()
+
+    def after_request(self, response):
+        """Aggregate the trace of the request."""
+        trace = current_trace()
+        if trace is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        elapsed = trace.elapsed
+        self.registry.observe(
+            'invenio_request_duration_seconds', elapsed, endpoint=endpoint,
+            method=request.method, status=response.status_code)
+        kinds = sorted(kind for kind, count in trace.counts.items() if count)
+        for kind in kinds:
+            self.registry.observe(
+                'invenio_request_{0}_seconds'.format(kind),
+                trace.durations[kind], endpoint=endpoint)
+
+        if self.server_timing:
+            response.headers['Server-Timing'] = ', '.join(
+                ['{0};dur={1:.2f}'.format(kind, trace.durations[kind] * 1000)
+                 for kind in kinds] +
+                ['total;dur={0:.2f}'.format(elapsed * 1000)])
+        return response
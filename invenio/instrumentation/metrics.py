@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Histograms exposed in the Prometheus text format."""
+
+from __future__ import absolute_import, print_function
+
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+"""Upper bounds in seconds of the histogram buckets."""
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+"""Content type of the Prometheus text exposition format."""
+
+
+def escape(value):
+    """Escape a label value."""
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace(
+        '"', r'\"')
+
+
+def format_labels(labels):
+    """Format labels as ``{name="value",...}``."""
+    if not labels:
+        return ''
+    return '{' + ','.join('{0}="{1}"'.format(k, escape(v))
+                          for k, v in labels) + '}'
+
+
+def format_value(value):
+    """Format a sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Histogram(object):
+    """Thread-safe cumulative histogram of observations."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        :param buckets: Sorted upper bounds of the buckets.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Add an observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self):
+        """List ``(upper bound, cumulative count)`` including ``+Inf``."""
+        with self._lock:
+            counts = list(self.counts)
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'), ), counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsRegistry(object):
+    """Collection of labelled histograms and gauge collectors."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize the registry.
+
+        :param buckets: Buckets of the histograms.
+        """
+        self.buckets = buckets
+        self.histograms = {}
+        self.descriptions = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def describe(self, name, description):
+        """Set the help text of a metric."""
+        self.descriptions[name] = description
+
+    def observe(self, name, value, **labels):
+        """Add an observation to a labelled histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(
+                    key, Histogram(self.buckets))
+        histogram.observe(value)
+
+    def register_collector(self, collector):
+        """Register a function returning gauges.
+
+        :param collector: Callable returning an iterable of
+            ``(name, labels dictionary, value)``.
+        """
+        self.collectors.append(collector)
+
+    def _header(self, name, metric_type):
+        lines = []
+        if name in self.descriptions:
+            lines.append('# HELP {0} {1}'.format(
+                name, self.descriptions[name]))
+        lines.append('# TYPE {0} {1}'.format(name, metric_type))
+        return lines
+
+    def render(self):
+        """Render all metrics in the Prometheus text format."""
+        lines = []
+        by_name = {}
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            by_name.setdefault(name, []).append((labels, histogram))
+        for name, histograms in sorted(by_name.items()):
+            lines.extend(self._header(name, 'histogram'))
+            for labels, histogram in histograms:
+                for bound, count in histogram.cumulative():
+                    bucket_labels = labels + (('le', format_value(bound)), )
+                    lines.append('{0}_bucket{1} {2}'.format(
+                        name, format_labels(bucket_labels), count))
+                lines.append('{0}_sum{1} {2}'.format(
+                    name, format_labels(labels), format_value(histogram.sum)))
+                lines.append('{0}_count{1} {2}'.format(
+                    name, format_labels(labels), histogram.count))
+
+        gauges = {}
+        for collector in self.collectors:
+            for name, labels, value in collector():
+                gauges.setdefault(name, []).append(
+                    (tuple(sorted(labels.items())), value))
+        for name, samples in sorted(gauges.items()):
+            lines.extend(self._header(name, 'gauge'))
+            for labels, value in samples:
+                lines.append('{0}{1} {2}'.format(
+                    name, format_labels(labels), format_value(value)))
+        return '\n'.join(lines) + '\n'
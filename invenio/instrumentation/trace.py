@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Per-request spans recorded by hooks in the instrumented libraries.
+
+The hooks are process-wide and only installed when the instrumentation is
+enabled, so disabled instrumentation costs nothing. Each hook adds the
+duration of a database query, template rendering, search request or task
+dispatch to the trace of the current request, if any.
+"""
+
+from __future__ import absolute_import, print_function
+
+import collections
+import timeit
+
+from flask import g, has_request_context
+
+timer = timeit.default_timer
+
+SPAN_KINDS = ('db', 'template', 'search', 'celery', )
+"""Kinds of spans recorded by the hooks."""
+
+_installed = {}
+
+
+class RequestTrace(object):
+    """Time spent per span kind during a request."""
+
+    def __init__(self):
+        """Start the trace."""
+        self.started = timer()
+        self.durations = collections.defaultdict(float)
+        self.counts = collections.defaultdict(int)
+        self.listeners = []
+        self._starts = collections.defaultdict(list)
+
+    @property
+    def elapsed(self):
+        """Seconds since the request started."""
+        return timer() - self.started
+
+    def add(self, kind, duration, detail=None):
+        """Record a span.
+
+        :param kind: Kind of the span (see :data:`SPAN_KINDS`).
+        :param duration: Duration in seconds.
+        :param detail: Optional detail (e.g. the SQL statement) passed to
+            the trace listeners.
+        """
+        self.durations[kind] += duration
+        self.counts[kind] += 1
+        for listener in self.listeners:
+            listener(kind, duration, detail)
+
+    def start(self, kind):
+        """Start a span which is ended by :meth:`stop`."""
+        self._starts[kind].append(timer())
+
+    def stop(self, kind, detail=None):
+        """End the last span started for a kind."""
+        if self._starts[kind]:
+            self.add(kind, timer() - self._starts[kind].pop(), detail)
+
+
+def start_trace():
+    """Start the trace of the current request."""
+    g._instrumentation_trace = trace = RequestTrace()
+    return trace
+
+
+def current_trace():
+    """Get the trace of the current request or ``None``."""
+    if has_request_context():
+        return getattr(g, '_instrumentation_trace', None)
+
+
+def install_sqlalchemy():
+    """Time the SQL statements of all engines."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        conn.info.setdefault('instrumentation_starts', []).append(timer())
+
+    def after_cursor_execute(conn, cursor, statement, *args):
+        starts = conn.info.get('instrumentation_starts')
+        trace = current_trace()
+        if starts:
+            duration = timer() - starts.pop()
+            if trace is not None:
+                trace.add('db', duration, statement)
+
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+
+    def uninstall():
+        event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.remove(Engine, 'after_cursor_execute', after_cursor_execute)
+    return uninstall
+
+
+def install_templates():
+    """Time the rendering of Jinja2 templates by Flask."""
+    from flask import before_render_template, template_rendered
+
+    def before(sender, template, context, **extra):
+        trace = current_trace()
+        if trace is not None:
+            trace.start('template')
+
+    def after(sender, template, context, **extra):
+        trace = current_trace()
+        if trace is not None:
+            trace.stop('template', template.name)
+
+    before_render_template.connect(before, weak=False)
+    template_rendered.connect(after, weak=False)
+
+    def uninstall():
+        before_render_template.disconnect(before)
+        template_rendered.disconnect(after)
+    return uninstall
+
+
+def install_search():
+    """Time the requests of the Elasticsearch client."""
+    from elasticsearch import Transport
+
+    original = Transport.perform_request
+
+    def perform_request(self, method, url, *args, **kwargs):
+        start = timer()
+        try:
+            return original(self, method, url, *args, **kwargs)
+        finally:
+            trace = current_trace()
+            if trace is not None:
+                trace.add('search', timer() - start, url)
+
+    Transport.perform_request = perform_request
+
+    def uninstall():
+        Transport.perform_request = original
+    return uninstall
+
+
+def install_celery():
+    """Time the dispatch of Celery tasks."""
+    from celery.signals import after_task_publish, before_task_publish
+
+    def before(sender=None, **kwargs):
+        trace = current_trace()
+        if trace is not None:
+            trace.start('celery')
+
+    def after(sender=None, **kwargs):
+        trace = current_trace()
+        if trace is not None:
+            trace.stop('celery', sender)
+
+    before_task_publish.connect(before, weak=False)
+    after_task_publish.connect(after, weak=False)
+
+    def uninstall():
+        before_task_publish.disconnect(before)
+        after_task_publish.disconnect(after)
+    return uninstall
+
+
+HOOKS = {
+    'db': install_sqlalchemy,
+    'template': install_templates,
+    'search': install_search,
+    'celery': install_celery,
+}
+"""Hook installers by span kind."""
+
+
+def install_hooks(kinds=SPAN_KINDS):
+    """Install the hooks of the libraries which are available.
+
+    Installing is idempotent.
+
+    :param kinds: Span kinds to instrument.
+    :returns: List of instrumented span kinds.
+    """
+    for kind in kinds:
+        if kind in _installed:
+            continue
+        try:
+            _installed[kind] = HOOKS[kind]()
+        except ImportError:
+            continue
+    return [kind for kind in kinds if kind in _installed]
+
+
+def uninstall_hooks():
+    """Remove all installed hooks."""
+    while _installed:
+        kind, uninstall = _installed.popitem()
+        uninstall()
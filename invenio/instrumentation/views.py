@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Metrics endpoint."""
+
+from __future__ import absolute_import, print_function
+
+import hmac
+
+from flask import abort, current_app, request
+
+from .metrics import CONTENT_TYPE
+
+
+def is_allowed():
+    """Check if the current request may read the metrics."""
+    token = current_app.config['INSTRUMENTATION_METRICS_TOKEN']
+    if token:
+        header = request.headers.get('Authorization', '')
+        if hmac.compare_digest(header.encode('utf-8'),
+                               'Bearer {0}'.format(token).encode('utf-8')):
+            return True
+    return request.remote_addr in \
+        current_app.config['INSTRUMENTATION_METRICS_ALLOWED_IPS']
+
+
+def metrics():
+    """Render the metrics in the Prometheus text format."""
+    if not is_allowed():
+        abort(403)
+    registry = current_app.extensions['invenio-instrumentation'].registry
+    return current_app.response_class(
+        registry.render(), mimetype=None, content_type=CONTENT_TYPE)
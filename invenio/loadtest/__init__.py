@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Load tests of Invenio instances.
+
+An instance is assembled from Invenio modules (or an application factory)
+and served by the pre-forking server with local stand-ins of the services
+of a production deployment: SQLite instead of PostgreSQL, in-memory cache
+and broker instead of Redis and RabbitMQ, and an in-process search engine
+instead of Elasticsearch. Concurrent clients then send a mix of read,
+search and write requests and the latency percentiles and throughput of
+each endpoint are reported:
+
+.. code-block:: console
+
+    $ invenio loadtest --mix mixed invenio-base invenio-db invenio-records
+
+The same measurement runs for the package aliases with
+``python setup.py bench --suites loadtest``, so that releases can be
+compared. Since every worker process has its own in-process search engine,
+records created during a test are only searchable through the worker which
+created them.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import MIXES, LoadTest, load_mix
+from .server import LocalInstance
+
+__all__ = ('LoadTest', 'LocalInstance', 'MIXES', 'load_mix')
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Concurrent HTTP load generation and latency reports."""
+
+from __future__ import absolute_import, print_function
+
+import bisect
+import copy
+import itertools
+import json
+import random
+import threading
+
+from ..bench.api import summarize, timer
+
+try:
+    from http.client import HTTPConnection
+    from urllib.parse import urlsplit
+except ImportError:  # pragma: no cover
+    from httplib import HTTPConnection
+    from urlparse import urlsplit
+
+WORDS = ('physics', 'higgs', 'boson', 'detector', 'collider', 'neutrino',
+         'quark', 'lepton', 'symmetry', 'invenio')
+"""Words used in generated queries and records."""
+
+MIXES = {
+    'pages': [
+        dict(name='home', path='/'),
+    ],
+    'read': [
+        dict(name='record', path='/records/{recid}'),
+    ],
+    'search': [
+        dict(name='search', path='/records/?q={word}&size=10'),
+    ],
+    'write': [
+        dict(name='create', method='POST', path='/records/',
+             body={'title': 'Load test {n} {word}'}),
+    ],
+    'mixed': [
+        dict(name='record', path='/records/{recid}', weight=80),
+        dict(name='search', path='/records/?q={word}&size=10', weight=15),
+        dict(name='create', method='POST', path='/records/',
+             body={'title': 'Load test {n} {word}'}, weight=5),
+    ],
+}
+"""Built-in request mixes.
+
+Each request of a mix has a ``name`` reported separately, a ``method``
+(``GET`` by default), a ``path`` and an optional JSON ``body``, and a
+relative ``weight`` (``1`` by default). In paths and bodies, ``{recid}`` is
+replaced by a random existing record identifier, ``{word}`` by a random
+word and ``{n}`` by a unique number.
+"""
+
+
+def load_mix(mix):
+    """Return the requests of a built-in mix or of a JSON file."""
+    if mix in MIXES:
+        return MIXES[mix]
+    with open(mix) as f:
+        return json.load(f)
+
+
+def render(value, variables):
+    """Replace the placeholders of a path or body."""
+    if isinstance(value, dict):
+        return dict((k, render(v, variables)) for k, v in value.items())
+    if isinstance(value, list):
+        return [render(v, variables) for v in value]
+    if hasattr(value, 'format'):
+        return value.format(**variables)
+    return value
+
+
+class EndpointStats(object):
+    """Latencies and outcomes of the requests to one endpoint."""
+
+    def __init__(self):
+        """Initialize."""
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def add(self, latency, status):
+        """Record a request (``status`` is ``None`` on connection errors)."""
+        self.latencies.append(latency)
+        key = str(status) if status else 'error'
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if not status or status >= 500:
+            self.errors += 1
+
+    def merge(self, other):
+        """Add the requests of another instance."""
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+
+    def to_dict(self, elapsed):
+        """Summarize the requests made during ``elapsed`` seconds."""
+        latency = summarize(self.latencies) if self.latencies else {}
+        if latency:
+            latency['p50'] = latency['median']
+        return dict(
+            requests=len(self.latencies),
+            errors=self.errors,
+            statuses=self.statuses,
+            requests_per_second=len(self.latencies) / elapsed
+            if elapsed else 0.0,
+            latency=latency,
+        )
+
+
+class LoadTest(object):
+    """Drive a request mix against an instance with concurrent clients.
+
+    Each client is a thread with its own keep-alive connection, choosing
+    requests at random according to their weights.
+    """
+
+    def __init__(self, url, mix, clients=8, duration=10, requests=None,
+                 records=100, seed=0, timeout=30):
+        """Initialize the load test.
+
+        :param url: Base URL of the instance.
+        :param mix: List of requests (see :data:`MIXES`).
+        :param clients: Number of concurrent clients.
+        :param duration: Seconds the test lasts, unless ``requests`` is set.
+        :param requests: Total number of requests to send.
+        :param records: Records with identifiers ``1`` to ``records`` exist.
+        :param seed: Seed of the random choices.
+        :param timeout: Seconds to wait for a response.
+        """
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.mix = mix
+        self.clients = clients
+        self.duration = duration
+        self.requests = requests
+        self.records = records
+        self.seed = seed
+        self.timeout = timeout
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def next_request(self):
+        """Reserve the next request, or return ``None`` when done."""
+        with self.lock:
+            n = next(self.counter)
+        if self.requests is not None:
+            return n if n < self.requests else None
+        return n if timer() < self.deadline else None
+
+    def client(self, number, results):
+        """Send requests until the test ends.
+
+        Requests failing for any reason (e.g. a connection error or a
+        placeholder missing from a custom mix) are counted as errors.
+        """
+        rng = random.Random(self.seed + number)
+        weights, total = [], 0
+        for request in self.mix:
+            total += request.get('weight', 1)
+            weights.append(total)
+        stats = results[number] = dict(
+            (request['name'], EndpointStats()) for request in self.mix)
+        connection = None
+        while True:
+            n = self.next_request()
+            if n is None:
+                break
+            request = self.mix[bisect.bisect(weights, rng.random() * total)]
+            start = timer()
+            status = None
+            try:
+                variables = dict(recid=rng.randint(1, max(self.records, 1)),
+                                 word=rng.choice(WORDS), n=n)
+                body = request.get('body')
+                headers = {'Accept': 'application/json'}
+                if body is not None:
+                    body = json.dumps(render(copy.deepcopy(body), variables))
+                    headers['Content-Type'] = 'application/json'
+                path = self.prefix + render(request['path'], variables)
+                if connection is None:
+                    connection = HTTPConnection(
+                        self.host, self.port, timeout=self.timeout)
+                connection.request(request.get('method', 'GET'), path,
+                                   body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+                    connection = None
+            except Exception:
+                if connection is not None:
+                    connection.close()
+                connection = None
+            stats[request['name']].add(timer() - start, status)
+        if connection is not None:
+            connection.close()
+
+    def run(self):
+        """Run the load test.
+
+        :returns: Dictionary with the summary of each endpoint and of all
+            requests (``total``).
+        """
+        results = [None] * self.clients
+        threads = [threading.Thread(target=self.client, args=(i, results))
+                   for i in range(self.clients)]
+        start = timer()
+        self.deadline = start + (self.duration or 0)
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = timer() - start
+
+        endpoints = dict((request['name'], EndpointStats())
+                         for request in self.mix)
+        total = EndpointStats()
+        for stats in results:
+            for name, endpoint in stats.items():
+                endpoints[name].merge(endpoint)
+                total.merge(endpoint)
+        return dict(
+            clients=self.clients,
+            seconds=elapsed,
+            endpoints=dict((name, stats.to_dict(elapsed))
+                           for name, stats in endpoints.items()),
+            total=total.to_dict(elapsed),
+        )
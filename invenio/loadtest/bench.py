@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Load test of the instances assembled by the package aliases.
+
+Each alias is served with the local stand-ins by
+:class:`~invenio.loadtest.server.LocalInstance` and driven by concurrent
+clients. Aliases providing records get the ``mixed`` request mix, the
+others the ``pages`` mix.
+"""
+
+from __future__ import absolute_import, print_function
+
+from ..bench.aliases import ALIASES, alias_requirements, invenio_projects, \
+    missing_requirements
+from .api import MIXES, LoadTest
+from .server import LocalInstance
+
+
+def run(aliases=None, requests=100, clients=8, records=100, workers=2,
+        **kwargs):
+    """Load test each alias.
+
+    :param aliases: Aliases to test. Defaults to the benchmarked aliases.
+    :param requests: Number of requests per alias.
+    :param clients: Number of concurrent clients.
+    :param records: Number of records to seed.
+    :param workers: Number of worker processes of the instance.
+    :returns: Dictionary of alias name to load test results.
+    """
+    results = {}
+    for alias in aliases or ALIASES:
+        requirements = alias_requirements(alias)
+        missing = missing_requirements(requirements)
+        if missing:
+            results[alias] = dict(skipped=True, missing=missing)
+            continue
+
+        projects = invenio_projects(requirements)
+        mix = 'mixed' if 'invenio-records' in projects else 'pages'
+        with LocalInstance(projects, records=records,
+                           workers=workers) as instance:
+            result = LoadTest(instance.url, MIXES[mix], clients=clients,
+                              requests=requests,
+                              records=instance.records).run()
+        result.update(projects=projects, mix=mix)
+        results[alias] = result
+    return results
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for load tests."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+import click
+
+from .api import MIXES, LoadTest, load_mix
+
+COLUMNS = ('requests', 'errors', 'requests_per_second', 'p50', 'p95', 'p99')
+"""Columns of the report table."""
+
+
+def format_report(result):
+    """Format the results of a load test as a table.
+
+    Latencies are shown in milliseconds.
+    """
+    rows = [('endpoint', ) + COLUMNS]
+    for name in sorted(result['endpoints']) + ['total']:
+        stats = result['total'] if name == 'total' else \
+            result['endpoints'][name]
+        latency = stats['latency']
+        rows.append((
+            name,
+            str(stats['requests']),
+            str(stats['errors']),
+            '{0:.1f}'.format(stats['requests_per_second']),
+        ) + tuple(
+            '{0:.1f}'.format(latency[p] * 1000) if latency else '-'
+            for p in ('p50', 'p95', 'p99')))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join(
+        '  '.join(cell.ljust(w) if not i else cell.rjust(w)
+                  for i, (cell, w) in enumerate(zip(row, widths)))
+        for row in rows)
+
+
+@click.command()
+@click.argument('projects', nargs=-1)
+@click.option('--app', '-a',
+              help='Import path of the application or application factory '
+                   'to serve instead of PROJECTS.')
+@click.option('--url', '-u',
+              help='Test a running instance instead of starting one.')
+@click.option('--mix', '-m', default='mixed', show_default=True,
+              help='Request mix: {0} or a JSON file.'.format(
+                  ', '.join(sorted(MIXES))))
+@click.option('--clients', '-c', default=8, type=int, show_default=True,
+              help='Number of concurrent clients.')
+@click.option('--duration', '-d', default=10.0, type=float,
+              show_default=True, help='Duration of the test in seconds.')
+@click.option('--requests', '-n', type=int,
+              help='Number of requests to send instead of a duration.')
+@click.option('--records', '-r', default=100, type=int, show_default=True,
+              help='Number of records to seed (or existing with --url).')
+@click.option('--workers', '-w', default=2, type=int, show_default=True,
+              help='Number of worker processes of the started instance.')
+@click.option('--output', '-o', type=click.File('w'),
+              help='Write the results as JSON to a file.')
+def loadtest(projects, app, url, mix, clients, duration, requests, records,
+             workers, output):
+    """Load test an instance with concurrent clients.
+
+    Unless --url is given, an instance with the Invenio modules PROJECTS
+    (e.g. "invenio-base invenio-db invenio-records") or the application
+    --app is started with local stand-ins of the database, cache, broker
+    and search engine.
+    """
+    from .server import LocalInstance
+
+    instance = None
+    if not url:
+        instance = LocalInstance(projects, app=app, records=records,
+                                 workers=workers).start()
+        url, records = instance.url, instance.records
+    try:
+        result = LoadTest(url, load_mix(mix), clients=clients,
+                          duration=duration, requests=requests,
+                          records=records).run()
+    finally:
+        if instance is not None:
+            instance.stop()
+
+    click.echo(format_report(result))
+    if output:
+        json.dump(result, output, indent=2, sort_keys=True)
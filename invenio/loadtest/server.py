@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Serve an Invenio instance backed by the local stand-ins.
+
+The module is executed by :class:`LocalInstance` as::
+
+    python -m invenio.loadtest.server --records 1000 invenio-base invenio-db
+
+It builds the application from the given projects (or from ``--app``),
+creates a SQLite database in a temporary directory, seeds it with
+generated records which are also indexed in an in-process search engine,
+then serves it with the pre-forking server on a free port. Once ready, a
+single line of JSON with the ``port`` is printed.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+
+from ..helpers import load_app
+from ..server.arbiter import PreforkServer
+from ..standins.search import FakeSearchClient
+from .api import WORDS
+
+
+def generate_records(count):
+    """Generate records with identifiers ``1`` to ``count``."""
+    for recid in range(1, count + 1):
+        yield dict(
+            recid=recid,
+            title='Record {0} about {1}'.format(
+                recid, WORDS[recid % len(WORDS)]),
+            keywords=[WORDS[recid % len(WORDS)],
+                      WORDS[(recid * 7) % len(WORDS)]],
+        )
+
+
+def install_search(app):
+    """Replace the search engine client of an application by a stand-in.
+
+    :returns: The :class:`~invenio.standins.search.FakeSearchClient`, or
+        ``None`` if Invenio-Search is not loaded.
+    """
+    from ..searchcache.api import CachedSearchClient
+
+    search = app.extensions.get('invenio-search')
+    if search is None:
+        return None
+    client = FakeSearchClient()
+    if isinstance(getattr(search, 'client', None), CachedSearchClient):
+        search.client = CachedSearchClient(client, search.client.cache)
+    else:
+        search.client = client
+    return client
+
+
+def seed(app, count, index='records', doc_type='record'):
+    """Create and index generated records.
+
+    Records are only created when Invenio-Records is loaded, and indexed
+    when a search client stand-in is installed.
+
+    :returns: Number of records created.
+    """
+    if not count or 'invenio-records' not in app.extensions:
+        return 0
+    from ..ingest.api import bulk_ingest
+
+    with app.app_context():
+        bulk_ingest(generate_records(count))
+    search = app.extensions.get('invenio-search')
+    if search is not None:
+        for record in generate_records(count):
+            search.client.index(index=index, doc_type=doc_type,
+                                id=record['recid'], body=record)
+        search.client.indices.refresh(index=index)
+    return count
+
+
+def create_app(projects, app=None, database_uri='sqlite://'):
+    """Build the application under test.
+
+    :param projects: Project keys of the Invenio modules to load.
+    :param app: Import path of an application or application factory,
+        instead of ``projects``.
+    :param database_uri: Database used by the application.
+    """
+    config = dict(SQLALCHEMY_DATABASE_URI=database_uri, TESTING=False)
+    if app:
+        app = load_app(app)
+        app.config.update(config)
+        if 'sqlalchemy' in app.extensions:
+            with app.app_context():
+                app.extensions['sqlalchemy'].db.create_all()
+        return app
+    from ..bench.probe import create_app
+    return create_app(set(projects), config=config)
+
+
+def main(argv=None):
+    """Build, seed and serve the application."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('projects', nargs='*')
+    parser.add_argument('--app')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--records', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', default='threads')
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    # An in-memory SQLite database is private to each connection, so the
+    # workers share a database file instead.
+    directory = tempfile.mkdtemp(prefix='invenio-loadtest-')
+    try:
+        app = create_app(
+            args.projects, app=args.app,
+            database_uri='sqlite:///{0}'.format(
+                os.path.join(directory, 'loadtest.db')))
+        install_search(app)
+        records = seed(app, args.records)
+
+        server = PreforkServer(
+            app, host=args.host, port=args.port, workers=args.workers,
+            concurrency=args.concurrency, threads=args.threads,
+            access_log=False)
+        host, port = server.bind()
+        print(json.dumps(dict(host=host, port=port, records=records)))
+        sys.stdout.flush()
+        server.run()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class LocalInstance(object):
+    """Instance served by :mod:`invenio.loadtest.server` in a subprocess.
+
+    Can be used as a context manager::
+
+        with LocalInstance(['invenio-base']) as instance:
+            LoadTest(instance.url, MIXES['pages']).run()
+    """
+
+    def __init__(self, projects=(), app=None, records=100, workers=2,
+                 concurrency='threads', threads=8, env=None):
+        """Initialize the instance.
+
+        :param projects: Project keys of the Invenio modules to load.
+        :param app: Import path of an application or application factory,
+            instead of ``projects``.
+        :param records: Number of records to seed.
+        :param workers: Number of worker processes.
+        :param concurrency: Request concurrency model of the workers.
+        :param threads: Concurrent requests per worker with ``threads``.
+        :param env: Environment variables of the subprocess.
+        """
+        self.args = [
+            sys.executable, '-m', 'invenio.loadtest.server',
+            '--records', str(records), '--workers', str(workers),
+            '--concurrency', concurrency, '--threads', str(threads),
+        ] + (['--app', app] if app else []) + list(projects)
+        self.env = env
+        self.process = None
+        self.url = None
+        self.records = 0
+
+    def start(self):
+        """Start the instance and wait until it accepts connections."""
+        self.process = subprocess.Popen(
+            self.args, stdout=subprocess.PIPE, env=self.env,
+            universal_newlines=True)
+        line = self.process.stdout.readline()
+        if not line:
+            self.process.wait()
+            raise RuntimeError('Instance failed to start (exit status '
+                               '{0}).'.format(self.process.returncode))
+        info = json.loads(line)
+        self.url = 'http://{host}:{port}'.format(**info)
+        self.records = info['records']
+        return self
+
+    def stop(self):
+        """Stop the instance gracefully."""
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            self.process.wait()
+        if self.process is not None:
+            self.process.stdout.close()
+        self.process = None
+
+    def __enter__(self):
+        """Start the instance."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop the instance."""
+        self.stop()
+
+
+if __name__ == '__main__':
+    main()
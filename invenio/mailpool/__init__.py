@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Pooled, batched and rate limited delivery of e-mails.
+
+Flask-Mail (used by Invenio-Mail) opens a new SMTP connection, with its
+TCP and TLS handshakes and authentication, for every message. When
+installed, the extension sends the messages of Flask-Mail over a small
+pool of SMTP connections per process instead, which are reused until they
+were idle for ``MAILPOOL_MAX_IDLE`` seconds or sent
+``MAILPOOL_MAX_MESSAGES`` messages. A per-process rate limit
+(``MAILPOOL_RATE_LIMIT``) keeps bursts within the quota of the relay.
+
+Bursts of notifications are best queued in batches, which sends up to
+``MAILPOOL_BATCH_SIZE`` messages per Celery task (routed to the ``mail``
+queue) over one connection:
+
+.. code-block:: python
+
+    ext = current_app.extensions['invenio-mailpool']
+    ext.queue(messages)
+
+Messages deferred by transient errors (``4xx`` replies, network errors)
+are retried by the task with an exponential backoff, while permanently
+refused messages are logged and counted as failed.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import ConnectionPool, DeliveryResult, PooledMailer, RateLimiter, \
+    deserialize_message, is_transient, serialize_message
+from .ext import InvenioMailPool
+
+__all__ = ('ConnectionPool', 'DeliveryResult', 'InvenioMailPool',
+           'PooledMailer', 'RateLimiter', 'deserialize_message',
+           'is_transient', 'serialize_message', )
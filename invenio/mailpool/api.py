@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Pooled SMTP connections and rate limited delivery."""
+
+from __future__ import absolute_import, print_function
+
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+def is_transient(exc):
+    """Check if a delivery error may succeed when retried later.
+
+    Replies with a ``4xx`` code (e.g. greylisting, throttling or a full
+    mailbox), closed connections and network errors are transient; other
+    errors (``5xx`` replies, invalid messages) are permanent.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500
+                   for code, dummy in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(exc, socket.error) and \
+        not isinstance(exc, smtplib.SMTPException)
+
+
+def is_reusable(exc):
+    """Check if a connection can be reused after a delivery error.
+
+    :mod:`smtplib` resets the transaction after a refused message, so the
+    connection stays usable unless the server closes it.
+    """
+    return isinstance(exc, smtplib.SMTPResponseException) and \
+        exc.smtp_code != 421 or \
+        isinstance(exc, smtplib.SMTPRecipientsRefused)
+
+
+def envelope(message):
+    """Validate a Flask-Mail message and get its SMTP envelope.
+
+    The envelope sender is the ``envelope_from`` attribute of the message,
+    if set, as with :meth:`flask_mail.Connection.send`.
+
+    :returns: Tuple ``(sender, recipients, data)``.
+    :raises ValueError: If the message has no sender or recipient.
+    :raises flask_mail.BadHeaderError: If a header contains a newline.
+    """
+    from flask_mail import BadHeaderError, sanitize_address, sanitize_addresses
+
+    sender = getattr(message, 'envelope_from', None) or message.sender
+    if not message.send_to:
+        raise ValueError('No recipients have been added.')
+    if not sender:
+        raise ValueError('The message does not specify a sender and a '
+                         'default sender has not been configured.')
+    if message.has_bad_headers():
+        raise BadHeaderError
+    if message.date is None:
+        message.date = time.time()
+    return (sanitize_address(sender),
+            list(sanitize_addresses(message.send_to)),
+            message.as_bytes())
+
+
+def serialize_message(message):
+    """Serialize a Flask-Mail message for a task, as Invenio-Mail does."""
+    return dict(message.__dict__)
+
+
+def deserialize_message(data):
+    """Create a Flask-Mail message from :func:`serialize_message` data."""
+    from flask_mail import Message
+
+    message = Message()
+    message.__dict__.update(data)
+    return message
+
+
+def connect(mail):
+    """Open an SMTP connection with the settings of Flask-Mail.
+
+    :param mail: Flask-Mail state (``app.extensions['mail']``).
+    """
+    from flask_mail import Connection
+
+    return Connection(mail).configure_host()
+
+
+class RateLimiter(object):
+    """Token bucket limiting the number of operations per second.
+
+    Callers exceeding the rate sleep until their turn, so the limit holds
+    across the threads of a process.
+    """
+
+    def __init__(self, rate=None, burst=1, clock=time.time,
+                 sleep=time.sleep):
+        """Initialize the limiter.
+
+        :param rate: Operations per second (``None`` for no limit).
+        :param burst: Operations allowed at once after an idle period.
+        :param clock: Function returning the current time in seconds.
+        :param sleep: Function sleeping a number of seconds.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = burst
+        self.updated = clock()
+        self.waited = 0.0
+        """Total seconds spent waiting."""
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until an operation is allowed.
+
+        :returns: The seconds waited.
+        """
+        if not self.rate:
+            return 0
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.tokens + (now - self.updated) * self.rate, self.burst)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / float(self.rate) if self.tokens < 0 else 0
+            self.waited += wait
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+class PooledConnection(object):
+    """SMTP connection taken from a :class:`ConnectionPool`."""
+
+    def __init__(self, host, created):
+        """Initialize the connection.
+
+        :param host: Connected :class:`smtplib.SMTP` instance.
+        :param created: Time of the connection.
+        """
+        self.host = host
+        self.messages = 0
+        self.last_used = created
+        self.reused = False
+        """The connection was idle in the pool before being taken."""
+
+
+class ConnectionPool(object):
+    """Idle SMTP connections of a process, reused by later messages.
+
+    Connections are reused most recently used first, closed when they
+    were idle longer than ``max_idle`` seconds or sent ``max_messages``
+    messages, and dropped without closing them in a forked child process
+    (their sockets belong to the parent).
+    """
+
+    def __init__(self, factory, size=2, max_idle=30, max_messages=100,
+                 clock=time.time):
+        """Initialize the pool.
+
+        :param factory: Function opening an :class:`smtplib.SMTP`
+            connection.
+        :param size: Maximum number of idle connections.
+        :param max_idle: Seconds after which an idle connection is closed.
+        :param max_messages: Messages sent before a connection is closed.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.factory = factory
+        self.size = size
+        self.max_idle = max_idle
+        self.max_messages = max_messages
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.idle = []
+        self.pid = os.getpid()
+        self.created = 0
+        self.reused = 0
+        self.closed = 0
+
+    def _check_pid(self):
+        """Forget the connections inherited from a parent process."""
+        if self.pid != os.getpid():
+            self.idle = []
+            self.pid = os.getpid()
+
+    def acquire(self):
+        """Take an idle connection or open a new one."""
+        expired = []
+        with self.lock:
+            self._check_pid()
+            now = self.clock()
+            while self.idle:
+                connection = self.idle.pop()
+                if now - connection.last_used <= self.max_idle:
+                    connection.reused = True
+                    self.reused += 1
+                    break
+                expired.append(connection)
+            else:
+                connection = None
+        for old in expired:
+            self.close_connection(old)
+        if connection is None:
+            connection = PooledConnection(self.factory(), self.clock())
+            with self.lock:
+                self.created += 1
+        return connection
+
+    def release(self, connection, reuse=True):
+        """Give a connection back to the pool.
+
+        :param reuse: ``False`` if the connection is in an unknown state
+            (e.g. after a network error) and must be closed.
+        """
+        connection.last_used = self.clock()
+        with self.lock:
+            keep = reuse and self.pid == os.getpid() and \
+                connection.messages < self.max_messages and \
+                len(self.idle) < self.size
+            if keep:
+                self.idle.append(connection)
+        if not keep:
+            self.close_connection(connection)
+
+    def close_connection(self, connection):
+        """Close a connection, politely if the server is still there."""
+        with self.lock:
+            self.closed += 1
+        try:
+            connection.host.quit()
+        except (smtplib.SMTPException, socket.error):
+            connection.host.close()
+
+    def close(self):
+        """Close the idle connections."""
+        with self.lock:
+            self._check_pid()
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.close_connection(connection)
+
+    def to_dict(self):
+        """Get the usage counters."""
+        return dict(created=self.created, reused=self.reused,
+                    closed=self.closed, idle=len(self.idle))
+
+
+class DeliveryResult(object):
+    """Outcome of the delivery of several messages.
+
+    Messages are referenced by their position in the sent sequence.
+    """
+
+    def __init__(self):
+        """Initialize an empty result."""
+        self.sent = []
+        self.failed = []
+        """List of ``(index, exception)`` of the permanent failures."""
+        self.deferred = []
+        """Indexes of the messages to retry later."""
+
+    def to_dict(self):
+        """Count the messages by outcome."""
+        return dict(sent=len(self.sent), failed=len(self.failed),
+                    deferred=len(self.deferred))
+
+
+class PooledMailer(object):
+    """Send Flask-Mail messages over pooled, rate limited connections."""
+
+    def __init__(self, mail, pool=None, limiter=None):
+        """Initialize the mailer.
+
+        :param mail: Flask-Mail state (``app.extensions['mail']``).
+        :param pool: :class:`ConnectionPool` opening connections with the
+            settings of ``mail`` by default.
+        :param limiter: :class:`RateLimiter` applied to every message.
+        """
+        self.mail = mail
+        self.pool = pool if pool is not None else \
+            ConnectionPool(lambda: connect(mail))
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.sent = 0
+        self.failed = 0
+        self.deferred = 0
+
+    def deliver(self, message):
+        """Send one message.
+
+        A pooled connection closed by the server while it was idle is
+        replaced and the message sent again once.
+
+        :returns: The refused recipients, as :meth:`smtplib.SMTP.sendmail`.
+        """
+        sender, recipients, data = envelope(message)
+        if not self.mail.suppress:
+            self.limiter.acquire()
+            while True:
+                connection = self.pool.acquire()
+                try:
+                    refused = connection.host.sendmail(
+                        sender, recipients, data, message.mail_options,
+                        message.rcpt_options)
+                except Exception as e:
+                    self.pool.release(connection, reuse=is_reusable(e))
+                    if connection.reused and \
+                            isinstance(e, smtplib.SMTPServerDisconnected):
+                        continue
+                    raise
+                connection.messages += 1
+                self.pool.release(connection)
+                break
+            if refused:
+                logger.warning('Recipients of %r refused: %r',
+                               message.subject, refused)
+        else:
+            refused = {}
+        if has_app_context():
+            from flask_mail import email_dispatched
+            email_dispatched.send(current_app._get_current_object(),
+                                  message=message)
+        return refused
+
+    def send(self, message):
+        """Send one message (replaces :meth:`flask_mail.Mail.send`)."""
+        try:
+            self.deliver(message)
+        except Exception:
+            self.failed += 1
+            raise
+        self.sent += 1
+
+    def send_many(self, messages):
+        """Send messages, deferring them when the server is unavailable.
+
+        Permanent failures are logged and do not stop the delivery. After
+        a transient error other than refused recipients, the remaining
+        messages are deferred without trying them.
+
+        :returns: A :class:`DeliveryResult`.
+        """
+        result = DeliveryResult()
+        messages = list(messages)
+        for index, message in enumerate(messages):
+            try:
+                self.deliver(message)
+            except Exception as e:
+                if not is_transient(e):
+                    logger.exception('Message %r not sent', message.subject)
+                    result.failed.append((index, e))
+                    continue
+                logger.warning('Message %r deferred: %s', message.subject, e)
+                if isinstance(e, smtplib.SMTPRecipientsRefused):
+                    result.deferred.append(index)
+                else:
+                    result.deferred.extend(range(index, len(messages)))
+                    break
+            else:
+                result.sent.append(index)
+        self.sent += len(result.sent)
+        self.failed += len(result.failed)
+        self.deferred += len(result.deferred)
+        return result
+
+    def to_dict(self):
+        """Get the delivery counters."""
+        return dict(sent=self.sent, failed=self.failed,
+                    deferred=self.deferred,
+                    throttled_seconds=self.limiter.waited)
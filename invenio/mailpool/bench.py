@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark of pooled versus per-message SMTP connections."""
+
+from __future__ import absolute_import, print_function
+
+from ..bench.api import summarize, timer
+from ..standins.smtp import FakeSMTPServer
+
+
+def run(repeat=3, messages=200, connect_latency=0.01, **kwargs):
+    """Measure the delivery of messages to a local SMTP stand-in.
+
+    :param repeat: Number of measurements per path.
+    :param messages: Number of messages sent per measurement.
+    :param connect_latency: Seconds the stand-in waits before greeting a
+        connection, standing for the TCP and TLS handshakes and the login
+        with a remote relay.
+    """
+    try:
+        from flask import Flask
+        from flask_mail import Mail, Message
+    except ImportError as e:
+        return dict(skipped=True, missing=[str(e)])
+
+    from .ext import InvenioMailPool
+
+    server = FakeSMTPServer(connect_latency=connect_latency).start()
+    try:
+        app = Flask('invenio-bench')
+        app.config.update(
+            MAIL_SERVER=server.host, MAIL_PORT=server.port,
+            MAIL_SUPPRESS_SEND=False,
+            MAIL_DEFAULT_SENDER='noreply@example.org',
+        )
+        mail = Mail(app)
+        ext = InvenioMailPool(app)
+        mailer = ext.mailer
+
+        rates = dict(single=[], pooled=[])
+        connections = dict(single=0, pooled=0)
+        with app.app_context():
+            outbox = [Message('Record {0} was published'.format(i),
+                              recipients=['user{0}@example.org'.format(i)],
+                              body='Your record is available.')
+                      for i in range(messages)]
+            for dummy in range(repeat):
+                before = server.connections
+                start = timer()
+                for message in outbox:
+                    mail.send(message)
+                rates['single'].append(messages / (timer() - start))
+                connections['single'] = server.connections - before
+
+                before = server.connections
+                start = timer()
+                result = mailer.send_many(outbox)
+                rates['pooled'].append(messages / (timer() - start))
+                connections['pooled'] = server.connections - before
+                assert len(result.sent) == messages
+                mailer.pool.close()
+    finally:
+        server.stop()
+
+    single_rate = summarize(rates['single'])
+    pooled_rate = summarize(rates['pooled'])
+    return dict(
+        messages=messages,
+        connect_latency=connect_latency,
+        single_messages_per_second=single_rate,
+        pooled_messages_per_second=pooled_rate,
+        single_connections=connections['single'],
+        pooled_connections=connections['pooled'],
+        speedup=pooled_rate['median'] / single_rate['median'],
+    )
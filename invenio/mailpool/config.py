@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Pooled mail delivery configuration.
+
+The SMTP server and credentials are the ``MAIL_*`` settings of
+Flask-Mail.
+"""
+
+MAILPOOL_ENABLED = True
+"""Send the messages of Flask-Mail over pooled connections."""
+
+MAILPOOL_POOL_SIZE = 2
+"""Maximum number of idle SMTP connections kept open per process."""
+
+MAILPOOL_MAX_IDLE = 30
+"""Seconds after which an idle connection is closed instead of reused.
+
+Keep it below the idle timeout of the SMTP server (usually a few
+minutes).
+"""
+
+MAILPOOL_MAX_MESSAGES = 100
+"""Number of messages sent over a connection before it is replaced."""
+
+MAILPOOL_RATE_LIMIT = None
+"""Maximum number of messages sent per second by a process (``None``
+for no limit).
+
+Set it below the limit of the SMTP relay divided by the number of mail
+worker processes.
+"""
+
+MAILPOOL_BATCH_SIZE = 50
+"""Maximum number of messages per queued task."""
+
+MAILPOOL_FLUSH_INTERVAL = 5.0
+"""Maximum seconds a message waits in the batcher before it is queued."""
+
+MAILPOOL_MAX_RETRIES = 5
+"""Retries of the messages deferred by transient delivery errors."""
+
+MAILPOOL_RETRY_BACKOFF = 30
+"""Delay in seconds before the first retry; it doubles with every
+retry."""
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Pooled mail delivery extension."""
+
+from __future__ import absolute_import, print_function
+
+from . import config
+from .api import ConnectionPool, PooledMailer, RateLimiter, connect, \
+    serialize_message
+
+
+class InvenioMailPool(object):
+    """Pooled mail delivery extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.mailer = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-mailpool'] = self
+        if not app.config['MAILPOOL_ENABLED']:
+            return
+
+        if not self.install(app):
+            app.before_request(lambda: self.install(app) and None)
+        try:
+            from celery.signals import worker_process_init, \
+                worker_process_shutdown
+        except ImportError:
+            return
+        worker_process_init.connect(
+            lambda **kwargs: self.install(app), weak=False)
+        worker_process_shutdown.connect(
+            lambda **kwargs: self.mailer and self.mailer.pool.close(),
+            weak=False)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('MAILPOOL_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def get_mailer(self, app):
+        """Get the pooled mailer of the Flask-Mail state of an application.
+
+        :returns: A :class:`invenio.mailpool.api.PooledMailer`, or ``None``
+            if Flask-Mail is not initialized.
+        """
+        mail = app.extensions.get('mail')
+        if mail is None:
+            return None
+        if self.mailer is None or self.mailer.mail is not mail:
+            self.mailer = PooledMailer(
+                mail,
+                pool=ConnectionPool(
+                    lambda: connect(mail),
+                    size=app.config['MAILPOOL_POOL_SIZE'],
+                    max_idle=app.config['MAILPOOL_MAX_IDLE'],
+                    max_messages=app.config['MAILPOOL_MAX_MESSAGES'],
+                ),
+                limiter=RateLimiter(app.config['MAILPOOL_RATE_LIMIT']),
+            )
+        return self.mailer
+
+    def install(self, app):
+        """Send the messages of Flask-Mail with the pooled mailer.
+
+        Messages sent with ``app.extensions['mail'].send()``, as the tasks
+        of Invenio-Mail do, reuse the connections of the pool.
+
+        :returns: ``True`` if the mailer is installed.
+        """
+        mailer = self.get_mailer(app)
+        if mailer is None:
+            return False
+        mailer.mail.send = mailer.send
+        return True
+
+    def batcher(self, **kwargs):
+        """Create a batcher queueing messages in batched tasks.
+
+        .. code-block:: python
+
+            with ext.batcher() as batcher:
+                for message in messages:
+                    batcher.add(serialize_message(message))
+            batcher.result()  # {'submitted': ..., 'succeeded': ..., ...}
+
+        Defaults to ``MAILPOOL_BATCH_SIZE`` messages per task and
+        ``MAILPOOL_FLUSH_INTERVAL``. The result of the batcher follows the
+        delivery by the Celery workers only with a shared
+        ``BATCH_RESULTS_BACKEND`` (e.g. ``'redis'``); otherwise a warning
+        is logged and only the submitted messages are counted.
+
+        :returns: A :class:`invenio.batch.api.Batcher`.
+        """
+        from flask import current_app
+
+        from ..batch.api import Batcher
+        from .tasks import send_batch
+
+        kwargs.setdefault('batch_size',
+                          current_app.config['MAILPOOL_BATCH_SIZE'])
+        kwargs.setdefault('flush_interval',
+                          current_app.config['MAILPOOL_FLUSH_INTERVAL'])
+        batcher = Batcher(send_batch, **kwargs)
+        if not batcher.aggregator.is_shared():
+            current_app.logger.warning(
+                'Mail delivery results are not shared with the workers; set '
+                'BATCH_RESULTS_BACKEND to follow batch %s.',
+                batcher.batch_id)
+        return batcher
+
+    def queue(self, messages, **kwargs):
+        """Queue Flask-Mail messages in batched tasks.
+
+        :param messages: Iterable of :class:`flask_mail.Message`.
+        :returns: The flushed :class:`invenio.batch.api.Batcher`.
+        """
+        with self.batcher(**kwargs) as batcher:
+            for message in messages:
+                batcher.add(serialize_message(message))
+        return batcher
+
+    def collect_metrics(self):
+        """Report the delivered messages and the SMTP connections."""
+        if self.mailer is None:
+            return
+        for key, value in sorted(self.mailer.to_dict().items()):
+            yield 'invenio_mail_{0}'.format(key), {}, value
+        for key, value in sorted(self.mailer.pool.to_dict().items()):
+            yield 'invenio_mail_connections_{0}'.format(key), {}, value
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Celery tasks sending batches of messages."""
+
+from __future__ import absolute_import, print_function
+
+from celery import shared_task
+from flask import current_app
+
+from ..batch.api import BatchAggregator
+from .api import deserialize_message
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=None)
+def send_batch(self, batch_id, items):
+    """Send a batch of serialized messages over pooled connections.
+
+    Messages deferred by transient errors are sent again by a retry of
+    the task, after a delay doubling with every retry, until
+    ``MAILPOOL_MAX_RETRIES`` is reached; they are then counted as failed.
+    The outcome is only counted when the batch counters are shared with
+    the producer (see ``BATCH_RESULTS_BACKEND``).
+
+    :param batch_id: Identifier of the batch (see
+        :class:`invenio.batch.api.BatchAggregator`).
+    :param items: List of ``(data, )`` tuples of
+        :func:`invenio.mailpool.api.serialize_message` data.
+    :raises RuntimeError: If Flask-Mail is not initialized.
+    """
+    mailer = current_app.extensions['invenio-mailpool'].get_mailer(
+        current_app)
+    if mailer is None:
+        raise RuntimeError('Flask-Mail is not initialized.')
+    result = mailer.send_many(deserialize_message(data) for data, in items)
+    aggregator = BatchAggregator(batch_id)
+    if not aggregator.is_shared():
+        aggregator = None
+    max_retries = current_app.config['MAILPOOL_MAX_RETRIES']
+    if result.deferred and self.request.retries < max_retries:
+        if aggregator:
+            aggregator.completed(len(result.sent), len(result.failed))
+        raise self.retry(
+            args=(batch_id, [items[index] for index in result.deferred]),
+            countdown=current_app.config['MAILPOOL_RETRY_BACKOFF'] *
+            2 ** self.request.retries,
+        )
+    if aggregator:
+        aggregator.completed(len(result.sent),
+                             len(result.failed) + len(result.deferred))
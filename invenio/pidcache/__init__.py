@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Two-tier cache of persistent identifier resolutions.
+
+Resolving ``/records/<pid_value>`` queries the persistent identifier table
+on every request. The cache maps ``(pid_type, pid_value)`` to the status
+and the assigned object of the identifier, first in a small in-process
+LRU, then optionally in Redis (``PIDCACHE_SHARED_BACKEND = 'redis'``, with
+``invenio[redis]`` installed). Identifiers are invalidated when their row
+changes (``assign``, ``register``, ``redirect``, ``delete``...).
+
+.. code-block:: python
+
+    from flask import current_app
+
+    cache = current_app.extensions['invenio-pidcache'].cache
+    pid = cache.resolve('recid', '1')
+    pid.object_uuid, pid.is_registered()
+
+    # Listing pages resolve many identifiers with one query at most.
+    pids = cache.resolve_many('recid', ['1', '2', '3'])
+
+:class:`~invenio.pidcache.api.CachedResolver` can replace the resolver of
+Invenio-PIDStore in record views.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import CachedResolver, PIDCache, ResolvedPID
+from .ext import InvenioPIDCache
+
+__all__ = ('CachedResolver', 'InvenioPIDCache', 'PIDCache', 'ResolvedPID', )
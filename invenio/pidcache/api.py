@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Two-tier cache of persistent identifier resolutions."""
+
+from __future__ import absolute_import, print_function
+
+from collections import namedtuple
+
+from ..cache import CacheStats
+from ..cache.invalidation import invalidate, listen_once, register
+
+PID_STATUSES = dict(new='N', reserved='K', registered='R', redirected='M',
+                    deleted='D')
+"""Status codes of persistent identifiers."""
+
+
+class ResolvedPID(namedtuple('ResolvedPID', (
+        'pid_type', 'pid_value', 'status', 'object_type', 'object_uuid'))):
+    """Resolution of a persistent identifier."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_pid(cls, pid):
+        """Create from a ``PersistentIdentifier``."""
+        status = getattr(pid.status, 'value', pid.status)
+        object_uuid = getattr(pid, 'object_uuid', None)
+        if object_uuid is None:
+            object_uuid = getattr(pid, 'object_value', None)
+        return cls(pid.pid_type, pid.pid_value, status, pid.object_type,
+                   str(object_uuid) if object_uuid is not None else None)
+
+    def is_registered(self):
+        """Check if the identifier is registered."""
+        return self.status == PID_STATUSES['registered']
+
+    def is_redirected(self):
+        """Check if the identifier is redirected."""
+        return self.status == PID_STATUSES['redirected']
+
+    def is_deleted(self):
+        """Check if the identifier is deleted."""
+        return self.status == PID_STATUSES['deleted']
+
+
+MISSING = ()
+"""Cached value of identifiers which do not exist."""
+
+
+def load_pids(pid_type, values):
+    """Load persistent identifiers of a type in one query."""
+    from invenio_pidstore.models import PersistentIdentifier
+
+    return [ResolvedPID.from_pid(pid) for pid in
+            PersistentIdentifier.query.filter(
+                PersistentIdentifier.pid_type == pid_type,
+                PersistentIdentifier.pid_value.in_(list(values)))]
+
+
+class PIDCache(object):
+    """Cache of persistent identifier resolutions.
+
+    Lookups go through an in-process tier, then an optional shared tier,
+    and finally to the database; identifiers found in a slower tier are
+    copied to the faster ones. Identifiers which do not exist are cached as
+    well. Invalidation removes an identifier from both tiers of the current
+    process; other processes may keep it in their in-process tier until it
+    expires, which is why its timeout is short.
+    """
+
+    def __init__(self, local, shared=None, loader=load_pids,
+                 local_timeout=5, shared_timeout=3600):
+        """Initialize the cache.
+
+        :param local: In-process cache backend.
+        :param shared: Shared cache backend (optional).
+        :param loader: Function loading the :class:`ResolvedPID` of
+            ``(pid_type, values)`` from the database.
+        :param local_timeout: Seconds an entry is kept in ``local``.
+        :param shared_timeout: Seconds an entry is kept in ``shared``.
+        """
+        self.local = local
+        self.shared = shared
+        self.loader = loader
+        self.local_timeout = local_timeout
+        self.shared_timeout = shared_timeout
+        self.stats = CacheStats()
+        self.queries = 0
+
+    @staticmethod
+    def key(pid_type, pid_value):
+        """Cache key of an identifier."""
+        return u'pid:{0}:{1}'.format(pid_type, pid_value)
+
+    def resolve(self, pid_type, pid_value):
+        """Resolve an identifier.
+
+        :returns: A :class:`ResolvedPID`, or ``None`` if it does not exist.
+        """
+        return self.resolve_many(pid_type, [pid_value])[pid_value]
+
+    def resolve_many(self, pid_type, values):
+        """Resolve identifiers of a type with at most one database query.
+
+        :returns: Dictionary mapping each value to its :class:`ResolvedPID`,
+            or to ``None`` if the identifier does not exist.
+        """
+        values = list(values)
+        keys = [self.key(pid_type, value) for value in values]
+        found = dict(zip(values, self.local.get_many(keys)))
+        missing = [value for value in values if found[value] is None]
+
+        if missing and self.shared is not None:
+            shared = dict(zip(missing, self.shared.get_many(
+                [self.key(pid_type, value) for value in missing])))
+            self.local.set_many(dict(
+                (self.key(pid_type, value), entry)
+                for value, entry in shared.items() if entry is not None
+            ), timeout=self.local_timeout)
+            found.update(shared)
+            missing = [value for value in missing if shared[value] is None]
+
+        self.stats.hit(len(values) - len(missing))
+        self.stats.miss(len(missing))
+        if missing:
+            self.queries += 1
+            loaded = dict((value, MISSING) for value in missing)
+            loaded.update((pid.pid_value, tuple(pid))
+                          for pid in self.loader(pid_type, missing))
+            entries = dict((self.key(pid_type, value), entry)
+                           for value, entry in loaded.items())
+            self.local.set_many(entries, timeout=self.local_timeout)
+            if self.shared is not None:
+                self.shared.set_many(entries, timeout=self.shared_timeout)
+            found.update(loaded)
+
+        return dict((value, ResolvedPID(*found[value]) if found[value]
+                     else None) for value in values)
+
+    def invalidate(self, pid_type, pid_value):
+        """Remove an identifier from the cache."""
+        key = self.key(pid_type, pid_value)
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+        self.stats.invalidate()
+
+
+def pid_changed(mapper, connection, target):
+    """Invalidate a changed identifier in all caches."""
+    from sqlalchemy.orm import object_session
+
+    invalidate('pidcache', [(target.pid_type, target.pid_value)],
+               session=object_session(target))
+
+
+def connect_model(model, cache):
+    """Invalidate the cache when identifiers of a model change.
+
+    Changed identifiers (e.g. by ``assign``, ``register``, ``redirect`` or
+    ``delete``) are invalidated when flushed, and again once the
+    transaction ends so that entries cached by concurrent requests before
+    the commit are dropped too. Listeners are only added once, whatever the
+    number of connected caches.
+
+    :param model: The ``PersistentIdentifier`` model.
+    :param cache: The :class:`PIDCache`.
+    """
+    register('pidcache', cache)
+    for name in ('after_insert', 'after_update', 'after_delete'):
+        listen_once(model, name, pid_changed)
+
+
+class CachedResolver(object):
+    """Resolver of persistent identifiers to objects using the cache.
+
+    Registered identifiers assigned to an object of the expected type are
+    resolved from the cache, returning a :class:`ResolvedPID` in place of
+    the ``PersistentIdentifier``. Other identifiers (unregistered, deleted,
+    redirected or missing) are rare and delegated to the resolver of
+    Invenio-PIDStore, which raises the appropriate errors.
+    """
+
+    def __init__(self, pid_type=None, object_type=None, getter=None,
+                 cache=None):
+        """Initialize the resolver.
+
+        :param pid_type: Type of the resolved identifiers.
+        :param object_type: Type of the objects they must be assigned to.
+        :param getter: Function returning an object from its identifier.
+        :param cache: The :class:`PIDCache` (defaults to the one of the
+            current application).
+        """
+        self.pid_type = pid_type
+        self.object_type = object_type
+        self.object_getter = getter
+        self._cache = cache
+
+    @property
+    def cache(self):
+        """Return the cache."""
+        if self._cache is not None:
+            return self._cache
+        from flask import current_app
+        return current_app.extensions['invenio-pidcache'].cache
+
+    def resolve(self, pid_value):
+        """Resolve an identifier to ``(pid, object)``."""
+        pid = self.cache.resolve(self.pid_type, pid_value)
+        if pid is not None and pid.is_registered() and \
+                pid.object_type == self.object_type and pid.object_uuid:
+            return pid, self.object_getter(pid.object_uuid)
+
+        from invenio_pidstore.resolver import Resolver
+        return Resolver(pid_type=self.pid_type, object_type=self.object_type,
+                        getter=self.object_getter).resolve(pid_value)
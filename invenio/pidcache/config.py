@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Persistent identifier cache configuration."""
+
+PIDCACHE_ENABLED = True
+"""Enable the persistent identifier cache."""
+
+PIDCACHE_LOCAL_MAX_SIZE = 8 * 1024 * 1024
+"""Maximum size in bytes of the in-process tier."""
+
+PIDCACHE_LOCAL_TIMEOUT = 5
+"""Seconds an identifier is kept in the in-process tier. Changes made by
+other processes may be seen this late."""
+
+PIDCACHE_SHARED_BACKEND = None
+"""Backend of the shared tier: ``'redis'`` (using ``CACHE_REDIS_HOST``,
+requires ``invenio[redis]``), ``'lru'``, an import path to a backend
+factory, or ``None`` to only use the in-process tier."""
+
+PIDCACHE_SHARED_TIMEOUT = 3600
+"""Seconds an identifier is kept in the shared tier."""
+
+PIDCACHE_LOADER = 'invenio.pidcache.api:load_pids'
+"""Function loading ``(pid_type, values)`` from the database."""
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Persistent identifier cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from ..cache import LRUCache, create_backend
+from ..helpers import obj_or_import_string
+from . import config
+from .api import PIDCache, connect_model
+
+
+class InvenioPIDCache(object):
+    """Persistent identifier cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.cache = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-pidcache'] = self
+        if not app.config['PIDCACHE_ENABLED']:
+            return
+
+        shared = None
+        if app.config['PIDCACHE_SHARED_BACKEND']:
+            try:
+                shared = create_backend(
+                    app.config['PIDCACHE_SHARED_BACKEND'], 'pidcache',
+                    config=app.config,
+                    default_timeout=app.config['PIDCACHE_SHARED_TIMEOUT'],
+                )
+            except ImportError as e:
+                app.logger.warning(
+                    'Shared persistent identifier cache disabled: %s', e)
+        self.cache = PIDCache(
+            LRUCache(max_size=app.config['PIDCACHE_LOCAL_MAX_SIZE']),
+            shared=shared,
+            loader=obj_or_import_string(app.config['PIDCACHE_LOADER']),
+            local_timeout=app.config['PIDCACHE_LOCAL_TIMEOUT'],
+            shared_timeout=app.config['PIDCACHE_SHARED_TIMEOUT'],
+        )
+        try:
+            from invenio_pidstore.models import PersistentIdentifier
+        except ImportError:
+            return
+        connect_model(PersistentIdentifier, self.cache)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('PIDCACHE_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def collect_metrics(self):
+        """Report the number of database queries."""
+        if self.cache is not None:
+            yield ('invenio_pidcache_queries', {}, self.cache.queries)
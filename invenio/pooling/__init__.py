@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Database connection pooling profiles and N+1 query detection.
+
+The connection pool options are chosen per process type from
+``POOLING_PROFILES``: web servers, Celery workers and command line
+processes get differently sized pools so that the total number of
+connections of a node stays predictable. The process type is detected
+automatically or set with the ``INVENIO_PROCESS_TYPE`` environment variable.
+
+Pool usage (connections checked out, peak, checkouts, new connections) is
+counted per process and reported by the instrumentation metrics. In debug
+mode, requests issuing many similar queries (e.g. one query per record of a
+listing) are logged as possible N+1 query patterns.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import PoolMonitor, QueryCounter, apply_profile, \
+    detect_process_type, normalize_statement
+from .ext import InvenioPooling
+
+__all__ = ('InvenioPooling', 'PoolMonitor', 'QueryCounter', 'apply_profile',
+           'detect_process_type', 'normalize_statement', )
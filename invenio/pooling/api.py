@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Connection pooling profiles, pool monitoring and N+1 query detection."""
+
+from __future__ import absolute_import, print_function
+
+import collections
+import os
+import re
+import sys
+import threading
+
+PROCESS_TYPES = ('web', 'worker', 'cli', )
+"""Known process types."""
+
+CONFIG_KEYS = {
+    'pool_size': 'SQLALCHEMY_POOL_SIZE',
+    'max_overflow': 'SQLALCHEMY_MAX_OVERFLOW',
+    'pool_timeout': 'SQLALCHEMY_POOL_TIMEOUT',
+    'pool_recycle': 'SQLALCHEMY_POOL_RECYCLE',
+}
+"""Flask-SQLAlchemy configuration variables of the pool options."""
+
+WEB_COMMANDS = ('run', 'serve', 'runserver', )
+"""Commands serving web requests."""
+
+
+def detect_process_type(argv=None, environ=None):
+    """Guess the type of the current process.
+
+    :param argv: Command line (defaults to ``sys.argv``).
+    :param environ: Environment (defaults to ``os.environ``).
+    :returns: ``web``, ``worker`` or ``cli``.
+    """
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    if environ.get('INVENIO_PROCESS_TYPE') in PROCESS_TYPES:
+        return environ['INVENIO_PROCESS_TYPE']
+
+    program = os.path.basename(argv[0]) if argv else ''
+    args = [arg for arg in argv[1:] if not arg.startswith('-')]
+    if program.startswith('celery') or 'worker' in args[:2]:
+        return 'worker'
+    if program in ('manage.py', 'inveniomanage', 'flask', 'invenio'):
+        return 'web' if args[:1] and args[0] in WEB_COMMANDS else 'cli'
+    return 'web'
+
+
+def apply_profile(config, profile):
+    """Set the pool options of a profile in the configuration.
+
+    Explicitly configured options are kept. Nothing is set for SQLite,
+    which does not use a queue pool.
+
+    :param config: Application configuration.
+    :param profile: Dictionary of pool options.
+    :returns: Dictionary of the applied configuration variables.
+    """
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or ''
+    if uri.startswith('sqlite'):
+        return {}
+    applied = {}
+    for option, value in profile.items():
+        key = CONFIG_KEYS[option]
+        if config.get(key) is None:
+            config[key] = applied[key] = value
+    return applied
+
+
+class PoolMonitor(object):
+    """Usage counters of the connection pools of the process."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.lock = threading.Lock()
+        self.checked_out = 0
+        self.peak = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.installed = False
+
+    def on_connect(self, dbapi_connection, connection_record):
+        """Count a new database connection."""
+        with self.lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record,
+                    connection_proxy):
+        """Count a connection taken from the pool."""
+        with self.lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak = max(self.peak, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        """Count a connection returned to the pool."""
+        with self.lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def install(self):
+        """Listen to the events of all pools."""
+        from sqlalchemy import event
+        from sqlalchemy.pool import Pool
+
+        if not self.installed:
+            event.listen(Pool, 'connect', self.on_connect)
+            event.listen(Pool, 'checkout', self.on_checkout)
+            event.listen(Pool, 'checkin', self.on_checkin)
+            self.installed = True
+
+    def to_dict(self):
+        """Serialize the counters."""
+        return dict(checked_out=self.checked_out, peak=self.peak,
+                    checkouts=self.checkouts, connects=self.connects)
+
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_in_lists = re.compile(r'\bIN\s*\([^)]*\)', re.IGNORECASE)
+_spaces = re.compile(r'\s+')
+
+
+def normalize_statement(statement):
+    """Reduce a SQL statement to its shape.
+
+    Literals and ``IN`` lists are replaced by placeholders so that queries
+    differing only by their values are considered identical.
+    """
+    statement = _literals.sub('?', statement)
+    statement = _in_lists.sub('IN (?)', statement)
+    return _spaces.sub(' ', statement).strip()
+
+
+class QueryCounter(object):
+    """Count the similar queries issued during a request."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.counts = collections.Counter()
+
+    def add(self, statement):
+        """Count a statement."""
+        self.counts[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold):
+        """List the statements issued at least ``threshold`` times.
+
+        :returns: List of ``(statement, count)`` by decreasing count.
+        """
+        return [(statement, count)
+                for statement, count in self.counts.most_common()
+                if count >= threshold]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Database connection pooling configuration.
+
+The connection budget of a node is the number of processes of each type
+multiplied by ``pool_size + max_overflow`` of their profile; keep it below
+the ``max_connections`` of PostgreSQL.
+"""
+
+POOLING_PROFILES = {
+    'web': dict(pool_size=5, max_overflow=5, pool_timeout=10,
+                pool_recycle=3600),
+    'worker': dict(pool_size=2, max_overflow=1, pool_timeout=30,
+                   pool_recycle=3600),
+    'cli': dict(pool_size=1, max_overflow=0, pool_timeout=30,
+                pool_recycle=3600),
+}
+"""Connection pool options per process type."""
+
+POOLING_PROCESS_TYPE = None
+"""Process type selecting the profile (``web``, ``worker`` or ``cli``).
+
+Detected from the ``INVENIO_PROCESS_TYPE`` environment variable or the
+command line when not set.
+"""
+
+POOLING_NPLUSONE_DETECT = None
+"""Flag requests issuing repeated similar queries (defaults to the debug
+mode of the application)."""
+
+POOLING_NPLUSONE_THRESHOLD = 5
+"""Number of similar queries in one request considered an N+1 pattern."""
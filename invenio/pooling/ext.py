@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Database connection pooling extension."""
+
+from __future__ import absolute_import, print_function
+
+import collections
+
+from flask import current_app, g, has_request_context, request
+
+from . import config
+from .api import PoolMonitor, QueryCounter, apply_profile, detect_process_type
+
+monitor = PoolMonitor()
+"""Connection pool counters of the process."""
+
+_detector_installed = []
+
+
+def install_detector():
+    """Count the statements of each request (installed once per process)."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if has_request_context():
+            counter = getattr(g, '_pooling_queries', None)
+            if counter is not None:
+                counter.add(statement)
+
+    if not _detector_installed:
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        _detector_installed.append(before_cursor_execute)
+
+
+class InvenioPooling(object):
+    """Database connection pooling extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.reports = collections.deque(maxlen=100)
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        self.process_type = app.config['POOLING_PROCESS_TYPE'] or \
+            detect_process_type()
+        self.applied = apply_profile(
+            app.config, app.config['POOLING_PROFILES'][self.process_type])
+        self.threshold = app.config['POOLING_NPLUSONE_THRESHOLD']
+        self.monitor = monitor
+        try:
+            monitor.install()
+        except ImportError:
+            pass
+
+        detect = app.config['POOLING_NPLUSONE_DETECT']
+        if detect is None:
+            detect = app.debug
+        if detect:
+            install_detector()
+            app.before_request(self.before_request)
+            app.after_request(self.after_request)
+        app.extensions['invenio-pooling'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('POOLING_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def collect_metrics(self):
+        """Report the pool usage counters as gauges."""
+        labels = dict(process_type=self.process_type)
+        for key, value in sorted(self.monitor.to_dict().items()):
+            yield 'invenio_db_pool_{0}'.format(key), labels, value
+
+    def before_request(self):
+        """Start counting the queries of the request."""
+        g._pooling_queries = QueryCounter()
+
+    def after_request(self, response):
+        """Flag the request if it issued repeated similar queries."""
+        counter = getattr(g, '_pooling_queries', None)
+        if counter is None:
+            return response
+        repeated = counter.repeated(self.threshold)
+        if repeated:
+            self.reports.append(dict(
+                endpoint=request.endpoint, path=request.path,
+                queries=repeated))
+            current_app.logger.warning(
+                'Possible N+1 queries in %s: %s', request.path,
+                '; '.join('{0} x {1}'.format(count, statement)
+                          for statement, count in repeated))
+            response.headers['X-Repeated-Queries'] = str(len(repeated))
+        return response
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Precomputed registry of the entry points of an Invenio installation.
+
+Discovering extensions and blueprints through ``pkg_resources`` scans every
+installed distribution, which is slow in large virtual environments and is
+repeated by every web and Celery worker process. The registry snapshots the
+resolved entry points into a versioned cache file:
+
+.. code-block:: console
+
+    $ invenio registry build
+
+Instances use it by importing the application factory from this package
+instead of :mod:`invenio_base.app`:
+
+.. code-block:: python
+
+    from invenio.registry import create_app_factory
+
+    create_app = create_app_factory(
+        'myinstance',
+        extension_entry_points=['invenio_base.apps'],
+        blueprint_entry_points=['invenio_base.blueprints'],
+    )
+
+The cache is rebuilt automatically whenever the installed distributions
+change.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import GROUPS, CachedEntryPoint, Registry, load_registry
+from .factory import create_app_factory
+
+__all__ = ('CachedEntryPoint', 'GROUPS', 'Registry', 'create_app_factory',
+           'load_registry', )
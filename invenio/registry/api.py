@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Snapshot of the entry points used to assemble an Invenio application."""
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import hashlib
+import importlib
+import json
+import os
+import sys
+
+from ..version import __version__
+
+GROUPS = (
+    'invenio_base.apps',
+    'invenio_base.api_apps',
+    'invenio_base.blueprints',
+    'invenio_base.api_blueprints',
+)
+"""Entry point groups included in the snapshot by default.
+
+Only the groups resolved by :func:`invenio.registry.create_app_factory`
+are cached.
+"""
+
+REGISTRY_FORMAT = 1
+"""Version of the cache file layout."""
+
+METADATA_SUFFIXES = ('.dist-info', '.egg-info', '.egg-link', '.egg', '.pth')
+"""Suffixes of the files describing installed distributions."""
+
+ENTRY_POINTS_FILES = {
+    '.dist-info': 'entry_points.txt',
+    '.egg-info': 'entry_points.txt',
+    '.egg': os.path.join('EGG-INFO', 'entry_points.txt'),
+}
+"""Location of the entry points file inside distribution metadata."""
+
+
+def default_cache_path():
+    """Get the default location of the cache file.
+
+    The location can be set with the ``INVENIO_REGISTRY_CACHE``
+    environment variable, otherwise the file is stored in ``var/`` of the
+    Python prefix (i.e. next to the instance folders).
+    """
+    return os.environ.get(
+        'INVENIO_REGISTRY_CACHE',
+        os.path.join(sys.prefix, 'var', 'invenio-registry.json'))
+
+
+def distributions_fingerprint(paths=None):
+    """Compute a fingerprint of the installed distributions.
+
+    Only the distribution metadata entries of the import paths and their
+    entry points files are inspected (no file is read), so computing the
+    fingerprint is cheap compared to scanning the entry points. Installing,
+    upgrading or removing a distribution changes the fingerprint, and so
+    does rewriting the entry points of an existing distribution (e.g.
+    re-running ``setup.py develop`` on an editable install).
+
+    :param paths: Import paths to inspect. Defaults to ``sys.path``.
+    :returns: Hexadecimal digest.
+    """
+    digest = hashlib.sha1()
+    digest.update(sys.version.encode('utf-8'))
+    for path in paths if paths is not None else sys.path:
+        digest.update(path.encode('utf-8'))
+        try:
+            names = sorted(os.listdir(path or '.'))
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith(METADATA_SUFFIXES):
+                continue
+            try:
+                mtime = os.stat(os.path.join(path, name)).st_mtime
+            except OSError:
+                continue
+            digest.update('{0}:{1!r}'.format(name, mtime).encode('utf-8'))
+            entry_points = ENTRY_POINTS_FILES.get(os.path.splitext(name)[1])
+            if entry_points:
+                try:
+                    stat = os.stat(os.path.join(path, name, entry_points))
+                    state = '{0!r}:{1}'.format(stat.st_mtime, stat.st_size)
+                except OSError:
+                    state = 'missing'
+                digest.update(state.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class CachedEntryPoint(object):
+    """Entry point restored from the cache.
+
+    It provides the subset of :class:`pkg_resources.EntryPoint` used by the
+    application factories, without requiring the entry point scan.
+    """
+
+    def __init__(self, name, module_name, attrs=(), dist=None):
+        """Initialize the entry point."""
+        self.name = name
+        self.module_name = module_name
+        self.attrs = tuple(attrs)
+        self.dist = dist
+
+    def load(self):
+        """Import the object referenced by the entry point."""
+        obj = importlib.import_module(self.module_name)
+        for attr in self.attrs:
+            obj = getattr(obj, attr)
+        return obj
+
+    def to_dict(self):
+        """Serialize the entry point."""
+        return dict(name=self.name, module_name=self.module_name,
+                    attrs=list(self.attrs), dist=self.dist)
+
+    @classmethod
+    def from_entry_point(cls, ep):
+        """Create from a :class:`pkg_resources.EntryPoint`."""
+        return cls(ep.name, ep.module_name, ep.attrs,
+                   dist=str(ep.dist) if ep.dist else None)
+
+    def __repr__(self):
+        """Represent the entry point like pkg_resources does."""
+        value = self.module_name
+        if self.attrs:
+            value += ':' + '.'.join(self.attrs)
+        return '{0} = {1}'.format(self.name, value)
+
+
+class Registry(object):
+    """Resolved entry points of a set of groups."""
+
+    def __init__(self, entry_points, fingerprint=None, created=None):
+        """Initialize the registry.
+
+        :param entry_points: Dictionary of group name to a list of
+            :class:`CachedEntryPoint`.
+        :param fingerprint: Fingerprint of the installed distributions at
+            the time the registry was built.
+        :param created: Creation date as an ISO formatted string.
+        """
+        self.entry_points = entry_points
+        self.fingerprint = fingerprint
+        self.created = created or datetime.datetime.utcnow().isoformat()
+
+    @classmethod
+    def build(cls, groups=GROUPS, paths=None):
+        """Scan the installed distributions for the entry points.
+
+        :param groups: Entry point groups to include.
+        :param paths: Import paths used for the fingerprint.
+        """
+        import pkg_resources
+        return cls(
+            dict((group, [CachedEntryPoint.from_entry_point(ep)
+                          for ep in pkg_resources.iter_entry_points(group)])
+                 for group in groups),
+            fingerprint=distributions_fingerprint(paths),
+        )
+
+    def is_valid(self, paths=None):
+        """Check if the installed distributions are still the same."""
+        return self.fingerprint == distributions_fingerprint(paths)
+
+    def iter_entry_points(self, group, name=None):
+        """Iterate over the entry points of a group.
+
+        :param group: Entry point group.
+        :param name: Only yield the entry points with this name.
+        """
+        if group not in self.entry_points:
+            raise KeyError('Entry point group {0!r} is not cached.'.format(
+                group))
+        for ep in self.entry_points[group]:
+            if name is None or ep.name == name:
+                yield ep
+
+    def load(self, group, exclude=()):
+        """Load all objects of an entry point group.
+
+        :param group: Entry point group.
+        :param exclude: Names of the entry points not to load.
+        """
+        return [ep.load() for ep in self.iter_entry_points(group)
+                if ep.name not in exclude]
+
+    def to_dict(self):
+        """Serialize the registry."""
+        return dict(
+            format=REGISTRY_FORMAT,
+            invenio=__version__,
+            fingerprint=self.fingerprint,
+            created=self.created,
+            entry_points=dict(
+                (group, [ep.to_dict() for ep in eps])
+                for group, eps in self.entry_points.items()),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize the registry."""
+        if data.get('format') != REGISTRY_FORMAT or \
+                data.get('invenio') != __version__:
+            raise ValueError('Incompatible registry cache.')
+        return cls(
+            dict((group, [CachedEntryPoint(**ep) for ep in eps])
+                 for group, eps in data['entry_points'].items()),
+            fingerprint=data['fingerprint'],
+            created=data['created'],
+        )
+
+    def save(self, path=None):
+        """Write the registry atomically to the cache file."""
+        path = path or default_cache_path()
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w') as fp:
+            json.dump(self.to_dict(), fp, indent=2, sort_keys=True)
+        os.rename(tmp_path, path)
+
+    @classmethod
+    def load_file(cls, path=None):
+        """Read the registry from the cache file."""
+        with open(path or default_cache_path()) as fp:
+            return cls.from_dict(json.load(fp))
+
+
+def load_registry(path=None, groups=GROUPS, paths=None, save=True):
+    """Load the cached registry, rebuilding it when it is stale.
+
+    The cache is rebuilt when it is missing, unreadable, does not contain
+    all requested groups or when the installed distributions changed since
+    it was built. The rebuilt registry keeps the groups already cached (and
+    the default ones), so that applications requesting different groups
+    (e.g. the UI and the REST API) share the cache instead of overwriting
+    each other's.
+
+    :param path: Path of the cache file.
+    :param groups: Entry point groups which must be available.
+    :param paths: Import paths used for the fingerprint.
+    :param save: Write the rebuilt registry back to the cache file.
+    :returns: A :class:`Registry` instance.
+    """
+    groups = set(groups)
+    try:
+        registry = Registry.load_file(path)
+        if registry.is_valid(paths) and groups <= set(registry.entry_points):
+            return registry
+        groups.update(registry.entry_points)
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        pass
+
+    registry = Registry.build(groups=sorted(groups | set(GROUPS)),
+                              paths=paths)
+    if save:
+        try:
+            registry.save(path)
+        except (IOError, OSError):
+            pass
+    return registry
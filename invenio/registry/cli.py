@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the entry point registry."""
+
+from __future__ import absolute_import, print_function
+
+import click
+
+from .api import GROUPS, Registry, default_cache_path
+
+
+@click.group()
+def registry():
+    """Entry point registry cache commands."""
+
+
+@registry.command()
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help='Path of the cache file.')
+@click.option('--group', '-g', 'groups', multiple=True,
+              help='Entry point group to include (repeatable).')
+def build(output, groups):
+    """Snapshot the installed entry points into the cache file."""
+    output = output or default_cache_path()
+    reg = Registry.build(groups=groups or GROUPS)
+    reg.save(output)
+    click.secho('Registry with {0} entry points written to {1}.'.format(
+        sum(len(eps) for eps in reg.entry_points.values()), output),
+        fg='green')
+
+
+@registry.command()
+@click.option('--path', '-p', type=click.Path(dir_okay=False),
+              help='Path of the cache file.')
+def show(path):
+    """Show the cached entry points and whether the cache is valid."""
+    path = path or default_cache_path()
+    try:
+        reg = Registry.load_file(path)
+    except (IOError, OSError, ValueError) as e:
+        raise click.ClickException(
+            'Cannot read registry cache {0}: {1}'.format(path, e))
+
+    for group in sorted(reg.entry_points):
+        click.echo('[{0}]'.format(group))
+        for ep in reg.entry_points[group]:
+            click.echo('  {0!r}'.format(ep))
+    if reg.is_valid():
+        click.secho('Cache is up to date ({0}).'.format(reg.created),
+                    fg='green')
+    else:
+        click.secho('Cache is stale, installed distributions changed.',
+                    fg='yellow')
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Application factory using the cached entry points."""
+
+from __future__ import absolute_import, print_function
+
+from .api import load_registry
+
+ENTRY_POINT_ARGUMENTS = (
+    ('extension_entry_points', 'extensions'),
+    ('blueprint_entry_points', 'blueprints'),
+    ('converter_entry_points', 'converters'),
+)
+"""Arguments of the application factory resolved from the registry."""
+
+
+def create_app_factory(app_name, registry_path=None, exclude=(), **kwargs):
+    """Create an application factory using the registry cache.
+
+    Drop-in replacement for :func:`invenio_base.app.create_app_factory`:
+    the ``*_entry_points`` arguments are resolved through the cached
+    registry instead of scanning the installed distributions.
+
+    :param app_name: Application name.
+    :param registry_path: Path of the registry cache file.
+    :param exclude: Names of the entry points not to load, e.g. the
+        extensions only needed to serve web pages.
+    """
+    from invenio_base.app import create_app_factory as base_factory
+
+    groups = set()
+    for entry_points_arg, dummy in ENTRY_POINT_ARGUMENTS:
+        groups.update(kwargs.get(entry_points_arg) or [])
+
+    if groups:
+        registry = load_registry(path=registry_path, groups=groups)
+        for entry_points_arg, objects_arg in ENTRY_POINT_ARGUMENTS:
+            objects = list(kwargs.get(objects_arg) or [])
+            for group in kwargs.pop(entry_points_arg, None) or []:
+                objects.extend(registry.load(group, exclude=exclude))
+            kwargs[objects_arg] = objects
+
+    return base_factory(app_name, **kwargs)
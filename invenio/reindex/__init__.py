@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Parallel multi-process reindexing of records.
+
+Record identifiers are partitioned into ranges, each range is serialized in
+a pool of processes and sent to the search engine as a bulk request. The
+number of bulk requests in flight is bounded, so a slow search engine slows
+down the serialization instead of filling the memory:
+
+.. code-block:: console
+
+    $ python manage.py reindex --processes 8 --checkpoint reindex.json
+
+An interrupted run resumes from the checkpoint file. Requires the
+``records`` bundle (``pip install invenio[records]``).
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import BulkIndexer, BulkIndexError, Checkpoint, bulk_body, \
+    partition, reindex
+from .ext import InvenioReindex
+
+__all__ = ('BulkIndexError', 'BulkIndexer', 'Checkpoint', 'InvenioReindex',
+           'bulk_body', 'partition', 'reindex', )
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Parallel reindexing API."""
+
+from __future__ import absolute_import, print_function
+
+import collections
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+try:
+    from queue import Queue
+    from urllib.error import HTTPError, URLError
+    from urllib.request import Request, urlopen
+except ImportError:
+    from Queue import Queue
+    from urllib2 import HTTPError, Request, URLError, urlopen
+
+from ..ingest.api import chunked
+
+RETRY_STATUSES = (429, 502, 503, 504)
+"""HTTP statuses for which a bulk request is retried."""
+
+
+def fork_context():
+    """Get the multiprocessing context starting workers with ``fork``.
+
+    The worker processes use the application context, the configuration
+    and the database engine of the parent process, which are only
+    inherited when the workers are forked (``spawn`` is the default on
+    macOS and ``forkserver`` on recent Python versions).
+    """
+    if hasattr(multiprocessing, 'get_context'):
+        return multiprocessing.get_context('fork')
+    return multiprocessing
+
+
+class BulkIndexError(Exception):
+    """A bulk request failed or some of its items were rejected."""
+
+
+def partition(ids, size):
+    """Partition sorted record identifiers into ranges.
+
+    :param ids: Iterable of identifiers in ascending order.
+    :param size: Maximum number of identifiers per range.
+    :returns: Generator of ``(first, last)`` tuples (both inclusive).
+    """
+    for chunk in chunked(ids, size):
+        yield (chunk[0], chunk[-1])
+
+
+def bulk_body(documents, index, doc_type):
+    """Build a newline delimited bulk request body.
+
+    :param documents: Iterable of ``(identifier, document)`` tuples.
+    :param index: Name of the index.
+    :param doc_type: Document type.
+    :returns: The request body as bytes.
+    """
+    lines = []
+    for doc_id, document in documents:
+        lines.append(json.dumps({'index': dict(
+            _index=index, _type=doc_type, _id=str(doc_id))}))
+        lines.append(json.dumps(document))
+    return ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+
+
+class Checkpoint(object):
+    """Completed ranges persisted to a file.
+
+    The file is rewritten atomically after every completed range, so an
+    interrupted reindexing resumes after the last acknowledged range.
+    """
+
+    def __init__(self, path=None):
+        """Initialize the checkpoint.
+
+        :param path: Path of the checkpoint file. Without path the progress
+            is only kept in memory.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.completed = set()
+        if path and os.path.exists(path):
+            with open(path) as fp:
+                self.completed = set(
+                    tuple(bounds) for bounds in json.load(fp)['completed'])
+
+    @staticmethod
+    def key(bounds):
+        """Normalize range bounds (e.g. UUIDs) to JSON values."""
+        return tuple(
+            b if isinstance(b, (int, float)) else str(b) for b in bounds)
+
+    def is_done(self, bounds):
+        """Check if a range was already indexed."""
+        return self.key(bounds) in self.completed
+
+    def done(self, bounds):
+        """Mark a range as indexed."""
+        with self.lock:
+            self.completed.add(self.key(bounds))
+            if self.path:
+                tmp_path = '{0}.tmp'.format(self.path)
+                with open(tmp_path, 'w') as fp:
+                    json.dump(dict(completed=sorted(self.completed)), fp)
+                os.rename(tmp_path, self.path)
+
+
+class BulkIndexer(object):
+    """Send bulk requests with a bounded number of requests in flight.
+
+    :meth:`submit` blocks while ``max_in_flight`` requests are queued or
+    being sent, which applies back-pressure on the producers. Requests
+    rejected because the engine is overloaded are retried with an
+    exponential backoff.
+    """
+
+    def __init__(self, url, max_in_flight=4, max_retries=5, backoff=0.5,
+                 timeout=60):
+        """Initialize the indexer and start the sender threads.
+
+        :param url: Base URL of the search engine.
+        :param max_in_flight: Maximum number of concurrent bulk requests.
+        :param max_retries: Retries of an overloaded request.
+        :param backoff: Initial delay between retries in seconds.
+        :param timeout: Timeout of a bulk request in seconds.
+        """
+        self.url = url.rstrip('/') + '/_bulk'
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.queue = Queue(maxsize=max_in_flight)
+        self.errors = []
+        self.sent = 0
+        self.retried = 0
+        self.threads = []
+        for dummy in range(max_in_flight):
+            thread = threading.Thread(target=self._worker)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, body, callback=None):
+        """Queue a bulk request, blocking while too many are in flight.
+
+        :param body: Newline delimited bulk request body.
+        :param callback: Called without arguments once the request
+            succeeded.
+        """
+        if self.errors:
+            raise self.errors[0]
+        self.queue.put((body, callback))
+
+    def send(self, body):
+        """Send one bulk request, retrying when the engine is overloaded."""
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            request = Request(self.url, data=body, headers={
+                'Content-Type': 'application/x-ndjson'})
+            try:
+                response = urlopen(request, timeout=self.timeout)
+                result = json.loads(response.read().decode('utf-8'))
+                break
+            except HTTPError as e:
+                if e.code not in RETRY_STATUSES or \
+                        attempt == self.max_retries:
+                    raise BulkIndexError('Bulk request failed: {0}'.format(e))
+            except URLError as e:
+                if attempt == self.max_retries:
+                    raise BulkIndexError('Bulk request failed: {0}'.format(e))
+            self.retried += 1
+            time.sleep(delay)
+            delay *= 2
+
+        if result.get('errors'):
+            failed = [item for item in result['items']
+                      if list(item.values())[0].get('status', 500) >= 300]
+            raise BulkIndexError('{0} documents rejected, first: {1}'.format(
+                len(failed), failed[0] if failed else None))
+        return result
+
+    def _worker(self):
+        """Send queued requests until the ``None`` sentinel is received."""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                body, callback = item
+                if not self.errors:
+                    self.send(body)
+                    self.sent += 1
+                    if callback:
+                        callback()
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """Wait for the queued requests and stop the sender threads.
+
+        :raises BulkIndexError: If any request failed.
+        """
+        for dummy in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.errors:
+            raise self.errors[0]
+
+
+def reindex(ranges, serializer, indexer, processes=None, checkpoint=None,
+            initializer=None, callback=None):
+    """Serialize ranges of records in parallel and bulk index them.
+
+    At most ``2 * processes`` serialized ranges are waiting for the indexer
+    at any time, so memory usage is bounded regardless of the number of
+    records.
+
+    :param ranges: Iterable of ``(first, last)`` identifier ranges.
+    :param serializer: Picklable function called in the worker processes
+        with a range and returning a bulk request body.
+    :param indexer: A :class:`BulkIndexer`.
+    :param processes: Number of worker processes (defaults to CPU count).
+    :param checkpoint: A :class:`Checkpoint` used to skip ranges already
+        indexed and to record progress.
+    :param initializer: Called in each worker process when it starts.
+    :param callback: Called with each range once it has been indexed.
+    :returns: Number of ranges submitted.
+    """
+    checkpoint = checkpoint or Checkpoint()
+    processes = processes or multiprocessing.cpu_count()
+    pending = collections.deque()
+    submitted = 0
+
+    def acknowledge(bounds):
+        def _acknowledge():
+            checkpoint.done(bounds)
+            if callback:
+                callback(bounds)
+        return _acknowledge
+
+    def drain(limit):
+        while len(pending) > limit:
+            bounds, result = pending.popleft()
+            body = result.get()
+            if body:
+                indexer.submit(body, callback=acknowledge(bounds))
+            else:
+                acknowledge(bounds)()
+
+    pool = fork_context().Pool(processes, initializer=initializer)
+    try:
+        for bounds in ranges:
+            if checkpoint.is_done(bounds):
+                continue
+            pending.append(
+                (bounds, pool.apply_async(serializer, (bounds, ))))
+            submitted += 1
+            drain(2 * processes)
+        drain(0)
+    finally:
+        pool.close()
+        pool.join()
+        indexer.close()
+    return submitted
+
+
+def record_ids():
+    """Iterate over the identifiers of all records in ascending order."""
+    from invenio_records.models import RecordMetadata
+
+    query = RecordMetadata.query.with_entities(RecordMetadata.id).order_by(
+        RecordMetadata.id)
+    for row in query.yield_per(10000):
+        yield row[0]
+
+
+def serialize_records(bounds):
+    """Serialize a range of records into a bulk request body.
+
+    Runs in the worker processes, within the application context inherited
+    from the parent process (see :func:`fork_context`).
+
+    :param bounds: ``(first, last)`` record identifiers (inclusive).
+    """
+    from flask import current_app
+    from invenio_records.models import RecordMetadata
+
+    first, last = bounds
+    query = RecordMetadata.query.filter(
+        RecordMetadata.id.between(first, last)).order_by(RecordMetadata.id)
+    return bulk_body(
+        ((model.id, model.json) for model in query),
+        index=current_app.config['REINDEX_INDEX'],
+        doc_type=current_app.config['REINDEX_DOC_TYPE'],
+    )
+
+
+def init_worker():
+    """Reset the inherited database connections in a worker process."""
+    from flask import current_app
+
+    from ..server.arbiter import reset_after_fork
+    reset_after_fork(current_app._get_current_object())
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for parallel reindexing."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import BulkIndexer, Checkpoint, init_worker, partition, record_ids, \
+    reindex, serialize_records
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.command('reindex')
+@click.option('--url', help='Search engine URL (REINDEX_URL).')
+@click.option('--processes', '-p', type=int,
+              help='Serialization processes (defaults to CPU count).')
+@click.option('--chunk-size', '-n', type=int,
+              help='Records per bulk request (REINDEX_CHUNK_SIZE).')
+@click.option('--max-in-flight', type=int,
+              help='Concurrent bulk requests (REINDEX_MAX_IN_FLIGHT).')
+@click.option('--checkpoint', '-c', type=click.Path(dir_okay=False),
+              help='File recording progress, to resume an interrupted run.')
+@with_appcontext
+def reindex_cmd(url, processes, chunk_size, max_in_flight, checkpoint):
+    """Reindex all records in parallel."""
+    config = current_app.config
+    indexer = BulkIndexer(
+        url or config['REINDEX_URL'],
+        max_in_flight=max_in_flight or config['REINDEX_MAX_IN_FLIGHT'],
+        max_retries=config['REINDEX_MAX_RETRIES'],
+    )
+    done = Checkpoint(checkpoint)
+    if done.completed:
+        click.echo('Resuming, {0} ranges already indexed.'.format(
+            len(done.completed)), err=True)
+
+    count = reindex(
+        partition(record_ids(), chunk_size or config['REINDEX_CHUNK_SIZE']),
+        serialize_records,
+        indexer,
+        processes=processes,
+        checkpoint=done,
+        initializer=init_worker,
+        callback=lambda bounds: click.echo(
+            'Indexed {0} - {1}'.format(*bounds), err=True),
+    )
+    searchcache = current_app.extensions.get('invenio-searchcache')
+    if searchcache is not None and searchcache.cache is not None:
+        searchcache.cache.invalidate(config['REINDEX_INDEX'], written=True)
+    click.secho('Reindexed {0} ranges ({1} retried requests).'.format(
+        count, indexer.retried), fg='green')
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Parallel reindexing configuration."""
+
+REINDEX_URL = 'http://localhost:9200'
+"""Base URL of the search engine."""
+
+REINDEX_INDEX = 'records'
+"""Name of the index receiving the records."""
+
+REINDEX_DOC_TYPE = 'record'
+"""Document type of the indexed records."""
+
+REINDEX_CHUNK_SIZE = 1000
+"""Number of records per range (and per bulk request)."""
+
+REINDEX_MAX_IN_FLIGHT = 4
+"""Maximum number of concurrent bulk requests."""
+
+REINDEX_MAX_RETRIES = 5
+"""Retries of a bulk request rejected because the engine is overloaded."""
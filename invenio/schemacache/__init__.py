@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cache of compiled JSONSchema validators.
+
+Invenio-Records validates every created or updated record against its
+``$schema``, building a new validator each time: the schema is checked
+against its meta-schema and its ``$ref`` chains are resolved again, which
+dominates bulk loads. This module keeps one validator per schema URL and
+content digest for the lifetime of the process:
+
+* schemas of the packages registered in the ``invenio_jsonschemas.schemas``
+  entry point group and of ``SCHEMACACHE_DIRECTORIES`` are stored locally,
+  so references are resolved without network access;
+* the validators of all local schemas are compiled at startup;
+* record validation by Invenio-Records goes through the cache;
+* many records are validated in one call with :meth:`validate_many
+  <invenio.schemacache.api.ValidatorCache.validate_many>`, or from the
+  command line with ``schemas validate``.
+
+Hits and misses are reported by the instrumentation metrics.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import BatchResult, SchemaNotFound, SchemaStore, ValidatorCache, \
+    compile_validator
+from .ext import InvenioSchemaCache
+
+__all__ = ('BatchResult', 'InvenioSchemaCache', 'SchemaNotFound',
+           'SchemaStore', 'ValidatorCache', 'compile_validator', )
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Local schema store and compiled validator cache."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import json
+import os
+import threading
+
+from ..cache import CacheStats
+
+try:
+    from urllib.parse import urldefrag
+except ImportError:  # pragma: no cover
+    from urlparse import urldefrag
+
+
+class SchemaNotFound(LookupError):
+    """A schema is neither stored locally nor resolvable."""
+
+
+def schema_digest(schema):
+    """Compute the content digest of a schema."""
+    return hashlib.sha1(json.dumps(
+        schema, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+
+
+class SchemaStore(object):
+    """Schemas available locally, by URL.
+
+    ``$ref`` to stored schemas are resolved without any network access.
+    """
+
+    def __init__(self):
+        """Initialize the store."""
+        self.schemas = {}
+        self.digests = {}
+
+    def __contains__(self, url):
+        """Check if a schema is stored."""
+        return urldefrag(url)[0] in self.schemas
+
+    def __len__(self):
+        """Return the number of stored schemas."""
+        return len(self.schemas)
+
+    def add(self, url, schema):
+        """Store a schema.
+
+        :returns: ``True`` if the schema is new or its content changed.
+        """
+        url = urldefrag(url)[0]
+        digest = schema_digest(schema)
+        changed = self.digests.get(url) != digest
+        self.schemas[url] = schema
+        self.digests[url] = digest
+        return changed
+
+    def get(self, url):
+        """Get a stored schema.
+
+        :raises SchemaNotFound: If the schema is not stored.
+        """
+        try:
+            return self.schemas[urldefrag(url)[0]]
+        except KeyError:
+            raise SchemaNotFound(url)
+
+    def load_directory(self, directory, url_prefix):
+        """Store the ``.json`` schemas of a directory tree.
+
+        :param directory: Root directory of the schemas.
+        :param url_prefix: URL of the root directory.
+        :returns: List of the URLs of the loaded schemas.
+        """
+        url_prefix = url_prefix.rstrip('/') + '/'
+        urls = []
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                with open(path) as fp:
+                    schema = json.load(fp)
+                url = url_prefix + os.path.relpath(path, directory).replace(
+                    os.sep, '/')
+                self.add(url, schema)
+                urls.append(url)
+        return urls
+
+
+def compile_validator(schema, url, store, format_checker=None):
+    """Build a validator of a schema resolving references in the store.
+
+    The schema itself is checked against its meta-schema once, here, and
+    not at every validation.
+
+    :param schema: The schema.
+    :param url: URL of the schema (base of relative references).
+    :param store: :class:`SchemaStore` of the referenced schemas.
+    :param format_checker: ``jsonschema.FormatChecker`` to use.
+    """
+    from jsonschema.validators import validator_for
+
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    try:
+        from referencing import Registry, Resource
+        from referencing.jsonschema import specification_with
+    except ImportError:
+        # jsonschema < 4.18 resolves references with a RefResolver.
+        from jsonschema import RefResolver
+        resolver = RefResolver(url or '', schema, store=dict(store.schemas))
+        return cls(schema, resolver=resolver, format_checker=format_checker)
+
+    default = specification_with(cls.META_SCHEMA.get('$schema', ''))
+
+    def retrieve(uri):
+        try:
+            return Resource.from_contents(store.get(uri),
+                                          default_specification=default)
+        except SchemaNotFound:
+            raise LookupError(uri)
+
+    resources = dict(
+        (ref_url, Resource.from_contents(
+            ref_schema, default_specification=default))
+        for ref_url, ref_schema in store.schemas.items())
+    if url:
+        resources[url] = Resource.from_contents(
+            schema, default_specification=default)
+    registry = Registry(retrieve=retrieve).with_resources(
+        resources.items()).crawl()
+    # Relative references are resolved against the URL of the schema.
+    return cls({'$ref': url} if url else schema, registry=registry,
+               format_checker=format_checker)
+
+
+class ValidatorCache(object):
+    """Process-wide cache of compiled validators.
+
+    Validators are keyed on the schema URL and the digest of its content,
+    so a schema changed in the store gets a new validator. References are
+    resolved from the :class:`SchemaStore` and, once resolved, kept by the
+    validator.
+    """
+
+    def __init__(self, store=None, format_checker=None):
+        """Initialize the cache.
+
+        :param store: :class:`SchemaStore` of the local schemas.
+        :param format_checker: ``jsonschema.FormatChecker`` used by the
+            validators.
+        """
+        self.store = SchemaStore() if store is None else store
+        self.format_checker = format_checker
+        self.validators = {}
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _key(self, schema):
+        """Get the cache key and the content of a schema URL or schema."""
+        if isinstance(schema, dict):
+            return ('', schema_digest(schema)), schema, ''
+        url = urldefrag(schema)[0]
+        if url not in self.store:
+            raise SchemaNotFound(schema)
+        return (url, self.store.digests[url]), self.store.get(url), url
+
+    def get(self, schema):
+        """Get the validator of a schema.
+
+        :param schema: URL of a stored schema, or a schema.
+        :raises SchemaNotFound: If the URL is not in the store.
+        """
+        key, content, url = self._key(schema)
+        validator = self.validators.get(key)
+        if validator is not None:
+            self.stats.hit()
+            return validator
+        self.stats.miss()
+        with self._lock:
+            validator = self.validators.get(key)
+            if validator is None:
+                validator = compile_validator(
+                    content, url, self.store,
+                    format_checker=self.format_checker)
+                # Drop the validators of previous versions of the schema.
+                for old in [k for k in self.validators
+                            if url and k[0] == url]:
+                    del self.validators[old]
+                    self.stats.invalidate()
+                self.validators[key] = validator
+        return validator
+
+    def preload(self, urls=None):
+        """Compile the validators of stored schemas.
+
+        :param urls: URLs of the schemas (defaults to all stored schemas).
+        :returns: Number of compiled validators.
+        """
+        urls = sorted(self.store.schemas) if urls is None else urls
+        for url in urls:
+            self.get(url)
+        return len(urls)
+
+    def clear(self):
+        """Drop all validators."""
+        with self._lock:
+            self.stats.invalidate(len(self.validators))
+            self.validators.clear()
+
+    def validate(self, data, schema):
+        """Validate data, like :func:`jsonschema.validate`.
+
+        :raises jsonschema.ValidationError: If the data is invalid.
+        """
+        from jsonschema.exceptions import best_match
+
+        validator = self.get(schema)
+        error = best_match(validator.iter_errors(data))
+        if error is not None:
+            raise error
+
+    def validate_many(self, records, schema=None, max_errors=10):
+        """Validate records in batch.
+
+        Records are validated with the schema of their ``$schema`` field
+        (or ``schema``); the validator of each schema is looked up once per
+        call. Valid records are only checked, errors are collected for the
+        invalid ones.
+
+        :param records: Iterable of record dictionaries.
+        :param schema: Schema URL or schema of the records without
+            ``$schema`` (records without any schema are not validated).
+        :param max_errors: Maximum number of errors reported per record.
+        :returns: A :class:`BatchResult`.
+        """
+        result = BatchResult()
+        validators = {}
+        for index, record in enumerate(records):
+            record_schema = record.get('$schema', schema)
+            if record_schema is None:
+                result.skipped += 1
+                continue
+            key = record_schema if not isinstance(record_schema, dict) \
+                else id(record_schema)
+            validator = validators.get(key)
+            if validator is None:
+                validator = validators[key] = self.get(record_schema)
+            if validator.is_valid(record):
+                result.valid += 1
+                continue
+            errors = []
+            for error in validator.iter_errors(record):
+                errors.append(dict(
+                    path='/'.join(str(p) for p in error.absolute_path),
+                    message=error.message))
+                if len(errors) >= max_errors:
+                    break
+            result.errors[index] = errors
+        return result
+
+
+class BatchResult(object):
+    """Outcome of a batch validation."""
+
+    def __init__(self):
+        """Initialize."""
+        self.valid = 0
+        self.skipped = 0
+        self.errors = {}
+        """Errors (``path`` and ``message``) of the invalid records, by
+        position in the batch."""
+
+    @property
+    def invalid(self):
+        """Number of invalid records."""
+        return len(self.errors)
+
+    def __bool__(self):
+        """Check that all records are valid."""
+        return not self.errors
+
+    __nonzero__ = __bool__
+
+    def to_dict(self):
+        """Serialize the result."""
+        return dict(valid=self.valid, invalid=self.invalid,
+                    skipped=self.skipped, errors=self.errors)
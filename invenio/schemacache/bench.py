@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Throughput of record validation with and without the validator cache.
+
+Records are validated against a schema referencing definitions of a second
+schema:
+
+* ``uncached``: a validator is built for every record, as Invenio-Records
+  does (the schema is checked and its references resolved every time);
+* ``cached``: every record is validated with the cached validator;
+* ``batch``: the records are validated in one batch.
+"""
+
+from __future__ import absolute_import, print_function
+
+from ..bench.api import timer
+from .api import SchemaStore, ValidatorCache, compile_validator
+
+DEFINITIONS_URL = 'http://localhost/schemas/definitions-v1.0.0.json'
+RECORD_URL = 'http://localhost/schemas/record-v1.0.0.json'
+
+DEFINITIONS = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'definitions': {
+        'title': {'type': 'string', 'minLength': 1},
+        'person': {
+            'type': 'object',
+            'properties': {
+                'name': {'type': 'string'},
+                'affiliation': {'type': 'string'},
+            },
+            'required': ['name'],
+        },
+        'keywords': {
+            'type': 'array',
+            'items': {'type': 'string'},
+            'uniqueItems': True,
+        },
+    },
+}
+
+RECORD = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'type': 'object',
+    'properties': {
+        '$schema': {'type': 'string'},
+        'recid': {'type': 'integer'},
+        'title': {'$ref': 'definitions-v1.0.0.json#/definitions/title'},
+        'authors': {
+            'type': 'array',
+            'items': {'$ref': 'definitions-v1.0.0.json#/definitions/person'},
+        },
+        'keywords': {
+            '$ref': 'definitions-v1.0.0.json#/definitions/keywords'},
+    },
+    'required': ['recid', 'title'],
+}
+
+
+def generate_records(count):
+    """Generate valid records."""
+    return [dict(
+        recid=recid,
+        title='Record {0}'.format(recid),
+        authors=[dict(name='Author {0}'.format(i), affiliation='CERN')
+                 for i in range(3)],
+        keywords=['physics', 'keyword {0}'.format(recid)],
+    ) for recid in range(count)]
+
+
+def run(records=2000, **kwargs):
+    """Measure the validated records per second.
+
+    :param records: Number of validated records.
+    :returns: Dictionary of the results, or of the missing dependency.
+    """
+    try:
+        import jsonschema  # noqa
+    except ImportError:
+        return dict(skipped=True, missing=['jsonschema'])
+
+    store = SchemaStore()
+    store.add(DEFINITIONS_URL, DEFINITIONS)
+    store.add(RECORD_URL, RECORD)
+    data = generate_records(records)
+
+    def uncached():
+        for record in data:
+            compile_validator(RECORD, RECORD_URL, store).validate(record)
+
+    def cached():
+        cache = ValidatorCache(store)
+        for record in data:
+            cache.validate(record, RECORD_URL)
+
+    def batch():
+        assert ValidatorCache(store).validate_many(data, RECORD_URL)
+
+    results = dict(records=records)
+    for name, func in (('uncached', uncached), ('cached', cached),
+                       ('batch', batch)):
+        start = timer()
+        func()
+        elapsed = timer() - start
+        results[name] = dict(seconds=elapsed,
+                             records_per_second=records / elapsed)
+    results['speedup'] = results['batch']['records_per_second'] / \
+        results['uncached']['records_per_second']
+    return results
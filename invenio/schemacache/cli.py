@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the JSONSchema validator cache."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from ..ingest.readers import READERS
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.group()
+def schemas():
+    """Record schema commands."""
+
+
+@schemas.command('list')
+@with_appcontext
+def list_schemas():
+    """List the local schemas."""
+    store = current_app.extensions['invenio-schemacache'].store
+    for url in sorted(store.schemas):
+        click.echo(url)
+
+
+@schemas.command()
+@click.argument('source', type=click.File('rb'), default='-')
+@click.option('--format', '-f', 'input_format', default='jsonl',
+              type=click.Choice(sorted(READERS)), show_default=True,
+              help='Format of the input.')
+@click.option('--schema', '-s',
+              help='Schema URL of the records without "$schema".')
+@click.option('--chunk-size', '-n', default=10000, type=int,
+              show_default=True, help='Records validated per batch.')
+@with_appcontext
+def validate(source, input_format, schema, chunk_size):
+    """Validate records from SOURCE (a file or "-" for stdin)."""
+    from ..ingest.api import chunked
+    from .api import SchemaNotFound
+
+    ext = current_app.extensions['invenio-schemacache']
+    offset = valid = invalid = 0
+    for batch in chunked(READERS[input_format](source), chunk_size):
+        try:
+            result = ext.validate_many(batch, schema=schema)
+        except SchemaNotFound as e:
+            raise click.ClickException('Unknown schema {0}.'.format(e))
+        for index, errors in sorted(result.errors.items()):
+            for error in errors:
+                click.echo('Record {0}: {1}: {2}'.format(
+                    offset + index + 1, error['path'] or '/',
+                    error['message']))
+        offset += len(batch)
+        valid += result.valid
+        invalid += result.invalid
+    click.secho('{0} valid, {1} invalid records.'.format(valid, invalid),
+                fg='red' if invalid else 'green')
+    if invalid:
+        raise SystemExit(1)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""JSONSchema validator cache configuration."""
+
+SCHEMACACHE_ENABLED = True
+"""Validate records with the cached validators."""
+
+SCHEMACACHE_URL_PREFIX = None
+"""URL of the schemas of the entry point packages (defaults to
+``http://<JSONSCHEMAS_HOST>/schemas/``, with ``localhost`` as host)."""
+
+SCHEMACACHE_ENTRY_POINT_GROUP = 'invenio_jsonschemas.schemas'
+"""Entry point group of the packages providing schemas.
+
+The URL of a schema file of a package is ``SCHEMACACHE_URL_PREFIX``
+followed by its path relative to the package.
+"""
+
+SCHEMACACHE_DIRECTORIES = {}
+"""Additional schema directories, by URL prefix (e.g.
+``{'http://example.org/schemas/': '/path/to/schemas'}``)."""
+
+SCHEMACACHE_PRELOAD = True
+"""Compile the validators of all local schemas when the application
+starts, instead of on first use."""
+
+SCHEMACACHE_MAX_ERRORS = 10
+"""Maximum number of errors reported per invalid record by batch
+validation."""
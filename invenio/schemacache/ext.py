@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""JSONSchema validator cache extension."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+from flask import appcontext_pushed
+
+from . import config
+from .api import SchemaNotFound, SchemaStore, ValidatorCache
+from .cli import schemas
+
+
+class InvenioSchemaCache(object):
+    """JSONSchema validator cache extension.
+
+    Loads the local schemas, compiles their validators when the application
+    starts and makes Invenio-Records validate records with them. The
+    validators are installed as soon as Invenio-Records is initialized:
+    right away if it was loaded first, otherwise when an application
+    context is pushed.
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.store = SchemaStore()
+        self.cache = ValidatorCache(self.store)
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.cli.add_command(schemas)
+        app.extensions['invenio-schemacache'] = self
+        if not app.config['SCHEMACACHE_ENABLED']:
+            return
+
+        self.load_schemas(app)
+        if app.config['SCHEMACACHE_PRELOAD']:
+            try:
+                self.cache.preload()
+            except ImportError:
+                app.logger.warning('Cannot preload the validators, '
+                                   '"jsonschema" is not installed.')
+        if not self.install(app):
+            appcontext_pushed.connect(
+                lambda sender, **kwargs: self.install(sender), app,
+                weak=False)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('SCHEMACACHE_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def load_schemas(self, app):
+        """Load the schemas of the entry point packages and directories.
+
+        :returns: List of the URLs of the loaded schemas.
+        """
+        import pkg_resources
+
+        prefix = app.config['SCHEMACACHE_URL_PREFIX'] or \
+            'http://{0}/schemas/'.format(
+                app.config.get('JSONSCHEMAS_HOST', 'localhost'))
+        urls = []
+        for ep in pkg_resources.iter_entry_points(
+                app.config['SCHEMACACHE_ENTRY_POINT_GROUP']):
+            directory = os.path.dirname(ep.load().__file__)
+            urls.extend(self.store.load_directory(directory, prefix))
+        for url_prefix, directory in sorted(
+                app.config['SCHEMACACHE_DIRECTORIES'].items()):
+            urls.extend(self.store.load_directory(directory, url_prefix))
+        return urls
+
+    def install(self, app):
+        """Validate the records of an application with cached validators.
+
+        :returns: ``True`` if the validation of Invenio-Records is replaced.
+        """
+        state = app.extensions.get('invenio-records')
+        if state is None:
+            return False
+        if getattr(state.validate, 'cached', False):
+            return True
+        original = state.validate
+
+        def validate(data, schema, **kwargs):
+            if any(kwargs.values()) or not isinstance(
+                    schema, (dict, type(u''), type(''))):
+                return original(data, schema, **kwargs)
+            try:
+                return self.cache.validate(data, schema)
+            except SchemaNotFound:
+                return original(data, schema, **kwargs)
+
+        validate.cached = True
+        state.validate = validate
+        return True
+
+    def validate_many(self, records, schema=None):
+        """Validate records in batch (see :class:`ValidatorCache`).
+
+        The schemas of the records must be stored locally.
+        """
+        from flask import current_app
+
+        return self.cache.validate_many(
+            records, schema=schema,
+            max_errors=current_app.config['SCHEMACACHE_MAX_ERRORS'])
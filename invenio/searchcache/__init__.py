@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Search result cache with index generation invalidation.
+
+Landing and browse pages send the same searches over and over. Once the
+extension is loaded, searches through the Invenio-Search client are
+answered from a cache keyed on the normalized search and on the
+generation of the searched indices. Indexing, deleting or refreshing
+through the client increments the generation, invalidating the cached
+results of the affected indices.
+
+The cache is disabled by default. It is kept in the Redis configured by
+``CACHE_REDIS_HOST``, so that index writes from any web or Celery worker
+process, or from a bulk reindex, invalidate the results of all processes:
+
+.. code-block:: python
+
+    SEARCHCACHE_ENABLED = True
+    SEARCHCACHE_BACKEND = 'redis'
+
+Timeouts can be set per index pattern (``SEARCHCACHE_INDEX_TIMEOUTS``),
+per query (``SEARCHCACHE_TIMEOUT_LOADER``) or per call:
+
+.. code-block:: python
+
+    from invenio_search import current_search_client
+
+    current_search_client.search(index='records', body=query,
+                                 cache_timeout=60)
+
+Hits, misses and invalidations are exposed by the instrumentation metrics
+endpoint.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import CachedSearchClient, SearchCache, normalize_query
+from .ext import InvenioSearchCache
+
+__all__ = ('CachedSearchClient', 'InvenioSearchCache', 'SearchCache',
+           'normalize_query', )
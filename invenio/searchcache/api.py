@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Search result cache with index generation invalidation."""
+
+from __future__ import absolute_import, print_function
+
+import fnmatch
+import json
+import math
+import re
+
+from ..cache import CacheStats
+from ..httpcache.api import digest
+
+ALL = '_all'
+"""Group of searches spanning all indices."""
+
+IGNORED_PARAMS = ('request_timeout', 'cache_timeout')
+"""Search parameters which do not change the result."""
+
+
+def _normalize(value):
+    """Collapse whitespace of query strings, recursively."""
+    if isinstance(value, dict):
+        return dict((k, re.sub(r'\s+', ' ', v).strip()
+                     if k in ('query', 'q') and hasattr(v, 'strip')
+                     else _normalize(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def normalize_query(index, doc_type, body, params):
+    """Return a canonical representation of a search.
+
+    Searches differing only by the order of keys, whitespace in query
+    strings or ignored parameters are equal.
+    """
+    params = dict((k, v) for k, v in params.items()
+                  if k not in IGNORED_PARAMS)
+    return json.dumps(_normalize(dict(
+        index=index, doc_type=doc_type, body=body or {}, params=params)),
+        sort_keys=True, separators=(',', ':'))
+
+
+def index_groups(index):
+    """Return the invalidation groups of an index expression.
+
+    Indices are grouped by the part of their name before the first dash,
+    following the Invenio naming of indices behind an alias (e.g. index
+    ``records-record-v1.0.0`` behind alias ``records``), so writes to an
+    index invalidate searches on its alias.
+    """
+    if not index or index in (ALL, '*'):
+        return [ALL]
+    if not isinstance(index, (list, tuple)):
+        index = index.split(',')
+    groups = set(name.split('-')[0].rstrip('*') for name in index)
+    return [ALL] if '' in groups else sorted(groups)
+
+
+def bulk_indices(body, index=None):
+    """Return the indices written by bulk actions."""
+    if not isinstance(body, list):
+        body = [json.loads(line) for line in body.splitlines() if line]
+    indices = set([index]) if index else set()
+    skip = False
+    for action in body:
+        if skip:
+            skip = False
+            continue
+        (op_type, meta), = action.items()
+        indices.add(meta.get('_index', index))
+        skip = op_type != 'delete'
+    return indices
+
+
+class SearchCache(object):
+    """Cache of search results.
+
+    Entries are keyed on the normalized search and on the generation of
+    the searched indices. Writing to or refreshing an index increments its
+    generation, which makes the cached results of the searches on it
+    unreachable in every process sharing the backend.
+
+    Written documents only become searchable after a refresh; until then
+    (at most ``refresh_interval`` seconds) results of the written indices are
+    not cached, as they could miss the new documents.
+    """
+
+    def __init__(self, backend, timeout=300, index_timeouts=None,
+                 timeout_loader=None, refresh_interval=1):
+        """Initialize the cache.
+
+        :param backend: Cache backend (see :mod:`invenio.cache`).
+        :param timeout: Default seconds a result is kept.
+        :param index_timeouts: Timeouts by index name pattern.
+        :param timeout_loader: Function returning the timeout of a query.
+        :param refresh_interval: Seconds until written documents become
+            searchable.
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self.index_timeouts = index_timeouts or {}
+        self.timeout_loader = timeout_loader
+        self.refresh_interval = int(math.ceil(refresh_interval))
+        self.stats = CacheStats()
+
+    @staticmethod
+    def generation_key(group):
+        """Key of the invalidation counter of an index group."""
+        return 'gen:{0}'.format(group)
+
+    @staticmethod
+    def dirty_key(group):
+        """Key marking an index group with unrefreshed writes."""
+        return 'dirty:{0}'.format(group)
+
+    def get_timeout(self, index, doc_type, body, params, timeout=None):
+        """Return the timeout of a search (``0`` if not cacheable).
+
+        :param timeout: Timeout requested by the caller, which takes
+            precedence over the configured ones.
+        """
+        if 'scroll' in params:
+            return 0
+        if timeout is None and self.timeout_loader:
+            timeout = self.timeout_loader(index, doc_type, body, params)
+        if timeout is None and self.index_timeouts and index:
+            names = index if isinstance(index, (list, tuple)) else \
+                index.split(',')
+            for pattern, value in sorted(self.index_timeouts.items()):
+                if any(fnmatch.fnmatch(name, pattern) for name in names):
+                    timeout = value
+                    break
+        return self.timeout if timeout is None else timeout
+
+    def is_dirty(self, groups):
+        """Check if some index groups have unrefreshed writes."""
+        return any(value is not None for value in self.backend.get_many(
+            [self.dirty_key(group) for group in groups]))
+
+    def make_key(self, index, doc_type, body, params):
+        """Build the cache key of a search."""
+        generations = ','.join(
+            '{0}={1}'.format(group, self.backend.get_counter(
+                self.generation_key(group)))
+            for group in index_groups(index))
+        return 'search:{0}:{1}'.format(
+            digest(normalize_query(index, doc_type, body, params)),
+            digest(generations))
+
+    def search(self, func, index=None, doc_type=None, body=None,
+               timeout=None, **params):
+        """Return a cached search result, or search and cache it.
+
+        :param func: Search function of the client.
+        :param timeout: Seconds the result is kept, overriding the
+            configured timeouts.
+        """
+        timeout = self.get_timeout(index, doc_type, body, params, timeout)
+        if not timeout or self.is_dirty(index_groups(index)):
+            self.stats.miss()
+            return func(index=index, doc_type=doc_type, body=body, **params)
+
+        key = self.make_key(index, doc_type, body, params)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.stats.hit()
+            return json.loads(cached)
+        self.stats.miss()
+        result = func(index=index, doc_type=doc_type, body=body, **params)
+        if not result.get('timed_out') and \
+                not result.get('_shards', {}).get('failed'):
+            self.backend.set(key, json.dumps(result), timeout=timeout)
+        return result
+
+    def invalidate(self, index=None, written=False):
+        """Invalidate the cached searches of indices.
+
+        :param index: Index expression (all indices by default).
+        :param written: Documents were written but the indices were not
+            refreshed: do not cache their results until they are.
+        """
+        groups = set(index_groups(index)) | set([ALL])
+        for group in groups:
+            self.backend.incr(self.generation_key(group))
+            if written:
+                self.backend.set(self.dirty_key(group), 1,
+                                 timeout=self.refresh_interval)
+            elif group != ALL or index_groups(index) == [ALL]:
+                self.backend.delete(self.dirty_key(group))
+        self.stats.invalidate()
+
+
+class CachedIndicesClient(object):
+    """Index management client invalidating the cache."""
+
+    def __init__(self, indices, cache):
+        """Wrap an indices client."""
+        self._indices = indices
+        self._cache = cache
+
+    def __getattr__(self, name):
+        """Delegate to the wrapped client."""
+        return getattr(self._indices, name)
+
+    def refresh(self, index=None, **params):
+        """Refresh indices and invalidate their cached searches."""
+        result = self._indices.refresh(index=index, **params)
+        self._cache.invalidate(index)
+        return result
+
+    def delete(self, index, **params):
+        """Delete indices and invalidate their cached searches."""
+        result = self._indices.delete(index=index, **params)
+        self._cache.invalidate(index)
+        return result
+
+
+class CachedSearchClient(object):
+    """Elasticsearch client answering searches from a :class:`SearchCache`.
+
+    Writes through the client invalidate the cache. Searches accept an
+    extra ``cache_timeout`` keyword argument overriding the configured
+    timeout (``0`` bypasses the cache).
+    """
+
+    def __init__(self, client, cache):
+        """Wrap a client."""
+        self.client = client
+        self.cache = cache
+        self.indices = CachedIndicesClient(client.indices, cache)
+
+    def __getattr__(self, name):
+        """Delegate to the wrapped client."""
+        return getattr(self.client, name)
+
+    def search(self, index=None, doc_type=None, body=None,
+               cache_timeout=None, **params):
+        """Search, using the cache."""
+        return self.cache.search(self.client.search, index=index,
+                                 doc_type=doc_type, body=body,
+                                 timeout=cache_timeout, **params)
+
+    def _written(self, index, params):
+        """Invalidate the cache after a write."""
+        refresh = params.get('refresh')
+        self.cache.invalidate(
+            index, written=not refresh or refresh == 'false')
+
+    def index(self, index, *args, **params):
+        """Index a document."""
+        result = self.client.index(index, *args, **params)
+        self._written(index, params)
+        return result
+
+    def create(self, index, *args, **params):
+        """Create a document."""
+        result = self.client.create(index, *args, **params)
+        self._written(index, params)
+        return result
+
+    def update(self, index, *args, **params):
+        """Update a document."""
+        result = self.client.update(index, *args, **params)
+        self._written(index, params)
+        return result
+
+    def delete(self, index, *args, **params):
+        """Delete a document."""
+        result = self.client.delete(index, *args, **params)
+        self._written(index, params)
+        return result
+
+    def bulk(self, body, index=None, *args, **params):
+        """Apply bulk actions."""
+        indices = bulk_indices(body, index)
+        result = self.client.bulk(body, index, *args, **params)
+        self._written(','.join(sorted(i for i in indices if i)) or None,
+                      params)
+        return result
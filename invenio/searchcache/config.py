@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Search result cache configuration."""
+
+SEARCHCACHE_ENABLED = False
+"""Enable the search result cache.
+
+Index writes invalidate the cache in the process which wrote, so the cache
+must be shared by all web and Celery worker processes (see
+``SEARCHCACHE_BACKEND``).
+"""
+
+SEARCHCACHE_BACKEND = 'redis'
+"""Cache backend: ``'redis'`` (shared, using ``CACHE_REDIS_HOST``, requires
+``invenio[redis]``), ``'lru'`` (per process, only for a single process,
+e.g. in development) or an import path to a backend factory."""
+
+SEARCHCACHE_LRU_MAX_SIZE = 64 * 1024 * 1024
+"""Maximum size in bytes of the results kept by the ``lru`` backend."""
+
+SEARCHCACHE_DEFAULT_TIMEOUT = 300
+"""Seconds a search result is kept in the cache."""
+
+SEARCHCACHE_INDEX_TIMEOUTS = {}
+"""Timeouts overriding the default one, by index name pattern (e.g.
+``{'records-*': 60}``). A timeout of ``0`` disables the cache."""
+
+SEARCHCACHE_TIMEOUT_LOADER = None
+"""Function called with ``(index, doc_type, body, params)`` returning the
+timeout of a query, or ``None`` to use the other settings."""
+
+SEARCHCACHE_REFRESH_INTERVAL = 1
+"""Seconds until written documents become searchable (the
+``refresh_interval`` of the indices). Results of the written indices are
+not cached meanwhile."""
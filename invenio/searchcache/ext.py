@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Search result cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from ..cache import create_backend
+from ..helpers import obj_or_import_string
+from . import config
+from .api import CachedSearchClient, SearchCache
+
+
+class InvenioSearchCache(object):
+    """Search result cache extension.
+
+    Wraps the client of Invenio-Search so that searches of all modules go
+    through the cache. The client is wrapped as soon as Invenio-Search is
+    initialized: right away if it was loaded first, otherwise on the first
+    request or when a Celery worker process starts.
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.cache = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-searchcache'] = self
+        if not app.config['SEARCHCACHE_ENABLED']:
+            return
+
+        if app.config['SEARCHCACHE_BACKEND'] == 'lru' and not (
+                app.debug or app.testing):
+            app.logger.warning(
+                'The search cache is not shared by the processes: index '
+                'writes of other processes are not seen.')
+        self.cache = SearchCache(
+            create_backend(
+                app.config['SEARCHCACHE_BACKEND'], 'searchcache',
+                config=app.config,
+                max_size=app.config['SEARCHCACHE_LRU_MAX_SIZE'],
+            ),
+            timeout=app.config['SEARCHCACHE_DEFAULT_TIMEOUT'],
+            index_timeouts=app.config['SEARCHCACHE_INDEX_TIMEOUTS'],
+            timeout_loader=obj_or_import_string(
+                app.config['SEARCHCACHE_TIMEOUT_LOADER']),
+            refresh_interval=app.config['SEARCHCACHE_REFRESH_INTERVAL'],
+        )
+        if not self.install(app):
+            app.before_request(lambda: self.install(app) and None)
+            try:
+                from celery.signals import worker_process_init
+            except ImportError:
+                return
+            worker_process_init.connect(
+                lambda **kwargs: self.install(app), weak=False)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('SEARCHCACHE_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def install(self, app):
+        """Wrap the Invenio-Search client of an application.
+
+        :returns: ``True`` if the client is wrapped.
+        """
+        search = app.extensions.get('invenio-search')
+        if search is None or getattr(search, 'client', None) is None:
+            return False
+        if not isinstance(search.client, CachedSearchClient):
+            search.client = CachedSearchClient(search.client, self.cache)
+        return True
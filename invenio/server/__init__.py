@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Pre-forking application server for Invenio instances.
+
+The application is built once in a master process (imports, configuration,
+URL map, templates) and served by forked worker processes sharing the loaded
+state copy-on-write:
+
+.. code-block:: console
+
+    $ invenio serve invenio3.factory:create_app --workers 4 --port 5000
+
+Each worker serves one request at a time (``--concurrency sync``) or a
+bounded number of concurrent requests in threads (``--concurrency threads
+--threads 8``).
+"""
+
+from __future__ import absolute_import, print_function
+
+from .arbiter import PreforkServer, preload_app
+from .workers import CONCURRENCY_MODELS, SyncServer, ThreadedServer
+
+__all__ = ('CONCURRENCY_MODELS', 'PreforkServer', 'SyncServer',
+           'ThreadedServer', 'preload_app', )
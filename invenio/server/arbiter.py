@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Master process forking pre-loaded worker processes."""
+
+from __future__ import absolute_import, print_function
+
+import errno
+import gc
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+
+from .workers import CONCURRENCY_MODELS, RequestHandler
+
+logger = logging.getLogger(__name__)
+
+
+def preload_app(app):
+    """Load lazily initialized application state before forking.
+
+    Everything loaded in the master process is shared copy-on-write by the
+    workers, so this builds the URL map, compiles the templates and runs
+    the ``before_first_request`` functions once.
+
+    :param app: Flask application.
+    """
+    with app.app_context():
+        app.url_map.update()
+        for name in app.jinja_env.list_templates(
+                filter_func=lambda name: name.endswith('.html')):
+            try:
+                app.jinja_env.get_template(name)
+            except Exception:
+                logger.warning('Cannot preload template %s', name,
+                               exc_info=True)
+    # Removed in Flask 2.3 together with ``before_first_request``.
+    trigger = getattr(app, 'try_trigger_before_first_request_functions',
+                      None)
+    if trigger is not None:
+        trigger()
+
+
+def reset_after_fork(app):
+    """Drop the state which must not be shared between processes.
+
+    :param app: Flask application.
+    """
+    random.seed()
+    state = getattr(app, 'extensions', {}).get('sqlalchemy')
+    if state is not None:
+        with app.app_context():
+            state.db.engine.dispose()
+
+
+class PreforkServer(object):
+    """Pre-forking server for a pre-loaded WSGI application.
+
+    The master process binds the listening socket and loads the application
+    once, then forks the workers which share the loaded state copy-on-write.
+    Dead workers are respawned by forking the master again, which takes
+    milliseconds since nothing needs to be imported or configured.
+
+    The master handles the following signals:
+
+    * ``TERM``, ``INT``: stop the workers gracefully and exit;
+    * ``HUP``: restart all workers;
+    * ``TTIN``, ``TTOU``: increase or decrease the number of workers.
+    """
+
+    interval = 0.2
+    """Seconds between checks of the workers by the master."""
+
+    graceful_timeout = 10
+    """Seconds given to the workers to finish their requests when stopping."""
+
+    def __init__(self, app, host='127.0.0.1', port=5000, workers=None,
+                 concurrency='sync', threads=8, backlog=128, access_log=True,
+                 preload=True):
+        """Initialize the server.
+
+        :param app: WSGI application.
+        :param host: Interface to bind.
+        :param port: Port to bind (``0`` picks a free port).
+        :param workers: Number of worker processes. Defaults to the number
+            of CPUs.
+        :param concurrency: Request concurrency model of the workers (see
+            :data:`invenio.server.workers.CONCURRENCY_MODELS`).
+        :param threads: Concurrent requests per worker with the ``threads``
+            concurrency model.
+        :param backlog: Size of the listening socket backlog.
+        :param access_log: Log each request.
+        :param preload: Preload the Flask application state before forking.
+        """
+        if concurrency not in CONCURRENCY_MODELS:
+            raise ValueError('Unknown concurrency model {0!r}.'.format(
+                concurrency))
+        self.app = app
+        self.address = (host, port)
+        self.num_workers = workers or multiprocessing.cpu_count()
+        self.concurrency = concurrency
+        self.threads = threads
+        self.backlog = backlog
+        self.access_log = access_log
+        self.preload = preload
+        self.socket = None
+        self.workers = {}
+        self.alive = False
+
+    def bind(self):
+        """Create the listening socket shared by the workers."""
+        if self.socket is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(self.address)
+            sock.listen(self.backlog)
+            self.socket = sock
+            self.address = sock.getsockname()[:2]
+        return self.address
+
+    def run(self):
+        """Load the application, fork the workers and supervise them."""
+        self.bind()
+        if self.preload and hasattr(self.app, 'jinja_env'):
+            preload_app(self.app)
+        if hasattr(gc, 'freeze'):
+            # Keep the garbage collector from touching (and thus copying)
+            # the pages of the pre-loaded objects.
+            gc.freeze()
+
+        self.alive = True
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+        signal.signal(signal.SIGTTIN, self._handle_more)
+        signal.signal(signal.SIGTTOU, self._handle_less)
+        logger.info('Serving on http://%s:%s with %s %s workers',
+                    self.address[0], self.address[1], self.num_workers,
+                    self.concurrency)
+        try:
+            while self.alive:
+                self.reap_workers()
+                self.manage_workers()
+                time.sleep(self.interval)
+        finally:
+            self.stop()
+
+    def manage_workers(self):
+        """Spawn or stop workers to match the requested number."""
+        while len(self.workers) < self.num_workers:
+            self.spawn_worker()
+        for pid in sorted(self.workers)[self.num_workers:]:
+            self.kill_worker(pid)
+
+    def spawn_worker(self):
+        """Fork a new worker process."""
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.time()
+            return pid
+
+        # Worker process: never return into the master loop.
+        exit_code = 0
+        try:
+            self._run_worker()
+        except Exception:
+            logger.exception('Worker %s failed', os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _run_worker(self):
+        """Serve requests in a worker process."""
+        for signum in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        reset_after_fork(self.app)
+
+        handler = type('RequestHandler', (RequestHandler, ),
+                       dict(access_log=self.access_log))
+        server_class = CONCURRENCY_MODELS[self.concurrency]
+        kwargs = dict(handler_class=handler)
+        if self.concurrency == 'threads':
+            kwargs.update(threads=self.threads,
+                          graceful_timeout=self.graceful_timeout)
+        server = server_class(self.socket, self.app, **kwargs)
+        signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+        server.serve()
+
+    def kill_worker(self, pid, signum=signal.SIGTERM):
+        """Send a signal to a worker."""
+        try:
+            os.kill(pid, signum)
+        except OSError as e:
+            if e.errno == errno.ESRCH:
+                self.workers.pop(pid, None)
+            else:
+                raise
+
+    def reap_workers(self):
+        """Collect the exited workers."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.ECHILD:
+                    return
+                raise
+            if not pid:
+                return
+            if self.workers.pop(pid, None) and self.alive:
+                logger.warning('Worker %s exited with status %s', pid, status)
+
+    def stop(self):
+        """Stop all workers, killing those exceeding the grace period."""
+        self.alive = False
+        for pid in list(self.workers):
+            self.kill_worker(pid)
+        deadline = time.time() + self.graceful_timeout
+        while self.workers and time.time() < deadline:
+            self.reap_workers()
+            time.sleep(0.05)
+        for pid in list(self.workers):
+            self.kill_worker(pid, signal.SIGKILL)
+        while self.workers:
+            self.reap_workers()
+            time.sleep(0.05)
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def _handle_stop(self, signum, frame):
+        """Stop the server."""
+        self.alive = False
+
+    def _handle_restart(self, signum, frame):
+        """Restart the workers, they are respawned by the master loop."""
+        for pid in list(self.workers):
+            self.kill_worker(pid)
+
+    def _handle_more(self, signum, frame):
+        """Increase the number of workers."""
+        self.num_workers += 1
+
+    def _handle_less(self, signum, frame):
+        """Decrease the number of workers."""
+        self.num_workers = max(self.num_workers - 1, 1)
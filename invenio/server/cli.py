@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the pre-forking server."""
+
+from __future__ import absolute_import, print_function
+
+import logging
+import os
+
+import click
+
+from ..helpers import load_app
+from .arbiter import PreforkServer
+from .workers import CONCURRENCY_MODELS
+
+
+@click.command()
+@click.argument('app')
+@click.option('--host', '-h', default='127.0.0.1', show_default=True,
+              help='Interface to bind.')
+@click.option('--port', '-p', default=5000, type=int, show_default=True,
+              help='Port to bind.')
+@click.option('--workers', '-w', type=int,
+              help='Number of worker processes (defaults to CPU count).')
+@click.option('--concurrency', '-c', default='sync', show_default=True,
+              type=click.Choice(sorted(CONCURRENCY_MODELS)),
+              help='Request concurrency model of each worker.')
+@click.option('--threads', '-t', default=8, type=int, show_default=True,
+              help='Concurrent requests per worker with "threads".')
+@click.option('--access-log/--no-access-log', default=True,
+              help='Log every request.')
+def serve(app, host, port, workers, concurrency, threads, access_log):
+    """Serve APP with pre-loaded forked workers.
+
+    APP is the import path of an application or application factory, e.g.
+    "invenio3.factory:create_app". The application is built once in the
+    master process and shared copy-on-write by the workers.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] [%(process)d] %(levelname)s %(message)s')
+    os.environ.setdefault('INVENIO_PROCESS_TYPE', 'web')
+    PreforkServer(
+        load_app(app),
+        host=host,
+        port=port,
+        workers=workers,
+        concurrency=concurrency,
+        threads=threads,
+        access_log=access_log,
+    ).run()
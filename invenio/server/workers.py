@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""WSGI servers running in the worker processes."""
+
+from __future__ import absolute_import, print_function
+
+import logging
+import threading
+import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+try:
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from SocketServer import ThreadingMixIn
+
+logger = logging.getLogger(__name__)
+
+
+class RequestHandler(WSGIRequestHandler):
+    """Request handler logging through :mod:`logging`."""
+
+    access_log = True
+
+    def address_string(self):
+        """Do not resolve the client host name."""
+        return self.client_address[0]
+
+    def log_message(self, format, *args):
+        """Log an access line."""
+        if self.access_log:
+            logger.info('%s - %s', self.address_string(), format % args)
+
+
+class SyncServer(WSGIServer):
+    """Serve one request at a time on an already bound socket."""
+
+    timeout = 0.5
+    """Seconds to wait for a connection before checking for shutdown."""
+
+    def __init__(self, sock, app, handler_class=RequestHandler):
+        """Initialize the server.
+
+        All the workers wait for connections on the same socket, so a
+        connection can wake several of them while only one accepts it.
+        Accepting times out, so that the other workers go back to checking
+        for shutdown instead of blocking until the next connection.
+
+        :param sock: Listening socket shared with the other workers.
+        :param app: WSGI application.
+        :param handler_class: Request handler class.
+        """
+        address = sock.getsockname()[:2]
+        WSGIServer.__init__(self, address, handler_class,
+                            bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        self.socket.settimeout(self.timeout)
+        self.server_name, self.server_port = address
+        self.setup_environ()
+        self.set_app(app)
+        self.alive = True
+
+    def get_request(self):
+        """Accept a connection handled with blocking operations."""
+        request, client_address = self.socket.accept()
+        request.settimeout(None)
+        return request, client_address
+
+    def serve(self):
+        """Handle requests until :meth:`stop` is called."""
+        while self.alive:
+            self.handle_request()
+
+    def stop(self):
+        """Stop handling requests after the current one."""
+        self.alive = False
+
+
+class ThreadedServer(ThreadingMixIn, SyncServer):
+    """Serve requests concurrently with a bounded number of threads.
+
+    When stopped, the server waits for the requests being handled before
+    :meth:`serve` returns, so that the worker process does not exit in the
+    middle of a response.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, sock, app, threads=8, graceful_timeout=10, **kwargs):
+        """Initialize the server.
+
+        :param threads: Maximum number of requests handled concurrently.
+        :param graceful_timeout: Seconds to wait for the requests being
+            handled when stopping.
+        """
+        SyncServer.__init__(self, sock, app, **kwargs)
+        self.slots = threading.BoundedSemaphore(threads)
+        self.graceful_timeout = graceful_timeout
+        self.active = 0
+        self.idle = threading.Condition()
+
+    def serve(self):
+        """Handle requests until stopped, then wait for the active ones."""
+        SyncServer.serve(self)
+        self.wait_requests(self.graceful_timeout)
+
+    def wait_requests(self, timeout):
+        """Wait until no request is being handled.
+
+        :returns: ``False`` if requests are still running after
+            ``timeout`` seconds.
+        """
+        deadline = time.time() + timeout
+        with self.idle:
+            while self.active:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    logger.warning('%s requests still running after %s s',
+                                   self.active, timeout)
+                    return False
+                self.idle.wait(remaining)
+        return True
+
+    def process_request(self, request, client_address):
+        """Wait for a free slot before handling the request."""
+        self.slots.acquire()
+        with self.idle:
+            self.active += 1
+        try:
+            ThreadingMixIn.process_request(self, request, client_address)
+        except Exception:
+            self.request_done()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        """Handle the request and free its slot."""
+        try:
+            ThreadingMixIn.process_request_thread(
+                self, request, client_address)
+        finally:
+            self.request_done()
+
+    def request_done(self):
+        """Free the slot of a request."""
+        with self.idle:
+            self.active -= 1
+            self.idle.notify_all()
+        self.slots.release()
+
+
+CONCURRENCY_MODELS = {
+    'sync': SyncServer,
+    'threads': ThreadedServer,
+}
+"""Available request concurrency models of a worker process."""
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Server-side session store and identity cache for logged in users.
+
+With Invenio-Accounts, every request of a logged in user loads the user
+and then its roles from the database. This module removes these queries:
+
+* with ``SESSIONCACHE_BACKEND = 'redis'`` (and ``invenio[redis]``
+  installed), sessions are stored in Redis and only a signed session id is
+  sent in the cookie; the session id is regenerated when a user logs in;
+* Flask-Login loads users from a two-tier identity cache keeping their
+  columns, roles and needs, by user id;
+* identities are invalidated when a user, its roles or one of its roles
+  change.
+
+Hits, misses and database queries are reported by the instrumentation
+metrics.
+
+.. code-block:: python
+
+    from flask import current_app
+
+    cache = current_app.extensions['invenio-sessioncache'].cache
+    user = cache.load_user(1)
+    user.has_role('admin'), user.needs
+
+    # Uncached attributes are read from the user model.
+    user.get_model().password
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import CachedUser, IdentityCache
+from .ext import InvenioSessionCache
+from .sessions import CachedSessionInterface, ServerSideSession
+
+__all__ = ('CachedSessionInterface', 'CachedUser', 'IdentityCache',
+           'InvenioSessionCache', 'ServerSideSession', )
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Two-tier cache of the identities of the logged in users."""
+
+from __future__ import absolute_import, print_function
+
+from ..cache import CacheStats
+from ..cache.invalidation import invalidate, listen_once, register
+
+EXCLUDED_COLUMNS = ('password', )
+"""Columns of the users which are never cached."""
+
+
+def load_user(user_id):
+    """Load a user of Invenio-Accounts."""
+    from invenio_accounts.models import User
+
+    return User.query.get(int(user_id))
+
+
+def user_needs(user):
+    """Needs provided by a user: its id and the names of its roles."""
+    return [('id', user.id)] + [('role', role.name) for role in user.roles]
+
+
+def serialize_user(user, needs_loader=None):
+    """Serialize a user with its roles and needs.
+
+    :param user: The user model.
+    :param needs_loader: Function returning additional needs of the user.
+    :returns: A picklable dictionary.
+    """
+    columns = dict(
+        (column.key, getattr(user, column.key))
+        for column in user.__table__.columns
+        if column.key not in EXCLUDED_COLUMNS)
+    roles = [dict((column.key, getattr(role, column.key))
+                  for column in role.__table__.columns)
+             for role in user.roles]
+    needs = user_needs(user)
+    if needs_loader is not None:
+        needs.extend(tuple(need) for need in needs_loader(user))
+    return dict(user=columns, roles=roles, needs=needs)
+
+
+class CachedRole(object):
+    """Role of a cached user."""
+
+    def __init__(self, **columns):
+        """Initialize the role from its columns."""
+        self.__dict__.update(columns)
+
+    def __eq__(self, other):
+        """Compare roles by name (or to a role name)."""
+        return getattr(other, 'name', other) == self.name
+
+    def __ne__(self, other):
+        """Compare roles by name."""
+        return not self == other
+
+    def __hash__(self):
+        """Hash of the role name."""
+        return hash(self.name)
+
+
+class CachedUser(object):
+    """User loaded from the identity cache.
+
+    Behaves like the user model of Flask-Login and Flask-Security for the
+    cached columns, roles and needs. Other attributes (relationships,
+    excluded columns) are read from the user model, which is then loaded
+    from the database; it is also the object to modify.
+    """
+
+    def __init__(self, entry, user_loader=load_user):
+        """Initialize the user.
+
+        :param entry: Cached identity (see :func:`serialize_user`).
+        :param user_loader: Function loading the user model by id.
+        """
+        self.__dict__.update(entry['user'])
+        self.roles = [CachedRole(**role) for role in entry['roles']]
+        self.needs = [tuple(need) for need in entry['needs']]
+        self._user_loader = user_loader
+        self._model = None
+
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def is_active(self):
+        """Check if the user is active."""
+        return self.__dict__.get('active', True) is not False
+
+    def get_id(self):
+        """Get the id used by Flask-Login."""
+        return u'{0}'.format(self.id)
+
+    def has_role(self, role):
+        """Check if the user has a role (a name or a role object)."""
+        return role in self.roles
+
+    def get_model(self):
+        """Load the user model from the database."""
+        if self._model is None:
+            self._model = self._user_loader(self.id)
+        return self._model
+
+    def __getattr__(self, name):
+        """Read uncached attributes from the user model."""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get_model(), name)
+
+    def __eq__(self, other):
+        """Compare users by id."""
+        return getattr(other, 'id', None) == self.id
+
+    def __ne__(self, other):
+        """Compare users by id."""
+        return not self == other
+
+    def __hash__(self):
+        """Hash of the user id."""
+        return hash(self.id)
+
+
+class IdentityCache(object):
+    """Cache of user identities: columns, roles and needs.
+
+    Identities are looked up in an in-process tier, then in an optional
+    shared tier, and finally loaded from the database, like the
+    persistent identifier cache (see :class:`invenio.pidcache.api.
+    PIDCache`). They are keyed on the user id, so that all sessions of a
+    user see a change once it is invalidated.
+    """
+
+    def __init__(self, local, shared=None, user_loader=load_user,
+                 needs_loader=None, local_timeout=5, shared_timeout=3600):
+        """Initialize the cache.
+
+        :param local: In-process cache backend.
+        :param shared: Shared cache backend (optional).
+        :param user_loader: Function loading a user model by id.
+        :param needs_loader: Function returning additional needs of a user.
+        :param local_timeout: Seconds an identity is kept in ``local``.
+        :param shared_timeout: Seconds an identity is kept in ``shared``.
+        """
+        self.local = local
+        self.shared = shared
+        self.user_loader = user_loader
+        self.needs_loader = needs_loader
+        self.local_timeout = local_timeout
+        self.shared_timeout = shared_timeout
+        self.stats = CacheStats()
+        self.queries = 0
+
+    @staticmethod
+    def key(user_id):
+        """Cache key of a user."""
+        return u'identity:{0}'.format(user_id)
+
+    def get(self, user_id):
+        """Get the identity of a user.
+
+        :returns: A dictionary (see :func:`serialize_user`), or ``None`` if
+            the user does not exist. Missing users are not cached.
+        """
+        key = self.key(user_id)
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.local.set(key, entry, timeout=self.local_timeout)
+        if entry is not None:
+            self.stats.hit()
+            return entry
+
+        self.stats.miss()
+        self.queries += 1
+        user = self.user_loader(user_id)
+        if user is None:
+            return None
+        entry = serialize_user(user, needs_loader=self.needs_loader)
+        self.local.set(key, entry, timeout=self.local_timeout)
+        if self.shared is not None:
+            self.shared.set(key, entry, timeout=self.shared_timeout)
+        return entry
+
+    def load_user(self, user_id):
+        """Load a user for Flask-Login.
+
+        :returns: A :class:`CachedUser`, or ``None`` if the user does not
+            exist.
+        """
+        entry = self.get(user_id)
+        if entry is None:
+            return None
+        return CachedUser(entry, user_loader=self.user_loader)
+
+    def invalidate(self, user_id):
+        """Remove the identity of a user from the cache."""
+        key = self.key(user_id)
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+        self.stats.invalidate()
+
+
+_models = set()
+
+
+def identities_changed(session, flush_context, instances):
+    """Invalidate the identities of the changed users in all caches."""
+    user_ids = set()
+    for user_model, role_model in _models:
+        for obj in list(session.dirty) + list(session.deleted):
+            if isinstance(obj, user_model) and obj.id is not None:
+                user_ids.add(obj.id)
+        for obj in list(session.new) + list(session.dirty) + \
+                list(session.deleted):
+            if isinstance(obj, role_model):
+                with session.no_autoflush:
+                    user_ids.update(user.id for user in obj.users
+                                    if user.id is not None)
+    invalidate('sessioncache', [(user_id, ) for user_id in user_ids],
+               session=session)
+
+
+def connect_models(user_model, role_model, cache):
+    """Invalidate the identities when users or roles change.
+
+    The identities of changed or deleted users, of users whose roles
+    changed and of all users of a changed role are invalidated when
+    flushed, and again once the transaction ends so that identities
+    cached by concurrent requests before the commit are dropped too.
+    Listeners are only added once, whatever the number of connected
+    caches.
+
+    :param user_model: The user model.
+    :param role_model: The role model (its ``users`` are invalidated).
+    :param cache: The :class:`IdentityCache`.
+    """
+    from sqlalchemy.orm import Session
+
+    _models.add((user_model, role_model))
+    register('sessioncache', cache)
+    listen_once(Session, 'before_flush', identities_changed)
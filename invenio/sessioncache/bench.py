@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Throughput of authenticated requests with and without the caches.
+
+Logged in clients request a page showing the user and its roles. Users and
+roles are stored in an in-memory SQLite database with the tables of
+Invenio-Accounts; the session store and the shared identity tier use the
+in-process ``'lru'`` backend in place of Redis:
+
+* ``uncached``: cookie sessions, the user and its roles are loaded from
+  the database on every request;
+* ``cached``: server-side sessions and the identity cache.
+"""
+
+from __future__ import absolute_import, print_function
+
+from ..bench.api import timer
+
+
+def create_models():
+    """Create the user and role models of Invenio-Accounts."""
+    from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Table
+    from sqlalchemy.orm import declarative_base, relationship
+
+    Base = declarative_base()
+    userrole = Table(
+        'accounts_userrole', Base.metadata,
+        Column('user_id', Integer, ForeignKey('accounts_user.id')),
+        Column('role_id', Integer, ForeignKey('accounts_role.id')),
+    )
+
+    class Role(Base):
+        __tablename__ = 'accounts_role'
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String(80), unique=True)
+        description = Column(String(255))
+
+    class User(Base):
+        __tablename__ = 'accounts_user'
+
+        id = Column(Integer, primary_key=True)
+        email = Column(String(255), unique=True)
+        password = Column(String(255))
+        active = Column(Boolean, default=True)
+        roles = relationship('Role', secondary=userrole, backref='users')
+
+        is_authenticated = True
+        is_anonymous = False
+
+        @property
+        def is_active(self):
+            return self.active
+
+        def get_id(self):
+            return u'{0}'.format(self.id)
+
+    return Base, User, Role
+
+
+def create_app(cached=True, users=10, roles=3):
+    """Create an application with logged in users.
+
+    :param cached: Use the session store and the identity cache.
+    :param users: Number of users (each one has all roles).
+    :param roles: Number of roles.
+    :returns: ``(app, db_session, queries)``, ``queries`` being a list
+        whose length is the number of executed SQL statements.
+    """
+    from flask import Flask, jsonify
+    from flask_login import LoginManager, current_user, login_user
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import scoped_session, sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from .ext import InvenioSessionCache
+
+    Base, User, Role = create_models()
+    engine = create_engine('sqlite://', poolclass=StaticPool,
+                           connect_args=dict(check_same_thread=False))
+    Base.metadata.create_all(engine)
+    db_session = scoped_session(sessionmaker(bind=engine))
+    all_roles = [Role(name='role{0}'.format(i)) for i in range(roles)]
+    db_session.add_all(
+        User(email='user{0}@example.org'.format(i), password='secret',
+             roles=all_roles) for i in range(1, users + 1))
+    db_session.commit()
+    db_session.remove()
+
+    def load_user(user_id):
+        return db_session.get(User, int(user_id))
+
+    app = Flask('sessioncache')
+    app.config.update(
+        SECRET_KEY='bench',
+        SESSIONCACHE_ENABLED=cached,
+        SESSIONCACHE_BACKEND='lru',
+        SESSIONCACHE_IDENTITY_SHARED_BACKEND='lru',
+        SESSIONCACHE_USER_LOADER=load_user,
+    )
+    login_manager = LoginManager(app)
+    login_manager.user_loader(load_user)
+    InvenioSessionCache(app)
+
+    @app.route('/login/<int:user_id>')
+    def login(user_id):
+        login_user(load_user(user_id))
+        return 'ok'
+
+    @app.route('/me')
+    def me():
+        return jsonify(id=current_user.id, email=current_user.email,
+                       roles=[role.name for role in current_user.roles])
+
+    app.teardown_appcontext(lambda exc: db_session.remove())
+    queries = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda *args: queries.append(1))
+    return app, db_session, queries
+
+
+def run(requests=1000, users=10, **kwargs):
+    """Measure the authenticated requests per second.
+
+    :param requests: Number of measured requests.
+    :param users: Number of logged in users.
+    :returns: Dictionary of the results, or of the missing dependencies.
+    """
+    missing = []
+    for module in ('flask_login', 'sqlalchemy'):
+        try:
+            __import__(module)
+        except ImportError:
+            missing.append(module)
+    if missing:
+        return dict(skipped=True, missing=missing)
+
+    results = dict(requests=requests, users=users)
+    for name, cached in (('uncached', False), ('cached', True)):
+        app, db_session, queries = create_app(cached=cached, users=users)
+        clients = []
+        for user_id in range(1, users + 1):
+            client = app.test_client()
+            client.get('/login/{0}'.format(user_id))
+            clients.append(client)
+        # Warm up the identity cache.
+        for client in clients:
+            client.get('/me')
+
+        del queries[:]
+        start = timer()
+        for i in range(requests):
+            response = clients[i % users].get('/me')
+            assert response.status_code == 200
+        elapsed = timer() - start
+        results[name] = dict(
+            seconds=elapsed,
+            requests_per_second=requests / elapsed,
+            queries_per_request=len(queries) / float(requests),
+        )
+    results['speedup'] = results['cached']['requests_per_second'] / \
+        results['uncached']['requests_per_second']
+    return results
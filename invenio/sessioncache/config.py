@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Session store and identity cache configuration."""
+
+SESSIONCACHE_ENABLED = True
+"""Enable the session store and the identity cache."""
+
+SESSIONCACHE_BACKEND = None
+"""Backend of the session store: ``'redis'`` (using ``CACHE_REDIS_HOST``,
+requires ``invenio[redis]``), ``'lru'`` (per process, for development and
+benchmarks), an import path to a backend factory, or ``None`` to keep the
+sessions in signed cookies."""
+
+SESSIONCACHE_LRU_MAX_SIZE = 64 * 1024 * 1024
+"""Maximum size in bytes of the sessions with the ``'lru'`` backend."""
+
+SESSIONCACHE_TIMEOUT = 24 * 3600
+"""Seconds a session which is not permanent is kept after its last write.
+Permanent sessions are kept for ``PERMANENT_SESSION_LIFETIME``."""
+
+SESSIONCACHE_REFRESH_INTERVAL = 60
+"""Minimum seconds between two writes of an unmodified permanent session
+refreshed on each request (see ``SESSION_REFRESH_EACH_REQUEST``)."""
+
+SESSIONCACHE_IDENTITY_LOCAL_MAX_SIZE = 8 * 1024 * 1024
+"""Maximum size in bytes of the in-process tier of the identity cache."""
+
+SESSIONCACHE_IDENTITY_LOCAL_TIMEOUT = 5
+"""Seconds an identity is kept in the in-process tier. Changes made by
+other processes may be seen this late."""
+
+SESSIONCACHE_IDENTITY_SHARED_BACKEND = None
+"""Backend of the shared tier of the identity cache: ``'redis'`` (requires
+``invenio[redis]``), ``'lru'``, an import path to a backend factory, or
+``None`` to only use the in-process tier."""
+
+SESSIONCACHE_IDENTITY_SHARED_TIMEOUT = 3600
+"""Seconds an identity is kept in the shared tier."""
+
+SESSIONCACHE_USER_LOADER = 'invenio.sessioncache.api:load_user'
+"""Function loading a user from the database by id (``None`` if missing)."""
+
+SESSIONCACHE_NEEDS_LOADER = None
+"""Function returning the additional needs of a user as ``(method,
+value)`` tuples (e.g. the actions granted to the user). The needs are
+cached with the identity and provided to Flask-Principal identities."""
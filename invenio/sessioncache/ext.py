@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Session store and identity cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from flask import session
+
+from ..cache import LRUCache, create_backend
+from ..helpers import obj_or_import_string
+from . import config
+from .api import IdentityCache, connect_models
+from .sessions import CachedSessionInterface
+
+
+class InvenioSessionCache(object):
+    """Session store and identity cache extension.
+
+    Stores the sessions in Redis instead of cookies and makes Flask-Login
+    load the logged in user from the identity cache. The user loader is
+    replaced as soon as the login manager is initialized: right away if
+    Invenio-Accounts was loaded first, otherwise on the first request.
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.cache = None
+        self.session_interface = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-sessioncache'] = self
+        if not app.config['SESSIONCACHE_ENABLED']:
+            return
+
+        if app.config['SESSIONCACHE_BACKEND']:
+            try:
+                backend = create_backend(
+                    app.config['SESSIONCACHE_BACKEND'], 'sessioncache',
+                    config=app.config,
+                    max_size=app.config['SESSIONCACHE_LRU_MAX_SIZE'],
+                )
+            except ImportError as e:
+                app.logger.warning('Server-side sessions disabled: %s', e)
+            else:
+                self.session_interface = CachedSessionInterface(
+                    backend,
+                    timeout=app.config['SESSIONCACHE_TIMEOUT'],
+                    refresh_interval=app.config[
+                        'SESSIONCACHE_REFRESH_INTERVAL'],
+                )
+                app.session_interface = self.session_interface
+
+        shared = None
+        if app.config['SESSIONCACHE_IDENTITY_SHARED_BACKEND']:
+            try:
+                shared = create_backend(
+                    app.config['SESSIONCACHE_IDENTITY_SHARED_BACKEND'],
+                    'identitycache', config=app.config,
+                    default_timeout=app.config[
+                        'SESSIONCACHE_IDENTITY_SHARED_TIMEOUT'],
+                )
+            except ImportError as e:
+                app.logger.warning('Shared identity cache disabled: %s', e)
+        needs_loader = app.config['SESSIONCACHE_NEEDS_LOADER']
+        self.cache = IdentityCache(
+            LRUCache(
+                max_size=app.config['SESSIONCACHE_IDENTITY_LOCAL_MAX_SIZE']),
+            shared=shared,
+            user_loader=obj_or_import_string(
+                app.config['SESSIONCACHE_USER_LOADER']),
+            needs_loader=obj_or_import_string(needs_loader)
+            if needs_loader else None,
+            local_timeout=app.config['SESSIONCACHE_IDENTITY_LOCAL_TIMEOUT'],
+            shared_timeout=app.config['SESSIONCACHE_IDENTITY_SHARED_TIMEOUT'],
+        )
+        self.connect_signals(app)
+        if not self.install(app):
+            app.before_request(lambda: self.install(app) and None)
+        try:
+            from invenio_accounts.models import Role, User
+        except ImportError:
+            return
+        connect_models(User, Role, self.cache)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('SESSIONCACHE_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def install(self, app):
+        """Load the users of Flask-Login from the identity cache.
+
+        :returns: ``True`` if the user loader is replaced.
+        """
+        login_manager = getattr(app, 'login_manager', None)
+        if login_manager is None:
+            return False
+        callback = getattr(login_manager, '_user_callback', None) or \
+            getattr(login_manager, 'user_callback', None)
+        if getattr(callback, '__self__', None) is not self.cache:
+            login_manager.user_loader(self.cache.load_user)
+        return True
+
+    def connect_signals(self, app):
+        """Regenerate the session on login and provide the cached needs."""
+        try:
+            from flask_login import user_logged_in
+        except ImportError:
+            return
+
+        def regenerate(sender, **kwargs):
+            if hasattr(session, 'regenerate'):
+                session.regenerate()
+
+        user_logged_in.connect(regenerate, app, weak=False)
+
+        try:
+            from flask_principal import Need, identity_loaded
+        except ImportError:
+            return
+
+        def provide_needs(sender, identity):
+            from flask_login import current_user
+            for need in getattr(current_user, 'needs', ()):
+                identity.provides.add(Need(*need))
+
+        identity_loaded.connect(provide_needs, app, weak=False)
+
+    def collect_metrics(self):
+        """Report the sessions found and the identity database queries."""
+        if self.session_interface is not None:
+            stats = self.session_interface.stats
+            yield ('invenio_sessioncache_sessions', dict(result='hit'),
+                   stats.hits)
+            yield ('invenio_sessioncache_sessions', dict(result='miss'),
+                   stats.misses)
+        if self.cache is not None:
+            yield ('invenio_sessioncache_identity_queries', {},
+                   self.cache.queries)
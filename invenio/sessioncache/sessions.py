@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Server-side sessions stored in a cache backend."""
+
+from __future__ import absolute_import, print_function
+
+import base64
+import os
+import pickle
+import time
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer, want_bytes
+from werkzeug.datastructures import CallbackDict
+
+from ..cache import CacheStats
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session whose data is stored on the server.
+
+    Only the signed session id is sent in the cookie.
+    """
+
+    def __init__(self, initial=None, sid=None, new=False, written=None):
+        """Initialize the session.
+
+        :param initial: Session data.
+        :param sid: Session id.
+        :param new: ``True`` if the session was not stored yet.
+        :param written: Time of the last write to the store.
+        """
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.written = written
+        self.modified = False
+        self.previous_sid = None
+
+    def regenerate(self):
+        """Move the session to a new id (e.g. when a user logs in).
+
+        The data stored under the previous id is removed when the session
+        is saved, so that a session id known before the login cannot be
+        used afterwards.
+        """
+        if not self.new and self.previous_sid is None:
+            self.previous_sid = self.sid
+        self.sid = generate_sid()
+        self.modified = True
+
+
+def generate_sid():
+    """Generate a random session id."""
+    return base64.urlsafe_b64encode(os.urandom(24)).decode('ascii')
+
+
+class CachedSessionInterface(SessionInterface):
+    """Session interface storing the sessions in a cache backend.
+
+    The session data is pickled, so that the values of the in-process
+    ``'lru'`` backend cannot be changed without saving the session. A
+    session is written back only when it is modified, or at most every
+    ``refresh_interval`` seconds when a permanent session is refreshed on
+    each request.
+    """
+
+    session_class = ServerSideSession
+    salt = 'invenio-sessioncache'
+
+    def __init__(self, backend, timeout=24 * 3600, refresh_interval=60,
+                 key_prefix='session:', clock=time.time):
+        """Initialize the interface.
+
+        :param backend: Cache backend (see :func:`invenio.cache.
+            create_backend`).
+        :param timeout: Seconds a session which is not permanent is kept.
+        :param refresh_interval: Minimum seconds between two refreshes of
+            an unmodified session.
+        :param key_prefix: Prefix of the keys of the sessions.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.key_prefix = key_prefix
+        self.clock = clock
+        self.stats = CacheStats()
+
+    def get_signer(self, app):
+        """Get the signer of the session ids, if a secret key is set."""
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt=self.salt)
+
+    def get_timeout(self, app, session):
+        """Seconds a session is kept in the store."""
+        if session.permanent:
+            return int(app.permanent_session_lifetime.total_seconds())
+        return self.timeout
+
+    def open_session(self, app, request):
+        """Load the session of a request."""
+        signer = self.get_signer(app)
+        if signer is None:
+            return None
+        cookie = request.cookies.get(app.config['SESSION_COOKIE_NAME'])
+        if cookie:
+            try:
+                sid = signer.unsign(want_bytes(cookie)).decode('ascii')
+            except (BadSignature, UnicodeDecodeError):
+                sid = None
+            value = self.backend.get(self.key_prefix + sid) if sid else None
+            if value is not None:
+                self.stats.hit()
+                written, data = pickle.loads(value)
+                return self.session_class(data, sid=sid, written=written)
+            self.stats.miss()
+        return self.session_class(sid=generate_sid(), new=True)
+
+    def save_session(self, app, session, response):
+        """Store the session and set its cookie."""
+        name = app.config['SESSION_COOKIE_NAME']
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.previous_sid is not None:
+            self.backend.delete(self.key_prefix + session.previous_sid)
+            session.previous_sid = None
+
+        if not session:
+            if session.modified and not session.new:
+                self.backend.delete(self.key_prefix + session.sid)
+                self.stats.invalidate()
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = self.clock()
+        refresh = self.should_set_cookie(app, session) and (
+            session.written is None or
+            now - session.written >= self.refresh_interval)
+        if not session.modified and not refresh:
+            return
+
+        self.backend.set(
+            self.key_prefix + session.sid,
+            pickle.dumps((now, dict(session)), pickle.HIGHEST_PROTOCOL),
+            timeout=self.get_timeout(app, session))
+        session.written = now
+
+        cookie = self.get_signer(app).sign(want_bytes(session.sid))
+        options = dict(
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+        )
+        if hasattr(self, 'get_cookie_samesite'):
+            options['samesite'] = self.get_cookie_samesite(app)
+        response.set_cookie(name, cookie.decode('ascii'), **options)
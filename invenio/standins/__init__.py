@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Local stand-ins for the services of an Invenio deployment.
+
+A production instance talks to PostgreSQL, Redis, Elasticsearch and a
+message broker. The stand-ins replace them with in-process or local
+substitutes so that an instance can be assembled and exercised on a single
+machine without any external service, e.g. for benchmarks:
+
+>>> from invenio.standins import standin_config
+>>> standin_config()['SQLALCHEMY_DATABASE_URI']
+'sqlite://'
+"""
+
+from __future__ import absolute_import, print_function
+
+STANDIN_CONFIG = dict(
+    SECRET_KEY='invenio-standin',
+    TESTING=True,
+    # Database
+    SQLALCHEMY_DATABASE_URI='sqlite://',
+    SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    # Cache
+    CACHE_TYPE='simple',
+    # Celery
+    BROKER_URL='memory://',
+    CELERY_ALWAYS_EAGER=True,
+    CELERY_EAGER_PROPAGATES_EXCEPTIONS=True,
+    CELERY_RESULT_BACKEND='cache',
+    CELERY_CACHE_BACKEND='memory',
+    # Mail
+    MAIL_SUPPRESS_SEND=True,
+)
+"""Configuration replacing external services with local substitutes."""
+
+
+def standin_config(**overrides):
+    """Return the stand-in configuration.
+
+    :param overrides: Configuration values taking precedence over the
+        stand-in defaults.
+    :returns: A new configuration dictionary.
+    """
+    config = dict(STANDIN_CONFIG)
+    config.update(overrides)
+    return config
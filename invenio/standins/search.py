@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""In-process stand-ins of Elasticsearch.
+
+:class:`FakeSearchServer` answers the subset of the REST API used by
+Invenio tooling: bulk indexing, document retrieval, index refresh and
+simple searches. :class:`FakeSearchClient` replaces the Python client for
+code calling it directly. Documents are kept in memory.
+
+>>> from invenio.standins.search import FakeSearchServer
+>>> server = FakeSearchServer().start()
+>>> server.url.startswith('http://127.0.0.1:')
+True
+>>> server.stop()
+"""
+
+from __future__ import absolute_import, print_function
+
+import fnmatch
+import json
+import threading
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Request handler which does not log."""
+
+    def log_message(self, format, *args):
+        """Do not log requests."""
+
+
+class FakeSearchServer(object):
+    """Fake search engine answering on a local port."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """Initialize the server.
+
+        :param host: Interface to bind.
+        :param port: Port to bind (``0`` picks a free port).
+        """
+        self.indices = {}
+        self.requests = []
+        self.refreshes = 0
+        self.fail_next = 0
+        """Number of upcoming requests answered with ``429``."""
+        self.lock = threading.Lock()
+        self.server = make_server(host, port, self.wsgi_app,
+                                  handler_class=QuietHandler)
+        self.thread = None
+
+    @property
+    def url(self):
+        """Base URL of the server."""
+        return 'http://{0}:{1}'.format(*self.server.server_address[:2])
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving requests."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def documents(self, index):
+        """Get the documents of an index by identifier."""
+        return self.indices.get(index, {})
+
+    def bulk(self, body):
+        """Apply newline delimited bulk actions."""
+        lines = [json.loads(line) for line in body.splitlines() if line]
+        items = []
+        errors = False
+        while lines:
+            action = lines.pop(0)
+            (op_type, meta), = action.items()
+            index = self.indices.setdefault(meta['_index'], {})
+            doc_id = str(meta['_id'])
+            if op_type in ('index', 'create'):
+                source = lines.pop(0)
+                if op_type == 'create' and doc_id in index:
+                    errors = True
+                    items.append({op_type: dict(
+                        _id=doc_id, status=409,
+                        error='document already exists')})
+                    continue
+                status = 200 if doc_id in index else 201
+                index[doc_id] = source
+            elif op_type == 'delete':
+                status = 200 if index.pop(doc_id, None) else 404
+            else:
+                raise ValueError('Unsupported action {0}'.format(op_type))
+            items.append({op_type: dict(_id=doc_id, status=status)})
+        return 200, dict(took=1, errors=errors, items=items)
+
+    def search(self, index, query):
+        """Return all documents of an index, paginated."""
+        docs = sorted(self.documents(index).items())
+        start = query.get('from', 0)
+        hits = [dict(_index=index, _id=doc_id, _source=source)
+                for doc_id, source in docs[start:start + query.get(
+                    'size', 10)]]
+        return 200, dict(took=1, hits=dict(total=len(docs), hits=hits))
+
+    def dispatch(self, method, path, body):
+        """Route a request to the fake implementation."""
+        parts = [p for p in path.split('/') if p]
+        if parts and parts[-1] == '_bulk' and method in ('POST', 'PUT'):
+            return self.bulk(body)
+        if parts and parts[-1] == '_refresh':
+            self.refreshes += 1
+            return 200, dict(_shards=dict(failed=0))
+        if len(parts) == 2 and parts[1] == '_search':
+            return self.search(parts[0], json.loads(body) if body else {})
+        if len(parts) == 3 and method == 'GET':
+            index, dummy, doc_id = parts
+            if doc_id in self.documents(index):
+                return 200, dict(_id=doc_id, found=True,
+                                 _source=self.documents(index)[doc_id])
+            return 404, dict(_id=doc_id, found=False)
+        return 400, dict(error='Unsupported request {0} {1}'.format(
+            method, path))
+
+    def wsgi_app(self, environ, start_response):
+        """WSGI entry point."""
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        body = environ['wsgi.input'].read(length).decode('utf-8')
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '/')
+        with self.lock:
+            self.requests.append((method, path))
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                status, data = 429, dict(error='Too many requests')
+            else:
+                status, data = self.dispatch(method, path, body)
+        start_response('{0} {1}'.format(status, 'OK' if status < 300
+                                        else 'ERROR'),
+                       [('Content-Type', 'application/json')])
+        return [json.dumps(data).encode('utf-8')]
+
+
+def _field(source, name):
+    """Get a dotted field of a document."""
+    for part in name.split('.'):
+        if not isinstance(source, dict):
+            return None
+        source = source.get(part)
+    return source
+
+
+def _matches(source, query):
+    """Check if a document matches a (small subset of the) query DSL."""
+    (kind, clause), = query.items() if query else (('match_all', {}), )
+    if kind == 'match_all':
+        return True
+    if kind == 'term':
+        (name, value), = clause.items()
+        value = value.get('value') if isinstance(value, dict) else value
+        return _field(source, name) == value
+    if kind == 'terms':
+        (name, values), = clause.items()
+        return _field(source, name) in values
+    if kind == 'query_string':
+        text = json.dumps(source).lower()
+        return all(word in text for word in clause['query'].lower().split()
+                   if word != '*')
+    if kind == 'bool':
+        clauses = []
+        for occur in ('must', 'filter'):
+            value = clause.get(occur, [])
+            clauses.extend(value if isinstance(value, list) else [value])
+        return all(_matches(source, q) for q in clauses)
+    raise ValueError('Unsupported query {0}'.format(kind))
+
+
+class FakeIndicesClient(object):
+    """Index management part of :class:`FakeSearchClient`."""
+
+    def __init__(self, client):
+        """Initialize."""
+        self.client = client
+
+    def refresh(self, index=None, **params):
+        """Make the pending changes of indices searchable."""
+        return self.client.refresh(index)
+
+
+class FakeSearchClient(object):
+    """In-process stand-in of the Elasticsearch Python client.
+
+    As with Elasticsearch, written documents become searchable once their
+    index is refreshed (or when written with ``refresh=True``). Searches
+    support ``match_all``, ``term``, ``terms``, ``bool`` and (word based)
+    ``query_string`` queries, ``from``/``size``, ``search_after`` and
+    scroll pagination, sorting on fields and ``terms`` aggregations.
+    """
+
+    def __init__(self):
+        """Initialize the client."""
+        self.indices = FakeIndicesClient(self)
+        self.documents = {}
+        """Searchable documents, by index and identifier."""
+        self.pending = {}
+        """Changes not yet refreshed, by index and identifier (``None`` for
+        deleted documents)."""
+        self.calls = []
+        """List of ``(method, index)`` of the calls."""
+        self.scrolls = {}
+        """Remaining hits of the open scrolls, by identifier."""
+        self.lock = threading.RLock()
+
+    def _resolve(self, index):
+        """Return the names of the existing indices matching ``index``."""
+        if index in (None, '_all', '*'):
+            return sorted(self.documents)
+        names = set()
+        for pattern in index.split(','):
+            names.update(fnmatch.filter(self.documents, pattern))
+        return sorted(names)
+
+    def _write(self, index, doc_id, source, refresh):
+        """Record a change to a document."""
+        self.documents.setdefault(index, {})
+        self.pending.setdefault(index, {})[str(doc_id)] = source
+        if refresh and refresh != 'false':
+            self.refresh(index)
+
+    def refresh(self, index=None):
+        """Apply the pending changes of indices."""
+        with self.lock:
+            self.calls.append(('refresh', index))
+            for name in self._resolve(index):
+                for doc_id, source in self.pending.pop(name, {}).items():
+                    if source is None:
+                        self.documents[name].pop(doc_id, None)
+                    else:
+                        self.documents[name][doc_id] = source
+        return dict(_shards=dict(failed=0))
+
+    def index(self, index, body, doc_type=None, id=None, refresh=False,
+              **params):
+        """Index a document."""
+        with self.lock:
+            self.calls.append(('index', index))
+            doc_id = id if id is not None else len(self.calls)
+            self._write(index, doc_id, body, refresh)
+        return dict(_index=index, _id=str(doc_id), created=True)
+
+    def delete(self, index, id, doc_type=None, refresh=False, **params):
+        """Delete a document."""
+        with self.lock:
+            self.calls.append(('delete', index))
+            self._write(index, id, None, refresh)
+        return dict(_index=index, _id=str(id), found=True)
+
+    def get(self, index, id, doc_type=None, **params):
+        """Get a document, including unrefreshed changes."""
+        with self.lock:
+            self.calls.append(('get', index))
+            pending = self.pending.get(index, {})
+            source = pending[str(id)] if str(id) in pending else \
+                self.documents.get(index, {}).get(str(id))
+        return dict(_index=index, _id=str(id), found=source is not None,
+                    _source=source)
+
+    def bulk(self, body, index=None, doc_type=None, refresh=False,
+             **params):
+        """Apply bulk actions, given as a list or newline delimited JSON."""
+        if isinstance(body, list):
+            body = list(body)
+        else:
+            body = [json.loads(line) for line in body.splitlines() if line]
+        items = []
+        with self.lock:
+            self.calls.append(('bulk', index))
+            while body:
+                (op_type, meta), = body.pop(0).items()
+                name = meta.get('_index', index)
+                source = body.pop(0) if op_type != 'delete' else None
+                self._write(name, meta['_id'], source, False)
+                items.append({op_type: dict(_index=name, _id=meta['_id'],
+                                            status=200)})
+            if refresh and refresh != 'false':
+                self.refresh(index)
+        return dict(errors=False, items=items)
+
+    def search(self, index=None, doc_type=None, body=None, **params):
+        """Search documents."""
+        body = body or {}
+        with self.lock:
+            self.calls.append(('search', index))
+            hits = [
+                dict(_index=name, _type=doc_type, _id=doc_id,
+                     _source=source)
+                for name in self._resolve(index)
+                for doc_id, source in sorted(self.documents[name].items())
+                if _matches(source, body.get('query'))
+            ]
+        orders = []
+        for sort in body.get('sort', []):
+            (name, order), = (sort.items() if isinstance(sort, dict) else
+                              ((sort, 'asc'), ))
+            orders.append((name, order.get('order', 'asc')
+                           if isinstance(order, dict) else order))
+        for hit in hits:
+            hit['sort'] = [hit['_id'] if name == '_id' else
+                           _field(hit['_source'], name)
+                           for name, order in orders]
+        for position, (name, order) in reversed(list(enumerate(orders))):
+            hits.sort(key=lambda hit: hit['sort'][position],
+                      reverse=order == 'desc')
+        if 'search_after' in body:
+            hits = [hit for hit in hits
+                    if self._after(hit['sort'], body['search_after'], orders)]
+
+        aggregations = {}
+        for name, agg in body.get('aggs', {}).items():
+            counts = {}
+            for hit in hits:
+                values = _field(hit['_source'], agg['terms']['field'])
+                for value in values if isinstance(values, list) else \
+                        [values]:
+                    counts[value] = counts.get(value, 0) + 1
+            aggregations[name] = dict(buckets=[
+                dict(key=key, doc_count=count) for key, count in sorted(
+                    counts.items(), key=lambda item: (-item[1], item[0]))
+            ][:agg['terms'].get('size', 10)])
+
+        start = int(params.get('from_', body.get('from', 0)))
+        size = int(params.get('size', body.get('size', 10)))
+        result = dict(took=1, timed_out=False, _shards=dict(failed=0),
+                      hits=dict(total=len(hits),
+                                hits=hits[start:start + size]))
+        if aggregations:
+            result['aggregations'] = aggregations
+        if params.get('scroll'):
+            with self.lock:
+                scroll_id = str(len(self.calls))
+                self.scrolls[scroll_id] = (
+                    hits[start + size:], size, len(hits))
+            result['_scroll_id'] = scroll_id
+        return result
+
+    @staticmethod
+    def _after(values, search_after, orders):
+        """Check if sort values come after those of ``search_after``."""
+        for value, reference, (name, order) in zip(
+                values, search_after, orders):
+            if value != reference:
+                return (value > reference) == (order != 'desc')
+        return False
+
+    def scroll(self, scroll_id, scroll=None, **params):
+        """Return the next page of a scroll."""
+        with self.lock:
+            self.calls.append(('scroll', None))
+            hits, size, total = self.scrolls[scroll_id]
+            self.scrolls[scroll_id] = (hits[size:], size, total)
+        return dict(took=1, timed_out=False, _scroll_id=scroll_id,
+                    hits=dict(total=total, hits=hits[:size]))
+
+    def clear_scroll(self, scroll_id=None, body=None, **params):
+        """Close scrolls."""
+        with self.lock:
+            self.calls.append(('clear_scroll', None))
+            for scroll_id in [scroll_id] if scroll_id else list(
+                    self.scrolls):
+                self.scrolls.pop(scroll_id, None)
+        return dict(succeeded=True)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Local stand-in of an SMTP relay.
+
+:class:`FakeSMTPServer` accepts mail on a local port and keeps the
+received messages in memory. It speaks the subset of SMTP used by
+:mod:`smtplib` (``EHLO``, ``MAIL``, ``RCPT``, ``DATA``, ``RSET``,
+``NOOP`` and ``QUIT``), can delay the greeting of each connection to
+simulate the TCP and TLS handshakes with a remote relay, and can answer
+with transient or permanent errors.
+
+>>> from invenio.standins.smtp import FakeSMTPServer
+>>> server = FakeSMTPServer().start()
+>>> server.port > 0
+True
+>>> server.stop()
+"""
+
+from __future__ import absolute_import, print_function
+
+import threading
+import time
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """SMTP session of one client connection."""
+
+    def reply(self, code, text):
+        """Send a reply line."""
+        self.wfile.write('{0} {1}\r\n'.format(code, text).encode('utf-8'))
+        self.wfile.flush()
+
+    def read_data(self):
+        """Read the message content up to the terminating dot."""
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                return b''.join(lines)
+            lines.append(line[1:] if line.startswith(b'..') else line)
+
+    def handle(self):
+        """Answer the commands of the client."""
+        standin = self.server.standin
+        standin.connected()
+        self.reply(220, 'localhost Fake ESMTP')
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command, dummy, arg = line.decode(
+                'utf-8', 'replace').strip().partition(' ')
+            command = command.upper()
+            if command in ('EHLO', 'HELO'):
+                self.reply(250, 'localhost')
+            elif command == 'MAIL':
+                failure = standin.take_failure()
+                if failure:
+                    self.reply(*failure)
+                    if failure[0] == 421:
+                        return
+                    continue
+                sender, recipients = arg.partition(':')[2].strip(), []
+                self.reply(250, 'OK')
+            elif command == 'RCPT':
+                recipient = arg.partition(':')[2].strip().strip('<>')
+                if recipient in standin.rejected:
+                    self.reply(550, 'No such user')
+                else:
+                    recipients.append(recipient)
+                    self.reply(250, 'OK')
+            elif command == 'DATA':
+                if not recipients:
+                    self.reply(503, 'No valid recipients')
+                    continue
+                self.reply(354, 'End data with <CR><LF>.<CR><LF>')
+                standin.received(sender.strip('<>'), recipients,
+                                 self.read_data())
+                sender, recipients = None, []
+                self.reply(250, 'OK')
+            elif command == 'RSET':
+                sender, recipients = None, []
+                self.reply(250, 'OK')
+            elif command == 'NOOP':
+                self.reply(250, 'OK')
+            elif command == 'QUIT':
+                self.reply(221, 'Bye')
+                return
+            else:
+                self.reply(502, 'Command not implemented')
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """TCP server handling each connection in a thread."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class FakeSMTPServer(object):
+    """Fake SMTP relay answering on a local port."""
+
+    def __init__(self, host='127.0.0.1', port=0, connect_latency=0):
+        """Initialize the server.
+
+        :param host: Interface to bind.
+        :param port: Port to bind (``0`` picks a free port).
+        :param connect_latency: Seconds waited before greeting a new
+            connection.
+        """
+        self.connect_latency = connect_latency
+        self.messages = []
+        """Received ``(sender, recipients, data)`` tuples."""
+        self.connections = 0
+        self.rejected = set()
+        """Recipients refused with a permanent error."""
+        self.failures = []
+        """Upcoming ``(code, text)`` replies to ``MAIL`` commands (e.g.
+        ``(451, 'Try again later')``). A ``421`` reply also closes the
+        connection."""
+        self.lock = threading.Lock()
+        self.server = ThreadingServer((host, port), FakeSMTPHandler)
+        self.server.standin = self
+        self.thread = None
+
+    @property
+    def host(self):
+        """Bound interface."""
+        return self.server.server_address[0]
+
+    @property
+    def port(self):
+        """Bound port."""
+        return self.server.server_address[1]
+
+    def start(self):
+        """Serve connections in a background thread."""
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop accepting connections."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fail(self, code=451, text='Try again later', count=1):
+        """Answer the next ``MAIL`` commands with an error."""
+        with self.lock:
+            self.failures.extend([(code, text)] * count)
+
+    def connected(self):
+        """Count a connection and simulate the handshake latency."""
+        with self.lock:
+            self.connections += 1
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+
+    def take_failure(self):
+        """Get the next injected error, if any."""
+        with self.lock:
+            return self.failures.pop(0) if self.failures else None
+
+    def received(self, sender, recipients, data):
+        """Store a received message."""
+        with self.lock:
+            self.messages.append((sender, recipients, data))
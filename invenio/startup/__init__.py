@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Startup time and memory profiling of an assembled instance.
+
+Every worker process of a node pays the cost of importing the modules of
+the instance and initializing their extensions. The profiler builds an
+application in a fresh interpreter and reports, to pin a regression to a
+module, package or bundle:
+
+* the import time and the retained memory of every module, also summed
+  by top-level package along with the bundle providing it;
+* the time and retained memory of every extension ``init_app``.
+
+.. code-block:: console
+
+    $ invenio profile-startup invenio3.factory:create_app --sort memory
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import StartupProfiler, profile_startup
+
+__all__ = ('StartupProfiler', 'profile_startup', )
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Import, extension initialization and memory profiling of startup."""
+
+from __future__ import absolute_import, print_function
+
+import inspect
+import sys
+
+from ..bench.api import timer
+from ..bundles import BUNDLES
+from ..helpers import load_app
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+PACKAGE_BUNDLES = dict(
+    (module, bundle) for bundle, modules in BUNDLES.items()
+    for module in modules.values())
+"""Bundle providing each top-level package."""
+
+
+class _Entry(object):
+    """Inclusive and exclusive measurements of a profiled call."""
+
+    def __init__(self, name):
+        """Initialize."""
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.memory = 0
+        self.children_seconds = 0.0
+        self.children_memory = 0
+
+    def to_dict(self):
+        """Serialize the measurements."""
+        return dict(
+            name=self.name,
+            calls=self.calls,
+            seconds=self.seconds,
+            self_seconds=self.seconds - self.children_seconds,
+            memory=self.memory,
+            self_memory=self.memory - self.children_memory,
+        )
+
+
+class StartupProfiler(object):
+    """Measure the modules imported and extensions initialized at startup.
+
+    While active, the profiler is the first finder of :data:`sys.meta_path`
+    and times the execution of every module imported for the first time,
+    and the ``init_app`` of every class defining it in these modules. With
+    ``memory`` enabled, the memory allocated by each of them and still
+    retained afterwards is traced with :mod:`tracemalloc`, which slows the
+    startup down.
+
+    Measurements are inclusive (``seconds``, ``memory``) or exclusive of
+    nested imports and initializations (``self_seconds``,
+    ``self_memory``).
+    """
+
+    def __init__(self, memory=True):
+        """Initialize the profiler.
+
+        :param memory: Trace the memory allocations (requires Python 3.4
+            or later).
+        """
+        self.trace_memory = memory and tracemalloc is not None
+        self.modules = {}
+        self.extensions = {}
+        self.patched = []
+        self.stack = []
+        self.seconds = 0.0
+        self.memory = 0
+        self.peak_memory = 0
+        self._start = None
+
+    def _traced(self):
+        """Return the currently traced memory in bytes."""
+        if not self.trace_memory:
+            return 0
+        return tracemalloc.get_traced_memory()[0]
+
+    def _measure(self, entries, name, func, *args, **kwargs):
+        """Call a function and add its measurements to an entry."""
+        entry = entries.get(name)
+        if entry is None:
+            entry = entries[name] = _Entry(name)
+        frame = [0.0, 0]
+        self.stack.append(frame)
+        memory = self._traced()
+        start = timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = timer() - start
+            memory = self._traced() - memory
+            self.stack.pop()
+            entry.calls += 1
+            entry.seconds += seconds
+            entry.memory += memory
+            entry.children_seconds += frame[0]
+            entry.children_memory += frame[1]
+            if self.stack:
+                self.stack[-1][0] += seconds
+                self.stack[-1][1] += memory
+
+    def find_spec(self, fullname, path=None, target=None):
+        """Find a module with the other finders and time its execution."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Built-in and frozen modules are loaded by classes shared by all
+        # modules, which must not be patched.
+        if loader is None or isinstance(loader, type) or \
+                not hasattr(loader, 'exec_module'):
+            return spec
+
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            del loader.exec_module
+            self._measure(self.modules, fullname, exec_module, module)
+            self.patch_extensions(module)
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+    def patch_extensions(self, module):
+        """Time the ``init_app`` of the classes defined in a module."""
+        for obj in list(vars(module).values()):
+            if not isinstance(obj, type) or \
+                    obj.__module__ != module.__name__:
+                continue
+            init_app = obj.__dict__.get('init_app')
+            if not inspect.isfunction(init_app):
+                continue
+            name = '{0}.{1}'.format(obj.__module__, obj.__name__)
+            obj.init_app = self._timed_init_app(name, init_app)
+            self.patched.append((obj, init_app))
+
+    def _timed_init_app(self, name, init_app):
+        """Wrap an ``init_app`` method."""
+        def timed_init_app(ext, *args, **kwargs):
+            return self._measure(self.extensions, name, init_app, ext, *args,
+                                 **kwargs)
+        timed_init_app.__doc__ = init_app.__doc__
+        return timed_init_app
+
+    def start(self):
+        """Start profiling."""
+        if self.trace_memory:
+            tracemalloc.start()
+        sys.meta_path.insert(0, self)
+        self._start = timer()
+
+    def stop(self):
+        """Stop profiling and restore the patched classes."""
+        self.seconds = timer() - self._start
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        for cls, init_app in self.patched:
+            cls.init_app = init_app
+        self.patched = []
+        if self.trace_memory:
+            self.memory, self.peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    def __enter__(self):
+        """Start profiling."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop profiling."""
+        self.stop()
+
+    def report(self):
+        """Build the report of the measurements.
+
+        :returns: Dictionary with the total ``seconds``, ``memory`` and
+            ``peak_memory``, and lists of ``modules``, ``extensions`` and
+            top-level ``packages`` (with their bundle, if any).
+        """
+        modules = []
+        packages = {}
+        for entry in self.modules.values():
+            data = entry.to_dict()
+            top = entry.name.split('.', 1)[0]
+            data['package'] = top
+            data['bundle'] = PACKAGE_BUNDLES.get(top)
+            modules.append(data)
+
+            package = packages.setdefault(top, dict(
+                name=top, bundle=data['bundle'], modules=0, self_seconds=0.0,
+                self_memory=0))
+            package['modules'] += 1
+            package['self_seconds'] += data['self_seconds']
+            package['self_memory'] += data['self_memory']
+
+        return dict(
+            seconds=self.seconds,
+            memory=self.memory,
+            peak_memory=self.peak_memory,
+            traced=self.trace_memory,
+            modules=modules,
+            extensions=[entry.to_dict() for entry in self.extensions.values()],
+            packages=list(packages.values()),
+        )
+
+
+def profile_startup(import_path, memory=True, **kwargs):
+    """Profile loading an application.
+
+    Only modules which are not imported yet are measured, so this should
+    run in a fresh interpreter (see :mod:`invenio.startup.profile`).
+
+    :param import_path: Import path of an application or application
+        factory.
+    :param memory: Trace the memory allocations.
+    :param kwargs: Keyword arguments passed to the application factory.
+    :returns: The report of the :class:`StartupProfiler`.
+    """
+    with StartupProfiler(memory=memory) as profiler:
+        load_app(import_path, **kwargs)
+    report = profiler.report()
+    report['app'] = import_path
+    return report
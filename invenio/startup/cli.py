@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the startup profiler."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+import click
+
+VIEWS = {
+    'modules': ('name', 'bundle', 'self_seconds', 'seconds', 'self_memory',
+                'memory'),
+    'packages': ('name', 'bundle', 'modules', 'self_seconds',
+                 'self_memory'),
+    'extensions': ('name', 'calls', 'self_seconds', 'seconds', 'self_memory',
+                   'memory'),
+}
+"""Columns of the report tables."""
+
+SORT_KEYS = {
+    'time': 'self_seconds',
+    'memory': 'self_memory',
+    'name': 'name',
+}
+"""Sort orders of the report tables."""
+
+
+def format_value(column, value):
+    """Format a cell: durations in milliseconds, memory in KiB."""
+    if value is None:
+        return '-'
+    if column.endswith('seconds'):
+        return '{0:.2f}'.format(value * 1000)
+    if column.endswith('memory'):
+        return '{0:.1f}'.format(value / 1024.0)
+    return str(value)
+
+
+def format_table(rows, columns, sort='time', limit=None):
+    """Format report rows as a table sorted by time, memory or name."""
+    key = SORT_KEYS[sort]
+    rows = sorted(rows, key=lambda row: row[key], reverse=key != 'name')
+    if limit:
+        rows = rows[:limit]
+    headers = tuple(
+        column.replace('seconds', 'ms').replace('memory', 'kib')
+        for column in columns)
+    cells = [headers] + [
+        tuple(format_value(column, row.get(column)) for column in columns)
+        for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+    return '\n'.join(
+        '  '.join(cell.ljust(w) if i < 2 else cell.rjust(w)
+                  for i, (cell, w) in enumerate(zip(row, widths)))
+        for row in cells)
+
+
+@click.command('profile-startup')
+@click.argument('app')
+@click.option('--view', '-v', 'views', multiple=True,
+              type=click.Choice(sorted(VIEWS)),
+              help='Table to show (repeatable, defaults to all).')
+@click.option('--sort', '-s', default='time', show_default=True,
+              type=click.Choice(sorted(SORT_KEYS)),
+              help='Sort order of the tables (exclusive time or memory).')
+@click.option('--limit', '-n', default=20, type=int, show_default=True,
+              help='Rows per table (0 for all).')
+@click.option('--memory/--no-memory', default=True,
+              help='Trace memory allocations (slows the startup down).')
+@click.option('--output', '-o', type=click.File('w'),
+              help='Write the full report as JSON to a file.')
+def profile_startup(app, views, sort, limit, memory, output):
+    """Profile the startup of APP in a fresh interpreter.
+
+    APP is the import path of an application or application factory, e.g.
+    "invenio3.factory:create_app". Reports the import time and retained
+    memory of every module (and of every top-level package with its
+    bundle), and the time and memory of every extension "init_app".
+    Exclusive ("self") measurements do not include nested imports or
+    initializations.
+    """
+    from .profile import run
+
+    report = run(app, memory=memory)
+    for view in views or ('packages', 'modules', 'extensions'):
+        click.secho('{0}:'.format(view.capitalize()), bold=True)
+        click.echo(format_table(report[view], VIEWS[view], sort=sort,
+                                limit=limit))
+        click.echo()
+    click.echo('Total: {0:.1f} ms, {1} modules, {2}'.format(
+        report['seconds'] * 1000, len(report['modules']),
+        '{0:.1f} KiB retained, {1:.1f} KiB peak'.format(
+            report['memory'] / 1024.0, report['peak_memory'] / 1024.0)
+        if report['traced'] else 'memory not traced'))
+    if output:
+        json.dump(report, output, indent=2, sort_keys=True)
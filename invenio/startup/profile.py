@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Profile the startup of an application in a fresh interpreter.
+
+The module is executed by :func:`invenio.startup.cli.profile_startup` as::
+
+    python -m invenio.startup.profile invenio3.factory:create_app
+
+and prints a single line of JSON with the report.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import subprocess
+import sys
+
+from .api import profile_startup
+
+
+def run(import_path, memory=True, env=None):
+    """Profile an application in a fresh interpreter.
+
+    :param import_path: Import path of an application or application
+        factory.
+    :param memory: Trace the memory allocations.
+    :param env: Environment variables of the interpreter.
+    :returns: The report (see :meth:`StartupProfiler.report`).
+    """
+    args = [sys.executable, '-m', 'invenio.startup.profile', import_path]
+    if not memory:
+        args.append('--no-memory')
+    output = subprocess.check_output(args, env=env, universal_newlines=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    """Profile the application and print the report as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('app')
+    parser.add_argument('--no-memory', dest='memory', action='store_false')
+    args = parser.parse_args(argv)
+    report = profile_startup(args.app, memory=args.memory)
+    print(json.dumps(report, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Precompiled Jinja2 template bytecode.
+
+Each new worker compiles the templates it renders, slowing down the first
+requests after every deploy. The ``templates compile`` command compiles all
+templates of the application ahead of time into a bytecode cache, keyed on
+the template source hash, which the extension installs on the Jinja2
+environment at startup.
+
+.. code-block:: console
+
+   $ python manage.py build-assets
+   $ python manage.py templates compile --prune
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import SourceHashBytecodeCache, compile_templates
+from .ext import InvenioTemplateCache
+
+__all__ = ('InvenioTemplateCache', 'SourceHashBytecodeCache',
+           'compile_templates', )
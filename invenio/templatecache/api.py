@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Jinja2 bytecode cache keyed on the template source hash."""
+
+from __future__ import absolute_import, print_function
+
+import errno
+import fnmatch
+import logging
+import os
+import tempfile
+from hashlib import sha1
+
+from jinja2 import TemplateSyntaxError
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+
+class SourceHashBytecodeCache(FileSystemBytecodeCache):
+    """Filesystem bytecode cache keyed on the template name and source hash.
+
+    Jinja2 keys its buckets on the template filename, which differs between
+    the host compiling the templates and the one serving them. Keying on the
+    source hash instead makes precompiled bytecode valid wherever the same
+    template source is installed, and leaves stale bytecode unused rather
+    than overwritten.
+
+    Failing to write the cache (e.g. read-only deployments) is logged and
+    otherwise ignored: templates are still compiled in memory.
+    """
+
+    def __init__(self, directory, pattern='__jinja2_%s.cache'):
+        """Initialize the cache, creating the directory if possible."""
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                logger.warning('Cannot create %s: %s', directory, e)
+        super(SourceHashBytecodeCache, self).__init__(directory, pattern)
+
+    def get_key(self, name, source):
+        """Return the bucket key of a template source."""
+        return sha1('{0}|{1}'.format(
+            name, self.get_source_checksum(source)).encode('utf-8')
+        ).hexdigest()
+
+    def get_bucket(self, environment, name, filename, source):
+        """Return the bucket of a template, loading cached bytecode."""
+        bucket = Bucket(environment, self.get_key(name, source),
+                        self.get_source_checksum(source))
+        self.load_bytecode(bucket)
+        return bucket
+
+    def dump_bytecode(self, bucket):
+        """Write the bytecode atomically, ignoring write failures."""
+        filename = self._get_cache_filename(bucket)
+        try:
+            fd, tmp = tempfile.mkstemp(
+                dir=self.directory, prefix=os.path.basename(filename),
+                suffix='.tmp')
+        except (IOError, OSError) as e:
+            logger.warning('Cannot write template bytecode: %s', e)
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                bucket.write_bytecode(f)
+            os.rename(tmp, filename)
+        except (IOError, OSError) as e:
+            logger.warning('Cannot write template bytecode: %s', e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def prune(self, keep):
+        """Remove bytecode files whose key is not in ``keep``.
+
+        :returns: Number of removed files.
+        """
+        keep = set(self.pattern % key for key in keep)
+        removed = 0
+        for filename in fnmatch.filter(os.listdir(self.directory),
+                                       self.pattern % '*'):
+            if filename not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def create_bytecode_cache(app):
+    """Create the bytecode cache configured for an application."""
+    return SourceHashBytecodeCache(
+        app.config['TEMPLATECACHE_DIRECTORY'] or
+        os.path.join(app.instance_path, 'jinja2'))
+
+
+def install_bytecode_cache(app, cache):
+    """Make the application's Jinja2 environment use a bytecode cache."""
+    if 'jinja_env' in app.__dict__:
+        app.jinja_env.bytecode_cache = cache
+    else:
+        app.jinja_options = dict(app.jinja_options, bytecode_cache=cache)
+
+
+def compile_templates(env, cache, names=None):
+    """Compile templates into a bytecode cache.
+
+    Templates already cached with the same source are not recompiled.
+
+    :param env: Jinja2 environment whose loader finds the templates.
+    :param cache: The :class:`SourceHashBytecodeCache` to fill.
+    :param names: Template names (defaults to all templates of the loader).
+    :returns: Tuple of the bucket keys of compiled templates and a
+        dictionary mapping template names to compilation errors.
+    """
+    env = env.overlay(bytecode_cache=cache)
+    keys, errors = set(), {}
+    for name in names or env.list_templates():
+        try:
+            source = env.loader.get_source(env, name)[0]
+            env.loader.load(env, name, env.make_globals(None))
+        except (TemplateSyntaxError, UnicodeDecodeError) as e:
+            errors[name] = e
+            continue
+        keys.add(cache.get_key(name, source))
+    return keys, errors
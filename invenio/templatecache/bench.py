@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark of first-render latency with and without precompiled bytecode."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import tempfile
+
+from ..bench.api import summarize, timer
+
+BASE = """<!DOCTYPE html>
+<html><head><title>{% block title %}{% endblock %}</title></head>
+<body>{% block body %}{% endblock %}</body></html>
+"""
+
+MACROS = """{% macro field(name, value) -%}
+<dt>{{ name|title }}</dt><dd>{{ value|e }}</dd>
+{%- endmacro %}
+"""
+
+PAGE = """{% extends "base.html" %}
+{% import "macros.html" as macros %}
+{% block title %}Page {{ number }}{% endblock %}
+{% block body %}
+<dl>
+{% for item in items %}
+{% if loop.index is odd %}{{ macros.field(item.name, item.value) }}
+{% else %}<dt class="even">{{ item.name|upper }}</dt>
+<dd>{{ item.value|truncate(20) }}</dd>{% endif %}
+{% endfor %}
+</dl>
+{% endblock %}
+"""
+
+
+def write_templates(path, pages):
+    """Write a base layout, a macro library and ``pages`` pages."""
+    templates = dict((('base.html', BASE), ('macros.html', MACROS)))
+    for number in range(pages):
+        templates['page{0}.html'.format(number)] = PAGE.replace(
+            '{{ number }}', str(number)) + '<!-- {0} -->\n'.format(
+                '-' * number)
+    for name, source in templates.items():
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(source)
+    return sorted(name for name in templates if name.startswith('page'))
+
+
+def first_render(template_folder, names, cache_directory=None):
+    """Render each template once in a fresh application."""
+    from flask import Flask, render_template
+
+    from .ext import InvenioTemplateCache
+
+    app = Flask('invenio-bench', template_folder=template_folder)
+    app.config.update(
+        TEMPLATECACHE_ENABLED=cache_directory is not None,
+        TEMPLATECACHE_DIRECTORY=cache_directory,
+    )
+    InvenioTemplateCache(app)
+    items = [dict(name='field{0}'.format(i), value='value ' * i)
+             for i in range(10)]
+    with app.app_context():
+        start = timer()
+        for name in names:
+            render_template(name, items=items)
+        return timer() - start
+
+
+def run(repeat=5, pages=50, **kwargs):
+    """Measure the first render of templates in fresh applications.
+
+    :param repeat: Number of fresh applications per path.
+    :param pages: Number of page templates rendered.
+    """
+    try:
+        import flask  # noqa
+    except ImportError as e:
+        return dict(skipped=True, missing=[str(e)])
+
+    from jinja2 import Environment, FileSystemLoader
+
+    from .api import SourceHashBytecodeCache, compile_templates
+
+    path = tempfile.mkdtemp()
+    try:
+        template_folder = os.path.join(path, 'templates')
+        cache_directory = os.path.join(path, 'cache')
+        os.mkdir(template_folder)
+        names = write_templates(template_folder, pages)
+
+        start = timer()
+        compile_templates(
+            Environment(loader=FileSystemLoader(template_folder)),
+            SourceHashBytecodeCache(cache_directory))
+        compile_time = timer() - start
+
+        cold = summarize([first_render(template_folder, names)
+                          for dummy in range(repeat)])
+        warm = summarize([
+            first_render(template_folder, names, cache_directory)
+            for dummy in range(repeat)])
+    finally:
+        shutil.rmtree(path)
+    return dict(
+        templates=pages + 2,
+        compile_seconds=compile_time,
+        first_render_seconds=cold,
+        first_render_cached_seconds=warm,
+        speedup=cold['median'] / warm['median'],
+    )
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface for the template bytecode cache."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask import current_app
+
+from .api import compile_templates, create_bytecode_cache
+
+try:
+    from flask.cli import with_appcontext
+except ImportError:
+    from flask_cli import with_appcontext
+
+
+@click.group()
+def templates():
+    """Template commands."""
+
+
+@templates.command('compile')
+@click.option('--prune', is_flag=True,
+              help='Remove bytecode of templates no longer installed.')
+@with_appcontext
+def compile_cmd(prune):
+    """Compile all templates into the bytecode cache."""
+    cache = create_bytecode_cache(current_app)
+    keys, errors = compile_templates(current_app.jinja_env, cache)
+    for name, error in sorted(errors.items()):
+        click.secho('Skipped {0}: {1}'.format(name, error), fg='yellow',
+                    err=True)
+    click.secho('Compiled {0} templates into {1}.'.format(
+        len(keys), cache.directory), fg='green')
+    if prune:
+        click.echo('Removed {0} stale files.'.format(cache.prune(keys)))
+
+
+@templates.command('clean')
+@with_appcontext
+def clean_cmd():
+    """Remove the template bytecode cache."""
+    create_bytecode_cache(current_app).clear()
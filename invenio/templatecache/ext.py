@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Template bytecode cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from . import config
+from .api import create_bytecode_cache, install_bytecode_cache
+from .cli import templates
+
+
+class InvenioTemplateCache(object):
+    """Template bytecode cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.bytecode_cache = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        if app.config['TEMPLATECACHE_ENABLED']:
+            self.bytecode_cache = create_bytecode_cache(app)
+            install_bytecode_cache(app, self.bytecode_cache)
+        app.cli.add_command(templates)
+        app.extensions['invenio-templatecache'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('TEMPLATECACHE_'):
+                app.config.setdefault(k, getattr(config, k))
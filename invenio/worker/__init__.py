@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Celery worker profile: queues, routing and per-pool tuning.
+
+Tasks are routed by name to separate queues (``indexing``, ``mail``,
+``maintenance`` and ``default``) declared by the extension, so that slow
+indexing tasks do not delay e-mails. Every queue is consumed by its own
+pool of workers; a worker selects its pool from its node name, which sets
+the queues it consumes, its concurrency, how many tasks it prefetches and
+how often its processes are recycled:
+
+.. code-block:: console
+
+    $ export INVENIO_WORKER_INSTANCE=invenio3
+    $ celery worker -A invenio.worker.celery -n indexing@%h
+    $ celery worker -A invenio.worker.celery -n mail@%h
+    $ celery worker -A invenio.worker.celery -n maintenance@%h
+    $ celery worker -A invenio.worker.celery -n default@%h
+
+The Celery application of :mod:`invenio.worker.celery` is built for the
+instance named by ``INVENIO_WORKER_INSTANCE`` with
+:func:`invenio.worker.factory.create_worker_app`, which skips the
+extensions only needed to serve web pages (assets, theme, template
+caches) and so reduces the memory of every worker process.
+"""
+
+from __future__ import absolute_import, print_function
+
+from .api import TaskRouter, celery_config, configure_worker, pool_name
+from .ext import InvenioWorker
+from .factory import WEB_ONLY_EXTENSIONS, create_app_factory, create_worker_app
+
+__all__ = ('InvenioWorker', 'TaskRouter', 'WEB_ONLY_EXTENSIONS',
+           'celery_config', 'configure_worker', 'create_app_factory',
+           'create_worker_app', 'pool_name', )
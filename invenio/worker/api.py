@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Celery task routing and worker pool options."""
+
+from __future__ import absolute_import, print_function
+
+import fnmatch
+import os
+
+POOL_OPTIONS = {
+    'concurrency': 'CELERYD_CONCURRENCY',
+    'prefetch_multiplier': 'CELERYD_PREFETCH_MULTIPLIER',
+    'max_tasks_per_child': 'CELERYD_MAX_TASKS_PER_CHILD',
+}
+"""Celery configuration variables of the pool options."""
+
+
+class TaskRouter(object):
+    """Route tasks to queues by matching their names against patterns.
+
+    Unlike the routes mapping of Celery, patterns may contain shell-style
+    wildcards.
+    """
+
+    def __init__(self, routes, default_queue=None):
+        """Initialize the router.
+
+        :param routes: List of ``(pattern, queue)``; the first matching
+            pattern wins.
+        :param default_queue: Queue of the tasks matching no pattern
+            (``None`` lets Celery decide).
+        """
+        self.routes = list(routes)
+        self.default_queue = default_queue
+        self._cache = {}
+
+    def queue_for(self, name):
+        """Get the queue of a task name."""
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        queue = self.default_queue
+        for pattern, route_queue in self.routes:
+            if fnmatch.fnmatchcase(name, pattern):
+                queue = route_queue
+                break
+        self._cache[name] = queue
+        return queue
+
+    def route_for_task(self, task, args=None, kwargs=None):
+        """Route a task (Celery router interface)."""
+        queue = self.queue_for(task)
+        return dict(queue=queue) if queue else None
+
+
+def celery_config(queues, routes, default_queue):
+    """Build the Celery configuration declaring the queues and routes.
+
+    :param queues: Names of the queues.
+    :param routes: List of ``(pattern, queue)``.
+    :param default_queue: Queue of the tasks matching no route.
+    :returns: Dictionary of Celery configuration variables.
+    """
+    from kombu import Queue
+
+    return dict(
+        CELERY_DEFAULT_QUEUE=default_queue,
+        CELERY_QUEUES=[Queue(name, routing_key=name) for name in queues],
+        CELERY_ROUTES=[TaskRouter(routes, default_queue)],
+    )
+
+
+def pool_name(hostname=None, environ=None):
+    """Get the pool of a worker.
+
+    :param hostname: Node name of the worker (e.g. ``indexing@host``).
+    :param environ: Environment (defaults to ``os.environ``).
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get('INVENIO_WORKER_POOL'):
+        return environ['INVENIO_WORKER_POOL']
+    if hostname and '@' in hostname:
+        return hostname.split('@', 1)[0]
+    return None
+
+
+def configure_worker(conf, amqp, pool, options=None):
+    """Apply the options of a pool to a starting worker.
+
+    Options given on the command line (e.g. ``-Q`` or ``-c``) win over the
+    pool options.
+
+    :param conf: Celery configuration of the worker.
+    :param amqp: AMQP helper of the Celery application, whose queues are
+        selected.
+    :param pool: Dictionary of pool options.
+    :param options: Command line options of the worker.
+    :returns: Dictionary of the applied options.
+    """
+    options = options or {}
+    applied = {}
+    for option, key in POOL_OPTIONS.items():
+        if pool.get(option) is not None and options.get(option) is None:
+            conf[key] = applied[option] = pool[option]
+    if pool.get('queues') and not options.get('queues'):
+        amqp.queues.select(pool['queues'])
+        applied['queues'] = list(pool['queues'])
+    return applied
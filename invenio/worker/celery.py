@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Celery application of the worker processes.
+
+The Flask application is built with
+:func:`invenio.worker.factory.create_worker_app` for the instance named by
+the ``INVENIO_WORKER_INSTANCE`` environment variable:
+
+.. code-block:: console
+
+    $ export INVENIO_WORKER_INSTANCE=invenio3
+    $ celery worker -A invenio.worker.celery -n mail@%h
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+from flask_celeryext import create_celery_app
+
+from .factory import create_worker_app
+
+celery = create_celery_app(
+    create_worker_app(os.environ['INVENIO_WORKER_INSTANCE']))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Celery worker profile configuration.
+
+Tasks are routed to separate queues so that slow indexing tasks cannot
+starve short ones, and each queue is consumed by its own pool of workers
+with suited concurrency and prefetching. Start one worker per pool, named
+after the pool::
+
+    celery worker -A invenio.worker.celery -n indexing@%h
+    celery worker -A invenio.worker.celery -n mail@%h
+"""
+
+WORKER_DEFAULT_QUEUE = 'default'
+"""Queue of the tasks not matching any route."""
+
+WORKER_QUEUES = ('default', 'indexing', 'mail', 'maintenance', )
+"""Declared queues."""
+
+WORKER_ROUTES = [
+    ('invenio_indexer.*', 'indexing'),
+    ('invenio_search.*', 'indexing'),
+    ('invenio.reindex.*', 'indexing'),
+    ('invenio_mail.*', 'mail'),
+    ('invenio.mailpool.*', 'mail'),
+    ('*.send_email', 'mail'),
+    ('celery.backend_cleanup', 'maintenance'),
+    ('*.tasks.clean*', 'maintenance'),
+    ('*.tasks.prune*', 'maintenance'),
+]
+"""Task name patterns (shell-style wildcards) and their queue.
+
+The first matching pattern wins.
+"""
+
+WORKER_POOLS = {
+    'default': dict(queues=['default'], concurrency=4,
+                    prefetch_multiplier=4, max_tasks_per_child=1000),
+    'indexing': dict(queues=['indexing'], concurrency=2,
+                     prefetch_multiplier=1, max_tasks_per_child=100),
+    'mail': dict(queues=['mail'], concurrency=4, prefetch_multiplier=8,
+                 max_tasks_per_child=1000),
+    'maintenance': dict(queues=['maintenance'], concurrency=1,
+                        prefetch_multiplier=1, max_tasks_per_child=10),
+}
+"""Options of the worker pools.
+
+Long running tasks (indexing, maintenance) only reserve one task at a time
+so that queued tasks go to idle workers, and their processes are recycled
+often to release memory. Short tasks (mail) are prefetched in batches to
+save round-trips to the broker.
+"""
+
+WORKER_POOL = None
+"""Pool of the worker process.
+
+Defaults to the ``INVENIO_WORKER_POOL`` environment variable or to the
+worker node name up to the ``@`` (e.g. ``indexing@%h``). Workers of an
+unknown pool consume all queues with the Celery defaults.
+"""
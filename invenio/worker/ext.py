@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Celery worker profile extension."""
+
+from __future__ import absolute_import, print_function
+
+from . import config
+from .api import celery_config, configure_worker, pool_name
+
+
+def get_celery(app):
+    """Get the Celery application of a Flask application, if created."""
+    for name in ('invenio-celery', 'flask-celeryext'):
+        celery = getattr(app.extensions.get(name), 'celery', None)
+        if celery is not None:
+            return celery
+    return None
+
+
+class InvenioWorker(object):
+    """Celery worker profile extension.
+
+    Declares the queues and routes in the Celery configuration and, when a
+    worker starts, applies the options of its pool.
+    """
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        self.pool = None
+        self.applied = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        routing = celery_config(
+            app.config['WORKER_QUEUES'],
+            app.config['WORKER_ROUTES'],
+            app.config['WORKER_DEFAULT_QUEUE'],
+        )
+        for key, value in routing.items():
+            app.config.setdefault(key, value)
+        celery = get_celery(app)
+        if celery is not None:
+            # Invenio-Celery was initialized first and copied the
+            # configuration already.
+            celery.conf.update(
+                dict((key, app.config[key]) for key in routing))
+
+        try:
+            from celery.signals import celeryd_init
+        except ImportError:
+            pass
+        else:
+            celeryd_init.connect(
+                lambda sender=None, instance=None, conf=None, options=None,
+                **kwargs: self.configure(app, sender, instance, options),
+                weak=False)
+        app.extensions['invenio-worker'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('WORKER_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def configure(self, app, hostname, worker, options=None):
+        """Apply the pool options to a starting worker.
+
+        :param hostname: Node name of the worker.
+        :param worker: The Celery worker.
+        :param options: Command line options of the worker.
+        :returns: Dictionary of the applied options.
+        """
+        celery = get_celery(app)
+        if celery is not None and celery is not worker.app:
+            return {}
+        self.pool = app.config['WORKER_POOL'] or pool_name(hostname)
+        pool = app.config['WORKER_POOLS'].get(self.pool)
+        if pool is None:
+            return {}
+        self.applied = configure_worker(
+            worker.app.conf, worker.app.amqp, pool, options)
+        app.logger.info('Worker %s uses the %s pool: %s', hostname,
+                        self.pool, self.applied)
+        return self.applied
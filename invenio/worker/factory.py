@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Application factory of the Celery worker processes."""
+
+from __future__ import absolute_import, print_function
+
+import importlib
+
+WEB_ONLY_EXTENSIONS = (
+    'invenio_assetbuild',
+    'invenio_assets',
+    'invenio_export',
+    'invenio_hashedassets',
+    'invenio_records_ui',
+    'invenio_templatecache',
+    'invenio_theme',
+)
+"""Names of the extension entry points only needed to serve web pages.
+
+Caches invalidated when records change (e.g. ``invenio_httpcache``) are
+not listed: workers update records, so they must invalidate the cached
+pages as well.
+"""
+
+
+def create_app_factory(app_name, exclude=WEB_ONLY_EXTENSIONS, **kwargs):
+    """Create an application factory for Celery workers.
+
+    Same as :func:`invenio.registry.factory.create_app_factory`, but the
+    web-only extensions (assets, theme, template cache, ...) are neither
+    imported nor initialized, which reduces the memory footprint of
+    every worker process.
+
+    :param app_name: Application name.
+    :param exclude: Names of the extension entry points not to load.
+    """
+    from ..registry.factory import create_app_factory
+
+    return create_app_factory(app_name, exclude=exclude, **kwargs)
+
+
+def create_worker_app(instance, **kwargs):
+    """Create the application of the Celery workers of an instance.
+
+    The configuration loader, instance path and static folder are taken
+    from the factory module of the instance (``<instance>.factory``, as
+    created by ``inveniomanage instance create``) when it defines them.
+
+    :param instance: Name of the package of the instance.
+    :param kwargs: Arguments of :func:`create_app_factory`, overriding the
+        ones of the instance.
+    :returns: The Flask application.
+    """
+    from ..helpers import include_current_directory
+
+    include_current_directory()
+    factory = importlib.import_module(instance + '.factory')
+    for name in ('config_loader', 'instance_path', 'static_folder'):
+        if getattr(factory, name, None) is not None:
+            kwargs.setdefault(name, getattr(factory, name))
+    kwargs.setdefault('extension_entry_points', ['invenio_base.apps'])
+    kwargs.setdefault('blueprint_entry_points', ['invenio_base.blueprints'])
+    return create_app_factory(instance, **kwargs)()
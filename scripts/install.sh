@@ -137,8 +137,10 @@ cd -
 # sphinxdoc-run-bower-end
 
 # sphinxdoc-collect-and-build-assets-begin
-python manage.py collect -v
-python manage.py assets build
+python manage.py build-assets --jobs 4
+python manage.py static hash --prune
+python manage.py templates compile --prune
+python manage.py catalogs build
 # sphinxdoc-collect-and-build-assets-end
 
 # sphinxdoc-create-database-begin
@@ -155,7 +157,10 @@ python manage.py users create \
 
 # sphinxdoc-start-celery-worker-begin
 # FIXME we should run celery worker on another node
-celery worker -A ${INVENIO_WEB_INSTANCE}.celery -l INFO &
+export INVENIO_WORKER_INSTANCE=${INVENIO_WEB_INSTANCE}
+for pool in default indexing mail maintenance; do
+    celery worker -A invenio.worker.celery -l INFO -n ${pool}@%h &
+done
 # sphinxdoc-start-celery-worker-end
 
 # sphinxdoc-populate-with-demo-records-begin
@@ -173,5 +178,5 @@ db.session.commit()" | python manage.py shell
 # sphinxdoc-register-pid-end
 
 # sphinxdoc-start-application-begin
-python manage.py --debug run &
+invenio serve ${INVENIO_WEB_INSTANCE}.factory:create_app --workers 4 &
 # sphinxdoc-start-application-end
@@ -27,7 +27,7 @@
 import os
 import sys
 
-from setuptools import find_packages, setup
+from setuptools import Command, find_packages, setup
 from setuptools.command.test import test as TestCommand
 
 readme = open('README.rst').read()
@@ -44,6 +44,7 @@ tests_require = [
     'pytest>=2.8.0',
 ]
 
+# Module bundles are mirrored in ``invenio/bundles.py``.
 extras_require = {
     'accounts': [
         'invenio-accounts>=1.0.0a2,<1.1.0',
@@ -54,7 +55,11 @@ extras_require = {
         'invenio-records-ui>=1.0.0a1,<1.1.0',
         'invenio-records-rest>=1.0.0a2,<1.1.0',
     ],
+    'redis': [
+        'redis>=2.10.0',
+    ],
     'theme': [
+        'Brotli>=0.1.0',
         'invenio-assets>=1.0.0a1,<1.1.0',
         'invenio-theme>=1.0.0a3,<1.1.0',
     ],
@@ -98,6 +103,7 @@ setup_requires = [
 ]
 
 install_requires = [
+    'click>=5.0',
     'invenio-base>=1.0.0a3,<1.1.0',
     'invenio-celery>=1.0.0a2,<1.1.0',
     'invenio-config>=1.0.0a1,<1.1.0',
@@ -140,6 +146,50 @@ class PyTest(TestCommand):
         errno = pytest.main(self.pytest_args)
         sys.exit(errno)
 
+
+class Bench(Command):
+    """Run the benchmark suites and write a JSON report."""
+
+    description = 'run the benchmark suites and write a JSON report'
+    user_options = [
+        ('suites=', 's', "Comma separated list of suites to run"),
+        ('aliases=', None, "Comma separated list of aliases to benchmark"),
+        ('repeat=', 'r', "Number of measurements per benchmark"),
+        ('requests=', None, "Number of requests for throughput benchmarks"),
+        ('output=', 'o', "Path of the JSON report"),
+    ]
+
+    def initialize_options(self):
+        """Init bench."""
+        self.suites = None
+        self.aliases = None
+        self.repeat = 3
+        self.requests = 100
+        self.output = 'bench.json'
+
+    def finalize_options(self):
+        """Finalize bench."""
+        if self.suites:
+            self.suites = self.suites.split(',')
+        if self.aliases:
+            self.aliases = self.aliases.split(',')
+        self.repeat = int(self.repeat)
+        self.requests = int(self.requests)
+
+    def run(self):
+        """Run benchmarks."""
+        # import here, cause outside the eggs aren't loaded
+        from invenio.bench import run
+        report = run(
+            suites=self.suites,
+            aliases=self.aliases,
+            repeat=self.repeat,
+            requests=self.requests,
+        )
+        report.save(self.output)
+        self.announce('Benchmark report written to {0}'.format(self.output),
+                      level=2)
+
 # Get the version string. Cannot be done with import!
 g = {}
 with open(os.path.join('invenio', 'version.py'), 'rt') as fp:
@@ -160,7 +210,56 @@ setup(
     zip_safe=False,
     include_package_data=True,
     platforms='any',
-    entry_points={},
+    entry_points={
+        'console_scripts': [
+            'invenio = invenio.cli:cli',
+        ],
+        'invenio_base.api_apps': [
+            'invenio_asyncread = invenio.asyncread:InvenioAsyncRead',
+            'invenio_batch = invenio.batch:InvenioBatch',
+            'invenio_catalogs = invenio.catalogs:InvenioCatalogs',
+            'invenio_export = invenio.export:InvenioExport',
+            'invenio_httpcache = invenio.httpcache:InvenioHTTPCache',
+            'invenio_instrumentation = '
+            'invenio.instrumentation:InvenioInstrumentation',
+            'invenio_mailpool = invenio.mailpool:InvenioMailPool',
+            'invenio_pidcache = invenio.pidcache:InvenioPIDCache',
+            'invenio_pooling = invenio.pooling:InvenioPooling',
+            'invenio_schemacache = invenio.schemacache:InvenioSchemaCache',
+            'invenio_searchcache = invenio.searchcache:InvenioSearchCache',
+            'invenio_sessioncache = '
+            'invenio.sessioncache:InvenioSessionCache',
+            'invenio_worker = invenio.worker:InvenioWorker',
+        ],
+        'invenio_base.apps': [
+            'invenio_assetbuild = invenio.assetbuild:InvenioAssetBuild',
+            'invenio_batch = invenio.batch:InvenioBatch',
+            'invenio_catalogs = invenio.catalogs:InvenioCatalogs',
+            'invenio_configsnapshot = '
+            'invenio.configsnapshot:InvenioConfigSnapshot',
+            'invenio_hashedassets = '
+            'invenio.hashedassets:InvenioHashedAssets',
+            'invenio_export = invenio.export:InvenioExport',
+            'invenio_httpcache = invenio.httpcache:InvenioHTTPCache',
+            'invenio_ingest = invenio.ingest:InvenioIngest',
+            'invenio_instrumentation = '
+            'invenio.instrumentation:InvenioInstrumentation',
+            'invenio_mailpool = invenio.mailpool:InvenioMailPool',
+            'invenio_pidcache = invenio.pidcache:InvenioPIDCache',
+            'invenio_pooling = invenio.pooling:InvenioPooling',
+            'invenio_reindex = invenio.reindex:InvenioReindex',
+            'invenio_schemacache = invenio.schemacache:InvenioSchemaCache',
+            'invenio_searchcache = invenio.searchcache:InvenioSearchCache',
+            'invenio_sessioncache = '
+            'invenio.sessioncache:InvenioSessionCache',
+            'invenio_templatecache = '
+            'invenio.templatecache:InvenioTemplateCache',
+            'invenio_worker = invenio.worker:InvenioWorker',
+        ],
+        'invenio_celery.tasks': [
+            'invenio_mailpool = invenio.mailpool.tasks',
+        ],
+    },
     extras_require=extras_require,
     install_requires=install_requires,
     setup_requires=setup_requires,
@@ -181,5 +280,5 @@ setup(
         'Programming Language :: Python :: 3.5',
         'Development Status :: 3 - Alpha',
     ],
-    cmdclass={'test': PyTest},
+    cmdclass={'test': PyTest, 'bench': Bench},
 )
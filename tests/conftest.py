@@ -27,4 +27,9 @@
 
 from __future__ import absolute_import, print_function
 
+import sys
+
 import pytest
+
+collect_ignore = ['test_asyncread.py'] if sys.version_info < (3, 7) else []
+"""Test modules requiring a newer Python version than the running one."""
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for incremental asset builds."""
+
+from __future__ import absolute_import, print_function
+
+import multiprocessing
+import os
+
+import pytest
+from click.testing import CliRunner
+from flask import Blueprint, Flask
+
+from invenio.assetbuild import BuildError, BuildState, InvenioAssetBuild, \
+    Target, build_targets, collect_targets
+from invenio.assetbuild.cli import build_assets
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+
+def concatenate(inputs, output):
+    """Concatenate files, failing on empty input."""
+    data = b''.join(open(path, 'rb').read() for path in inputs)
+    if not data:
+        raise ValueError('empty')
+    with open(output, 'wb') as f:
+        f.write(data)
+
+
+def make_target(tmpdir, name):
+    """Return a target concatenating ``<name>.src``."""
+    inputs = [str(tmpdir.join(name + '.src'))]
+    output = str(tmpdir.join(name + '.out'))
+    return Target(name, inputs, lambda: concatenate(inputs, output),
+                  outputs=[output])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_build_targets(tmpdir, processes):
+    """Test only targets with changed inputs are rebuilt."""
+    for name in 'abc':
+        tmpdir.join(name + '.src').write(name)
+    state_path = str(tmpdir.join('state.json'))
+
+    def build(force=False):
+        targets = [make_target(tmpdir, name) for name in 'abc']
+        built, skipped = build_targets(targets, BuildState(state_path),
+                                       processes=processes, force=force)
+        return sorted(built), sorted(skipped)
+
+    assert build() == (['a', 'b', 'c'], [])
+    assert tmpdir.join('b.out').read() == 'b'
+    assert build() == ([], ['a', 'b', 'c'])
+
+    tmpdir.join('b.src').write('bb')
+    tmpdir.join('c.out').remove()
+    assert build() == (['b', 'c'], ['a'])
+    assert tmpdir.join('b.out').read() == 'bb'
+    assert build(force=True) == (['a', 'b', 'c'], [])
+
+    tmpdir.join('a.src').write('')
+    tmpdir.join('c.src').write('cc')
+    with pytest.raises(BuildError) as excinfo:
+        build()
+    assert list(excinfo.value.errors) == ['a']
+    assert 'ValueError' in excinfo.value.errors['a']
+    assert tmpdir.join('c.out').read() == 'cc'
+    with pytest.raises(BuildError):
+        build()
+    tmpdir.join('a.src').write('a')
+    assert build() == (['a'], ['b', 'c'])
+
+
+def test_build_targets_start_method(tmpdir, monkeypatch):
+    """Test parallel targets are built whatever the default start method."""
+    if not hasattr(multiprocessing, 'get_context'):
+        pytest.skip('Only the fork start method is available.')
+    monkeypatch.setattr(multiprocessing, 'Pool',
+                        multiprocessing.get_context('spawn').Pool)
+    for name in 'ab':
+        tmpdir.join(name + '.src').write(name)
+    targets = [make_target(tmpdir, name) for name in 'ab']
+    built, skipped = build_targets(targets, BuildState(), processes=2)
+    assert sorted(built) == ['a', 'b']
+    assert tmpdir.join('b.out').read() == 'b'
+
+
+def create_app(tmpdir):
+    """Create an application with two blueprints having static files."""
+    for name in ('one', 'two'):
+        static = tmpdir.mkdir(name)
+        static.join('common.js').write(name)
+        static.join(name + '.css').write(name)
+    app = Flask('testapp', static_folder=str(tmpdir.join('static')),
+                instance_path=str(tmpdir))
+    app.register_blueprint(Blueprint(
+        'one', __name__, static_folder=str(tmpdir.join('one'))))
+    app.register_blueprint(Blueprint(
+        'two', __name__, static_folder=str(tmpdir.join('two')),
+        static_url_path='/static/two'))
+    return app
+
+
+def test_collect_targets(tmpdir):
+    """Test blueprint precedence and static URL prefixes."""
+    app = create_app(tmpdir)
+    build_targets(collect_targets(app), BuildState())
+    static = tmpdir.join('static')
+    assert static.join('common.js').read() == 'one'
+    assert static.join('one.css').read() == 'one'
+    assert static.join('two', 'common.js').read() == 'two'
+
+
+def test_cli(tmpdir):
+    """Test the build-assets command."""
+    app = create_app(tmpdir)
+    InvenioAssetBuild(app)
+    assert app.extensions['invenio-assetbuild'].state_path == \
+        str(tmpdir.join('assetbuild.json'))
+    runner = CliRunner()
+    obj = ScriptInfo(create_app=lambda *args: app)
+
+    result = runner.invoke(build_assets, [], obj=obj)
+    assert result.exit_code == 0, result.output
+    assert 'Collected 2, 0 unchanged.' in result.output
+    assert os.path.exists(str(tmpdir.join('static', 'one.css')))
+
+    tmpdir.join('two', 'two.css').write('changed')
+    result = runner.invoke(build_assets, [], obj=obj)
+    assert 'Collected 1, 1 unchanged.' in result.output
+    assert tmpdir.join('static', 'two', 'two.css').read() == 'changed'
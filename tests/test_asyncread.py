@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the asynchronous record read path."""
+
+from __future__ import absolute_import, print_function
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from flask import Flask, current_app
+
+from invenio.asyncread import InvenioAsyncRead
+from invenio.asyncread.adapters import Gone, Limiter, Overloaded
+from invenio.asyncread.app import AsyncReadApp
+from invenio.asyncread.bench import run
+from invenio.asyncread.server import HTTPServer
+from invenio.standins.search import FakeSearchClient
+
+try:
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+except ImportError:
+    from urllib2 import HTTPError, Request, urlopen
+
+RECORDS = {'1': dict(title='Higgs boson'), '2': dict(title='Neutrino')}
+
+
+async def load_record(pid_value):
+    """Load a test record."""
+    if pid_value == 'deleted':
+        raise Gone()
+    return RECORDS.get(pid_value)
+
+
+def load_record_sync(pid_value, pid_type='recid'):
+    """Load a test record within the application context."""
+    return dict(RECORDS[pid_value], app=current_app.name) \
+        if pid_value in RECORDS else None
+
+
+@pytest.fixture()
+def search_client():
+    """Search stand-in with the test records."""
+    client = FakeSearchClient()
+    for pid_value, record in RECORDS.items():
+        client.index(index='records', id=pid_value, body=record)
+    client.refresh()
+    return client
+
+
+@pytest.fixture()
+def server(search_client):
+    """Serve the read path in a thread."""
+    def search(query, start, size):
+        return search_client.search(index='records', body={
+            'query': {'query_string': {'query': query}} if query else
+            {'match_all': {}}, 'from': start, 'size': size})
+
+    server = HTTPServer(AsyncReadApp(load_record, search))
+    host, port = server.start()
+    server.url = 'http://{0}:{1}'.format(host, port)
+    yield server
+    server.stop()
+
+
+def get(url, method='GET'):
+    """Request a URL and return the status and decoded JSON body."""
+    try:
+        response = urlopen(Request(url, method=method), timeout=5)
+    except HTTPError as e:
+        response = e
+    body = response.read()
+    return response.code, json.loads(body.decode('utf-8')) if body else None
+
+
+def test_get_record(server):
+    """Test fetching records."""
+    assert get(server.url + '/records/1') == (200, dict(
+        id='1', metadata=RECORDS['1']))
+    assert get(server.url + '/records/3')[0] == 404
+    assert get(server.url + '/records/deleted')[0] == 410
+    assert get(server.url + '/records/1/files')[0] == 404
+    assert get(server.url + '/other')[0] == 404
+    assert get(server.url + '/records/1', method='HEAD') == (200, None)
+    assert get(server.url + '/records/1', method='DELETE')[0] == 405
+
+
+def test_search(server):
+    """Test searching records."""
+    status, body = get(server.url + '/records/?q=neutrino')
+    assert status == 200
+    assert body['hits'] == dict(total=1, hits=[
+        dict(id='2', metadata=RECORDS['2'])])
+    status, body = get(server.url + '/records?size=1&page=2')
+    assert body['hits']['total'] == 2
+    assert len(body['hits']['hits']) == 1
+    assert get(server.url + '/records/?page=0')[0] == 400
+    assert get(server.url + '/records/?size=x')[0] == 400
+
+
+def test_limiter():
+    """Test bounded concurrency and rejection of waiting calls."""
+    limiter = Limiter(2, max_waiting=1)
+    active = []
+
+    async def task():
+        active.append(limiter.active)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        calls = [limiter.run(task) for dummy in range(4)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.new_event_loop().run_until_complete(main())
+    assert [isinstance(r, Overloaded) for r in results] == [
+        False, False, False, True]
+    assert max(active) == 2
+    assert limiter.active == limiter.waiting == 0
+
+
+def test_overloaded(search_client):
+    """Test requests beyond the bounds are answered with 503."""
+    async def slow_load(pid_value):
+        await asyncio.sleep(0.2)
+        return RECORDS[pid_value]
+
+    app = AsyncReadApp(slow_load, None,
+                       db_limiter=Limiter(1, max_waiting=0))
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def main():
+        scope = dict(type='http', method='GET', path='/records/1')
+        await asyncio.gather(app(scope, None, send), app(scope, None, send))
+
+    asyncio.new_event_loop().run_until_complete(main())
+    statuses = [m['status'] for m in messages
+                if m['type'] == 'http.response.start']
+    assert sorted(statuses) == [200, 503]
+    assert (b'retry-after', b'1') in messages[0]['headers']
+
+
+def test_extension(search_client):
+    """Test the read path of an application with synchronous clients."""
+    app = Flask('test_asyncread')
+    app.config.update(
+        ASYNCREAD_RECORD_LOADER=load_record_sync,
+        ASYNCREAD_SEARCH_CLIENT=search_client,
+    )
+    ext = InvenioAsyncRead(app)
+    assert app.extensions['invenio-asyncread'] is ext
+
+    server = HTTPServer(ext.create_asgi_app(app))
+    host, port = server.start()
+    url = 'http://{0}:{1}/records/'.format(host, port)
+    try:
+        assert get(url + '1')[1]['metadata'] == dict(
+            RECORDS['1'], app='test_asyncread')
+        assert get(url + '3')[0] == 404
+        assert get(url + '?q=higgs')[1]['hits']['total'] == 1
+    finally:
+        server.stop()
+
+
+def test_extension_slow_search(search_client):
+    """Test slow searches do not delay record fetches."""
+    release = threading.Event()
+
+    class SlowClient(object):
+        """Search client blocking until released."""
+
+        def search(self, **kwargs):
+            release.wait(10)
+            return search_client.search(**kwargs)
+
+    app = Flask('test_asyncread')
+    app.config.update(
+        ASYNCREAD_RECORD_LOADER=load_record_sync,
+        ASYNCREAD_SEARCH_CLIENT=SlowClient(),
+    )
+    ext = InvenioAsyncRead(app)
+    server = HTTPServer(ext.create_asgi_app(app))
+    host, port = server.start()
+    url = 'http://{0}:{1}/records/'.format(host, port)
+    searches = [
+        threading.Thread(target=get, args=(url + '?q=higgs', ))
+        for dummy in range(app.config['ASYNCREAD_SEARCH_CONCURRENCY'])]
+    try:
+        for thread in searches:
+            thread.start()
+        time.sleep(0.2)
+        start = time.time()
+        assert get(url + '1')[0] == 200
+        assert time.time() - start < 2
+    finally:
+        release.set()
+        for thread in searches:
+            thread.join()
+        server.stop()
+
+
+def test_bench():
+    """Test the scaling benchmark."""
+    results = run(clients=(1, 4), requests=8, latency=0.001, threads=2)
+    for path in ('sync', 'async_executor', 'async'):
+        assert set(results[path]) == set(['1', '4'])
+        assert results[path]['4']['errors'] == 0
+        assert results[path]['4']['requests_per_second'] > 0
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for batched task submission."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+from celery import Celery
+from flask import Flask
+
+from invenio.batch import BatchAggregator, Batcher, InvenioBatch, batch_task
+from invenio.batch.bench import run
+from invenio.cache import LRUCache
+
+PROCESSED = []
+
+
+@pytest.fixture()
+def celery():
+    """Celery application executing tasks eagerly."""
+    celery = Celery('testapp', broker='memory://', set_as_current=True)
+    celery.conf.task_always_eager = True
+    return celery
+
+
+class FakeTask(object):
+    """Record the sent messages."""
+
+    def __init__(self):
+        """Initialize."""
+        self.messages = []
+
+    def apply_async(self, args):
+        """Record a message."""
+        self.messages.append(args)
+
+
+class FailingTask(object):
+    """Task whose messages cannot be sent."""
+
+    def apply_async(self, args):
+        """Fail to send a message."""
+        raise IOError('Broker unavailable')
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    now = 0
+
+    def __call__(self):
+        """Current time."""
+        return self.now
+
+
+def test_batcher_size():
+    """Test items are grouped by batch size."""
+    task = FakeTask()
+    aggregator = BatchAggregator('b1', backend=LRUCache())
+    with Batcher(task, batch_size=2, aggregator=aggregator) as batcher:
+        for i in range(5):
+            batcher.add(i)
+    assert [items for dummy, items in task.messages] == [
+        [(0, ), (1, )], [(2, ), (3, )], [(4, )]]
+    assert batcher.messages == 3
+    assert batcher.result()['submitted'] == 5
+    assert batcher.result()['pending'] == 5
+
+
+def test_batcher_interval():
+    """Test items are sent after the flush interval."""
+    task = FakeTask()
+    clock = Clock()
+    batcher = Batcher(task, batch_size=100, flush_interval=1,
+                      aggregator=BatchAggregator('b2', LRUCache()),
+                      clock=clock)
+    batcher.add(1)
+    assert task.messages == []
+    clock.now = 2
+    batcher.add(2)
+    assert len(task.messages) == 1
+
+
+def test_batch_task(celery):
+    """Test chunk tasks aggregate their results."""
+    @batch_task(batch_size=3)
+    def process(value):
+        if value == 4:
+            raise ValueError(value)
+        PROCESSED.append(value)
+
+    process(0)
+    with process.batcher() as batcher:
+        for i in range(1, 8):
+            batcher.add(i)
+    assert PROCESSED == [0, 1, 2, 3, 5, 6, 7]
+    assert batcher.messages == 3
+    assert batcher.result() == dict(submitted=7, succeeded=6, failed=1,
+                                    pending=0)
+    assert batcher.aggregator.wait(timeout=1)['pending'] == 0
+    assert batcher.result()['submitted'] == 0
+
+
+def test_init(celery):
+    """Test extension initialization and configuration."""
+    app = Flask('testapp')
+    app.config['BATCH_SIZE'] = 2
+    ext = InvenioBatch(app)
+    assert isinstance(ext.backend, LRUCache)
+
+    @batch_task()
+    def noop(value):
+        pass
+
+    with app.app_context():
+        batcher = noop.batcher()
+        assert batcher.batch_size == 2
+        assert batcher.aggregator.backend is ext.backend
+        assert batcher.aggregator.timeout == 24 * 60 * 60
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(repeat=1, tasks=20, batch_size=10)
+    assert result['batched_round_trips'] == 2
+    assert result['round_trips_saved'] == 18
+
+
+def test_submission_errors():
+    """Test items are only counted once their message is sent."""
+    aggregator = BatchAggregator('b4', LRUCache())
+    batcher = Batcher(FailingTask(), aggregator=aggregator)
+    batcher.add(1)
+    with pytest.raises(IOError):
+        batcher.flush()
+    assert batcher.result()['submitted'] == 0
+
+
+def test_wait_process_local():
+    """Test waiting for workers fails with per-process counters."""
+    celery = Celery('testapp', broker='memory://', set_as_current=True)
+    aggregator = BatchAggregator('b5', LRUCache())
+    with pytest.raises(RuntimeError):
+        aggregator.wait(timeout=1)
+    celery.conf.task_always_eager = True
+    assert aggregator.wait(timeout=1)['pending'] == 0
+
+
+def test_counters_expire():
+    """Test the counters of a batch expire after their last update."""
+    clock = Clock()
+    backend = LRUCache(clock=clock)
+    aggregator = BatchAggregator('b6', backend, timeout=60)
+    aggregator.submitted(2)
+    clock.now = 50
+    aggregator.completed(1, 0)
+    clock.now = 100
+    assert aggregator.summary() == dict(submitted=2, succeeded=1, failed=0,
+                                        pending=1)
+    clock.now = 200
+    assert aggregator.summary()['submitted'] == 0
+    assert backend._counters == {}
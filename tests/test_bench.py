@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the benchmark suite."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+import pkg_resources
+import pytest
+from flask import Flask
+
+from invenio.bench import SUITES, Report, aliases, measure, probe, run, \
+    summarize
+from invenio.bench.aliases import invenio_projects
+
+
+def test_summarize():
+    """Test sample summary."""
+    assert summarize([]) == dict(count=0)
+    stats = summarize([3, 1, 2, 4])
+    assert stats['count'] == 4
+    assert stats['min'] == 1
+    assert stats['max'] == 4
+    assert stats['mean'] == 2.5
+    assert stats['p99'] == 4
+
+
+def test_measure():
+    """Test measuring a function."""
+    calls = []
+    samples = measure(lambda: calls.append(1), repeat=3)
+    assert len(samples) == 3
+    assert len(calls) == 3
+    assert all(s >= 0 for s in samples)
+
+
+def test_report_roundtrip(tmpdir):
+    """Test saving and loading a report."""
+    report = Report(results={'suite': {'value': 1}})
+    path = str(tmpdir.join('bench.json'))
+    report.save(path)
+    loaded = Report.load(path)
+    assert loaded.results == report.results
+    assert loaded.environment == report.environment
+
+    with pytest.raises(ValueError):
+        Report.from_dict({'format': -1})
+
+
+def test_run(monkeypatch):
+    """Test running registered suites."""
+    monkeypatch.setitem(SUITES, 'dummy', lambda **kwargs: kwargs)
+    report = run(suites=['dummy'], repeat=2)
+    assert report.results == {'dummy': {'repeat': 2}}
+
+    with pytest.raises(KeyError):
+        run(suites=['unknown'])
+
+
+def test_invenio_projects():
+    """Test filtering of Invenio requirements."""
+    requirements = pkg_resources.parse_requirements(
+        ['invenio-records>=1.0', 'Sphinx>=1.3', 'invenio-base'])
+    assert invenio_projects(requirements) == [
+        'invenio-base', 'invenio-records']
+
+
+def test_aliases_run(monkeypatch):
+    """Test the summary of the alias measurements."""
+    requirements = {
+        'available': ['Flask', 'invenio-records', 'invenio-base'],
+        'unavailable': ['invenio-unavailable>=1.0'],
+    }
+    samples = iter([
+        dict(import_time=1.0, app_factory_time=0.5, first_request_time=0.1,
+             requests_per_second=100.0, status_code=404),
+        dict(import_time=3.0, app_factory_time=1.5, first_request_time=0.3,
+             requests_per_second=300.0, status_code=200),
+    ])
+    probed = []
+
+    def fake_probe(projects, requests=100, path='/'):
+        probed.append((projects, requests, path))
+        return next(samples)
+
+    monkeypatch.setattr(
+        aliases, 'alias_requirements',
+        lambda alias: list(pkg_resources.parse_requirements(
+            requirements[alias])))
+    monkeypatch.setattr(aliases, 'missing_requirements', lambda reqs: [
+        str(req) for req in reqs if req.key == 'invenio-unavailable'])
+    monkeypatch.setattr(aliases, 'probe', fake_probe)
+
+    results = aliases.run(['available', 'unavailable'], repeat=2,
+                          requests=5, path='/ping')
+    assert probed == [(['invenio-base', 'invenio-records'], 5, '/ping')] * 2
+    assert results['unavailable'] == dict(
+        skipped=True, missing=['invenio-unavailable>=1.0'])
+    available = results['available']
+    assert available['projects'] == ['invenio-base', 'invenio-records']
+    assert available['status_code'] == 200
+    assert available['import_time']['mean'] == 2.0
+    assert available['app_factory_time']['max'] == 1.5
+    assert available['first_request_time']['min'] == 0.1
+    assert available['requests_per_second']['count'] == 2
+
+
+
+def test_aliases_not_installed(monkeypatch):
+    """Test aliases are skipped when the distribution is not installed."""
+    alias_requirements = aliases.alias_requirements
+    with pytest.raises(pkg_resources.DistributionNotFound):
+        alias_requirements('full', distribution='invenio-missing')
+    monkeypatch.setattr(
+        aliases, 'alias_requirements',
+        lambda alias: alias_requirements(alias, 'invenio-missing'))
+    assert aliases.run(['full']) == dict(
+        full=dict(skipped=True, missing=['invenio-missing']))
+
+def test_probe(monkeypatch, capsys):
+    """Test the measurements printed by the probe."""
+    app = Flask('testapp')
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+    created = []
+
+    def create_app(projects, config=None):
+        created.append(projects)
+        return app
+
+    monkeypatch.setattr(probe, 'create_app', create_app)
+    probe.main(['--requests', '3', '--path', '/ping', 'invenio'])
+    assert created == [set(['invenio'])]
+    result = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert sorted(result) == [
+        'app_factory_time', 'first_request_time', 'import_time',
+        'requests_per_second', 'status_code']
+    assert result['status_code'] == 200
+    assert result['requests_per_second'] > 0
+    assert probe.import_modules(['invenio']) >= 0
+
+
+def test_probe_application():
+    """Test the probe in a fresh interpreter."""
+    pytest.importorskip('invenio_base')
+    result = aliases.probe(['invenio-base'], requests=2)
+    assert result['status_code'] == 404
+    assert result['requests_per_second'] > 0
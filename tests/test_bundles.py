@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the lazily imported bundles."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+
+import pytest
+
+import invenio
+from invenio.bundles import Bundle, import_report
+
+
+def test_bundle_attributes():
+    """Test bundles are exposed by the package."""
+    from invenio import records
+
+    assert isinstance(invenio.records, Bundle)
+    assert invenio.records is invenio.records is records
+    assert getattr(invenio, 'theme') is sys.modules['invenio'].theme
+    assert not hasattr(invenio, 'unknown')
+    assert 'records' in dir(invenio)
+    assert 'pidstore' in dir(invenio.records)
+    with pytest.raises(AttributeError):
+        invenio.unknown
+
+
+def test_lazy_import():
+    """Test modules are imported on first access and reported."""
+    sys.modules.pop('colorsys', None)
+    bundle = Bundle('dummy', {'colors': 'colorsys'})
+    assert 'colorsys' not in sys.modules
+    assert bundle.installed == ['colors']
+    assert 'colorsys' not in sys.modules
+
+    assert bundle.colors is sys.modules['colorsys']
+    entry = import_report()[-1]
+    assert entry['bundle'] == 'dummy'
+    assert entry['module'] == 'colorsys'
+    assert entry['seconds'] >= 0
+
+
+def test_missing_module():
+    """Test error on missing modules."""
+    bundle = Bundle('dummy', {'missing': 'invenio_does_not_exist'})
+    assert bundle.installed == []
+    with pytest.raises(ImportError) as excinfo:
+        bundle.missing
+    assert 'invenio[dummy]' in str(excinfo.value)
+    with pytest.raises(AttributeError):
+        bundle.unknown
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the cache backends."""
+
+from __future__ import absolute_import, print_function
+
+from invenio.cache import CacheStats, LRUCache, create_backend
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0
+
+    def __call__(self):
+        """Current time."""
+        return self.now
+
+
+def test_lru_eviction():
+    """Test the least recently used entries are evicted by size."""
+    cache = LRUCache(max_size=10)
+    cache.set('a', b'1234')
+    cache.set('b', b'1234')
+    assert cache.get('a') == b'1234'
+    cache.set('c', b'1234')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1234'
+    assert cache.size == 8
+    assert cache.evictions == 1
+    assert cache.set('big', b'x' * 11) is False
+    assert len(cache) == 2
+
+
+def test_lru_timeout():
+    """Test entries expire."""
+    clock = Clock()
+    cache = LRUCache(default_timeout=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2, timeout=100)
+    clock.now = 50
+    assert cache.get_many(['a', 'b']) == [None, 2]
+
+
+def test_lru_counters():
+    """Test counters are never evicted."""
+    cache = LRUCache(max_size=1)
+    assert cache.incr('gen') == 1
+    cache.set('a', b'1')
+    cache.set('b', b'1')
+    assert cache.get_counter('gen') == 1
+    assert cache.delete('gen')
+    assert cache.get_counter('gen') == 0
+    cache.incr('gen')
+    cache.clear()
+    assert cache.get_counter('gen') == 0
+
+
+def test_lru_counter_timeout():
+    """Test counters incremented with a timeout expire."""
+    clock = Clock()
+    cache = LRUCache(clock=clock)
+    cache.incr('gen')
+    cache.incr('batch', 2, timeout=10)
+    clock.now = 5
+    assert cache.incr('batch', timeout=10) == 3
+    clock.now = 14
+    assert cache.get_counter('batch') == 3
+    clock.now = 15
+    assert cache.get_counter('batch') == 0
+    assert cache.get_counter('gen') == 1
+    assert cache._counter_expires == {}
+
+
+def test_create_backend():
+    """Test backend creation."""
+    assert isinstance(create_backend('lru', 'test', max_size=1), LRUCache)
+    backend = create_backend(lambda namespace, **kw: (namespace, kw), 'ns',
+                             max_size=1)
+    assert backend == ('ns', {'max_size': 1})
+
+
+def test_stats():
+    """Test hit and miss counters."""
+    stats = CacheStats()
+    assert stats.hit_ratio == 0
+    stats.hit(3)
+    stats.miss()
+    assert stats.to_dict()['hit_ratio'] == 0.75
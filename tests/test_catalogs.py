@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the merged translation catalogs."""
+
+from __future__ import absolute_import, print_function
+
+import gettext
+import os
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from invenio.catalogs import CatalogStore, InvenioCatalogs, \
+    MappedTranslations, build_catalogs
+from invenio.catalogs import ext as catalogs_ext
+from invenio.catalogs.api import read_mo
+from invenio.catalogs.bench import run, write_mo
+from invenio.catalogs.cli import catalogs
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+
+def mo_path(directory, locale):
+    """Path of the catalog of a locale in a translation directory."""
+    return os.path.join(directory, locale, 'LC_MESSAGES', 'messages.mo')
+
+
+@pytest.fixture()
+def directories(tmpdir):
+    """Translation directories of two modules."""
+    first, second = str(tmpdir.join('first')), str(tmpdir.join('second'))
+    write_mo(mo_path(first, 'de'), {
+        u'Search': u'Suche',
+        u'Home': u'Start',
+        (u'{0} record', u'{0} records'): [u'{0} Datensatz',
+                                          u'{0} Datensätze'],
+        u'menu\x04Home': u'Startseite',
+    })
+    write_mo(mo_path(second, 'de'), {u'Search': u'Suchen'})
+    write_mo(mo_path(second, 'pt'), {u'Search': u'Pesquisar'},
+             plural_forms='nplurals=2; plural=(n > 1);')
+    return [first, second]
+
+
+def test_read_mo(directories):
+    """Test messages are read from .mo files."""
+    messages, info = read_mo(mo_path(directories[0], 'de'))
+    assert messages[u'{0} record\x00'] == u'{0} Datensatz\x00{0} Datensätze'
+    assert messages[u'menu\x04Home'] == u'Startseite'
+    assert info['plural-forms'] == 'nplurals=2; plural=(n != 1);'
+
+
+def test_translations(directories, tmpdir):
+    """Test translations are read from the merged catalogs."""
+    output = str(tmpdir.join('catalogs'))
+    assert build_catalogs(directories, output) == {'de': 4, 'pt': 1}
+    translations = MappedTranslations(os.path.join(output, 'de.catalog'))
+    assert len(translations) == 4
+    assert u'Home' in translations and u'Missing' not in translations
+    assert translations.gettext(u'Search') == u'Suchen'
+    assert translations.ugettext(u'Home') == u'Start'
+    assert translations.gettext(u'Missing') == u'Missing'
+    assert translations.ngettext(u'{0} record', u'{0} records', 1) == \
+        u'{0} Datensatz'
+    assert translations.ngettext(u'{0} record', u'{0} records', 2) == \
+        u'{0} Datensätze'
+    assert translations.ngettext(u'file', u'files', 2) == u'files'
+    assert translations.pgettext(u'menu', u'Home') == u'Startseite'
+    assert translations.pgettext(u'page', u'Home') == u'Home'
+    assert translations.npgettext(u'page', u'file', u'files', 1) == u'file'
+    assert translations.info()['sources'] == [
+        mo_path(directories[0], 'de'), mo_path(directories[1], 'de')]
+
+    fallback = gettext.NullTranslations()
+    fallback.gettext = lambda message: message.upper()
+    translations.add_fallback(fallback)
+    assert translations.gettext(u'Missing') == u'MISSING'
+    translations.close()
+
+    pt = MappedTranslations(os.path.join(output, 'pt.catalog'))
+    assert pt.plural(1) == 0 and pt.plural(0) == 0
+
+    assert build_catalogs(directories, output, locales=['fr']) == {}
+    assert build_catalogs([str(tmpdir.join('missing'))], output) == {}
+
+    tmpdir.join('invalid.catalog').write('invalid catalog file')
+    with pytest.raises(ValueError):
+        MappedTranslations(str(tmpdir.join('invalid.catalog')))
+
+
+def test_store(directories, tmpdir):
+    """Test catalogs are mapped once per locale."""
+    output = str(tmpdir.join('catalogs'))
+    build_catalogs(directories, output)
+    store = CatalogStore(output)
+    assert store.get('de') is store.get('de')
+    assert store.get('pt_BR').gettext(u'Search') == u'Pesquisar'
+    assert store.get('fr') is None
+    store.clear()
+    assert store.catalogs == {}
+
+
+def test_store_stale(directories, tmpdir, caplog):
+    """Test catalogs out of date with the translations are not used."""
+    output = str(tmpdir.join('catalogs'))
+    build_catalogs(directories, output)
+    assert CatalogStore(output, directories=lambda: directories).get('de')
+
+    third = str(tmpdir.join('third'))
+    write_mo(mo_path(third, 'de'), {u'Search': u'Durchsuchen'})
+    store = CatalogStore(output, directories=directories + [third])
+    assert store.get('de') is None
+    assert 'out of date' in caplog.text
+    assert store.get('pt').gettext(u'Search') == u'Pesquisar'
+
+    built = os.path.getmtime(os.path.join(output, 'pt.catalog'))
+    os.utime(mo_path(directories[1], 'pt'), (built + 10, built + 10))
+    assert CatalogStore(output, directories=directories).get('pt') is None
+
+
+class FakeDomain(object):
+    """Translation domain of Invenio-I18N."""
+
+    def get_translations(self):
+        """Get the translations of the current locale."""
+        return gettext.NullTranslations()
+
+
+class FakeI18N(object):
+    """Invenio-I18N state."""
+
+    def __init__(self):
+        """Create the domain."""
+        self.domain = FakeDomain()
+
+
+def test_init(directories, tmpdir, monkeypatch):
+    """Test the domain of Invenio-I18N uses the catalogs."""
+    locale = ['de']
+    monkeypatch.setattr(catalogs_ext, 'get_locale', lambda: locale[0])
+    output = str(tmpdir.join('catalogs'))
+    build_catalogs(directories, output)
+
+    app = Flask('testapp')
+    app.config['CATALOGS_DIRECTORY'] = output
+    app.config['I18N_TRANSLATIONS_PATHS'] = directories
+    app.extensions['invenio-i18n'] = i18n = FakeI18N()
+    ext = InvenioCatalogs(app)
+    assert i18n.domain.get_translations().gettext(u'Search') == u'Suchen'
+    locale[0] = 'fr'
+    assert i18n.domain.get_translations().gettext(u'Search') == u'Search'
+    assert list(ext.collect_metrics()) == [(
+        'invenio_catalogs_mapped_bytes', {'locale': 'de'},
+        os.path.getsize(os.path.join(output, 'de.catalog')))]
+
+    app.config['I18N_TRANSLATIONS_PATHS'] = directories[:1]
+    ext.store.clear()
+    locale[0] = 'de'
+    assert i18n.domain.get_translations().gettext(u'Search') == u'Search'
+
+    app = Flask('testapp')
+    ext = InvenioCatalogs(app)
+    assert ext.store.directory == os.path.join(app.instance_path, 'catalogs')
+    app.extensions['invenio-i18n'] = i18n = FakeI18N()
+    app.add_url_rule('/', 'index', lambda: 'ok')
+    with app.test_client() as client:
+        assert client.get('/').status_code == 200
+    assert i18n.domain.get_translations.catalogs is ext
+    assert ext.install(app)
+
+    app = Flask('testapp')
+    app.config['CATALOGS_ENABLED'] = False
+    app.extensions['invenio-i18n'] = i18n = FakeI18N()
+    InvenioCatalogs(app)
+    assert not hasattr(i18n.domain.get_translations, 'catalogs')
+
+
+def test_cli(directories, tmpdir):
+    """Test the build command."""
+    output = str(tmpdir.join('catalogs'))
+
+    def create_app(*args):
+        app = Flask('testapp')
+        app.config.update(
+            CATALOGS_DIRECTORY=output,
+            CATALOGS_ENTRY_POINT_GROUP='invenio_catalogs.tests',
+            I18N_TRANSLATIONS_PATHS=directories,
+        )
+        InvenioCatalogs(app)
+        return app
+
+    runner = CliRunner()
+    obj = ScriptInfo(create_app=create_app)
+    result = runner.invoke(catalogs, ['build', '-l', 'de'], obj=obj)
+    assert result.exit_code == 0, result.output
+    assert 'de: 4 messages' in result.output
+    assert os.listdir(output) == ['de.catalog']
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(workers=1, modules=2, messages=5, locales=('de', 'fr'))
+    assert result['mapped']['load_seconds_per_locale'] >= 0
+    assert result['catalog_bytes'] > 0
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the configuration snapshots."""
+
+from __future__ import absolute_import, print_function
+
+import datetime
+import json
+import os.path
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from invenio.configsnapshot import FrozenConfigLoader, InvenioConfigSnapshot, \
+    Snapshot, SnapshotError
+from invenio.configsnapshot.api import decode_value, diff_configs, \
+    encode_value, mask
+from invenio.configsnapshot.bench import run
+from invenio.configsnapshot.cli import config
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+
+def config_loader(app, **kwargs_config):
+    """Load the instance file, the keyword and the environment config."""
+    app.config['RECORDS_PER_PAGE'] = 10
+    app.config.from_pyfile(
+        os.path.join(app.instance_path, app.name + '.cfg'), silent=True)
+    app.config.update(kwargs_config)
+    for name, value in os.environ.items():
+        if name.startswith('APP_'):
+            app.config[name[4:]] = value
+
+
+@pytest.fixture()
+def instance_path(tmpdir, monkeypatch):
+    """Instance folder with a configuration file."""
+    for name in list(os.environ):
+        if name.startswith('APP_'):
+            monkeypatch.delenv(name)
+    tmpdir.join('testapp.cfg').write(
+        "SQLALCHEMY_DATABASE_URI = 'postgresql://invenio:dbpass@db/invenio'"
+        "\nCACHE_REDIS_HOST = 'redis'\n")
+    return str(tmpdir)
+
+
+def test_values():
+    """Test values are encoded in JSON and decoded to an equal value."""
+    values = [
+        None, True, 1, 1.5, u'text', b'\x00bytes', [1, (2, 3)],
+        {u'a': {1, 2}}, frozenset([u'a']), datetime.timedelta(days=31),
+        os.path.join, Flask,
+    ]
+    for value in values:
+        encoded = encode_value(value)
+        assert decode_value(json.loads(json.dumps(encoded))) == value
+    for value in (lambda: None, object(), {1: 2}):
+        with pytest.raises(SnapshotError):
+            encode_value(value)
+
+
+def test_snapshot(tmpdir):
+    """Test snapshots are validated."""
+    snapshot = Snapshot('testapp', {'A': (1, 2), 'B': u'b'}, fingerprint='f')
+    path = str(tmpdir.join('snapshot.json'))
+    snapshot.save(path)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    loaded = Snapshot.load_file(path)
+    assert loaded.config == snapshot.config
+    assert loaded.created == snapshot.created
+
+    data = snapshot.to_dict()
+    data['config']['B'] = u'c'
+    with pytest.raises(SnapshotError):
+        Snapshot.from_dict(data)
+    with pytest.raises(SnapshotError):
+        Snapshot.from_dict(dict(data, format=0))
+    tmpdir.join('invalid.json').write('{')
+    with pytest.raises(SnapshotError):
+        Snapshot.load_file(str(tmpdir.join('invalid.json')))
+
+    with pytest.raises(SnapshotError) as e:
+        Snapshot('testapp', {'A': object(), 'B': lambda: None}).to_dict()
+    assert 'A: Cannot freeze' in str(e.value)
+    assert 'B: Cannot freeze' in str(e.value)
+
+
+def test_mask_and_diff():
+    """Test secrets are masked and configurations compared."""
+    assert mask('SECRET_KEY', 'abc') == '***'
+    assert mask('SECRET_KEY', None) == 'None'
+    assert mask('SQLALCHEMY_DATABASE_URI', 'postgresql://u:p@db/x') == \
+        "'postgresql://u:***@db/x'"
+    assert mask('CACHE_REDIS_HOST', 'redis') == "'redis'"
+    assert diff_configs({'A': 1, 'B': 2, 'C': 3}, {'A': 1, 'B': 3, 'D': 4}) \
+        == [('B', 'changed', 2, 3), ('C', 'removed', 3, None),
+            ('D', 'added', None, 4)]
+
+
+def test_loader(instance_path, monkeypatch):
+    """Test the snapshot is used while its sources do not change."""
+    loader = FrozenConfigLoader(config_loader, env_prefix='APP')
+    app = Flask('testapp', instance_path=instance_path)
+    loader(app)
+    assert not loader.frozen
+    assert app.config_loader is loader
+    live = dict(app.config)
+
+    snapshot = loader.freeze(app)
+    assert snapshot.config == live
+    app = Flask('testapp', instance_path=instance_path)
+    loader(app, DEBUG=True)
+    assert loader.frozen
+    assert dict(app.config) == dict(live, DEBUG=True)
+
+    monkeypatch.setenv('APP_CACHE_REDIS_HOST', 'localhost')
+    app = Flask('testapp', instance_path=instance_path)
+    loader(app)
+    assert not loader.frozen
+    assert app.config['CACHE_REDIS_HOST'] == 'localhost'
+
+    loader.freeze(app)
+    loader(Flask('testapp', instance_path=instance_path))
+    assert loader.frozen
+    with open(os.path.join(instance_path, 'testapp.cfg'), 'a') as fp:
+        fp.write('RECORDS_PER_PAGE = 20\n')
+    app = Flask('testapp', instance_path=instance_path)
+    loader(app)
+    assert not loader.frozen
+    assert app.config['RECORDS_PER_PAGE'] == 20
+
+    loader.freeze(app)
+    loader(Flask('other', instance_path=instance_path))
+    assert not loader.frozen
+    with open(loader.snapshot_path(app), 'w') as fp:
+        fp.write('{}')
+    loader(Flask('testapp', instance_path=instance_path))
+    assert not loader.frozen
+
+
+def test_loader_modules(instance_path, tmpdir, monkeypatch):
+    """Test editing a module default invalidates the snapshot."""
+    package = tmpdir.mkdir('snapshotinstance')
+    package.join('__init__.py').write('')
+    package.join('config.py').write('RECORDS_PER_PAGE = 10\n')
+    package.join('defaults.py').write('SEARCH_SIZE = 10\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    def modules_loader(app, **kwargs_config):
+        app.config.from_object('snapshotinstance.config')
+        app.config.from_object('snapshotinstance.defaults')
+        config_loader(app, **kwargs_config)
+
+    loader = FrozenConfigLoader(modules_loader, env_prefix='APP',
+                                modules=['snapshotinstance.defaults'])
+    for name in ('config.py', 'defaults.py'):
+        app = Flask('snapshotinstance', instance_path=instance_path)
+        loader.freeze(app)
+        loader(Flask('snapshotinstance', instance_path=instance_path))
+        assert loader.frozen
+
+        package.join(name).write('# Edited.\n', mode='a')
+        loader(Flask('snapshotinstance', instance_path=instance_path))
+        assert not loader.frozen
+
+
+def test_cli(instance_path, monkeypatch):
+    """Test the freeze, diff and show commands."""
+    loader = FrozenConfigLoader(config_loader, env_prefix='APP')
+
+    def create_app(*args):
+        app = Flask('testapp', instance_path=instance_path)
+        loader(app)
+        InvenioConfigSnapshot(app)
+        return app
+
+    runner = CliRunner()
+    obj = ScriptInfo(create_app=create_app)
+    result = runner.invoke(config, ['diff'], obj=obj)
+    assert result.exit_code != 0
+    assert 'No snapshot' in result.output
+
+    result = runner.invoke(config, ['freeze'], obj=obj)
+    assert result.exit_code == 0, result.output
+    assert 'frozen into' in result.output
+
+    result = runner.invoke(config, ['diff'], obj=obj)
+    assert result.exit_code == 0, result.output
+    assert 'matches the live configuration' in result.output
+
+    monkeypatch.setenv('APP_CACHE_REDIS_HOST', 'localhost')
+    monkeypatch.setenv('APP_SECRET_KEY', 'secret')
+    with open(os.path.join(instance_path, 'testapp.cfg'), 'a') as fp:
+        fp.write('RECORDS_PER_PAGE = 20\nSEARCH_HOSTS = []\n')
+    result = runner.invoke(config, ['diff'], obj=obj)
+    assert result.exit_code == 1
+    lines = result.output.splitlines()
+    assert "~ CACHE_REDIS_HOST = 'redis' -> 'localhost' " \
+        "(environment APP_CACHE_REDIS_HOST)" in lines
+    assert '~ SECRET_KEY = None -> *** (environment APP_SECRET_KEY)' in lines
+    assert '~ RECORDS_PER_PAGE = 10 -> 20 (instance {0})'.format(
+        os.path.join(instance_path, 'testapp.cfg')) in lines
+    assert '+ SEARCH_HOSTS = [] (instance {0})'.format(
+        os.path.join(instance_path, 'testapp.cfg')) in lines
+    assert 'The sources changed' in result.output
+
+    result = runner.invoke(config, ['show'], obj=obj)
+    assert result.exit_code == 0
+    assert "SQLALCHEMY_DATABASE_URI = 'postgresql://invenio:***@db/" \
+        "invenio'" in result.output.splitlines()
+    result = runner.invoke(config, ['show', '--live'], obj=obj)
+    assert 'RECORDS_PER_PAGE = 20' in result.output
+
+    def create_plain_app(*args):
+        app = Flask('testapp')
+        InvenioConfigSnapshot(app)
+        return app
+
+    result = runner.invoke(config, ['freeze'],
+                           obj=ScriptInfo(create_app=create_plain_app))
+    assert 'not configured with a FrozenConfigLoader' in result.output
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(repeat=1)
+    assert result['frozen']['keys'] == result['live']['keys']
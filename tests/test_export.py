@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for streaming exports."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from invenio.export import InvenioExport, JSONArraySerializer, \
+    JSONLinesSerializer, MARCXMLSerializer, scroll_hits, search_after_hits
+from invenio.export.bench import run
+from invenio.export.cli import export_cmd
+from invenio.export.permissions import allow_all
+from invenio.searchcache import InvenioSearchCache
+from invenio.standins.search import FakeSearchClient
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+MARC = '{http://www.loc.gov/MARC21/slim}'
+
+
+class FakeSearch(object):
+    """Stand-in of the Invenio-Search extension."""
+
+    def __init__(self, count):
+        """Initialize with a fake client holding ``count`` records."""
+        self.client = FakeSearchClient()
+        for i in range(count):
+            self.client.index('records', dict(
+                recid=i, control_number=i, title='Title {0}'.format(i),
+                kind='even' if i % 2 == 0 else 'odd'), id='{0:04d}'.format(i))
+        self.client.indices.refresh()
+
+
+@pytest.fixture()
+def app():
+    """Application with 25 records."""
+    app = Flask('testapp')
+    app.config.update(EXPORT_URL='/records/export',
+                      EXPORT_PERMISSION_FACTORY=allow_all,
+                      EXPORT_PAGE_SIZE=10,
+                      EXPORT_MARC21_CONVERTER=lambda record: {
+                          '001': record['recid'],
+                          '245__': dict(a=record['title'])})
+    app.extensions['invenio-search'] = FakeSearch(25)
+    InvenioExport(app)
+    return app
+
+
+def test_pagination():
+    """Test search_after and scroll pagination return all hits once."""
+    client = FakeSearch(25).client
+    hits = list(search_after_hits(client, 'records', size=10))
+    assert [hit['_source']['recid'] for hit in hits] == list(range(25))
+    assert len([c for c in client.calls if c[0] == 'search']) == 3
+
+    hits = scroll_hits(client, 'records', {'query': {'term': {
+        'kind': 'odd'}}}, size=5)
+    assert [hit['_source']['recid'] for hit in hits] == list(range(1, 25, 2))
+    assert client.scrolls == {}
+
+    hits = scroll_hits(client, 'records', size=5)
+    next(hits)
+    hits.close()
+    assert client.scrolls == {}
+
+
+def test_serializers():
+    """Test the serialized formats."""
+    records = [dict(id=1, title=u'\xe9t\xe9'), dict(id=2, title='<b>')]
+    chunks = list(JSONLinesSerializer().stream(iter(records), buffer_size=1))
+    assert len(chunks) == 3
+    assert [json.loads(line) for line in b''.join(chunks).decode(
+        'utf-8').splitlines()] == records
+    assert json.loads(b''.join(JSONArraySerializer().stream(
+        iter(records))).decode('utf-8')) == records
+    assert json.loads(b''.join(JSONArraySerializer().stream(
+        iter([]))).decode('utf-8')) == []
+
+    xml = b''.join(MARCXMLSerializer().stream(iter([{
+        'leader': '00000nam',
+        '001': '1',
+        '24510': {'a': u'\xe9t\xe9 <b>', 'b': ['x', 'y']},
+        '700__': [{'a': 'Ellis'}, {'a': 'Smith'}],
+        '__order__': ['001'],
+    }])))
+    record = ET.fromstring(xml).find(MARC + 'record')
+    assert record.find(MARC + 'controlfield').text == '1'
+    fields = record.findall(MARC + 'datafield')
+    assert [(f.get('tag'), f.get('ind1'), f.get('ind2')) for f in fields] == [
+        ('245', '1', '0'), ('700', ' ', ' '), ('700', ' ', ' ')]
+    assert [s.text for s in fields[0]] == [u'\xe9t\xe9 <b>', 'x', 'y']
+
+
+@pytest.mark.parametrize('pagination', ['search_after', 'scroll'])
+def test_view(app, pagination):
+    """Test the streamed export responses."""
+    app.config['EXPORT_PAGINATION'] = pagination
+    with app.test_client() as client:
+        res = client.get('/records/export/jsonl?q=odd')
+        assert res.status_code == 200
+        assert res.mimetype == 'application/x-ndjson'
+        assert res.is_streamed
+        assert 'records.jsonl' in res.headers['Content-Disposition']
+        assert [json.loads(line)['recid'] for line in res.get_data(
+            as_text=True).splitlines()] == list(range(1, 25, 2))
+
+        res = client.get('/records/export/marcxml')
+        records = ET.fromstring(res.data).findall(MARC + 'record')
+        assert len(records) == 25
+
+        assert client.get('/records/export/unknown').status_code == 404
+
+
+def test_view_access(app):
+    """Test the export view is disabled, restricted and throttled."""
+    plain = Flask('testapp')
+    InvenioExport(plain)
+    assert plain.url_map.bind('').test('/records/export/json') is False
+
+    app.config['EXPORT_PERMISSION_FACTORY'] = \
+        'invenio.export.permissions:deny_all'
+    with app.test_client() as client:
+        assert client.get('/records/export/json').status_code == 403
+    app.config['EXPORT_PERMISSION_FACTORY'] = \
+        'invenio.export.permissions:authenticated_user'
+    with app.test_client() as client:
+        assert client.get('/records/export/json').status_code == 403
+
+    app.config.update(EXPORT_PERMISSION_FACTORY=allow_all,
+                      EXPORT_MAX_CONCURRENT=1)
+    client = app.test_client()
+    first = client.get('/records/export/json', buffered=False)
+    assert first.status_code == 200
+    assert client.get('/records/export/json').status_code == 429
+    first.close()
+    assert client.get('/records/export/json').status_code == 200
+
+
+def test_bypass_search_cache(app):
+    """Test exports do not fill the search result cache."""
+    app.config.update(SEARCHCACHE_ENABLED=True, SEARCHCACHE_BACKEND='lru')
+    ext = InvenioSearchCache(app)
+    with app.test_client() as client:
+        client.get('/records/export/json')
+    assert ext.cache.stats.misses == 0
+
+
+def test_cli(app, tmpdir):
+    """Test the export command."""
+    output = tmpdir.join('records.json')
+    result = CliRunner().invoke(
+        export_cmd, ['json', '-q', 'even', '-o', str(output)],
+        obj=ScriptInfo(create_app=lambda *args: app))
+    assert result.exit_code == 0, result.output
+    assert len(json.loads(output.read())) == 13
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(sizes=(10, ), page_size=3)
+    assert result['exports'][0]['records'] == 10
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for hashed static assets."""
+
+from __future__ import absolute_import, print_function
+
+import gzip
+import os
+
+from click.testing import CliRunner
+from flask import Flask, url_for
+
+from invenio.hashedassets import InvenioHashedAssets, Manifest, build_manifest
+from invenio.hashedassets.api import hashed_name, rewrite_css
+from invenio.hashedassets.cli import static
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+CSS = b'body { color: red; }\n' * 50
+
+
+def write_static(tmpdir):
+    """Write a static folder."""
+    static_folder = tmpdir.mkdir('static')
+    static_folder.mkdir('gen').join('theme.css').write(CSS, 'wb')
+    static_folder.join('logo.png').write(b'\x89PNG', 'wb')
+    return str(static_folder)
+
+
+def test_build_manifest(tmpdir):
+    """Test hashed copies, compressed siblings and pruning."""
+    static_folder = write_static(tmpdir)
+    manifest_path = os.path.join(static_folder, 'manifest.json')
+    manifest = build_manifest(static_folder, manifest_path,
+                              compress_extensions=['.css'])
+    css = manifest.resolve('gen/theme.css')
+    assert css.startswith('gen/theme.') and css.endswith('.css')
+    assert len(css) == len('gen/theme.css') + 13
+    assert manifest.resolve('unknown.js') == 'unknown.js'
+    assert 'gzip' in manifest.encodings[css]
+    assert manifest.resolve('logo.png') not in manifest.encodings
+    with gzip.open(os.path.join(static_folder, css + '.gz')) as f:
+        assert f.read() == CSS
+
+    # Rebuilding does not hash the hashed copies.
+    assert build_manifest(
+        static_folder, manifest_path).to_dict() == manifest.to_dict()
+    assert Manifest.load(manifest_path).to_dict() == manifest.to_dict()
+    os.remove(manifest_path)
+    assert build_manifest(
+        static_folder, manifest_path).assets == manifest.assets
+
+    tmpdir.join('static', 'gen', 'theme.css').write(b'body {}', 'wb')
+    new = build_manifest(static_folder, manifest_path, prune=True)
+    assert new.resolve('gen/theme.css') != css
+    assert not os.path.exists(os.path.join(static_folder, css))
+    assert not os.path.exists(os.path.join(static_folder, css + '.gz'))
+    assert os.path.exists(os.path.join(static_folder, 'gen', 'theme.css'))
+
+
+def test_stylesheet_references(tmpdir):
+    """Test stylesheets reference the hashed copies of other files."""
+    static_folder = write_static(tmpdir)
+    tmpdir.join('static', 'gen', 'theme.css').write(
+        b'@import url(base.css);\n'
+        b'a { background: url("../logo.png?v=1"); }\n'
+        b'b { background: url(/static/logo.png) url(data:x) '
+        b'url(http://example.org/logo.png) url(missing.png); }\n', 'wb')
+    tmpdir.join('static', 'gen', 'base.css').write(
+        b"i { background: url('../logo.png#icon'); }", 'wb')
+    manifest_path = os.path.join(static_folder, 'manifest.json')
+    manifest = build_manifest(static_folder, manifest_path,
+                              static_url_path='/static')
+    logo = os.path.basename(manifest.resolve('logo.png'))
+    base = os.path.basename(manifest.resolve('gen/base.css'))
+
+    with open(os.path.join(
+            static_folder, manifest.resolve('gen/base.css'))) as f:
+        assert f.read() == "i {{ background: url('../{0}#icon'); }}".format(
+            logo)
+    with open(os.path.join(
+            static_folder, manifest.resolve('gen/theme.css'))) as f:
+        assert f.read().splitlines() == [
+            '@import url({0});'.format(base),
+            'a {{ background: url("../{0}?v=1"); }}'.format(logo),
+            'b {{ background: url(/static/{0}) url(data:x) '
+            'url(http://example.org/logo.png) url(missing.png); }}'.format(
+                logo),
+        ]
+
+    # The hash of a stylesheet changes with the files it references.
+    theme = manifest.resolve('gen/theme.css')
+    tmpdir.join('static', 'logo.png').write(b'\x89PNG new', 'wb')
+    new = build_manifest(static_folder, manifest_path,
+                         static_url_path='/static')
+    assert new.resolve('gen/base.css') != manifest.resolve('gen/base.css')
+    assert new.resolve('gen/theme.css') != theme
+
+
+def test_rewrite_css():
+    """Test only references to hashed files are rewritten."""
+    assets = {'a.png': 'a.0f.png'}
+    assert rewrite_css('url( a.png )', 'x.css', assets) == 'url(a.0f.png)'
+    assert rewrite_css('url(/static/a.png)', 'x.css', assets) == \
+        'url(/static/a.png)'
+    assert rewrite_css('url(/s/a.png)', 'x.css', assets, '/s') == \
+        'url(/s/a.0f.png)'
+
+
+def test_hashed_name():
+    """Test the digest is inserted before the extension."""
+    assert hashed_name('a/b.min.js', '0f') == 'a/b.min.0f.js'
+    assert hashed_name('LICENSE', '0f') == 'LICENSE.0f'
+
+
+def test_serve(tmpdir):
+    """Test URLs and responses of hashed files."""
+    static_folder = write_static(tmpdir)
+    app = Flask('testapp', static_folder=static_folder)
+    InvenioHashedAssets(app)
+    obj = ScriptInfo(create_app=lambda *args: app)
+    result = CliRunner().invoke(static, ['hash'], obj=obj)
+    assert result.exit_code == 0, result.output
+    assert 'Hashed 2 files (1 precompressed)' in result.output
+
+    app = Flask('testapp', static_folder=static_folder)
+    ext = InvenioHashedAssets(app)
+    css = ext.manifest.resolve('gen/theme.css')
+    with app.test_request_context():
+        assert url_for('static', filename='gen/theme.css') == \
+            '/static/' + css
+        assert url_for('static', filename='other.css') == \
+            '/static/other.css'
+
+    with app.test_client() as client:
+        res = client.get('/static/' + css,
+                         headers={'Accept-Encoding': 'gzip'})
+        assert res.headers['Content-Encoding'] == 'gzip'
+        assert res.headers['Vary'] == 'Accept-Encoding'
+        assert 'immutable' in res.headers['Cache-Control']
+        assert res.mimetype == 'text/css'
+        assert len(res.data) < len(CSS)
+
+        res = client.get('/static/' + css)
+        assert 'Content-Encoding' not in res.headers
+        assert res.data == CSS
+        assert 'immutable' in res.headers['Cache-Control']
+
+        res = client.get('/static/gen/theme.css')
+        assert res.data == CSS
+        assert 'immutable' not in res.headers.get('Cache-Control', '')
+
+
+def test_disabled(tmpdir):
+    """Test the manifest is ignored when disabled."""
+    app = Flask('testapp', static_folder=write_static(tmpdir))
+    app.config['HASHEDASSETS_ENABLED'] = False
+    ext = InvenioHashedAssets(app)
+    build_manifest(app.static_folder, ext.manifest_path)
+    ext = InvenioHashedAssets(app)
+    assert ext.manifest.assets == {}
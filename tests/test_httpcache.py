@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the record response cache."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+import pytest
+from flask import Flask, request
+from sqlalchemy import Column, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from invenio.cache.invalidation import register
+from invenio.httpcache import InvenioHTTPCache
+
+REVISIONS = {}
+RENDERS = []
+
+Base = declarative_base()
+
+
+class RecordMetadata(Base):
+    """Table of the records."""
+
+    __tablename__ = 'records_metadata'
+
+    id = Column(Integer, primary_key=True)
+    version_id = Column(Integer)
+
+
+class Record(dict):
+    """Record with its database model, as in Invenio-Records."""
+
+    def __init__(self, data, model):
+        """Initialize the record."""
+        super(Record, self).__init__(data)
+        self.model = model
+
+
+def revision_loader(pid_type, pid_value):
+    """Return the fake record revision."""
+    return REVISIONS.get(pid_value, 0), datetime(2015, 11, 9)
+
+
+@pytest.fixture()
+def app():
+    """Application with a fake record endpoint."""
+    app = Flask('testapp')
+    app.config.update(
+        SECRET_KEY='test',
+        HTTPCACHE_ENABLED=True,
+        HTTPCACHE_BACKEND='lru',
+        HTTPCACHE_ENDPOINTS={'record': 'recid'},
+        HTTPCACHE_REVISION_LOADER=revision_loader,
+        HTTPCACHE_PIDS_LOADER=lambda record: [('recid', record['recid'])],
+    )
+
+    @app.route('/records/<pid_value>')
+    def record(pid_value):
+        RENDERS.append(pid_value)
+        return 'Record {0} {1}'.format(pid_value, request.args.get('q', ''))
+
+    InvenioHTTPCache(app)
+    del RENDERS[:]
+    return app
+
+
+def test_cache_hit(app):
+    """Test responses are cached per variant."""
+    client = app.test_client()
+    res = client.get('/records/1')
+    assert res.headers['X-Cache'] == 'MISS'
+    assert res.headers['ETag']
+    assert res.headers['Last-Modified']
+
+    res = client.get('/records/1')
+    assert res.headers['X-Cache'] == 'HIT'
+    assert res.get_data(as_text=True) == 'Record 1 '
+    assert RENDERS == ['1']
+
+    res = client.get('/records/1?q=a')
+    assert res.headers['X-Cache'] == 'MISS'
+    stats = app.extensions['invenio-httpcache'].cache.stats
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_conditional(app):
+    """Test revalidation with the ETag."""
+    client = app.test_client()
+    etag = client.get('/records/1').headers['ETag']
+    res = client.get('/records/1', headers={'If-None-Match': etag})
+    assert res.status_code == 304
+    assert res.headers['X-Cache'] == 'HIT'
+
+
+def test_invalidation(app):
+    """Test record changes invalidate the cached responses."""
+    client = app.test_client()
+    etag = client.get('/records/1').headers['ETag']
+    REVISIONS['1'] = 1
+    app.extensions['invenio-httpcache'].record_changed({'recid': '1'})
+
+    res = client.get('/records/1', headers={'If-None-Match': etag})
+    assert res.status_code == 200
+    assert res.headers['X-Cache'] == 'MISS'
+    assert res.headers['ETag'] != etag
+    assert RENDERS == ['1', '1']
+
+
+def test_invalidation_after_commit(app):
+    """Test responses cached before the commit of a change are dropped."""
+    ext = app.extensions['invenio-httpcache']
+    register('httpcache', ext.cache)
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    model = RecordMetadata(id=2, version_id=1)
+    session.add(model)
+    session.commit()
+
+    client = app.test_client()
+    client.get('/records/2')
+    model.version_id = 2
+    ext.record_changed(Record({'recid': '2'}, model))
+    assert client.get('/records/2').headers['X-Cache'] == 'MISS'
+    assert client.get('/records/2').headers['X-Cache'] == 'HIT'
+    session.commit()
+    assert client.get('/records/2').headers['X-Cache'] == 'MISS'
+    assert RENDERS == ['2', '2', '2']
+
+
+def test_not_cached(app):
+    """Test authenticated requests are not cached."""
+    client = app.test_client()
+    headers = {'Authorization': 'Bearer token'}
+    client.get('/records/1', headers=headers)
+    res = client.get('/records/1', headers=headers)
+    assert 'X-Cache' not in res.headers
+    assert RENDERS == ['1', '1']
+
+
+def test_disabled():
+    """Test the cache can be disabled."""
+    app = Flask('testapp')
+    ext = InvenioHTTPCache(app)
+    assert ext.cache is None
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for bulk record ingestion."""
+
+from __future__ import absolute_import, print_function
+
+import gc
+import weakref
+from io import BytesIO
+
+import pytest
+from flask import Flask
+
+from invenio.ingest import InvenioIngest, bulk_ingest, chunked
+from invenio.ingest.readers import iter_marcxml, read_jsonlines
+
+MARCXML = b"""<?xml version="1.0"?>
+<collection xmlns="http://www.loc.gov/MARC21/slim">
+  <record><controlfield tag="001">1</controlfield></record>
+  <record><controlfield tag="001">2</controlfield></record>
+</collection>
+"""
+
+
+def test_chunked():
+    """Test splitting a stream in chunks."""
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_read_jsonlines():
+    """Test reading JSON Lines."""
+    fp = BytesIO(b'{"recid": 1}\n\n{"recid": 2}\n')
+    assert list(read_jsonlines(fp)) == [{'recid': 1}, {'recid': 2}]
+    with pytest.raises(ValueError) as excinfo:
+        list(read_jsonlines(BytesIO(b'{"recid": 1}\nnot json\n')))
+    assert 'line 2' in str(excinfo.value)
+
+
+def test_iter_marcxml():
+    """Test iterating over MARCXML records."""
+    records = [len(element) for element in iter_marcxml(BytesIO(MARCXML))]
+    assert records == [1, 1]
+
+    # Processed records are released while the file is being read.
+    records = iter_marcxml(BytesIO(MARCXML))
+    first = weakref.ref(next(records))
+    next(records)
+    gc.collect()
+    assert first() is None
+
+
+def test_bulk_ingest():
+    """Test records are written in batches."""
+    batches = []
+    progress = []
+    stats = bulk_ingest(
+        ({'recid': i} for i in range(5)), writer=batches.append,
+        chunk_size=2, callback=lambda s: progress.append(s.records))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert progress == [2, 4, 5]
+    assert stats.records == 5
+    assert stats.batches == 3
+    assert stats.to_dict()['records_per_second'] >= 0
+
+
+def test_init():
+    """Test extension initialization."""
+    app = Flask('testapp')
+    ext = InvenioIngest(app)
+    assert app.extensions['invenio-ingest'] is ext
+    assert app.config['INGEST_CHUNK_SIZE'] == 1000
+    assert 'ingest' in app.cli.commands
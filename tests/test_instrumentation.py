@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the request instrumentation."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+from flask import Flask, render_template_string
+
+from invenio.instrumentation import Histogram, InvenioInstrumentation, \
+    MetricsRegistry, current_trace
+from invenio.instrumentation.trace import uninstall_hooks
+
+
+@pytest.fixture()
+def app():
+    """Instrumented application."""
+    app = Flask('testapp')
+    app.config.update(INSTRUMENTATION_ENABLED=True,
+                      INSTRUMENTATION_SERVER_TIMING=True)
+
+    @app.route('/')
+    def index():
+        current_trace().add('search', 0.01)
+        return render_template_string('Hello {{ name }}', name='world')
+
+    InvenioInstrumentation(app)
+    yield app
+    uninstall_hooks()
+
+
+def test_histogram():
+    """Test cumulative buckets."""
+    histogram = Histogram(buckets=(1, 2))
+    for value in (0.5, 1.5, 3):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1, 1), (2, 2), (float('inf'), 3)]
+    assert histogram.sum == 5
+
+
+def test_render():
+    """Test the Prometheus text format."""
+    registry = MetricsRegistry(buckets=(1, ))
+    registry.describe('latency', 'Latency.')
+    registry.observe('latency', 0.5, endpoint='a"b')
+    registry.register_collector(lambda: [('hits', {'cache': 'x'}, 2)])
+    assert registry.render().splitlines() == [
+        '# HELP latency Latency.',
+        '# TYPE latency histogram',
+        'latency_bucket{endpoint="a\\"b",le="1.0"} 1',
+        'latency_bucket{endpoint="a\\"b",le="+Inf"} 1',
+        'latency_sum{endpoint="a\\"b"} 0.5',
+        'latency_count{endpoint="a\\"b"} 1',
+        '# TYPE hits gauge',
+        'hits{cache="x"} 2.0',
+    ]
+
+
+def test_request_breakdown(app):
+    """Test spans are aggregated per request."""
+    client = app.test_client()
+    res = client.get('/')
+    assert res.get_data(as_text=True) == 'Hello world'
+    timing = res.headers['Server-Timing']
+    assert 'template;dur=' in timing
+    assert 'search;dur=10.00' in timing
+
+    res = client.get('/metrics')
+    assert res.content_type.startswith('text/plain; version=0.0.4')
+    body = res.get_data(as_text=True)
+    assert 'invenio_request_duration_seconds_count{endpoint="index",' \
+        'method="GET",status="200"} 1' in body
+    assert 'invenio_request_template_seconds_count{endpoint="index"} 1' \
+        in body
+    assert 'endpoint="invenio_instrumentation.metrics"' not in body
+
+
+def test_metrics_access(app):
+    """Test the metrics are restricted to allowed clients."""
+    client = app.test_client()
+    assert client.get('/metrics').status_code == 200
+    remote = dict(environ_base={'REMOTE_ADDR': '192.0.2.1'})
+    assert client.get('/metrics', **remote).status_code == 403
+
+    app.config['INSTRUMENTATION_METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics', headers={
+        'Authorization': 'Bearer wrong'}, **remote).status_code == 403
+    assert client.get('/metrics', headers={
+        'Authorization': 'Bearer secret'}, **remote).status_code == 200
+
+
+def test_disabled():
+    """Test no hook is installed when disabled."""
+    app = Flask('testapp')
+    ext = InvenioInstrumentation(app)
+    assert ext.registry is None
+    assert ext.spans == []
+    assert app.test_client().get('/metrics').status_code == 404
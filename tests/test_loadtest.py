@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the load testing harness."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import os
+import socket
+import sys
+import textwrap
+import threading
+
+from click.testing import CliRunner
+from flask import Flask, jsonify, request
+
+from invenio.loadtest import MIXES, LoadTest, LocalInstance, load_mix
+from invenio.loadtest.api import render
+from invenio.loadtest.cli import loadtest
+from invenio.server.workers import ThreadedServer
+
+APP_MODULE = textwrap.dedent('''
+    from flask import Flask
+
+    app = Flask('loadtest_app')
+
+    @app.route('/')
+    def index():
+        return 'Home'
+''')
+
+
+def create_app():
+    """Create an application answering the built-in mixes."""
+    app = Flask('test_loadtest')
+    app.created = []
+
+    @app.route('/records/<int:recid>')
+    def record(recid):
+        if recid > 10:
+            return 'Not found', 404
+        return jsonify(recid=recid)
+
+    @app.route('/records/', methods=['GET', 'POST'])
+    def records():
+        if request.method == 'POST':
+            app.created.append(request.get_json()['title'])
+            return jsonify(created=True), 201
+        if request.args['q'] == 'boson':
+            return 'Error', 500
+        return jsonify(hits=[])
+
+    return app
+
+
+class Server(object):
+    """Serve an application in a thread."""
+
+    def __init__(self, app):
+        """Bind a free port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(16)
+        self.server = ThreadedServer(sock, app)
+        self.server.RequestHandlerClass.access_log = False
+        self.url = 'http://127.0.0.1:{0}'.format(sock.getsockname()[1])
+        self.thread = threading.Thread(target=self.server.serve)
+
+    def __enter__(self):
+        """Start serving."""
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop serving."""
+        self.server.stop()
+        self.thread.join()
+        self.server.server_close()
+
+
+def test_render():
+    """Test placeholders are replaced in paths and bodies."""
+    assert render({'a': ['{n}', 1]}, dict(n=3)) == {'a': ['3', 1]}
+    assert render('/records/{recid}', dict(recid=5)) == '/records/5'
+
+
+def test_load_mix(tmpdir):
+    """Test loading built-in and custom mixes."""
+    assert load_mix('read') == MIXES['read']
+    path = tmpdir.join('mix.json')
+    path.write(json.dumps([dict(name='home', path='/')]))
+    assert load_mix(str(path)) == [dict(name='home', path='/')]
+
+
+def test_load_test():
+    """Test the requests and statistics of a load test."""
+    app = create_app()
+    with Server(app) as server:
+        result = LoadTest(server.url, MIXES['mixed'], clients=4,
+                          requests=200, records=20).run()
+
+    assert result['total']['requests'] == 200
+    assert sum(e['requests'] for e in result['endpoints'].values()) == 200
+    record = result['endpoints']['record']
+    assert set(record['statuses']) == set(['200', '404'])
+    assert record['errors'] == 0
+    assert record['latency']['p50'] <= record['latency']['p99']
+    search = result['endpoints']['search']
+    assert search['errors'] == search['statuses'].get('500', 0)
+    assert result['endpoints']['create']['statuses'].get('201', 0) == \
+        len(app.created)
+    assert result['total']['requests_per_second'] > 0
+
+
+def test_load_test_duration():
+    """Test a load test lasting a given duration."""
+    with Server(create_app()) as server:
+        result = LoadTest(server.url, MIXES['read'], clients=2,
+                          duration=0.2).run()
+    assert result['total']['requests'] > 0
+    assert 0.2 <= result['seconds'] < 5
+
+
+def test_connection_errors():
+    """Test requests to an unreachable instance are counted as errors."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    result = LoadTest('http://127.0.0.1:{0}'.format(port), MIXES['read'],
+                      clients=1, requests=3).run()
+    assert result['total']['errors'] == 3
+    assert result['total']['statuses'] == {'error': 3}
+
+
+def test_client_errors():
+    """Test requests failing in the client are counted as errors."""
+    mix = [dict(name='broken', method='POST', path='/records/',
+                body={'title': '{missing}'})]
+    with Server(create_app()) as server:
+        result = LoadTest(server.url, mix, clients=2, requests=4).run()
+    assert result['total']['errors'] == 4
+    assert result['endpoints']['broken']['statuses'] == {'error': 4}
+
+
+def test_local_instance(tmpdir):
+    """Test serving an application in a subprocess."""
+    tmpdir.join('loadtest_app.py').write(APP_MODULE)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(tmpdir)] + sys.path)
+    with LocalInstance(app='loadtest_app:app', records=0, workers=1,
+                       env=env) as instance:
+        result = LoadTest(instance.url, MIXES['pages'], clients=2,
+                          requests=20).run()
+        process = instance.process
+    assert result['endpoints']['home']['statuses'] == {'200': 20}
+    assert process.returncode is not None
+
+
+def test_cli(tmpdir):
+    """Test the load test command against a running instance."""
+    output = tmpdir.join('result.json')
+    with Server(create_app()) as server:
+        result = CliRunner().invoke(
+            loadtest, ['--url', server.url, '--mix', 'read', '-n', '10',
+                       '-c', '2', '-o', str(output)])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[0].split()[:3] == [
+        'endpoint', 'requests', 'errors']
+    assert 'total' in result.output
+    assert json.loads(output.read())['total']['requests'] == 10
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for pooled mail delivery."""
+
+from __future__ import absolute_import, print_function
+
+import smtplib
+import socket
+
+import pytest
+from celery import Celery
+from flask import Flask
+from flask_mail import Mail, Message
+
+from invenio.mailpool import ConnectionPool, InvenioMailPool, RateLimiter, \
+    deserialize_message, is_transient, serialize_message
+from invenio.mailpool.bench import run
+from invenio.standins.smtp import FakeSMTPServer
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    now = 0
+
+    def __call__(self):
+        """Current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock."""
+        self.now += seconds
+
+
+class FakeHost(object):
+    """SMTP connection recording its closing."""
+
+    def __init__(self):
+        """Initialize."""
+        self.closed = False
+
+    def quit(self):
+        """Close the connection."""
+        self.closed = True
+
+
+@pytest.fixture()
+def server():
+    """Local SMTP stand-in."""
+    server = FakeSMTPServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def app(server):
+    """Application sending mail to the stand-in."""
+    app = Flask('testapp')
+    app.config.update(
+        MAIL_SERVER=server.host, MAIL_PORT=server.port,
+        MAIL_SUPPRESS_SEND=False, MAIL_DEFAULT_SENDER='noreply@example.org',
+        MAILPOOL_RETRY_BACKOFF=0,
+    )
+    Mail(app)
+    InvenioMailPool(app)
+    with app.app_context():
+        yield app
+    app.extensions['invenio-mailpool'].mailer.pool.close()
+
+
+def message(recipient='user@example.org'):
+    """Create a message."""
+    return Message('Record published', recipients=[recipient],
+                   body='Your record is available.')
+
+
+def test_is_transient():
+    """Test delivery errors are classified."""
+    assert is_transient(smtplib.SMTPSenderRefused(451, b'Later', 'a'))
+    assert is_transient(smtplib.SMTPServerDisconnected())
+    assert is_transient(socket.error())
+    assert is_transient(smtplib.SMTPRecipientsRefused(
+        {'a': (450, b'Busy'), 'b': (451, b'Later')}))
+    assert not is_transient(smtplib.SMTPRecipientsRefused(
+        {'a': (450, b'Busy'), 'b': (550, b'Unknown')}))
+    assert not is_transient(smtplib.SMTPDataError(554, b'Rejected'))
+    assert not is_transient(ValueError())
+
+
+def test_rate_limiter():
+    """Test operations are spaced according to the rate."""
+    clock = Clock()
+    limiter = RateLimiter(10, clock=clock, sleep=clock.sleep)
+    assert [limiter.acquire() for dummy in range(3)] == [0, 0.1, 0.1]
+    assert clock.now == pytest.approx(0.2)
+    clock.now += 1
+    assert limiter.acquire() == 0
+    assert limiter.waited == pytest.approx(0.2)
+    assert RateLimiter().acquire() == 0
+
+
+def test_pool():
+    """Test connections are reused until idle or used too long."""
+    clock = Clock()
+    pool = ConnectionPool(FakeHost, size=1, max_idle=10, max_messages=2,
+                          clock=clock)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert second.host.closed and not first.host.closed
+    assert pool.acquire() is first
+    first.messages = 2
+    pool.release(first)
+    assert first.host.closed
+
+    third = pool.acquire()
+    pool.release(third)
+    clock.now = 11
+    assert pool.acquire() is not third
+    assert third.host.closed
+
+    fourth = pool.acquire()
+    pool.release(fourth, reuse=False)
+    assert fourth.host.closed
+    fifth = pool.acquire()
+    pool.release(fifth)
+    pool.pid = -1
+    assert pool.acquire() is not fifth
+    assert not fifth.host.closed
+    assert pool.to_dict() == dict(created=7, reused=1, closed=4, idle=0)
+
+
+def test_send(app, server):
+    """Test Flask-Mail messages reuse the pooled connections."""
+    mail = app.extensions['mail']
+    for i in range(3):
+        mail.send(message('user{0}@example.org'.format(i)))
+    assert server.connections == 1
+    assert [m[1] for m in server.messages] == [
+        ['user0@example.org'], ['user1@example.org'], ['user2@example.org']]
+    assert server.messages[0][0] == 'noreply@example.org'
+
+    mailer = app.extensions['invenio-mailpool'].mailer
+    mailer.pool.idle[0].host.close()
+    mail.send(message())
+    assert server.connections == 2
+    assert len(server.messages) == 4
+
+    server.fail(code=550, text='Rejected')
+    with pytest.raises(smtplib.SMTPSenderRefused):
+        mail.send(message())
+    assert mailer.to_dict()['failed'] == 1
+    assert dict(
+        (name, value) for name, labels, value in
+        app.extensions['invenio-mailpool'].collect_metrics()
+    )['invenio_mail_sent'] == 4
+
+    bounced = message()
+    bounced.envelope_from = 'bounces@example.org'
+    mail.send(bounced)
+    assert server.messages[-1][0] == 'bounces@example.org'
+
+
+def test_send_many(app, server):
+    """Test permanent failures are skipped and transient ones deferred."""
+    mailer = app.extensions['invenio-mailpool'].mailer
+    server.rejected.add('unknown@example.org')
+    result = mailer.send_many([message(), message('unknown@example.org'),
+                               message()])
+    assert result.sent == [0, 2]
+    assert [index for index, dummy in result.failed] == [1]
+
+    server.fail(code=421, text='Too busy')
+    result = mailer.send_many([message(), message(), message()])
+    assert result.to_dict() == dict(sent=0, failed=0, deferred=3)
+    assert result.deferred == [0, 1, 2]
+    assert len(server.messages) == 2
+
+
+def test_reconnect(app, server):
+    """Test idle connections closed by the server are replaced."""
+    mail = app.extensions['mail']
+    mailer = app.extensions['invenio-mailpool'].mailer
+    server.rejected.add('unknown@example.org')
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        mail.send(message('unknown@example.org'))
+    connection, = mailer.pool.idle
+    assert connection.messages == 0
+    connection.host.close()
+    mail.send(message())
+    assert len(server.messages) == 1
+    assert server.connections == 2
+
+
+def test_queue(app, server):
+    """Test batched tasks retry the deferred messages."""
+    celery = Celery('testapp', broker='memory://', set_as_current=True)
+    celery.conf.task_always_eager = True
+    ext = app.extensions['invenio-mailpool']
+    data = serialize_message(message())
+    assert deserialize_message(data).send_to == {'user@example.org'}
+
+    server.fail(count=2)
+    batcher = ext.queue([message('user{0}@example.org'.format(i))
+                         for i in range(5)], batch_size=2)
+    assert batcher.messages == 3
+    assert len(server.messages) == 5
+    assert batcher.result() == dict(submitted=5, succeeded=5, failed=0,
+                                    pending=0)
+
+    app.config['MAILPOOL_MAX_RETRIES'] = 1
+    server.fail(count=2)
+    batcher = ext.queue([message()])
+    assert batcher.result()['failed'] == 1
+
+    celery.conf.task_always_eager = False
+    batcher = ext.batcher()
+    assert not batcher.aggregator.is_shared()
+
+
+def test_disabled():
+    """Test Flask-Mail is left alone when disabled."""
+    app = Flask('testapp')
+    app.config['MAILPOOL_ENABLED'] = False
+    mail = Mail(app)
+    ext = InvenioMailPool(app)
+    assert ext.mailer is None
+    assert 'send' not in vars(app.extensions['mail'])
+    assert list(ext.collect_metrics()) == []
+    assert mail
+
+
+def test_queue_disabled(server):
+    """Test batched tasks send the messages when Flask-Mail is left alone."""
+    app = Flask('testapp')
+    app.config.update(
+        MAIL_SERVER=server.host, MAIL_PORT=server.port,
+        MAIL_SUPPRESS_SEND=False, MAIL_DEFAULT_SENDER='noreply@example.org',
+        MAILPOOL_ENABLED=False,
+    )
+    ext = InvenioMailPool(app)
+    celery = Celery('testapp', broker='memory://', set_as_current=True)
+    celery.conf.update(task_always_eager=True, task_eager_propagates=True)
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            ext.queue([Message('Record published', sender='a@example.org',
+                               recipients=['user@example.org'])])
+        Mail(app)
+        ext.queue([message(), message()])
+    assert len(server.messages) == 2
+    assert 'send' not in vars(app.extensions['mail'])
+    ext.mailer.pool.close()
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(repeat=1, messages=10, connect_latency=0)
+    assert result['single_connections'] == 10
+    assert result['pooled_connections'] == 1
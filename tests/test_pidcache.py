@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the persistent identifier cache."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+
+import pytest
+from flask import Flask
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from invenio.cache import LRUCache
+from invenio.pidcache import CachedResolver, InvenioPIDCache, PIDCache, \
+    ResolvedPID
+from invenio.pidcache.api import connect_model
+
+Base = declarative_base()
+
+
+class PID(Base):
+    """Table with the columns of the persistent identifiers."""
+
+    __tablename__ = 'pidstore_pid'
+
+    id = Column(Integer, primary_key=True)
+    pid_type = Column(String(6))
+    pid_value = Column(String(255))
+    status = Column(String(1))
+    object_type = Column(String(3))
+    object_value = Column(String(255))
+
+
+@pytest.fixture()
+def session():
+    """Database session with three identifiers."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    for value, status in (('1', 'R'), ('2', 'R'), ('3', 'D')):
+        session.add(PID(pid_type='recid', pid_value=value, status=status,
+                        object_type='rec', object_value='uuid-' + value))
+    session.commit()
+    return session
+
+
+def make_cache(session, shared=None):
+    """Create a cache loading identifiers from the session."""
+    def loader(pid_type, values):
+        return [ResolvedPID.from_pid(pid) for pid in session.query(PID).filter(
+            PID.pid_type == pid_type, PID.pid_value.in_(values))]
+    cache = PIDCache(LRUCache(), shared=shared, loader=loader)
+    connect_model(PID, cache)
+    return cache
+
+
+def test_resolve(session):
+    """Test resolution through both tiers."""
+    shared = LRUCache()
+    cache = make_cache(session, shared=shared)
+    pid = cache.resolve('recid', '1')
+    assert pid == ('recid', '1', 'R', 'rec', 'uuid-1')
+    assert pid.is_registered() and not pid.is_deleted()
+    assert cache.resolve('recid', '1') == pid
+    assert cache.resolve('recid', 'missing') is None
+    assert cache.resolve('recid', 'missing') is None
+    assert cache.queries == 2
+    assert cache.stats.hits == 2
+
+    # Another process sharing the second tier.
+    other = PIDCache(LRUCache(), shared=shared, loader=None)
+    assert other.resolve('recid', '1') == pid
+    assert other.resolve('recid', 'missing') is None
+
+
+def test_resolve_many(session):
+    """Test bulk resolution uses one query."""
+    cache = make_cache(session)
+    cache.resolve('recid', '1')
+    pids = cache.resolve_many('recid', ['1', '2', '3', '4'])
+    assert cache.queries == 2
+    assert pids['2'].object_uuid == 'uuid-2'
+    assert pids['3'].is_deleted()
+    assert pids['4'] is None
+    cache.resolve_many('recid', ['1', '2', '3', '4'])
+    assert cache.queries == 2
+
+
+def test_invalidation(session):
+    """Test changes to identifiers invalidate them."""
+    shared = LRUCache()
+    cache = make_cache(session, shared=shared)
+    cache.resolve_many('recid', ['1', '2', '3', '4'])
+
+    pid = session.query(PID).filter_by(pid_value='1').one()
+    pid.status = 'D'
+    session.flush()
+    assert cache.resolve('recid', '1').is_deleted()
+    session.commit()
+    assert cache.resolve('recid', '1').is_deleted()
+
+    session.add(PID(pid_type='recid', pid_value='4', status='N'))
+    session.commit()
+    assert cache.resolve('recid', '4').status == 'N'
+
+    session.delete(session.query(PID).filter_by(pid_value='2').one())
+    session.commit()
+    assert cache.resolve('recid', '2') is None
+    assert shared.get(cache.key('recid', '2')) == ()
+    assert cache.queries == 5
+
+
+def test_invalidation_after_commit(session):
+    """Test all connected caches are invalidated once committed."""
+    caches = [make_cache(session), make_cache(session)]
+    invalidated = []
+    for cache in caches:
+        cache.invalidate = lambda *key: invalidated.append(key)
+
+    session.query(PID).filter_by(pid_value='1').one().status = 'D'
+    session.commit()
+    assert invalidated == [('recid', '1')] * 4
+
+
+def test_cached_resolver(session):
+    """Test registered identifiers are resolved from the cache."""
+    cache = make_cache(session)
+    resolver = CachedResolver(pid_type='recid', object_type='rec',
+                              getter=lambda uuid: dict(id=uuid),
+                              cache=cache)
+    pid, record = resolver.resolve('1')
+    assert pid.pid_value == '1'
+    assert record == dict(id='uuid-1')
+
+
+def test_init():
+    """Test extension initialization."""
+    app = Flask('testapp')
+    app.config['PIDCACHE_SHARED_BACKEND'] = 'lru'
+    ext = InvenioPIDCache(app)
+    assert isinstance(ext.cache.shared, LRUCache)
+    assert list(ext.collect_metrics()) == [
+        ('invenio_pidcache_queries', {}, 0)]
+
+    app = Flask('testapp')
+    app.config['PIDCACHE_SHARED_BACKEND'] = None
+    assert InvenioPIDCache(app).cache.shared is None
+
+
+def test_init_without_redis(monkeypatch):
+    """Test the shared tier is skipped when Redis is not installed."""
+    monkeypatch.setitem(sys.modules, 'redis', None)
+    app = Flask('testapp')
+    assert InvenioPIDCache(app).cache.shared is None
+    app = Flask('testapp')
+    app.config['PIDCACHE_SHARED_BACKEND'] = 'redis'
+    assert InvenioPIDCache(app).cache.shared is None
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the connection pooling profiles and N+1 query detection."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from invenio.pooling import InvenioPooling, QueryCounter, apply_profile, \
+    detect_process_type, normalize_statement
+
+
+@pytest.mark.parametrize('argv,expected', [
+    (['celery', 'worker', '-A', 'invenio3.celery'], 'worker'),
+    (['manage.py', 'run'], 'web'),
+    (['manage.py', 'records', 'create'], 'cli'),
+    (['invenio', 'serve', 'invenio3.factory:create_app'], 'web'),
+    (['uwsgi', '--http', ':5000'], 'web'),
+])
+def test_detect_process_type(argv, expected):
+    """Test process type detection."""
+    assert detect_process_type(argv, environ={}) == expected
+
+
+def test_detect_process_type_environ():
+    """Test the process type can be forced."""
+    assert detect_process_type(
+        ['manage.py', 'run'], {'INVENIO_PROCESS_TYPE': 'cli'}) == 'cli'
+
+
+def test_apply_profile():
+    """Test pool options are set unless configured."""
+    config = dict(SQLALCHEMY_DATABASE_URI='postgresql://localhost/invenio',
+                  SQLALCHEMY_POOL_SIZE=None, SQLALCHEMY_MAX_OVERFLOW=20)
+    applied = apply_profile(config, dict(pool_size=5, max_overflow=5))
+    assert applied == dict(SQLALCHEMY_POOL_SIZE=5)
+    assert config['SQLALCHEMY_MAX_OVERFLOW'] == 20
+    assert apply_profile(dict(SQLALCHEMY_DATABASE_URI='sqlite://'),
+                         dict(pool_size=5)) == {}
+
+
+def test_normalize_statement():
+    """Test statements differing by their values are identical."""
+    assert normalize_statement(
+        "SELECT * FROM t WHERE id = 12 AND name = 'it''s'") == \
+        normalize_statement('SELECT *  FROM t\nWHERE id = 3 AND name = \'x\'')
+    assert normalize_statement('SELECT 1 WHERE id IN (1, 2, 3)') == \
+        'SELECT ? WHERE id IN (?)'
+
+
+def test_query_counter():
+    """Test repeated statements are reported."""
+    counter = QueryCounter()
+    for i in range(3):
+        counter.add('SELECT * FROM pid WHERE id = {0}'.format(i))
+    counter.add('SELECT * FROM record')
+    assert counter.repeated(3) == [('SELECT * FROM pid WHERE id = ?', 3)]
+
+
+def test_detector():
+    """Test requests issuing N+1 queries are flagged."""
+    engine = create_engine('sqlite://')
+    app = Flask('testapp')
+    app.config.update(POOLING_NPLUSONE_DETECT=True,
+                      POOLING_NPLUSONE_THRESHOLD=3)
+
+    @app.route('/<int:count>')
+    def index(count):
+        with engine.connect() as conn:
+            for i in range(count):
+                conn.execute(text('SELECT {0}'.format(i)))
+        return 'OK'
+
+    ext = InvenioPooling(app)
+    client = app.test_client()
+    assert 'X-Repeated-Queries' not in client.get('/2').headers
+    assert client.get('/5').headers['X-Repeated-Queries'] == '1'
+    assert ext.reports[-1]['queries'] == [('SELECT ?', 5)]
+
+    metrics = dict((name, value) for name, labels, value
+                   in ext.collect_metrics())
+    assert metrics['invenio_db_pool_checkouts'] >= 2
+    assert metrics['invenio_db_pool_checked_out'] == 0
+
+
+def test_init_profile():
+    """Test the profile of the process type is applied."""
+    app = Flask('testapp')
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI='postgresql://localhost/invenio',
+        POOLING_PROCESS_TYPE='worker')
+    ext = InvenioPooling(app)
+    assert ext.process_type == 'worker'
+    assert app.config['SQLALCHEMY_POOL_SIZE'] == 2
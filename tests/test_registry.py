@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the entry point registry cache."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+from click.testing import CliRunner
+
+from invenio.cli import cli
+from invenio.registry import CachedEntryPoint, Registry, load_registry
+from invenio.registry.api import distributions_fingerprint
+
+
+def test_cached_entry_point():
+    """Test loading a cached entry point."""
+    ep = CachedEntryPoint('dumps', 'json', ['dumps'])
+    assert ep.load() is json.dumps
+    assert repr(ep) == 'dumps = json:dumps'
+    assert CachedEntryPoint(**ep.to_dict()).load() is json.dumps
+
+
+def test_fingerprint(tmpdir):
+    """Test the fingerprint changes with installed distributions."""
+    paths = [str(tmpdir)]
+    before = distributions_fingerprint(paths)
+    tmpdir.mkdir('other')
+    assert distributions_fingerprint(paths) == before
+    dist = tmpdir.mkdir('invenio_foo-1.0.dist-info')
+    assert distributions_fingerprint(paths) != before
+
+    # Rewriting the entry points in place keeps the directory mtime.
+    before = distributions_fingerprint(paths)
+    mtime = dist.mtime()
+    entry_points = dist.join('entry_points.txt')
+    entry_points.write('[invenio_base.apps]\n')
+    dist.setmtime(mtime)
+    assert distributions_fingerprint(paths) != before
+
+    before = distributions_fingerprint(paths)
+    mtime = entry_points.mtime()
+    entry_points.write('[invenio_base.apps]\nfoo = foo:Foo\n')
+    entry_points.setmtime(mtime)
+    assert distributions_fingerprint(paths) != before
+
+
+def test_registry_roundtrip(tmpdir):
+    """Test saving and loading the registry."""
+    path = str(tmpdir.join('var', 'registry.json'))
+    registry = Registry(
+        {'group': [CachedEntryPoint('dumps', 'json', ['dumps'])]},
+        fingerprint='abc')
+    registry.save(path)
+    loaded = Registry.load_file(path)
+    assert loaded.fingerprint == 'abc'
+    assert loaded.load('group') == [json.dumps]
+    assert list(loaded.iter_entry_points('group', name='other')) == []
+    assert loaded.load('group', exclude=['dumps']) == []
+
+
+def test_load_registry(tmpdir):
+    """Test the cache is rebuilt when distributions change."""
+    site = tmpdir.mkdir('site')
+    path = str(tmpdir.join('registry.json'))
+    paths = [str(site)]
+
+    registry = load_registry(path, groups=['console_scripts'], paths=paths)
+    assert registry.is_valid(paths)
+    cached = load_registry(path, groups=['console_scripts'], paths=paths)
+    assert cached.created == registry.created
+
+    site.mkdir('invenio_foo-1.0.dist-info')
+    rebuilt = load_registry(path, groups=['console_scripts'], paths=paths)
+    assert rebuilt.fingerprint != registry.fingerprint
+    assert Registry.load_file(path).fingerprint == rebuilt.fingerprint
+
+
+def test_load_registry_groups(tmpdir):
+    """Test applications requesting different groups share the cache."""
+    path = str(tmpdir.join('registry.json'))
+    paths = [str(tmpdir)]
+    ui = load_registry(path, groups=['console_scripts'], paths=paths)
+    api = load_registry(path, groups=['gui_scripts'], paths=paths)
+    assert api.created != ui.created
+    assert 'console_scripts' in api.entry_points
+
+    for groups in (['console_scripts'], ['gui_scripts']) * 2:
+        cached = load_registry(path, groups=groups, paths=paths)
+        assert cached.created == api.created
+
+
+def test_cli(tmpdir):
+    """Test the registry commands."""
+    path = str(tmpdir.join('registry.json'))
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ['registry', 'build', '-o', path, '-g', 'console_scripts'])
+    assert result.exit_code == 0
+    assert 'console_scripts' in Registry.load_file(path).entry_points
+
+    result = runner.invoke(cli, ['registry', 'show', '-p', path])
+    assert result.exit_code == 0
+    assert 'up to date' in result.output
+
+    result = runner.invoke(
+        cli, ['registry', 'show', '-p', str(tmpdir.join('missing'))])
+    assert result.exit_code != 0
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the parallel reindexing."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+from flask import Flask, current_app
+
+from invenio.reindex import BulkIndexer, BulkIndexError, Checkpoint, \
+    InvenioReindex, bulk_body, partition, reindex
+from invenio.reindex.api import fork_context
+from invenio.standins.search import FakeSearchServer
+
+
+def serialize(bounds):
+    """Serialize a range of fake records."""
+    first, last = bounds
+    return bulk_body(
+        ((i, {'title': 'Record {0}'.format(i)})
+         for i in range(first, last + 1)),
+        index='records', doc_type='record')
+
+
+def serialize_from_app(bounds):
+    """Serialize a range of fake records into the configured index."""
+    first, last = bounds
+    return bulk_body(
+        ((i, {'title': 'Record {0}'.format(i)})
+         for i in range(first, last + 1)),
+        index=current_app.config['REINDEX_INDEX'], doc_type='record')
+
+
+@pytest.fixture()
+def search():
+    """Fake bulk endpoint."""
+    server = FakeSearchServer().start()
+    yield server
+    server.stop()
+
+
+def test_partition():
+    """Test partitioning identifiers into ranges."""
+    assert list(partition(range(1, 8), 3)) == [(1, 3), (4, 6), (7, 7)]
+
+
+def test_reindex(search, tmpdir):
+    """Test reindexing with resume from the checkpoint."""
+    path = str(tmpdir.join('checkpoint.json'))
+    ranges = list(partition(range(1, 101), 10))
+
+    checkpoint = Checkpoint(path)
+    checkpoint.done(ranges[0])
+    count = reindex(ranges, serialize, BulkIndexer(search.url),
+                    processes=2, checkpoint=checkpoint)
+    assert count == 9
+    docs = search.documents('records')
+    assert len(docs) == 90
+    assert docs['11'] == {'title': 'Record 11'}
+
+    resumed = Checkpoint(path)
+    assert len(resumed.completed) == 10
+    assert reindex(ranges, serialize, BulkIndexer(search.url),
+                   processes=2, checkpoint=resumed) == 0
+
+
+def test_reindex_app_context(search):
+    """Test the workers inherit the application context."""
+    if hasattr(fork_context(), 'get_start_method'):
+        assert fork_context().get_start_method() == 'fork'
+    app = Flask('testapp')
+    app.config['REINDEX_INDEX'] = 'inherited'
+    with app.app_context():
+        reindex([(1, 5)], serialize_from_app, BulkIndexer(search.url),
+                processes=1)
+    assert len(search.documents('inherited')) == 5
+
+
+def test_backpressure_retry(search):
+    """Test overloaded requests are retried."""
+    search.fail_next = 2
+    indexer = BulkIndexer(search.url, max_in_flight=1, backoff=0.01)
+    indexer.submit(serialize((1, 5)))
+    indexer.close()
+    assert indexer.retried == 2
+    assert len(search.documents('records')) == 5
+
+
+def test_bulk_errors(search):
+    """Test rejected documents raise an error."""
+    search.fail_next = 3
+    indexer = BulkIndexer(search.url, max_retries=1, backoff=0.01)
+    indexer.submit(serialize((1, 5)))
+    with pytest.raises(BulkIndexError):
+        indexer.close()
+
+
+def test_init():
+    """Test extension initialization."""
+    app = Flask('testapp')
+    ext = InvenioReindex(app)
+    assert app.extensions['invenio-reindex'] is ext
+    assert app.config['REINDEX_INDEX'] == 'records'
+    assert 'reindex' in app.cli.commands
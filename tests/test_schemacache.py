@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the JSONSchema validator cache."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from invenio.schemacache import InvenioSchemaCache, SchemaNotFound, \
+    SchemaStore, ValidatorCache
+from invenio.schemacache.bench import run
+from invenio.schemacache.cli import schemas
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+jsonschema = pytest.importorskip('jsonschema')
+
+PREFIX = 'http://localhost/schemas/'
+
+DEFINITIONS = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'definitions': {'title': {'type': 'string', 'minLength': 1}},
+}
+
+RECORD = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'type': 'object',
+    'properties': {
+        'recid': {'type': 'integer'},
+        'title': {'$ref': 'definitions.json#/definitions/title'},
+    },
+    'required': ['recid'],
+}
+
+
+@pytest.fixture()
+def directory(tmpdir):
+    """Directory of schemas."""
+    tmpdir.mkdir('records').join('record.json').write(json.dumps(RECORD))
+    tmpdir.join('records', 'definitions.json').write(json.dumps(DEFINITIONS))
+    tmpdir.join('README.txt').write('not a schema')
+    return str(tmpdir)
+
+
+class FakeRecords(object):
+    """Invenio-Records state validating with a fresh validator."""
+
+    def __init__(self):
+        """Count the validations."""
+        self.calls = 0
+
+    def validate(self, data, schema, **kwargs):
+        """Validate data."""
+        self.calls += 1
+
+
+def test_store(directory):
+    """Test schemas are loaded from a directory."""
+    store = SchemaStore()
+    assert store.load_directory(directory, PREFIX) == [
+        PREFIX + 'records/definitions.json', PREFIX + 'records/record.json']
+    assert len(store) == 2
+    assert PREFIX + 'records/record.json#/properties' in store
+    assert store.get(PREFIX + 'records/record.json') == RECORD
+    assert not store.add(PREFIX + 'records/record.json', dict(RECORD))
+    with pytest.raises(SchemaNotFound):
+        store.get(PREFIX + 'unknown.json')
+
+
+def test_validate(directory):
+    """Test validators are compiled once and resolve local references."""
+    store = SchemaStore()
+    store.load_directory(directory, PREFIX)
+    cache = ValidatorCache(store)
+    url = PREFIX + 'records/record.json'
+    cache.validate({'recid': 1, 'title': 'Title'}, url)
+    cache.validate({'recid': 2}, url)
+    with pytest.raises(jsonschema.ValidationError):
+        cache.validate({'recid': 3, 'title': ''}, url)
+    assert cache.stats.to_dict()['misses'] == 1
+    assert cache.stats.to_dict()['hits'] == 2
+    with pytest.raises(SchemaNotFound):
+        cache.validate({}, PREFIX + 'unknown.json')
+
+    # A changed schema gets a new validator.
+    schema = dict(RECORD, required=['recid', 'title'])
+    assert store.add(url, schema)
+    with pytest.raises(jsonschema.ValidationError):
+        cache.validate({'recid': 2}, url)
+    assert len(cache.validators) == 1
+
+    cache.clear()
+    assert cache.preload() == 2
+    assert len(cache.validators) == 2
+
+    cache.validate({'type': 'string'}, {'type': 'object'})
+
+
+def test_validate_many(directory):
+    """Test batch validation."""
+    store = SchemaStore()
+    store.load_directory(directory, PREFIX)
+    cache = ValidatorCache(store)
+    url = PREFIX + 'records/record.json'
+    result = cache.validate_many([
+        {'recid': 1},
+        {'recid': 'a', 'title': ''},
+        {'$schema': url, 'recid': 3},
+        {'$schema': url},
+    ], schema=url, max_errors=1)
+    assert not result
+    assert result.valid == 2
+    assert result.invalid == 2
+    assert result.errors[1] == [
+        dict(path='recid', message="'a' is not of type 'integer'")]
+    assert result.errors[3][0]['path'] == ''
+    assert cache.stats.to_dict()['misses'] == 1
+
+    result = cache.validate_many([{'recid': 1}, {}])
+    assert result and result.skipped == 2
+    assert result.to_dict()['valid'] == 0
+
+
+def test_init(directory):
+    """Test schemas are preloaded and used by Invenio-Records."""
+    app = Flask('testapp')
+    app.config['SCHEMACACHE_DIRECTORIES'] = {PREFIX: directory}
+    app.extensions['invenio-records'] = records = FakeRecords()
+    ext = InvenioSchemaCache(app)
+    assert len(ext.cache.validators) == 2
+    url = PREFIX + 'records/record.json'
+    records.validate({'recid': 1}, url)
+    with pytest.raises(jsonschema.ValidationError):
+        records.validate({}, url)
+    assert records.calls == 0
+    assert ext.cache.stats.to_dict()['hits'] == 2
+
+    # Unknown schemas and custom validators use the original validation.
+    records.validate({}, PREFIX + 'unknown.json')
+    records.validate({}, url, cls=object)
+    records.validate({'recid': 1}, url, format_checker=None)
+    assert records.calls == 2
+    assert ext.install(app)
+    records.validate({}, PREFIX + 'unknown.json')
+    assert records.calls == 3
+
+    app = Flask('testapp')
+    app.config.update(SCHEMACACHE_DIRECTORIES={PREFIX: directory},
+                      SCHEMACACHE_PRELOAD=False)
+    ext = InvenioSchemaCache(app)
+    assert ext.cache.validators == {}
+    app.extensions['invenio-records'] = records = FakeRecords()
+    with app.app_context():
+        records.validate({'recid': 1}, url)
+    assert records.calls == 0
+
+    app = Flask('testapp')
+    app.config['SCHEMACACHE_ENABLED'] = False
+    app.extensions['invenio-records'] = records = FakeRecords()
+    assert len(InvenioSchemaCache(app).store) == 0
+    records.validate({}, url)
+    assert records.calls == 1
+
+
+def test_cli(directory, tmpdir):
+    """Test the validate and list commands."""
+    url = PREFIX + 'records/record.json'
+    source = tmpdir.join('records.jsonl')
+    source.write('{"recid": 1}\n{"recid": "a"}\n{"recid": 3}\n')
+
+    def create_app(*args):
+        app = Flask('testapp')
+        app.config['SCHEMACACHE_DIRECTORIES'] = {PREFIX: directory}
+        InvenioSchemaCache(app)
+        return app
+
+    runner = CliRunner()
+    obj = ScriptInfo(create_app=create_app)
+    result = runner.invoke(schemas, ['list'], obj=obj)
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        PREFIX + 'records/definitions.json', url]
+
+    result = runner.invoke(
+        schemas, ['validate', str(source), '-s', url, '-n', '2'], obj=obj)
+    assert result.exit_code == 1
+    assert "Record 2: recid: 'a' is not of type 'integer'" in result.output
+    assert '2 valid, 1 invalid records.' in result.output
+
+    result = runner.invoke(schemas, ['validate', str(source), '-s', 'x'],
+                           obj=obj)
+    assert result.exit_code != 0
+    assert 'Unknown schema' in result.output
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(records=10)
+    assert result['records'] == 10
+    assert result['batch']['records_per_second'] > 0
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the search result cache."""
+
+from __future__ import absolute_import, print_function
+
+from flask import Flask
+
+from invenio.cache import LRUCache
+from invenio.searchcache import CachedSearchClient, InvenioSearchCache, \
+    SearchCache, normalize_query
+from invenio.searchcache.api import bulk_indices, index_groups
+from invenio.standins.search import FakeSearchClient
+
+QUERY = {'query': {'term': {'type': 'book'}},
+         'aggs': {'years': {'terms': {'field': 'year'}}}}
+
+
+class FakeSearch(object):
+    """Stand-in of the Invenio-Search extension."""
+
+    def __init__(self):
+        """Initialize with a fake client."""
+        self.client = FakeSearchClient()
+
+
+def make_client(**kwargs):
+    """Create a cached fake client."""
+    return CachedSearchClient(FakeSearchClient(),
+                              SearchCache(LRUCache(), **kwargs))
+
+
+def searches(client):
+    """Count the searches which reached the search engine."""
+    return len([c for c in client.client.calls if c[0] == 'search'])
+
+
+def test_normalize_query():
+    """Test equivalent searches have the same representation."""
+    assert normalize_query('records', None, {'a': 1, 'b': {'q': 'x  y '}},
+                           {'request_timeout': 3}) == \
+        normalize_query('records', None, {'b': {'q': 'x y'}, 'a': 1}, {})
+    assert normalize_query('records', None, {'size': 1}, {}) != \
+        normalize_query('records', None, {'size': 2}, {})
+
+
+def test_index_groups():
+    """Test indices are grouped by alias."""
+    assert index_groups(None) == ['_all']
+    assert index_groups('records-record-v1.0.0') == ['records']
+    assert index_groups('records*,authors') == ['authors', 'records']
+    assert index_groups('*,records') == ['_all']
+    assert bulk_indices([{'index': {'_index': 'a', '_id': 1}}, {},
+                         {'delete': {'_index': 'b', '_id': 2}},
+                         {'index': {'_id': 3}}, {}], index='c') == \
+        set(['a', 'b', 'c'])
+
+
+def test_hit_and_invalidation():
+    """Test results are cached until the index is refreshed."""
+    client = make_client()
+    client.bulk([{'index': {'_index': 'records-v1', '_id': 1}},
+                 {'type': 'book', 'year': 2015}], refresh=True)
+
+    assert client.search('records*', body=QUERY)['hits']['total'] == 1
+    assert client.search('records*', body=dict(QUERY))['hits']['total'] == 1
+    assert searches(client) == 1
+    assert client.cache.stats.hits == 1
+
+    # Not cached until refreshed.
+    client.index('records-v1', {'type': 'book', 'year': 2016}, id=2)
+    assert client.search('records*', body=QUERY)['hits']['total'] == 1
+    assert client.search('records*', body=QUERY)['hits']['total'] == 1
+    assert searches(client) == 3
+
+    client.indices.refresh('records-v1')
+    result = client.search('records*', body=QUERY)
+    assert result['hits']['total'] == 2
+    assert len(result['aggregations']['years']['buckets']) == 2
+    client.search('records*', body=QUERY)
+    assert searches(client) == 4
+
+    # Writes to other indices do not invalidate.
+    client.index('authors-v1', {'name': 'Ellis'}, id=1, refresh=True)
+    client.search('records*', body=QUERY)
+    assert searches(client) == 4
+    client.search(body=QUERY)
+    client.index('authors-v1', {'name': 'Smith'}, id=2, refresh=True)
+    client.search(body=QUERY)
+    assert searches(client) == 6
+    assert client.cache.stats.invalidations == 5
+
+
+def test_cached_result_is_a_copy():
+    """Test modifying a returned result does not alter the cache."""
+    client = make_client()
+    client.search('records')['hits']['total'] = 42
+    assert client.search('records')['hits']['total'] == 0
+
+
+def test_timeouts():
+    """Test per-call, per-query and per-index timeouts."""
+    clock = [0]
+    backend = LRUCache(clock=lambda: clock[0])
+    client = CachedSearchClient(FakeSearchClient(), SearchCache(
+        backend, timeout=100, index_timeouts={'authors*': 10},
+        timeout_loader=lambda index, doc_type, body, params:
+            0 if body and 'nocache' in body else None))
+
+    for dummy in range(2):
+        client.search('records', body={'nocache': True})
+        client.search('records', cache_timeout=0)
+        client.search('records', scroll='1m')
+    assert searches(client) == 6
+
+    client.search('records')
+    client.search('authors')
+    clock[0] = 50
+    client.search('records')
+    client.search('authors')
+    assert searches(client) == 9
+    client.search('records', body=QUERY, cache_timeout=5)
+    clock[0] = 60
+    client.search('records', body=QUERY, cache_timeout=5)
+    assert searches(client) == 11
+
+
+def test_init():
+    """Test the client is wrapped at initialization or later."""
+    app = Flask('testapp')
+    app.config.update(SEARCHCACHE_ENABLED=True, SEARCHCACHE_BACKEND='lru')
+    app.extensions['invenio-search'] = search = FakeSearch()
+    ext = InvenioSearchCache(app)
+    assert isinstance(search.client, CachedSearchClient)
+    assert search.client.cache is ext.cache
+
+    app = Flask('testapp')
+    app.config.update(SEARCHCACHE_ENABLED=True, SEARCHCACHE_BACKEND='lru')
+    ext = InvenioSearchCache(app)
+    app.extensions['invenio-search'] = search = FakeSearch()
+    app.add_url_rule('/', 'index', lambda: 'ok')
+    assert not isinstance(search.client, CachedSearchClient)
+    with app.test_client() as client:
+        assert client.get('/').status_code == 200
+    assert isinstance(search.client, CachedSearchClient)
+    assert ext.install(app)
+    assert not isinstance(search.client.client, CachedSearchClient)
+
+    app = Flask('testapp')
+    app.extensions['invenio-search'] = search = FakeSearch()
+    assert InvenioSearchCache(app).cache is None
+    assert isinstance(search.client, FakeSearchClient)
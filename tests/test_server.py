@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the pre-forking server."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from invenio.helpers import load_app
+from invenio.server import PreforkServer, SyncServer
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+
+def app(environ, start_response):
+    """Return the process identifier of the worker."""
+    if environ['PATH_INFO'] == '/slow':
+        time.sleep(1)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok']
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [str(os.getpid()).encode('ascii')]
+
+
+def get_pid(address):
+    """Request the server and return the worker process identifier."""
+    for dummy in range(50):
+        try:
+            return int(urlopen(
+                'http://{0}:{1}/'.format(*address), timeout=5).read())
+        except IOError:
+            time.sleep(0.1)
+    raise AssertionError('Server is not responding.')
+
+
+@pytest.mark.parametrize('concurrency', ['sync', 'threads'])
+def test_prefork_server(concurrency):
+    """Test serving, respawning workers and stopping."""
+    server = PreforkServer(app, port=0, workers=2, concurrency=concurrency,
+                           access_log=False)
+    address = server.bind()
+    master = os.fork()
+    if not master:
+        try:
+            server.run()
+        finally:
+            os._exit(0)
+    server.socket.close()
+
+    try:
+        worker = get_pid(address)
+        assert worker not in (master, os.getpid())
+
+        os.kill(worker, signal.SIGKILL)
+        pids = set(get_pid(address) for dummy in range(20))
+        assert worker not in pids
+    finally:
+        os.kill(master, signal.SIGTERM)
+        dummy, status = os.waitpid(master, 0)
+    assert os.WIFEXITED(status)
+
+
+def test_load_app_from_cwd(tmpdir, monkeypatch):
+    """Test loading the application of an instance which is not installed."""
+    package = tmpdir.mkdir('serverinstance')
+    package.join('__init__.py').write('')
+    package.join('factory.py').write(
+        'from flask import Flask\n\n\n'
+        'def create_app(**kwargs):\n'
+        '    return Flask(__name__)\n')
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.setattr(sys, 'path', [p for p in sys.path
+                                      if p not in ('', str(tmpdir))])
+    app = load_app('serverinstance.factory:create_app')
+    assert app.name == 'serverinstance.factory'
+
+
+def test_unknown_concurrency():
+    """Test invalid concurrency model."""
+    with pytest.raises(ValueError):
+        PreforkServer(app, concurrency='unknown')
+
+
+@pytest.mark.parametrize('concurrency', ['sync', 'threads'])
+def test_graceful_stop(concurrency):
+    """Test the requests being handled complete when stopping."""
+    server = PreforkServer(app, port=0, workers=1, concurrency=concurrency,
+                           access_log=False)
+    address = server.bind()
+    master = os.fork()
+    if not master:
+        try:
+            server.run()
+        finally:
+            os._exit(0)
+    server.socket.close()
+
+    responses = []
+    try:
+        get_pid(address)
+        client = threading.Thread(target=lambda: responses.append(urlopen(
+            'http://{0}:{1}/slow'.format(*address), timeout=5).read()))
+        client.start()
+        time.sleep(0.3)
+    finally:
+        os.kill(master, signal.SIGTERM)
+        os.waitpid(master, 0)
+    client.join()
+    assert responses == [b'ok']
+
+
+def test_accept_without_connection():
+    """Test a worker which lost the race for a connection does not block."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(5)
+    server = SyncServer(sock, app)
+    try:
+        # Accept as if the listening socket had been reported readable.
+        thread = threading.Thread(target=server._handle_request_noblock)
+        thread.daemon = True
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive()
+    finally:
+        sock.close()
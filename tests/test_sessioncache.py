@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the session store and the identity cache."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+
+import pytest
+from flask import Flask, session
+
+from invenio.cache import LRUCache
+from invenio.sessioncache import CachedSessionInterface, CachedUser, \
+    IdentityCache, InvenioSessionCache
+from invenio.sessioncache.api import connect_models
+from invenio.sessioncache.bench import create_app, create_models, run
+
+pytest.importorskip('flask_login')
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0
+
+    def __call__(self):
+        """Current time."""
+        return self.now
+
+
+@pytest.fixture()
+def app():
+    """Application with server-side sessions."""
+    app = Flask('testapp')
+    app.secret_key = 'secret'
+    app.session_interface = CachedSessionInterface(
+        LRUCache(), refresh_interval=10, clock=Clock())
+
+    @app.route('/set/<value>')
+    def set_value(value):
+        session['value'] = value
+        return 'ok'
+
+    @app.route('/get')
+    def get_value():
+        return session.get('value', '')
+
+    @app.route('/regenerate')
+    def regenerate():
+        session.regenerate()
+        return 'ok'
+
+    @app.route('/clear')
+    def clear():
+        session.clear()
+        return 'ok'
+
+    return app
+
+
+def session_cookie(client):
+    """Get the session cookie of a test client."""
+    return client.get_cookie('session').value
+
+
+def test_sessions(app):
+    """Test the session data is stored on the server."""
+    backend = app.session_interface.backend
+    with app.test_client() as client:
+        assert client.get('/get').data == b''
+        assert len(backend) == 0
+        client.get('/set/42')
+        assert len(backend) == 1
+        cookie = session_cookie(client)
+        assert '42' not in cookie
+        assert client.get('/get').data == b'42'
+
+        client.get('/regenerate')
+        assert session_cookie(client) != cookie
+        assert len(backend) == 1
+        assert client.get('/get').data == b'42'
+
+        client.get('/clear')
+        assert len(backend) == 0
+        assert client.get('/get').data == b''
+
+    with app.test_client() as client:
+        client.set_cookie('session', cookie)
+        assert client.get('/get').data == b''
+    assert app.session_interface.stats.misses == 1
+
+
+def test_session_refresh(app):
+    """Test unmodified permanent sessions are rewritten periodically."""
+    interface = app.session_interface
+    writes = []
+    backend_set = interface.backend.set
+    interface.backend.set = lambda *args, **kwargs: writes.append(
+        kwargs['timeout']) or backend_set(*args, **kwargs)
+
+    @app.route('/permanent')
+    def permanent():
+        session.permanent = True
+        return 'ok'
+
+    with app.test_client() as client:
+        client.get('/set/1')
+        client.get('/get')
+        assert writes == [24 * 3600]
+        client.get('/permanent')
+        client.get('/get')
+        interface.clock.now = 10
+        client.get('/get')
+        assert writes == [24 * 3600, 31 * 24 * 3600, 31 * 24 * 3600]
+
+
+@pytest.fixture()
+def accounts():
+    """Database with a user having two roles."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    Base, User, Role = create_models()
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db_session = Session(engine)
+    db_session.add(User(email='info@example.org', password='secret',
+                        roles=[Role(name='admin'), Role(name='curator')]))
+    db_session.commit()
+    return db_session, User, Role
+
+
+def test_identity_cache(accounts):
+    """Test identities are cached and invalidated."""
+    db_session, User, Role = accounts
+    loaded = []
+
+    def load_user(user_id):
+        loaded.append(user_id)
+        return db_session.get(User, int(user_id))
+
+    shared = LRUCache()
+    cache = IdentityCache(LRUCache(), shared=shared, user_loader=load_user,
+                          needs_loader=lambda user: [('action', 'read')])
+    connect_models(User, Role, cache)
+
+    user = cache.load_user('1')
+    assert isinstance(user, CachedUser)
+    assert user.email == 'info@example.org'
+    assert user.get_id() == '1' and user.is_active
+    assert user.has_role('admin') and not user.has_role('owner')
+    assert sorted(user.needs) == [('action', 'read'), ('id', 1),
+                                  ('role', 'admin'), ('role', 'curator')]
+    assert 'password' not in user.__dict__
+    assert cache.load_user('1') == user
+    assert cache.stats.hits == 1
+    assert loaded == ['1']
+
+    # Uncached attributes load the user model.
+    assert user.password == 'secret'
+    assert loaded == ['1', 1]
+
+    cache.local.clear()
+    assert cache.load_user('1').has_role('curator')
+    assert cache.stats.hits == 2
+
+    assert cache.load_user('2') is None
+    assert cache.load_user('2') is None
+    assert cache.queries == 3
+
+    db_session.get(Role, 2).name = 'editor'
+    db_session.commit()
+    assert cache.load_user('1').has_role('editor')
+
+    model = db_session.get(User, 1)
+    model.roles = [role for role in model.roles if role.name != 'editor']
+    db_session.commit()
+    assert not cache.load_user('1').has_role('editor')
+
+    model.active = False
+    db_session.flush()
+    assert not cache.load_user('1').is_active
+    db_session.rollback()
+    assert cache.load_user('1').is_active
+    assert cache.queries == 7
+
+
+def test_identity_invalidation_after_commit(accounts):
+    """Test all connected caches are invalidated once committed."""
+    db_session, User, Role = accounts
+    caches = [IdentityCache(LRUCache()), IdentityCache(LRUCache())]
+    invalidated = []
+    for cache in caches:
+        connect_models(User, Role, cache)
+        cache.invalidate = lambda user_id: invalidated.append(user_id)
+
+    db_session.get(Role, 1).name = 'superuser'
+    db_session.commit()
+    assert invalidated == [1] * 4
+
+
+def test_init():
+    """Test users are loaded from the cache without any query."""
+    app, db_session, queries = create_app(users=2)
+    ext = app.extensions['invenio-sessioncache']
+    assert app.session_interface is ext.session_interface
+    assert app.login_manager._user_callback == ext.cache.load_user
+    with app.test_client() as client:
+        client.get('/login/1')
+        assert sorted(client.get('/me').json['roles']) == [
+            'role0', 'role1', 'role2']
+        del queries[:]
+        assert client.get('/me').json['email'] == 'user1@example.org'
+        assert queries == []
+    assert ext.install(app)
+    metrics = list(ext.collect_metrics())
+    assert ('invenio_sessioncache_identity_queries', {}, 1) in metrics
+    assert ('invenio_sessioncache_sessions', {'result': 'hit'}, 2) in metrics
+
+    app, db_session, queries = create_app(cached=False, users=1)
+    assert app.extensions['invenio-sessioncache'].cache is None
+    with app.test_client() as client:
+        client.get('/login/1')
+        del queries[:]
+        client.get('/me')
+        assert len(queries) == 2
+
+
+def test_init_defaults(monkeypatch):
+    """Test sessions stay in cookies unless a backend is configured."""
+    monkeypatch.setitem(sys.modules, 'redis', None)
+    app = Flask('testapp')
+    ext = InvenioSessionCache(app)
+    assert ext.session_interface is None
+    assert ext.cache.shared is None
+
+    app = Flask('testapp')
+    app.config.update(SESSIONCACHE_BACKEND='redis',
+                      SESSIONCACHE_IDENTITY_SHARED_BACKEND='redis')
+    ext = InvenioSessionCache(app)
+    assert ext.session_interface is None
+    assert not isinstance(app.session_interface, CachedSessionInterface)
+    assert ext.cache.shared is None
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(requests=10, users=2)
+    assert result['cached']['queries_per_request'] == 0
+    assert result['uncached']['queries_per_request'] == 2
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the startup profiler."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import os
+import sys
+import textwrap
+
+import pytest
+from click.testing import CliRunner
+
+from invenio.startup import StartupProfiler, profile_startup
+from invenio.startup.cli import format_table
+from invenio.startup.cli import profile_startup as profile_startup_cmd
+
+APP_MODULE = textwrap.dedent('''
+    from flask import Flask
+
+    from {name}_ext import Ext
+
+
+    def create_app():
+        app = Flask(__name__)
+        Ext(app)
+        return app
+''')
+
+EXT_MODULE = textwrap.dedent('''
+    import {name}_data
+
+
+    class Ext(object):
+        def __init__(self, app=None):
+            if app:
+                self.init_app(app)
+
+        def init_app(self, app):
+            self.data = [str(i) * 10 for i in range(1000)]
+            app.extensions['ext'] = self
+''')
+
+
+@pytest.fixture()
+def app_module(tmpdir, monkeypatch):
+    """Write an application module on the import path."""
+    name = 'startup_{0}'.format(os.getpid())
+    tmpdir.join(name + '.py').write(APP_MODULE.format(name=name))
+    tmpdir.join(name + '_ext.py').write(EXT_MODULE.format(name=name))
+    tmpdir.join(name + '_data.py').write('DATA = list(range(10000))\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join(
+        [str(tmpdir)] + sys.path))
+    yield name
+    for module in (name, name + '_ext', name + '_data'):
+        sys.modules.pop(module, None)
+
+
+def by_name(rows):
+    """Index report rows by name."""
+    return dict((row['name'], row) for row in rows)
+
+
+def test_profiler(app_module):
+    """Test modules and extensions are measured."""
+    report = profile_startup(app_module + ':create_app')
+    assert report['app'] == app_module + ':create_app'
+    assert report['traced'] and report['memory'] > 0
+
+    modules = by_name(report['modules'])
+    ext, data = modules[app_module + '_ext'], modules[app_module + '_data']
+    assert ext['calls'] == 1
+    assert ext['seconds'] >= data['seconds']
+    assert ext['self_seconds'] == ext['seconds'] - data['seconds']
+    assert data['memory'] > 10000
+    assert ext['memory'] >= data['memory']
+    assert data['package'] == app_module + '_data'
+    assert data['bundle'] is None
+
+    extension = by_name(report['extensions'])[app_module + '_ext.Ext']
+    assert extension['calls'] == 1
+    assert extension['memory'] > 0
+    assert by_name(report['packages'])[app_module + '_data']['modules'] == 1
+
+    # Classes and import system are restored.
+    Ext = sys.modules[app_module + '_ext'].Ext
+    assert Ext.init_app is Ext.__dict__['init_app']
+    assert Ext.init_app.__name__ == 'init_app'
+    assert not any(isinstance(f, StartupProfiler) for f in sys.meta_path)
+
+
+def test_profiler_without_memory(app_module):
+    """Test profiling without tracing memory."""
+    with StartupProfiler(memory=False) as profiler:
+        __import__(app_module + '_data')
+    report = profiler.report()
+    assert not report['traced']
+    assert by_name(report['modules'])[app_module + '_data']['memory'] == 0
+
+
+def test_format_table():
+    """Test sorting and limiting tables."""
+    rows = [dict(name='a', self_seconds=0.001, self_memory=2048),
+            dict(name='b', self_seconds=0.002, self_memory=1024)]
+    columns = ('name', 'self_seconds', 'self_memory')
+    lines = format_table(rows, columns).splitlines()
+    assert lines[0].split() == ['name', 'self_ms', 'self_kib']
+    assert lines[1].split() == ['b', '2.00', '1.0']
+    lines = format_table(rows, columns, sort='memory', limit=1).splitlines()
+    assert len(lines) == 2 and lines[1].startswith('a')
+
+
+def test_cli(app_module, tmpdir):
+    """Test the command in a fresh interpreter."""
+    output = tmpdir.join('report.json')
+    result = CliRunner().invoke(profile_startup_cmd, [
+        app_module + ':create_app', '--view', 'extensions', '-o',
+        str(output)])
+    assert result.exit_code == 0, result.output
+    assert app_module + '_ext.Ext' in result.output
+    assert 'Modules:' not in result.output
+    report = json.loads(output.read())
+    assert app_module + '_data' in by_name(report['modules'])
+    assert 'flask' in by_name(report['packages'])
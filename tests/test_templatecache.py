@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the template bytecode cache."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+from click.testing import CliRunner
+from flask import Flask, render_template
+from jinja2 import DictLoader, Environment
+
+from invenio.templatecache import InvenioTemplateCache, \
+    SourceHashBytecodeCache, compile_templates
+from invenio.templatecache.bench import run
+from invenio.templatecache.cli import templates
+
+try:
+    from flask.cli import ScriptInfo
+except ImportError:
+    from flask_cli import ScriptInfo
+
+
+def cached_files(path):
+    """List the bytecode files of a directory."""
+    return sorted(name for name in os.listdir(path)
+                  if name.endswith('.cache'))
+
+
+def test_source_hash_key(tmpdir):
+    """Test bytecode is shared across filenames but not sources."""
+    cache = SourceHashBytecodeCache(str(tmpdir.join('cache')))
+    loader = DictLoader({'a.html': '{{ 1 + 1 }}', 'b.html': '{% if %}'})
+    keys, errors = compile_templates(Environment(loader=loader), cache)
+    assert list(errors) == ['b.html']
+    assert len(keys) == 1
+    assert cached_files(cache.directory) == [cache.pattern % k for k in keys]
+
+    env = Environment(loader=loader, bytecode_cache=cache)
+    bucket = cache.get_bucket(env, 'a.html', '/elsewhere/a.html',
+                              '{{ 1 + 1 }}')
+    assert bucket.code is not None
+    assert cache.get_bucket(env, 'a.html', None, '{{ 2 }}').code is None
+
+    loader.mapping['a.html'] = '{{ 2 }}'
+    new_keys, errors = compile_templates(env, cache)
+    assert len(cached_files(cache.directory)) == 2
+    assert cache.prune(new_keys) == 1
+    assert cached_files(cache.directory) == [
+        cache.pattern % k for k in new_keys]
+    assert env.get_template('a.html').render() == '2'
+
+
+def test_init(tmpdir):
+    """Test extension initialization."""
+    app = Flask('testapp', template_folder=str(tmpdir))
+    app.config['TEMPLATECACHE_DIRECTORY'] = str(tmpdir.join('cache'))
+    ext = InvenioTemplateCache(app)
+    assert app.jinja_env.bytecode_cache is ext.bytecode_cache
+
+    app = Flask('testapp')
+    app.jinja_env
+    app.config['TEMPLATECACHE_DIRECTORY'] = str(tmpdir.join('cache'))
+    ext = InvenioTemplateCache(app)
+    assert app.jinja_env.bytecode_cache is ext.bytecode_cache
+
+    app = Flask('testapp')
+    app.config['TEMPLATECACHE_ENABLED'] = False
+    assert InvenioTemplateCache(app).bytecode_cache is None
+    assert app.jinja_env.bytecode_cache is None
+
+
+def test_unwritable_cache(tmpdir):
+    """Test rendering works when the cache cannot be written."""
+    tmpdir.join('page.html').write('{{ 40 + 2 }}')
+    app = Flask('testapp', template_folder=str(tmpdir))
+    app.config['TEMPLATECACHE_DIRECTORY'] = str(tmpdir.join('missing'))
+    InvenioTemplateCache(app)
+    os.rmdir(app.config['TEMPLATECACHE_DIRECTORY'])
+    with app.app_context():
+        assert render_template('page.html') == '42'
+
+
+def test_cli(tmpdir):
+    """Test the compile and clean commands."""
+    tmpdir.join('page.html').write('{{ title }}')
+    cache_directory = str(tmpdir.join('cache'))
+
+    def create_app(*args):
+        app = Flask('testapp', template_folder=str(tmpdir))
+        app.config['TEMPLATECACHE_DIRECTORY'] = cache_directory
+        InvenioTemplateCache(app)
+        return app
+
+    runner = CliRunner()
+    obj = ScriptInfo(create_app=create_app)
+    result = runner.invoke(templates, ['compile', '--prune'], obj=obj)
+    assert result.exit_code == 0, result.output
+    assert 'Compiled 1 templates' in result.output
+    assert len(cached_files(cache_directory)) == 1
+
+    result = runner.invoke(templates, ['clean'], obj=obj)
+    assert result.exit_code == 0
+    assert cached_files(cache_directory) == []
+
+
+def test_bench():
+    """Test the benchmark runs."""
+    result = run(repeat=1, pages=2)
+    assert result['templates'] == 4
+    assert result['first_render_cached_seconds']['count'] == 1
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Tests for the Celery worker profile."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+
+import pytest
+from celery import Celery
+from flask import Flask
+
+from invenio.worker import WEB_ONLY_EXTENSIONS, InvenioWorker, TaskRouter, \
+    create_worker_app, factory, pool_name
+
+
+@pytest.fixture()
+def app():
+    """Application with a Celery application."""
+    app = Flask('test_worker')
+    app.config.update(BROKER_URL='memory://')
+    InvenioWorker(app)
+    celery = Celery(app.import_name)
+    celery.conf.update(app.config)
+    app.celery = celery
+    return app
+
+
+def test_router():
+    """Test routing by task name patterns."""
+    router = TaskRouter([('invenio_indexer.*', 'indexing'),
+                         ('*.send_email', 'mail')], 'default')
+    assert router.route_for_task('invenio_indexer.tasks.index') == dict(
+        queue='indexing')
+    assert router.route_for_task('invenio_mail.tasks.send_email') == dict(
+        queue='mail')
+    assert router.route_for_task('other') == dict(queue='default')
+    assert TaskRouter([]).route_for_task('other') is None
+
+
+def test_routes(app):
+    """Test tasks are sent to the queue of their route."""
+    router = app.celery.amqp.router
+    assert router.route({}, 'invenio_indexer.tasks.index_record')[
+        'queue'].name == 'indexing'
+    assert router.route({}, 'invenio_mail.tasks.send_email')[
+        'queue'].name == 'mail'
+    assert router.route({}, 'celery.backend_cleanup')[
+        'queue'].name == 'maintenance'
+    assert router.route({}, 'invenio_records.tasks.create')[
+        'queue'].name == 'default'
+    assert set(app.celery.amqp.queues) == set(
+        ['default', 'indexing', 'mail', 'maintenance'])
+
+
+def test_pool_name():
+    """Test the pool is taken from the environment or the node name."""
+    assert pool_name('indexing@host', environ={}) == 'indexing'
+    assert pool_name('host', environ={}) is None
+    assert pool_name('indexing@host',
+                     environ=dict(INVENIO_WORKER_POOL='mail')) == 'mail'
+
+
+def test_configure_worker(app):
+    """Test the pool options are applied to starting workers."""
+    from celery.apps.worker import Worker
+
+    worker = Worker(app=app.celery, hostname='indexing@localhost',
+                    quiet=True)
+    ext = app.extensions['invenio-worker']
+    assert ext.pool == 'indexing'
+    assert set(ext.applied) == set([
+        'queues', 'concurrency', 'prefetch_multiplier',
+        'max_tasks_per_child'])
+    assert worker.concurrency == 2
+    assert worker.max_tasks_per_child == 100
+    assert app.celery.conf.worker_prefetch_multiplier == 1
+    assert set(app.celery.amqp.queues.consume_from) == set(['indexing'])
+
+
+def test_configure_worker_options(app):
+    """Test command line options win over the pool options."""
+    ext = app.extensions['invenio-worker']
+
+    class Worker(object):
+        """Starting worker."""
+
+        def __init__(self, celery):
+            """Initialize."""
+            self.app = celery
+
+    applied = ext.configure(app, 'mail@localhost', Worker(app.celery),
+                            dict(concurrency=10, queues='default'))
+    assert set(applied) == set(['prefetch_multiplier', 'max_tasks_per_child'])
+    assert ext.configure(app, 'other@localhost', Worker(app.celery)) == {}
+
+
+def test_web_only_extensions():
+    """Test caches invalidated by record changes are loaded by workers."""
+    assert 'invenio_httpcache' not in WEB_ONLY_EXTENSIONS
+    assert 'invenio_theme' in WEB_ONLY_EXTENSIONS
+
+
+def test_create_worker_app(tmpdir, monkeypatch):
+    """Test workers use the configuration of the instance."""
+    package = tmpdir.mkdir('worker_instance')
+    package.join('__init__.py').write('')
+    package.join('factory.py').write(
+        'config_loader = dict\n'
+        'instance_path = \'/srv/worker_instance\'\n'
+        'static_folder = None\n')
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    monkeypatch.setattr(
+        factory, 'create_app_factory',
+        lambda app_name, **kwargs: lambda: (app_name, kwargs))
+
+    app_name, kwargs = create_worker_app('worker_instance')
+    assert app_name == 'worker_instance'
+    assert kwargs == dict(
+        config_loader=dict, instance_path='/srv/worker_instance',
+        extension_entry_points=['invenio_base.apps'],
+        blueprint_entry_points=['invenio_base.blueprints'])
+    assert create_worker_app(
+        'worker_instance', instance_path='/tmp')[1]['instance_path'] == '/tmp'
+    del sys.modules['worker_instance.factory']
+    del sys.modules['worker_instance']